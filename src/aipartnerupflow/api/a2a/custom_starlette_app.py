@@ -387,6 +387,16 @@ class CustomA2AStarletteApplication(A2AStarletteApplication):
                 app.add_middleware(middleware_class)
                 logger.info(f"Added custom middleware: {middleware_class.__name__}")
         
+        # Claim queued executions while the app runs (work queue enabled only)
+        from aipartnerupflow.core.execution.work_queue import run_queue_worker_on_startup
+
+        run_queue_worker_on_startup(app)
+
+        # Close pooled HTTP clients (executors, webhooks) on shutdown
+        from aipartnerupflow.extensions.http.client_pool import close_http_clients_on_shutdown
+
+        close_http_clients_on_shutdown(app)
+
         # Cache the built app
         self._built_app = app
         return self._built_app
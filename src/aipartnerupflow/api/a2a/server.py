@@ -47,6 +47,16 @@ def load_skills() -> list[AgentSkill]:
         )
     )
     
+    skills.append(
+        AgentSkill(
+            id="tasks.execute_batch",
+            name="Execute Task Tree Batch",
+            description="Create several independent task trees in one transaction and execute them together",
+            tags=["task", "orchestration", "execution", "batch"],
+            examples=["execute task trees in batch", "run many workflows at once"],
+        )
+    )
+    
     # Task CRUD operations
     skills.append(
         AgentSkill(
@@ -182,6 +192,26 @@ def load_skills() -> list[AgentSkill]:
         )
     )
     
+    # Task templates
+    skills.append(
+        AgentSkill(
+            id="tasks.template.create",
+            name="Create Task Template",
+            description="Validate a task tree once and store it as a template with parameters",
+            tags=["task", "template", "create"],
+            examples=["create task template", "register workflow template"],
+        )
+    )
+    skills.append(
+        AgentSkill(
+            id="tasks.template.instantiate",
+            name="Instantiate Task Template",
+            description="Create (and optionally execute) a task tree from a template with parameter values",
+            tags=["task", "template", "instantiate"],
+            examples=["instantiate task template", "create task tree from template"],
+        )
+    )
+    
     # Task generation
     skills.append(
         AgentSkill(
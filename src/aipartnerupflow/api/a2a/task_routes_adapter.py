@@ -88,8 +88,11 @@ class TaskRoutesAdapter:
                     "tasks.running.count": "tasks.running.count",
                     "tasks.cancel": "tasks.cancel",
                     "tasks.copy": "tasks.copy",
+                    "tasks.template.create": "tasks.template.create",
+                    "tasks.template.instantiate": "tasks.template.instantiate",
                     "tasks.generate": "tasks.generate",
                     "tasks.execute": "tasks.execute",
+                    "tasks.execute_batch": "tasks.execute_batch",
                 }
                 return skill_to_method.get(skill_id, skill_id)
         
@@ -269,8 +272,16 @@ class TaskRoutesAdapter:
             return await self.task_routes.handle_task_cancel(params, request, request_id)
         elif method == "tasks.copy":
             return await self.task_routes.handle_task_copy(params, request, request_id)
+        elif method == "tasks.template.create":
+            return await self.task_routes.handle_task_template_create(params, request, request_id)
+        elif method == "tasks.template.instantiate":
+            return await self.task_routes.handle_task_template_instantiate(params, request, request_id)
         elif method == "tasks.generate":
             return await self.task_routes.handle_task_generate(params, request, request_id)
+        elif method == "tasks.execute_batch":
+            # The A2A response is a single message: no SSE stream through the adapter
+            params = {**params, "use_streaming": False}
+            return await self.task_routes.handle_task_execute_batch(params, request, request_id)
         elif method == "tasks.execute":
             # tasks.execute is handled separately in agent_executor
             # This should not be called through the adapter
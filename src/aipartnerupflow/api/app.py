@@ -112,6 +112,16 @@ def create_mcp_server(
         version=__version__,
     )
 
+    # Claim queued executions while the app runs (work queue enabled only)
+    from aipartnerupflow.core.execution.work_queue import run_queue_worker_on_startup
+
+    run_queue_worker_on_startup(app)
+
+    # Close pooled HTTP clients (executors, webhooks) on shutdown
+    from aipartnerupflow.extensions.http.client_pool import close_http_clients_on_shutdown
+
+    close_http_clients_on_shutdown(app)
+
     # Create MCP server instance
     mcp_server = McpServer(task_routes_class=task_routes_class)
 
@@ -261,6 +261,53 @@ def generate_openapi_schema(
                                             "id": "copy-request-1",
                                         },
                                     },
+                                    "createTaskTemplate": {
+                                        "summary": "Create Task Template",
+                                        "value": {
+                                            "jsonrpc": "2.0",
+                                            "method": "tasks.template.create",
+                                            "params": {
+                                                "name": "fetch-and-summarize",
+                                                "parameters": ["url"],
+                                                "tasks": [
+                                                    {
+                                                        "name": "Fetch",
+                                                        "schemas": {"method": "rest_executor"},
+                                                        "inputs": {"url": "{{url}}", "method": "GET"},
+                                                    }
+                                                ],
+                                            },
+                                            "id": "template-create-request-1",
+                                        },
+                                    },
+                                    "instantiateTaskTemplate": {
+                                        "summary": "Instantiate Task Template",
+                                        "value": {
+                                            "jsonrpc": "2.0",
+                                            "method": "tasks.template.instantiate",
+                                            "params": {
+                                                "template_id": "template-abc-123",
+                                                "parameters": {"url": "https://example.com"},
+                                                "execute": True,
+                                            },
+                                            "id": "template-instantiate-request-1",
+                                        },
+                                    },
+                                    "executeTaskBatch": {
+                                        "summary": "Execute Task Tree Batch",
+                                        "value": {
+                                            "jsonrpc": "2.0",
+                                            "method": "tasks.execute_batch",
+                                            "params": {
+                                                "trees": [
+                                                    [{"name": "Report Paris", "schemas": {"method": "system_info_executor"}}],
+                                                    [{"name": "Report Rome", "schemas": {"method": "system_info_executor"}}],
+                                                ],
+                                                "use_streaming": False,
+                                            },
+                                            "id": "batch-request-1",
+                                        },
+                                    },
                                     "getTaskTree": {
                                         "summary": "Get Task Tree",
                                         "value": {
@@ -399,6 +446,15 @@ def generate_openapi_schema(
                                             "id": "health-request-1",
                                         },
                                     },
+                                    "executorStats": {
+                                        "summary": "Executor Duration Statistics",
+                                        "value": {
+                                            "jsonrpc": "2.0",
+                                            "method": "system.executor_stats",
+                                            "params": {"executor_id": "rest_executor"},
+                                            "id": "executor-stats-request-1",
+                                        },
+                                    },
                                 },
                             }
                         },
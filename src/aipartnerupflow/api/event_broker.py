@@ -0,0 +1,220 @@
+"""
+In-memory pub/sub broker for task streaming events
+
+Each root task execution gets its own stream with a bounded ring buffer of
+(event_id, event) pairs. Event ids increase by one per stream, so SSE clients can
+resume from the last id they received (Last-Event-ID). Subscribers wait on an
+asyncio.Condition instead of polling, and only receive the events after their offset.
+
+A stream is finished when a final event is published or its producer closes it;
+finished streams are evicted once they are older than the TTL.
+
+Environment variables:
+- AIPARTNERUPFLOW_STREAM_BUFFER_SIZE: events kept per stream (default 1000)
+- AIPARTNERUPFLOW_STREAM_TTL: seconds a finished stream is kept (default 300)
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from aipartnerupflow.core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_STREAM_BUFFER_SIZE = 1000
+DEFAULT_STREAM_TTL = 300.0
+
+
+class _TaskEventStream:
+    """Events of one root task execution"""
+
+    def __init__(self, max_events: int):
+        self.events: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=max_events)
+        self.next_id = 1
+        self.condition = asyncio.Condition()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def last_id(self) -> int:
+        return self.next_id - 1
+
+    def events_after(self, after_id: int) -> List[Tuple[int, Dict[str, Any]]]:
+        if not self.events:
+            return []
+        # Ids in the buffer are contiguous, so the offset can be computed directly
+        start = max(0, after_id - self.events[0][0] + 1)
+        return list(islice(self.events, start, None))
+
+
+class TaskEventBroker:
+    """
+    Per-root-task event streams with bounded buffers and TTL eviction
+    """
+
+    def __init__(self, max_events: int = DEFAULT_STREAM_BUFFER_SIZE, ttl: float = DEFAULT_STREAM_TTL):
+        """
+        Initialize broker
+
+        Args:
+            max_events: Maximum number of events kept per stream (oldest are dropped)
+            ttl: Seconds a finished stream is kept for late subscribers
+        """
+        if max_events < 1:
+            raise ValueError(f"max_events must be >= 1, got {max_events}")
+        self.max_events = max_events
+        self.ttl = ttl
+        self._streams: Dict[str, _TaskEventStream] = {}
+
+    def open_stream(self, root_task_id: str) -> None:
+        """
+        Open the stream of a root task
+
+        An unfinished stream is kept as is; a finished one (previous execution of the
+        same task) is replaced by an empty stream.
+
+        Args:
+            root_task_id: Root task ID
+        """
+        self._evict_expired()
+        stream = self._streams.get(root_task_id)
+        if stream is None or stream.finished_at is not None:
+            self._streams[root_task_id] = _TaskEventStream(self.max_events)
+
+    async def publish(self, root_task_id: str, event: Dict[str, Any]) -> int:
+        """
+        Append an event and wake up subscribers
+
+        Args:
+            root_task_id: Root task ID
+            event: Event data (an event with "final": True finishes the stream)
+
+        Returns:
+            Event id
+        """
+        stream = self._streams.get(root_task_id)
+        if stream is None:
+            self.open_stream(root_task_id)
+            stream = self._streams[root_task_id]
+        async with stream.condition:
+            event_id = stream.next_id
+            stream.next_id += 1
+            stream.events.append((event_id, event))
+            if event.get("final", False) and stream.finished_at is None:
+                stream.finished_at = time.monotonic()
+            stream.condition.notify_all()
+        return event_id
+
+    async def finish(self, root_task_id: str) -> None:
+        """
+        Mark a stream as finished (no more events will be published)
+
+        Args:
+            root_task_id: Root task ID
+        """
+        stream = self._streams.get(root_task_id)
+        if stream is None:
+            return
+        async with stream.condition:
+            if stream.finished_at is None:
+                stream.finished_at = time.monotonic()
+            stream.condition.notify_all()
+
+    async def wait_for_events(
+        self, root_task_id: str, after_id: int = 0, timeout: Optional[float] = None
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Wait until events newer than after_id are available
+
+        Returns immediately if there already are such events or the stream is finished.
+        Events dropped from the buffer cannot be replayed; the oldest retained events
+        are returned instead.
+
+        Args:
+            root_task_id: Root task ID
+            after_id: Id of the last event the subscriber received (0 for all)
+            timeout: Maximum seconds to wait (None to wait indefinitely)
+
+        Returns:
+            List of (event_id, event) pairs, empty on timeout
+        """
+        stream = self._streams.get(root_task_id)
+        if stream is None:
+            return []
+        async with stream.condition:
+            try:
+                await asyncio.wait_for(
+                    stream.condition.wait_for(
+                        lambda: stream.last_id > after_id or stream.finished_at is not None
+                    ),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                pass
+            return stream.events_after(after_id)
+
+    def get_events(self, root_task_id: str, after_id: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get a snapshot of the buffered events of a stream
+
+        Args:
+            root_task_id: Root task ID
+            after_id: Only return events with a greater id
+
+        Returns:
+            List of events
+        """
+        stream = self._streams.get(root_task_id)
+        if stream is None:
+            return []
+        return [event for _, event in stream.events_after(after_id)]
+
+    def has_stream(self, root_task_id: str) -> bool:
+        """Check whether a (not yet evicted) stream exists for a root task"""
+        self._evict_expired()
+        return root_task_id in self._streams
+
+    def is_finished(self, root_task_id: str) -> bool:
+        """Check whether a stream is finished (missing streams count as finished)"""
+        stream = self._streams.get(root_task_id)
+        return stream is None or stream.finished_at is not None
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            root_task_id
+            for root_task_id, stream in self._streams.items()
+            if stream.finished_at is not None and now - stream.finished_at >= self.ttl
+        ]
+        for root_task_id in expired:
+            del self._streams[root_task_id]
+        if expired:
+            logger.debug(f"Evicted {len(expired)} finished event streams")
+
+
+_broker: Optional[TaskEventBroker] = None
+
+
+def get_event_broker() -> TaskEventBroker:
+    """
+    Get the process-wide TaskEventBroker instance
+
+    Returns:
+        TaskEventBroker singleton
+    """
+    global _broker
+    if _broker is None:
+        _broker = TaskEventBroker(
+            max_events=int(os.getenv("AIPARTNERUPFLOW_STREAM_BUFFER_SIZE", DEFAULT_STREAM_BUFFER_SIZE)),
+            ttl=float(os.getenv("AIPARTNERUPFLOW_STREAM_TTL", DEFAULT_STREAM_TTL)),
+        )
+    return _broker
+
+
+__all__ = [
+    "TaskEventBroker",
+    "get_event_broker",
+]
@@ -213,8 +213,7 @@ def create_runnable_app(**kwargs):
     try:
         from sqlalchemy.ext.asyncio import AsyncSession
         from sqlalchemy import create_engine
-        from aipartnerupflow.core.storage.sqlalchemy.models import Base
-        from aipartnerupflow.core.storage.factory import _get_database_url_from_env, is_postgresql_url, normalize_postgresql_url
+        from aipartnerupflow.core.storage.factory import _create_tables, _get_database_url_from_env, is_postgresql_url, normalize_postgresql_url
         
         # Check if DATABASE_URL is set
         db_url = _get_database_url_from_env()
@@ -224,7 +223,7 @@ def create_runnable_app(**kwargs):
             connection_string = normalize_postgresql_url(db_url, async_mode=False)
             sync_engine = create_engine(connection_string, echo=False)
             try:
-                Base.metadata.create_all(sync_engine)
+                _create_tables(sync_engine)
                 logger.info("Database tables created successfully")
             except Exception as e:
                 logger.warning(f"Could not create tables automatically: {e}")
@@ -14,6 +14,9 @@ from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from aipartnerupflow.api.routes.base import BaseRouteHandler
+from aipartnerupflow.core.execution.duration_stats import get_executor_stats
+from aipartnerupflow.core.execution.lanes import get_execution_lanes
+from aipartnerupflow.core.storage import create_pooled_session
 from aipartnerupflow.core.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -46,6 +49,8 @@ class SystemRoutes(BaseRouteHandler):
             # Route to specific handler based on method
             if method == "system.health":
                 result = await self.handle_health(params, request_id)
+            elif method == "system.executor_stats":
+                result = await self.handle_executor_stats(params, request_id)
             elif method == "config.llm_key.set":
                 result = await self.handle_llm_key_set(params, request, request_id)
             elif method == "config.llm_key.get":
@@ -100,8 +105,26 @@ class SystemRoutes(BaseRouteHandler):
             "version": "0.2.0",
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "running_tasks_count": 0,  # TODO: Implement actual task count
+            "execution_lanes": get_execution_lanes().get_metrics(),
         }
 
+    async def handle_executor_stats(self, params: dict, request_id: str) -> dict:
+        """
+        Handle executor duration statistics
+
+        Params:
+            executor_id: Optional executor ID (default: all executors)
+
+        Returns:
+            {"executors": {executor_id: {"count", "mean", "p50", "p95", "p99"}}} (seconds)
+        """
+        stats = get_executor_stats()
+        async with create_pooled_session() as db_session:
+            # Write local recordings, then read the totals of all processes
+            await stats.flush(db_session)
+            await stats.load(db_session, force=True)
+        return {"executors": stats.get_stats(params.get("executor_id"))}
+
     async def handle_llm_key_set(self, params: dict, request: Request, request_id: str) -> dict:
         """
         Handle LLM key configuration - set LLM API key for user
@@ -15,33 +15,24 @@ import httpx
 from starlette.requests import Request
 from starlette.responses import JSONResponse, StreamingResponse
 
+from aipartnerupflow.api.event_broker import get_event_broker
 from aipartnerupflow.api.routes.base import BaseRouteHandler
 from aipartnerupflow.core.storage import get_default_session, create_pooled_session
 from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
 from aipartnerupflow.core.execution.task_creator import TaskCreator
+from aipartnerupflow.core.execution.templates import TaskTemplateRegistry
+from aipartnerupflow.core.execution.work_queue import TaskWorkQueue, get_queue_worker
+from aipartnerupflow.core.config import get_work_queue
 from aipartnerupflow.core.utils.logger import get_logger
 from aipartnerupflow.core.utils.helpers import tree_node_to_dict
+from aipartnerupflow.extensions.http.client_pool import get_http_client, make_auth_key
 
 logger = get_logger(__name__)
 
-# Global event storage for task streaming (keyed by root_task_id)
-# Global event storage for task streaming (keyed by root_task_id)
-_task_streaming_events: Dict[str, List[Dict[str, Any]]] = {}
-_task_streaming_events_lock: Optional[asyncio.Lock] = None
-
-
-def _get_streaming_events_lock() -> asyncio.Lock:
-    """Get or create the global lock for streaming events"""
-    global _task_streaming_events_lock
-    if _task_streaming_events_lock is None:
-        _task_streaming_events_lock = asyncio.Lock()
-    return _task_streaming_events_lock
-
-
 class TaskStreamingContext:
     """
     Streaming context for JSON-RPC tasks.execute endpoint
-    Similar to EventQueueBridge but stores updates in memory for SSE consumption
+    Similar to EventQueueBridge but publishes updates to the event broker for SSE consumption
     """
 
     def __init__(self, root_task_id: str):
@@ -54,12 +45,14 @@ class TaskStreamingContext:
         self.root_task_id = root_task_id
         self._update_queue = asyncio.Queue()
         self._bridge_task = None
+        self._broker = get_event_broker()
+        self._broker.open_stream(root_task_id)
 
         # Start background task to process updates
         self._start_bridge_task()
 
     def _start_bridge_task(self):
-        """Start background task to store updates"""
+        """Start background task to publish updates"""
 
         async def bridge_worker():
             while True:
@@ -69,11 +62,7 @@ class TaskStreamingContext:
                     if update_data is None:  # Sentinel to stop
                         break
 
-                    # Store update in global event store
-                    async with _get_streaming_events_lock():
-                        if self.root_task_id not in _task_streaming_events:
-                            _task_streaming_events[self.root_task_id] = []
-                        _task_streaming_events[self.root_task_id].append(update_data)
+                    await self._broker.publish(self.root_task_id, update_data)
 
                     self._update_queue.task_done()
                 except Exception as e:
@@ -97,20 +86,20 @@ class TaskStreamingContext:
         await self._update_queue.put(None)  # Sentinel to stop worker
         if self._bridge_task:
             await self._bridge_task
+        await self._broker.finish(self.root_task_id)
 
 
 async def get_task_streaming_events(root_task_id: str) -> List[Dict[str, Any]]:
     """
-    Get streaming events for a task
+    Get buffered streaming events for a task
 
     Args:
         root_task_id: Root task ID
 
     Returns:
-        List of streaming events
+        List of streaming events (snapshot of the broker's buffer)
     """
-    async with _get_streaming_events_lock():
-        return _task_streaming_events.get(root_task_id, []).copy()
+    return get_event_broker().get_events(root_task_id)
 
 
 class WebhookStreamingContext:
@@ -142,8 +131,10 @@ class WebhookStreamingContext:
         self.timeout = webhook_config.get("timeout", 30.0)
         self.max_retries = webhook_config.get("max_retries", 3)
 
-        # Create HTTP client
-        self.http_client = httpx.AsyncClient(timeout=self.timeout)
+        # Shared pooled HTTP client (keyed by webhook host and headers, closed on app shutdown)
+        self.http_client = get_http_client(
+            self.webhook_url, auth_key=make_auth_key(self.webhook_headers)
+        )
 
         # Update queue for processing updates
         self._update_queue = asyncio.Queue()
@@ -210,11 +201,11 @@ class WebhookStreamingContext:
                 # Send HTTP request
                 if self.webhook_method == "POST":
                     response = await self.http_client.post(
-                        self.webhook_url, json=webhook_payload, headers=headers
+                        self.webhook_url, json=webhook_payload, headers=headers, timeout=self.timeout
                     )
                 elif self.webhook_method == "PUT":
                     response = await self.http_client.put(
-                        self.webhook_url, json=webhook_payload, headers=headers
+                        self.webhook_url, json=webhook_payload, headers=headers, timeout=self.timeout
                     )
                 else:
                     raise ValueError(f"Unsupported HTTP method: {self.webhook_method}")
@@ -287,9 +278,6 @@ class WebhookStreamingContext:
         if self._bridge_task:
             await self._bridge_task
 
-        # Close HTTP client
-        await self.http_client.aclose()
-
 
 class CombinedStreamingContext:
     """
@@ -329,6 +317,55 @@ class CombinedStreamingContext:
         await self.webhook_context.close()
 
 
+class BatchStreamingContext:
+    """
+    Streaming context of one tree in a tasks.execute_batch execution
+
+    Multiplexes the updates of every tree of a batch into the shared SSE stream
+    (keyed by the batch ID): updates are tagged with root_task_id, and the final
+    update of a tree is marked "tree_final" so it does not end the shared stream.
+    Webhook callbacks receive the updates unchanged.
+    """
+
+    def __init__(
+        self,
+        root_task_id: str,
+        sse_context: Optional[TaskStreamingContext] = None,
+        webhook_context: Optional[WebhookStreamingContext] = None,
+    ):
+        """
+        Initialize batch streaming context
+
+        Args:
+            root_task_id: Root task ID of the tree
+            sse_context: Shared streaming context of the batch (optional)
+            webhook_context: Webhook context of the tree (optional)
+        """
+        self.root_task_id = root_task_id
+        self.sse_context = sse_context
+        self.webhook_context = webhook_context
+
+    async def put(self, update_data: Dict[str, Any]):
+        """
+        Put progress update to the shared stream and the webhook context
+
+        Args:
+            update_data: Progress update data from TaskManager
+        """
+        update_data = {**update_data, "root_task_id": self.root_task_id}
+        if self.webhook_context:
+            await self.webhook_context.put(update_data)
+        if self.sse_context:
+            event = dict(update_data)
+            event["tree_final"] = bool(event.pop("final", False))
+            await self.sse_context.put(event)
+
+    async def close(self):
+        """Close the webhook context (the shared stream is closed by the batch)"""
+        if self.webhook_context:
+            await self.webhook_context.close()
+
+
 class TaskRoutes(BaseRouteHandler):
     """
     Task management route handlers
@@ -401,6 +438,18 @@ class TaskRoutes(BaseRouteHandler):
                 # Task copy
                 elif method == "tasks.copy":
                     result = await self.handle_task_copy(params, request, request_id)
+                # Task templates
+                elif method == "tasks.template.create":
+                    result = await self.handle_task_template_create(params, request, request_id)
+                elif method == "tasks.template.instantiate":
+                    jsonrpc_id = body.get("id") if body.get("id") is not None else request_id
+                    response = await self.handle_task_template_instantiate(
+                        params, request, request_id, jsonrpc_id
+                    )
+                    # With execute=True and use_streaming=True the execution stream is returned
+                    if isinstance(response, StreamingResponse):
+                        return response
+                    result = response
                 # Task generation
                 elif method == "tasks.generate":
                     result = await self.handle_task_generate(params, request, request_id)
@@ -415,6 +464,15 @@ class TaskRoutes(BaseRouteHandler):
                     if isinstance(response, StreamingResponse):
                         return response
                     result = response
+                elif method == "tasks.execute_batch":
+                    jsonrpc_id = body.get("id") if body.get("id") is not None else request_id
+                    response = await self.handle_task_execute_batch(
+                        params, request, request_id, jsonrpc_id
+                    )
+                    # With use_streaming=True all trees share one SSE stream
+                    if isinstance(response, StreamingResponse):
+                        return response
+                    result = response
                 else:
                     return JSONResponse(
                         status_code=400,
@@ -533,6 +591,26 @@ class TaskRoutes(BaseRouteHandler):
             logger.error(f"Error getting task tree: {str(e)}", exc_info=True)
             raise
 
+    async def _get_running_task_ids(self, task_executor: Any, db_session: Any) -> List[str]:
+        """
+        Get root task IDs running in this process and, with the work queue enabled, on any worker
+        """
+        running_task_ids = task_executor.get_all_running_tasks()
+        if get_work_queue()["enabled"]:
+            shared_task_ids = await TaskWorkQueue(db_session).get_running_root_ids()
+            running_task_ids = list(dict.fromkeys([*running_task_ids, *shared_task_ids]))
+        return running_task_ids
+
+    async def _is_task_running(self, task_executor: Any, task_id: str, db_session: Any) -> bool:
+        """
+        Check whether a task runs in this process or, with the work queue enabled, on any worker
+        """
+        if task_executor.is_task_running(task_id):
+            return True
+        if get_work_queue()["enabled"]:
+            return await TaskWorkQueue(db_session).is_running(task_id)
+        return False
+
     async def handle_running_tasks_list(
         self, params: dict, request: Request, request_id: str
     ) -> list:
@@ -565,17 +643,17 @@ class TaskRoutes(BaseRouteHandler):
                         user_id = authenticated_user_id
                 # If no JWT and no user_id, user_id remains None (list all tasks, backward compatibility)
 
-            # Get running tasks from memory using TaskExecutor
+            # Get running tasks from memory using TaskExecutor (and from the shared work queue)
             from aipartnerupflow.core.execution.task_executor import TaskExecutor
 
             task_executor = TaskExecutor()
-            running_task_ids = task_executor.get_all_running_tasks()
-
-            if not running_task_ids:
-                return []
 
             # Get database session and create repository to fetch task details
             async with create_pooled_session() as db_session:
+                running_task_ids = await self._get_running_task_ids(task_executor, db_session)
+                if not running_task_ids:
+                    return []
+
                 task_repository = self._get_task_repository(db_session)
 
                 # Fetch task details for running tasks
@@ -770,8 +848,8 @@ class TaskRoutes(BaseRouteHandler):
                 for task_id in task_ids:
                     task_id = task_id.strip()
 
-                    # First check if task is running in memory
-                    is_running = task_executor.is_task_running(task_id)
+                    # First check if task is running in memory (or on another worker)
+                    is_running = await self._is_task_running(task_executor, task_id, db_session)
 
                     # Get task from database for details
                     task = await task_repository.get_task_by_id(task_id)
@@ -883,13 +961,13 @@ class TaskRoutes(BaseRouteHandler):
             task_executor = TaskExecutor()
 
             if user_id:
-                # Filter by user_id: get all running tasks and filter by user_id
-                running_task_ids = task_executor.get_all_running_tasks()
-                if not running_task_ids:
-                    return {"count": 0, "user_id": user_id}
-
                 # Get database session to check user_id
                 async with create_pooled_session() as db_session:
+                    # Filter by user_id: get all running tasks and filter by user_id
+                    running_task_ids = await self._get_running_task_ids(task_executor, db_session)
+                    if not running_task_ids:
+                        return {"count": 0, "user_id": user_id}
+
                     task_repository = self._get_task_repository(db_session)
 
                     count = 0
@@ -899,6 +977,11 @@ class TaskRoutes(BaseRouteHandler):
                             count += 1
 
                     return {"count": count, "user_id": user_id}
+            elif get_work_queue()["enabled"]:
+                # No user_id filter, count running trees of all workers
+                async with create_pooled_session() as db_session:
+                    running_task_ids = await self._get_running_task_ids(task_executor, db_session)
+                return {"count": len(running_task_ids)}
             else:
                 # No user_id filter, return total count from memory
                 count = task_executor.get_running_tasks_count()
@@ -916,6 +999,9 @@ class TaskRoutes(BaseRouteHandler):
         1. Calls TaskExecutor.cancel_task() for each task
         2. Returns cancellation results with token_usage if available
 
+        With the work queue enabled, a task whose tree runs on another worker gets a
+        cancellation request instead ("cancel_requested"); that worker cancels it.
+
         Params:
             task_ids: List of task IDs to cancel (required)
             context_ids: Alternative - list of context IDs (task IDs)
@@ -927,7 +1013,7 @@ class TaskRoutes(BaseRouteHandler):
             [
                 {
                     "task_id": str,
-                    "status": "cancelled" | "failed",
+                    "status": "cancelled" | "failed" | "cancel_requested",
                     "message": str,
                     "token_usage": Dict,  # Optional, if available
                     "result": Any,  # Optional partial result if available
@@ -974,6 +1060,31 @@ class TaskRoutes(BaseRouteHandler):
                                 f"Task {task_id} not found in database, attempting cancellation anyway"
                             )
 
+                        # With the work queue enabled, executions of the tree on other
+                        # workers are cancelled by their worker; queued ones are removed
+                        if task and get_work_queue()["enabled"]:
+                            root_task = await task_repository.get_root_task(task)
+                            queue_result = await TaskWorkQueue(db_session).request_cancel(
+                                task_id,
+                                root_task.id,
+                                error_message,
+                                local_worker_id=get_queue_worker().worker_id,
+                            )
+                            if queue_result and queue_result["status"] == "requested":
+                                results.append(
+                                    {
+                                        "task_id": task_id,
+                                        "status": "cancel_requested",
+                                        "message": (
+                                            f"Cancellation requested from worker(s) "
+                                            f"{', '.join(queue_result['worker_ids'])}"
+                                        ),
+                                        "worker_ids": queue_result["worker_ids"],
+                                        "force": force,
+                                    }
+                                )
+                                continue
+
                         # Call TaskExecutor.cancel_task() which handles:
                         # 1. Calling executor.cancel() if executor supports cancellation
                         # 2. Updating database with cancelled status and token_usage
@@ -1577,6 +1688,115 @@ class TaskRoutes(BaseRouteHandler):
             logger.error(f"Error copying task: {str(e)}", exc_info=True)
             raise
 
+    async def handle_task_template_create(self, params: dict, request: Request, request_id: str) -> dict:
+        """
+        Handle task template creation
+
+        Validates a tasks array once and stores its compiled form, so trees can be
+        created from it with tasks.template.instantiate.
+
+        Params:
+            tasks: Tasks array (same format as tasks.create, required)
+            name: Template name (optional)
+            parameters: Names of the "{{name}}" placeholders in task names, inputs,
+                params and schemas that are substituted at instantiation (optional)
+            template_id: Template ID (optional, default: generated UUID)
+            user_id: Owner of the template (optional, default: user from the request)
+
+        Returns:
+            {"template_id": str, "name": str, "parameters": list, "task_count": int}
+        """
+        try:
+            tasks = params.get("tasks")
+            if not isinstance(tasks, list) or not tasks:
+                raise ValueError("tasks must be a non-empty array")
+
+            user_id = params.get("user_id")
+            if user_id:
+                user_id = self._check_permission(request, user_id, "create templates for") or user_id
+            else:
+                user_id = self._extract_user_id_from_request(request)
+
+            async with create_pooled_session() as db_session:
+                registry = TaskTemplateRegistry(db_session, task_model_class=self.task_model_class)
+                template = await registry.create_template(
+                    tasks,
+                    name=params.get("name"),
+                    parameters=params.get("parameters"),
+                    user_id=user_id,
+                    template_id=params.get("template_id"),
+                )
+
+            return {
+                "template_id": template.id,
+                "name": template.name,
+                "parameters": template.parameters,
+                "task_count": len(template.nodes),
+            }
+
+        except Exception as e:
+            logger.error(f"Error creating task template: {str(e)}", exc_info=True)
+            raise
+
+    async def handle_task_template_instantiate(
+        self, params: dict, request: Request, request_id: str, jsonrpc_id: Any = None
+    ) -> Union[dict, StreamingResponse]:
+        """
+        Handle task template instantiation
+
+        Creates a task tree from a template by parameter substitution and one bulk
+        insert (the tasks array is not validated again).
+
+        Params:
+            template_id: Template ID (required)
+            parameters: Parameter values (required for every declared parameter)
+            user_id: User ID of the new tasks (optional, default: user from the
+                request, then the user_id of the template tasks)
+            execute: If True, execute the new tree right away (default: False).
+                use_streaming, webhook_config and use_demo are passed to tasks.execute
+
+        Returns:
+            Task tree of the new tasks (as tasks.create), or the tasks.execute
+            response for the new root task when execute=True
+        """
+        try:
+            template_id = params.get("template_id")
+            if not template_id:
+                raise ValueError("Template ID is required")
+
+            async with create_pooled_session() as db_session:
+                registry = TaskTemplateRegistry(db_session, task_model_class=self.task_model_class)
+                template = await registry.get_template(template_id)
+                if template is None:
+                    raise ValueError(f"Task template {template_id} not found")
+
+                user_id = params.get("user_id")
+                self._check_permission(request, user_id or template.user_id, "instantiate templates of")
+                if not user_id:
+                    user_id = self._extract_user_id_from_request(request)
+
+                task_tree = await registry.instantiate(
+                    template_id, params.get("parameters"), user_id=user_id
+                )
+                root_task_id = task_tree.task.id
+                result = None if params.get("execute") else tree_node_to_dict(task_tree)
+
+            logger.info(f"Instantiated task template {template_id}: root task {root_task_id}")
+            if result is not None:
+                return result
+
+            execute_params = {
+                key: params[key]
+                for key in ("use_streaming", "webhook_config", "use_demo")
+                if key in params
+            }
+            execute_params["task_id"] = root_task_id
+            return await self.handle_task_execute(execute_params, request, request_id, jsonrpc_id)
+
+        except Exception as e:
+            logger.error(f"Error instantiating task template: {str(e)}", exc_info=True)
+            raise
+
     async def handle_task_generate(self, params: dict, request: Request, request_id: str) -> dict:
         """
         Handle task tree generation from natural language requirement
@@ -1803,12 +2023,111 @@ class TaskRoutes(BaseRouteHandler):
                     pass
         finally:
             if streaming_context:
-                # Ensure we close the streaming context if it wasn't closed by the executor
-                # (Executor doesn't close it, the SSE generator closes it, but if we are just pushing to it...)
-                # Wait, the SSE generator closes it when the loop ends.
-                # The loop ends when it sees a final event or timeout.
-                # If we crash here, we should send a final event or error.
-                pass
+                # Execution owns the producer side: closing it finishes the event stream,
+                # independently of whether an SSE client is still connected
+                try:
+                    await streaming_context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing streaming context: {str(e)}")
+
+    @staticmethod
+    def _get_last_event_id(params: dict, request: Request) -> Optional[int]:
+        """
+        Get the SSE resume offset from params["last_event_id"] or the Last-Event-ID header
+
+        Returns:
+            Last received event id, or None if the client is not resuming
+        """
+        value = params.get("last_event_id")
+        if value is None:
+            headers = getattr(request, "headers", None)
+            value = headers.get("last-event-id") if headers is not None else None
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            return None
+
+    def _create_sse_response(
+        self,
+        root_task_id: str,
+        initial_response: Optional[Dict[str, Any]],
+        last_event_id: int = 0,
+    ) -> StreamingResponse:
+        """
+        Create an SSE response streaming the broker events of a root task
+
+        Events are pushed as soon as they are published (no polling). Each event
+        carries an SSE id so clients can resume with Last-Event-ID. A client
+        disconnect does not stop the execution, which keeps publishing to the broker.
+
+        Args:
+            root_task_id: Root task ID of the stream
+            initial_response: JSON-RPC response sent first (None when resuming)
+            last_event_id: Only stream events after this id
+        """
+        broker = get_event_broker()
+        max_wait_time = 300  # Maximum wait time in seconds (5 minutes)
+        keepalive_interval = 30
+
+        async def sse_event_generator():
+            """Generate SSE events from task execution"""
+            try:
+                if initial_response is not None:
+                    yield f"data: {json.dumps(initial_response, ensure_ascii=False)}\n\n"
+
+                after_id = last_event_id
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + max_wait_time
+                timed_out = True
+                while loop.time() < deadline:
+                    timeout = min(keepalive_interval, deadline - loop.time())
+                    events = await broker.wait_for_events(root_task_id, after_id, timeout=timeout)
+                    if not events:
+                        if broker.is_finished(root_task_id):
+                            timed_out = False
+                            yield f"data: {json.dumps({'type': 'stream_end', 'task_id': root_task_id}, ensure_ascii=False)}\n\n"
+                            break
+                        yield ": keepalive\n\n"
+                        continue
+
+                    final = False
+                    for event_id, event in events:
+                        yield f"id: {event_id}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+                        final = final or event.get("final", False)
+                    after_id = events[-1][0]
+
+                    if final:
+                        # Final event (task completed or failed): end the stream
+                        timed_out = False
+                        yield f"data: {json.dumps({'type': 'stream_end', 'task_id': root_task_id}, ensure_ascii=False)}\n\n"
+                        break
+
+                if timed_out:
+                    yield f"data: {json.dumps({'type': 'timeout', 'task_id': root_task_id, 'message': 'Stream timeout'}, ensure_ascii=False)}\n\n"
+
+            except asyncio.CancelledError:
+                # Client disconnected
+                logger.debug(f"SSE connection closed for task {root_task_id}")
+                raise
+            except Exception as e:
+                logger.error(f"Error in SSE stream for task {root_task_id}: {str(e)}", exc_info=True)
+                error_data = json.dumps(
+                    {"type": "error", "task_id": root_task_id, "error": str(e)},
+                    ensure_ascii=False,
+                )
+                yield f"data: {error_data}\n\n"
+
+        return StreamingResponse(
+            sse_event_generator(),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",  # Disable buffering in nginx
+            },
+        )
 
     async def handle_task_execute(
         self, params: dict, request: Request, request_id: str, jsonrpc_id: Any = None
@@ -1850,6 +2169,10 @@ class TaskRoutes(BaseRouteHandler):
                     "max_retries": int  # Optional: Maximum retry attempts (default: 3)
                 }
 
+        Work queue:
+        - With the work queue enabled (set_work_queue()), executions by task_id without
+          streaming or webhook are queued for any worker and return status "queued"
+
         Returns:
             Regular POST mode (use_streaming=False):
             {
@@ -1901,6 +2224,8 @@ class TaskRoutes(BaseRouteHandler):
             copy_execution = params.get("copy_execution", False)
             copy_children = params.get("copy_children", False)
             use_demo = params.get("use_demo", False)
+            # Executions by task_id go through the shared work queue when it is enabled
+            use_work_queue = get_work_queue()["enabled"] and execution_mode == "task_id"
 
             # Get TaskExecutor
             from aipartnerupflow.core.execution.task_executor import TaskExecutor
@@ -1911,6 +2236,7 @@ class TaskRoutes(BaseRouteHandler):
             execution_tasks = None
             root_task_id = None
             original_task_id = None
+            execution_priority = None
             
             # Preparation phase (Foreground)
             async with create_pooled_session() as db_session:
@@ -1924,6 +2250,17 @@ class TaskRoutes(BaseRouteHandler):
                     # Check permission
                     self._check_permission(request, task.user_id, "execute")
 
+                    # Reconnecting SSE client: resume the existing stream instead of re-executing
+                    last_event_id = self._get_last_event_id(params, request)
+                    if (
+                        use_streaming
+                        and not copy_execution
+                        and last_event_id is not None
+                        and get_event_broker().has_stream(task_id)
+                    ):
+                        logger.info(f"Resuming event stream of task {task_id} after event {last_event_id}")
+                        return self._create_sse_response(task_id, None, last_event_id=last_event_id)
+
                     # If copy_execution is True, create a copy first
                     original_task_id = task_id
                     if copy_execution:
@@ -1940,10 +2277,12 @@ class TaskRoutes(BaseRouteHandler):
                     else:
                         execution_task_id = task_id
 
-                    # Check if task is already running
+                    # Check if task is already running (or queued, with the work queue enabled)
                     from aipartnerupflow.core.execution.task_tracker import TaskTracker
                     task_tracker = TaskTracker()
-                    if task_tracker.is_task_running(execution_task_id):
+                    if task_tracker.is_task_running(execution_task_id) or (
+                        use_work_queue and await TaskWorkQueue(db_session).is_active(execution_task_id)
+                    ):
                         return {
                             "success": False,
                             "protocol": "jsonrpc",
@@ -1956,6 +2295,7 @@ class TaskRoutes(BaseRouteHandler):
                     # Get root task ID for streaming context
                     root_task = await task_repository.get_root_task(task)
                     root_task_id = root_task.id
+                    execution_priority = task.priority
 
                 elif execution_mode == "tasks_array":
                     # Mode 2: Execute by tasks array
@@ -1984,7 +2324,7 @@ class TaskRoutes(BaseRouteHandler):
             # Execution phase
             if use_streaming or webhook_config:
                 # Background execution
-                asyncio.create_task(self._run_background_execution(
+                background_execution = self._run_background_execution(
                     task_executor=task_executor,
                     execution_mode=execution_mode,
                     streaming_context=streaming_context,
@@ -1992,7 +2332,36 @@ class TaskRoutes(BaseRouteHandler):
                     task_id=execution_task_id,
                     tasks=execution_tasks,
                     use_demo=use_demo
-                ))
+                )
+                if use_work_queue:
+                    # Streaming events are delivered by this process: run here, but
+                    # share the running state through the work queue
+                    background_execution = get_queue_worker().run_local(
+                        execution_task_id, root_task_id, background_execution, use_demo=use_demo
+                    )
+                asyncio.create_task(background_execution)
+            elif use_work_queue:
+                # Queue the execution for whichever worker has a free slot
+                async with create_pooled_session() as db_session:
+                    await TaskWorkQueue(db_session).enqueue(
+                        execution_task_id,
+                        root_task_id,
+                        priority=execution_priority,
+                        use_demo=use_demo,
+                    )
+                get_queue_worker().notify()
+                logger.info(f"Task execution queued (root: {root_task_id})")
+                response = {
+                    "success": True,
+                    "protocol": "jsonrpc",
+                    "root_task_id": root_task_id,
+                    "task_id": execution_task_id,
+                    "status": "queued",
+                    "message": "Task execution queued",
+                }
+                if copy_execution:
+                    response["original_task_id"] = original_task_id
+                return response
             else:
                 # Foreground execution (awaiting background wrapper)
                 # Note: We pass None as streaming_context here as we are not streaming
@@ -2016,99 +2385,27 @@ class TaskRoutes(BaseRouteHandler):
                 if not streaming_context:
                     raise ValueError("streaming_context is required for SSE mode")
 
-                async def sse_event_generator():
-                    """Generate SSE events from task execution"""
-                    try:
-                        # Send initial response as JSON-RPC result
-                        response_data = {
-                            "success": True,
-                            "protocol": "jsonrpc",
-                            "root_task_id": root_task_id,
-                            "task_id": execution_task_id or root_task_id,
-                            "status": "started",
-                            "streaming": True,
-                            "message": "Task execution started with streaming",
-                            **(
-                                {"webhook_url": webhook_config.get("url")} if webhook_config else {}
-                            ),
-                        }
-                        # Add original_task_id if copy_execution was used
-                        if execution_mode == "task_id" and copy_execution:
-                            response_data["original_task_id"] = original_task_id
+                # Send initial response as JSON-RPC result
+                response_data = {
+                    "success": True,
+                    "protocol": "jsonrpc",
+                    "root_task_id": root_task_id,
+                    "task_id": execution_task_id or root_task_id,
+                    "status": "started",
+                    "streaming": True,
+                    "message": "Task execution started with streaming",
+                    **({"webhook_url": webhook_config.get("url")} if webhook_config else {}),
+                }
+                # Add original_task_id if copy_execution was used
+                if execution_mode == "task_id" and copy_execution:
+                    response_data["original_task_id"] = original_task_id
 
-                        initial_response = {
-                            "jsonrpc": "2.0",
-                            "id": jsonrpc_id if jsonrpc_id is not None else request_id,
-                            "result": response_data,
-                        }
-                        yield f"data: {json.dumps(initial_response, ensure_ascii=False)}\n\n"
-
-                        # Poll for events and stream them
-                        last_event_count = 0
-                        max_wait_time = 300  # Maximum wait time in seconds (5 minutes)
-                        wait_time = 0
-                        check_interval = 0.3  # Check for new events every 0.3 seconds
-
-                        while wait_time < max_wait_time:
-                            # Get all events for this task
-                            events = await get_task_streaming_events(root_task_id)
-
-                            # Send any new events
-                            if len(events) > last_event_count:
-                                for i in range(last_event_count, len(events)):
-                                    event = events[i]
-                                    # Format as SSE: data: {json}\n\n
-                                    event_data = json.dumps(event, ensure_ascii=False)
-                                    yield f"data: {event_data}\n\n"
-
-                                last_event_count = len(events)
-
-                                # Check if final event (task completed or failed)
-                                if events and events[-1].get("final", False):
-                                    # Send final event and close connection
-                                    yield f"data: {json.dumps({'type': 'stream_end', 'task_id': root_task_id}, ensure_ascii=False)}\n\n"
-                                    break
-
-                            # Wait before checking again
-                            await asyncio.sleep(check_interval)
-                            wait_time += check_interval
-
-                            # Send keepalive comment every 30 seconds
-                            if int(wait_time) % 30 == 0:
-                                yield ": keepalive\n\n"
-
-                        # If we've exceeded max wait time, send timeout event
-                        if wait_time >= max_wait_time:
-                            yield f"data: {json.dumps({'type': 'timeout', 'task_id': root_task_id, 'message': 'Stream timeout'}, ensure_ascii=False)}\n\n"
-
-                        # Clean up
-                        await streaming_context.close()
-
-                    except asyncio.CancelledError:
-                        # Client disconnected
-                        logger.debug(f"SSE connection closed for task {root_task_id}")
-                        await streaming_context.close()
-                        raise
-                    except Exception as e:
-                        logger.error(
-                            f"Error in SSE stream for task {root_task_id}: {str(e)}", exc_info=True
-                        )
-                        error_data = json.dumps(
-                            {"type": "error", "task_id": root_task_id, "error": str(e)},
-                            ensure_ascii=False,
-                        )
-                        yield f"data: {error_data}\n\n"
-                        await streaming_context.close()
-
-                return StreamingResponse(
-                    sse_event_generator(),
-                    media_type="text/event-stream",
-                    headers={
-                        "Cache-Control": "no-cache",
-                        "Connection": "keep-alive",
-                        "X-Accel-Buffering": "no",  # Disable buffering in nginx
-                    },
-                )
+                initial_response = {
+                    "jsonrpc": "2.0",
+                    "id": jsonrpc_id if jsonrpc_id is not None else request_id,
+                    "result": response_data,
+                }
+                return self._create_sse_response(root_task_id, initial_response)
 
             elif streaming_context:
                 # Response mode 2: Regular POST with webhook callbacks
@@ -2155,3 +2452,203 @@ class TaskRoutes(BaseRouteHandler):
         except Exception as e:
             logger.error(f"Error executing task: {str(e)}", exc_info=True)
             raise
+
+    async def _run_background_batch_execution(
+        self,
+        task_executor: Any,
+        batch_id: str,
+        root_task_ids: List[str],
+        streaming_contexts: Dict[str, BatchStreamingContext],
+        sse_context: Optional[TaskStreamingContext] = None,
+        use_demo: bool = False,
+    ):
+        """
+        Run the trees of a batch in background and close their streaming contexts
+        """
+        results: List[Dict[str, Any]] = []
+        try:
+            results = await task_executor.execute_task_trees(
+                root_task_ids,
+                use_streaming=True,
+                streaming_callbacks_contexts=streaming_contexts,
+                use_demo=use_demo,
+            )
+            for result in results:
+                if result.get("error"):
+                    # The tree failed before its execution started
+                    await streaming_contexts[result["root_task_id"]].put(
+                        {"type": "error", "error": result["error"], "final": True}
+                    )
+        except Exception as e:
+            logger.error(f"Error in background batch execution: {str(e)}", exc_info=True)
+        finally:
+            for streaming_context in streaming_contexts.values():
+                try:
+                    await streaming_context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing streaming context: {str(e)}")
+            if sse_context:
+                try:
+                    all_completed = bool(results) and all(
+                        result.get("status") == "completed" for result in results
+                    )
+                    await sse_context.put({
+                        "type": "batch_completed",
+                        "batch_id": batch_id,
+                        "root_task_ids": root_task_ids,
+                        "status": "completed" if all_completed else "partial",
+                        "final": True,
+                    })
+                    await sse_context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing batch stream: {str(e)}")
+
+    async def handle_task_execute_batch(
+        self, params: dict, request: Request, request_id: str, jsonrpc_id: Any = None
+    ) -> Union[dict, StreamingResponse]:
+        """
+        Handle batch execution of several independent task trees
+
+        All trees are validated before anything is written and inserted in one
+        transaction (see TaskCreator.create_task_trees_from_arrays()), then executed
+        together with at most get_batch_max_concurrency() trees running at once.
+
+        Params:
+            trees: Array of tasks arrays, one per tree (same format as tasks.create, required)
+            use_streaming: Optional, if True, stream the updates of all trees over one
+                          SSE stream (default: False). Every event carries root_task_id;
+                          the last event of a tree has "tree_final": true and the stream
+                          ends with a "batch_completed" event
+            use_demo: Optional, if True, use demo mode (default: False)
+            webhook_config: Optional webhook configuration (as tasks.execute); updates
+                          of every tree are sent with their root_task_id
+
+        Work queue:
+        - With the work queue enabled (set_work_queue()), batches without streaming or
+          webhook are queued for any worker and return status "queued"
+
+        Returns:
+            Regular POST mode (use_streaming=False, no webhook_config):
+            {
+                "success": True,
+                "protocol": "jsonrpc",
+                "batch_id": str,
+                "root_task_ids": [str, ...],
+                "status": "completed" | "partial" | "queued",
+                "results": [...]  # Execution result per tree (not present when queued)
+            }
+
+            With webhook_config: status "started", trees execute in background
+
+            SSE mode (use_streaming=True):
+            StreamingResponse with text/event-stream media type, the initial event
+            contains the JSON-RPC response with batch_id and root_task_ids
+        """
+        try:
+            trees = params.get("trees")
+            if not isinstance(trees, list) or not trees:
+                raise ValueError("trees must be a non-empty array of tasks arrays")
+            for index, tasks in enumerate(trees):
+                if not isinstance(tasks, list) or not tasks:
+                    raise ValueError(f"Tree {index}: tasks array cannot be empty")
+
+            use_streaming = params.get("use_streaming", False)
+            webhook_config = params.get("webhook_config", None)
+            use_demo = params.get("use_demo", False)
+            use_work_queue = get_work_queue()["enabled"] and not (use_streaming or webhook_config)
+
+            # Resolve user_id of every task as tasks.create does
+            extracted_user_id = self._extract_user_id_from_request(request)
+            for tasks in trees:
+                for task_data in tasks:
+                    user_id = task_data.get("user_id")
+                    if user_id:
+                        task_data["user_id"] = (
+                            self._check_permission(request, user_id, "create tasks for") or user_id
+                        )
+                    elif extracted_user_id:
+                        task_data["user_id"] = extracted_user_id
+
+            from aipartnerupflow.core.execution.task_executor import TaskExecutor
+            task_executor = TaskExecutor()
+            batch_id = str(uuid.uuid4())
+
+            async with create_pooled_session() as db_session:
+                task_creator = TaskCreator(db_session)
+                task_trees = await task_creator.create_task_trees_from_arrays(trees)
+                root_task_ids = [task_tree.task.id for task_tree in task_trees]
+
+                if use_work_queue:
+                    work_queue = TaskWorkQueue(db_session)
+                    for task_tree in task_trees:
+                        await work_queue.enqueue(
+                            task_tree.task.id,
+                            task_tree.task.id,
+                            priority=task_tree.task.priority,
+                            use_demo=use_demo,
+                        )
+
+            logger.info(f"Created batch {batch_id} with {len(root_task_ids)} task trees")
+            response = {
+                "success": True,
+                "protocol": "jsonrpc",
+                "batch_id": batch_id,
+                "root_task_ids": root_task_ids,
+            }
+
+            if use_work_queue:
+                get_queue_worker().notify()
+                response.update(status="queued", message="Task executions queued")
+                return response
+
+            if not (use_streaming or webhook_config):
+                results = await task_executor.execute_task_trees(root_task_ids, use_demo=use_demo)
+                all_completed = all(result.get("status") == "completed" for result in results)
+                response.update(
+                    status="completed" if all_completed else "partial",
+                    results=results,
+                )
+                return response
+
+            # Background execution with one shared SSE stream and/or per-tree webhooks
+            sse_context = TaskStreamingContext(batch_id) if use_streaming else None
+            streaming_contexts = {
+                root_task_id: BatchStreamingContext(
+                    root_task_id,
+                    sse_context=sse_context,
+                    webhook_context=(
+                        WebhookStreamingContext(root_task_id, webhook_config) if webhook_config else None
+                    ),
+                )
+                for root_task_id in root_task_ids
+            }
+            asyncio.create_task(
+                self._run_background_batch_execution(
+                    task_executor,
+                    batch_id,
+                    root_task_ids,
+                    streaming_contexts,
+                    sse_context=sse_context,
+                    use_demo=use_demo,
+                )
+            )
+
+            response.update(
+                status="started",
+                streaming=True,
+                message="Task executions started",
+                **({"webhook_url": webhook_config.get("url")} if webhook_config else {}),
+            )
+            if not use_streaming:
+                return response
+
+            initial_response = {
+                "jsonrpc": "2.0",
+                "id": jsonrpc_id if jsonrpc_id is not None else request_id,
+                "result": response,
+            }
+            return self._create_sse_response(batch_id, initial_response)
+
+        except Exception as e:
+            logger.error(f"Error executing task batch: {str(e)}", exc_info=True)
+            raise
@@ -134,6 +134,11 @@ def flow(
     background: bool = typer.Option(False, "--background", "-b", help="Run in background (returns immediately with task ID)"),
     watch: bool = typer.Option(False, "--watch", "-w", help="Watch task status in real-time after starting"),
     use_demo: bool = typer.Option(False, "--use-demo", help="Use demo mode (returns demo data instead of executing)"),
+    batch: bool = typer.Option(
+        False,
+        "--batch",
+        help="Create unrelated task groups in one transaction and execute them concurrently",
+    ),
 ):
     """
     Execute tasks through TaskExecutor (same execution path as API)
@@ -143,7 +148,9 @@ def flow(
     2. Task array execution (standard mode): tasks list (JSON array)
     
     For multiple unrelated tasks (multiple root tasks), CLI will execute them separately
-    since TaskExecutor only supports single root task tree.
+    since TaskExecutor only supports single root task tree. With --batch, all groups
+    are validated and created in one transaction and executed concurrently
+    (TaskExecutor.execute_task_batch(), same path as the tasks.execute_batch API).
     
     Args:
         executor_id: Executor ID (legacy mode, use --tasks instead)
@@ -153,6 +160,7 @@ def flow(
         inputs_file: Input JSON file (legacy mode, use with executor_id)
         output: Optional output file path
         user_id: User ID for task execution (default: "cli_user")
+        batch: Execute unrelated task groups as one batch
     """
     try:
         # Parse tasks or inputs
@@ -224,7 +232,10 @@ def flow(
         # Group tasks by root (handle multiple unrelated tasks)
         task_groups = _group_tasks_by_root(tasks_list)
         
-        if len(task_groups) > 1:
+        use_batch = batch and len(task_groups) > 1
+        if use_batch:
+            typer.echo(f"Found {len(task_groups)} unrelated task groups, executing as one batch...")
+        elif len(task_groups) > 1:
             typer.echo(f"Found {len(task_groups)} unrelated task groups, executing separately...")
         
         # Execute through TaskExecutor (same path as API)
@@ -268,6 +279,8 @@ def flow(
             def run_in_background():
                 try:
                     async def run_all_groups():
+                        if use_batch:
+                            return (await task_executor.execute_task_batch(task_groups, use_demo=use_demo))["results"]
                         results = []
                         for i, task_group in enumerate(task_groups):
                             result = await execute_task_group(task_group, i)
@@ -391,6 +404,9 @@ def flow(
         try:
             # Execute all task groups sequentially
             async def execute_all_groups():
+                if use_batch:
+                    batch_result = await task_executor.execute_task_batch(task_groups, use_demo=use_demo)
+                    return batch_result["results"], batch_result["root_task_ids"]
                 results = []
                 root_ids = []
                 for i, task_group in enumerate(task_groups):
@@ -6,6 +6,7 @@ BaseTask to get common implementations, or implement ExecutableTask directly
 for maximum flexibility.
 """
 
+import time
 import weakref
 from typing import Dict, Any, Optional, Callable, Type, Union
 
@@ -101,6 +102,10 @@ class BaseTask(ExecutableTask):
         # Returns True if cancelled, False otherwise
         self.cancellation_checker: Optional[Callable[[], bool]] = kwargs.get("cancellation_checker")
         
+        # Execution deadline (epoch seconds, set by TaskManager from schemas.timeout and the
+        # tree deadline). Use get_timeout() to shrink network/command timeouts to it.
+        self.deadline: Optional[float] = kwargs.get("deadline")
+        
         # Initialize with any provided kwargs
         self.init(**kwargs)
     
@@ -133,6 +138,8 @@ class BaseTask(ExecutableTask):
             self._user_id = kwargs["user_id"]
         if "cancellation_checker" in kwargs:
             self.cancellation_checker = kwargs["cancellation_checker"]
+        if "deadline" in kwargs:
+            self.deadline = kwargs["deadline"]
         if "cancelable" in kwargs:
             self.cancelable = kwargs["cancelable"]
         if "inputs_schema" in kwargs:
@@ -158,6 +165,37 @@ class BaseTask(ExecutableTask):
         self.event_queue = event_queue
         self.context = context
     
+    def get_remaining_time(self) -> Optional[float]:
+        """
+        Get the seconds left before the execution deadline
+        
+        Returns:
+            Seconds left (0 when passed), or None if the execution has no deadline
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+    
+    def get_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        """
+        Shrink a timeout to the time left before the execution deadline
+        
+        Example:
+            timeout = self.get_timeout(inputs.get("timeout", 30.0))
+        
+        Args:
+            timeout: Timeout requested by the inputs (None = no timeout)
+            
+        Returns:
+            The smaller of timeout and the remaining time
+        """
+        remaining = self.get_remaining_time()
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return remaining
+        return min(float(timeout), remaining)
+    
     def get_input_schema(self) -> Dict[str, Any]:
         """
         Get input parameter schema with metadata (required, type, description, default)
@@ -26,6 +26,34 @@ from aipartnerupflow.core.config.registry import (
     task_model_register,
     set_demo_sleep_scale,
     get_demo_sleep_scale,
+    set_scheduler_mode,
+    get_scheduler_mode,
+    set_scheduler_max_workers,
+    get_scheduler_max_workers,
+    set_critical_path_scheduling,
+    get_critical_path_scheduling,
+    set_batch_max_concurrency,
+    get_batch_max_concurrency,
+    set_max_concurrency,
+    get_max_concurrency,
+    set_user_max_concurrency,
+    get_user_max_concurrency,
+    set_executor_max_concurrency,
+    get_executor_max_concurrency,
+    set_write_behind,
+    get_write_behind,
+    set_work_queue,
+    get_work_queue,
+    set_result_cache,
+    get_result_cache,
+    set_incremental_reexecution,
+    get_incremental_reexecution,
+    set_dependency_result_mode,
+    get_dependency_result_mode,
+    set_lane_workers,
+    get_lane_workers,
+    set_cancellation_grace_period,
+    get_cancellation_grace_period,
 )
 
 __all__ = [
@@ -46,5 +74,33 @@ __all__ = [
     "task_model_register",
     "set_demo_sleep_scale",
     "get_demo_sleep_scale",
+    "set_scheduler_mode",
+    "get_scheduler_mode",
+    "set_scheduler_max_workers",
+    "get_scheduler_max_workers",
+    "set_critical_path_scheduling",
+    "get_critical_path_scheduling",
+    "set_batch_max_concurrency",
+    "get_batch_max_concurrency",
+    "set_max_concurrency",
+    "get_max_concurrency",
+    "set_user_max_concurrency",
+    "get_user_max_concurrency",
+    "set_executor_max_concurrency",
+    "get_executor_max_concurrency",
+    "set_write_behind",
+    "get_write_behind",
+    "set_work_queue",
+    "get_work_queue",
+    "set_result_cache",
+    "get_result_cache",
+    "set_incremental_reexecution",
+    "get_incremental_reexecution",
+    "set_dependency_result_mode",
+    "get_dependency_result_mode",
+    "set_lane_workers",
+    "get_lane_workers",
+    "set_cancellation_grace_period",
+    "get_cancellation_grace_period",
 ]
 
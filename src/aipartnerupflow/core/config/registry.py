@@ -16,6 +16,43 @@ from aipartnerupflow.core.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Supported task tree scheduler modes (see TaskManager)
+# - "recursive": priority-group traversal of the tree (default)
+# - "ready_queue": dependency-counted ready queue with a bounded worker pool
+SCHEDULER_MODES = ("recursive", "ready_queue")
+DEFAULT_SCHEDULER_MODE = "recursive"
+DEFAULT_SCHEDULER_MAX_WORKERS = 10
+# Task trees of one batch execution (tasks.execute_batch) running at the same time
+DEFAULT_BATCH_MAX_CONCURRENCY = 10
+# Write-behind defaults for TaskRepository status/progress updates
+DEFAULT_WRITE_BEHIND_MAX_PENDING = 100
+DEFAULT_WRITE_BEHIND_FLUSH_INTERVAL = 0.5
+# Shared work queue defaults (see core/execution/work_queue.py)
+DEFAULT_WORK_QUEUE_POLL_INTERVAL = 1.0
+DEFAULT_WORK_QUEUE_LEASE_SECONDS = 30.0
+DEFAULT_WORK_QUEUE_MAX_CONCURRENT = 4
+# Executor result cache defaults (see core/execution/result_cache.py)
+RESULT_CACHE_BACKENDS = ("memory", "database")
+DEFAULT_RESULT_CACHE_MAX_ENTRIES = 1024
+# How dependency results reach dependent task inputs (see core/execution/result_references.py)
+# - "copy": the result is copied into the stored inputs (default)
+# - "reference": the stored inputs hold a reference, read when the executor runs
+DEPENDENCY_RESULT_MODES = ("copy", "reference")
+DEFAULT_DEPENDENCY_RESULT_MODE = "copy"
+
+EXECUTION_LANES = ("event_loop", "thread", "process")
+DEFAULT_THREAD_LANE_WORKERS = 4
+# Seconds a cancelled executor may take to return before its asyncio task is cancelled
+DEFAULT_CANCELLATION_GRACE_PERIOD = 2.0
+
+
+def _get_env_limit(name: str) -> Optional[int]:
+    """Read an optional positive integer limit from the environment (unset/empty/0 = unlimited)"""
+    value = os.getenv(name, "").strip()
+    if not value or int(value) <= 0:
+        return None
+    return int(value)
+
 # Thread-local storage for configuration (supports multi-threaded scenarios)
 _thread_local = local()
 
@@ -50,6 +87,72 @@ class ConfigRegistry:
         # Default: read from environment variable AIPARTNERUPFLOW_DEMO_SLEEP_SCALE, or 1.0 (no scaling)
         # Example: executor returns _demo_sleep=2.0, global scale=0.5 → actual sleep=1.0s
         self._demo_sleep_scale: float = float(os.getenv("AIPARTNERUPFLOW_DEMO_SLEEP_SCALE", "1.0"))
+        # Task tree scheduler mode and worker pool size for the "ready_queue" mode
+        # Default: read from AIPARTNERUPFLOW_SCHEDULER_MODE / AIPARTNERUPFLOW_SCHEDULER_MAX_WORKERS
+        self._scheduler_mode: str = os.getenv("AIPARTNERUPFLOW_SCHEDULER_MODE", DEFAULT_SCHEDULER_MODE)
+        self._scheduler_max_workers: int = int(
+            os.getenv("AIPARTNERUPFLOW_SCHEDULER_MAX_WORKERS", str(DEFAULT_SCHEDULER_MAX_WORKERS))
+        )
+        # Critical-path ordering of equal-priority tasks in the "ready_queue" mode
+        # Default: enabled, or AIPARTNERUPFLOW_CRITICAL_PATH_SCHEDULING=false
+        self._critical_path_scheduling: bool = (
+            os.getenv("AIPARTNERUPFLOW_CRITICAL_PATH_SCHEDULING", "true").lower() not in ("0", "false", "no")
+        )
+        # Trees of a batch execution running at the same time (each holds a pooled session)
+        # Default: 10, or AIPARTNERUPFLOW_BATCH_MAX_CONCURRENCY
+        self._batch_max_concurrency: int = int(
+            os.getenv("AIPARTNERUPFLOW_BATCH_MAX_CONCURRENCY", str(DEFAULT_BATCH_MAX_CONCURRENCY))
+        )
+        # Concurrency limits for task execution (None = unlimited)
+        # - process-wide limit: AIPARTNERUPFLOW_MAX_CONCURRENCY
+        # - per user_id limit: AIPARTNERUPFLOW_USER_MAX_CONCURRENCY
+        # - per executor id: set_executor_max_concurrency() or executor_register(max_concurrency=...)
+        self._max_concurrency: Optional[int] = _get_env_limit("AIPARTNERUPFLOW_MAX_CONCURRENCY")
+        self._user_max_concurrency: Optional[int] = _get_env_limit("AIPARTNERUPFLOW_USER_MAX_CONCURRENCY")
+        self._executor_max_concurrency: Dict[str, int] = {}
+        # Write-behind buffering of non-terminal status/progress updates in TaskRepository
+        # Default: disabled, or AIPARTNERUPFLOW_WRITE_BEHIND=true
+        self._write_behind_enabled: bool = os.getenv("AIPARTNERUPFLOW_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+        self._write_behind_max_pending: int = DEFAULT_WRITE_BEHIND_MAX_PENDING
+        self._write_behind_flush_interval: float = DEFAULT_WRITE_BEHIND_FLUSH_INTERVAL
+        # Shared database work queue for multi-worker deployments
+        # Default: disabled, or AIPARTNERUPFLOW_WORK_QUEUE=true
+        self._work_queue_enabled: bool = os.getenv("AIPARTNERUPFLOW_WORK_QUEUE", "").lower() in ("1", "true", "yes")
+        self._work_queue_poll_interval: float = DEFAULT_WORK_QUEUE_POLL_INTERVAL
+        self._work_queue_lease_seconds: float = DEFAULT_WORK_QUEUE_LEASE_SECONDS
+        self._work_queue_max_concurrent: int = int(
+            os.getenv("AIPARTNERUPFLOW_WORK_QUEUE_MAX_CONCURRENT", str(DEFAULT_WORK_QUEUE_MAX_CONCURRENT))
+        )
+        # Result cache for executors declared cacheable (executor_register(cacheable=True))
+        # Default: disabled, or AIPARTNERUPFLOW_RESULT_CACHE=memory|database
+        result_cache_backend = os.getenv("AIPARTNERUPFLOW_RESULT_CACHE", "").strip().lower()
+        self._result_cache_enabled: bool = result_cache_backend in RESULT_CACHE_BACKENDS
+        self._result_cache_backend: Any = result_cache_backend if self._result_cache_enabled else "memory"
+        self._result_cache_ttl: Optional[float] = (
+            float(os.getenv("AIPARTNERUPFLOW_RESULT_CACHE_TTL")) if os.getenv("AIPARTNERUPFLOW_RESULT_CACHE_TTL") else None
+        )
+        self._result_cache_max_entries: int = DEFAULT_RESULT_CACHE_MAX_ENTRIES
+        # Incremental re-execution (only re-run failed tasks and tasks whose inputs changed)
+        # Default: disabled, or AIPARTNERUPFLOW_INCREMENTAL_REEXECUTION=true
+        self._incremental_reexecution: bool = (
+            os.getenv("AIPARTNERUPFLOW_INCREMENTAL_REEXECUTION", "").lower() in ("1", "true", "yes")
+        )
+        # Default mode of dependencies without a "mode" of their own
+        # Default: "copy", or AIPARTNERUPFLOW_DEPENDENCY_RESULT_MODE=reference
+        self._dependency_result_mode: str = os.getenv(
+            "AIPARTNERUPFLOW_DEPENDENCY_RESULT_MODE", DEFAULT_DEPENDENCY_RESULT_MODE
+        )
+        # Worker pools of the "thread" and "process" execution lanes (executor_register(execution_lane=...))
+        # Default: AIPARTNERUPFLOW_THREAD_LANE_WORKERS (4) / AIPARTNERUPFLOW_PROCESS_LANE_WORKERS (CPU count)
+        self._thread_lane_workers: int = int(
+            os.getenv("AIPARTNERUPFLOW_THREAD_LANE_WORKERS", str(DEFAULT_THREAD_LANE_WORKERS))
+        )
+        self._process_lane_workers: Optional[int] = _get_env_limit("AIPARTNERUPFLOW_PROCESS_LANE_WORKERS")
+        # Grace period of cancelled executors (see core/execution/cancellation.py)
+        # Default: AIPARTNERUPFLOW_CANCELLATION_GRACE_PERIOD (2.0 seconds)
+        self._cancellation_grace_period: float = float(
+            os.getenv("AIPARTNERUPFLOW_CANCELLATION_GRACE_PERIOD", str(DEFAULT_CANCELLATION_GRACE_PERIOD))
+        )
 
     def set_task_model_class(self, task_model_class: Optional[Type[TaskModel]]) -> None:
         """
@@ -257,6 +360,474 @@ class ConfigRegistry:
         """
         return self._demo_sleep_scale
 
+    def set_scheduler_mode(self, mode: str) -> None:
+        """
+        Set the task tree scheduler mode used by TaskManager
+
+        Modes:
+            - "recursive": Walk the tree by priority groups; waiting tasks are
+              triggered after each completion (default)
+            - "ready_queue": Count unfinished dependencies per task and dispatch
+              tasks from a priority heap as soon as their count reaches zero
+
+        Args:
+            mode: Scheduler mode
+
+        Raises:
+            ValueError: If mode is not supported
+        """
+        if mode not in SCHEDULER_MODES:
+            raise ValueError(f"Invalid scheduler mode '{mode}'. Valid modes: {list(SCHEDULER_MODES)}")
+        self._scheduler_mode = mode
+        logger.debug(f"Set scheduler_mode: {mode}")
+
+    def get_scheduler_mode(self) -> str:
+        """
+        Get the task tree scheduler mode
+
+        Returns:
+            Scheduler mode (default: "recursive", or from AIPARTNERUPFLOW_SCHEDULER_MODE env var)
+        """
+        return self._scheduler_mode
+
+    def set_scheduler_max_workers(self, max_workers: int) -> None:
+        """
+        Set the maximum number of tasks executed concurrently by the "ready_queue" scheduler
+
+        Args:
+            max_workers: Worker pool size (must be >= 1)
+
+        Raises:
+            ValueError: If max_workers is less than 1
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {max_workers}")
+        self._scheduler_max_workers = int(max_workers)
+        logger.debug(f"Set scheduler_max_workers: {max_workers}")
+
+    def get_scheduler_max_workers(self) -> int:
+        """
+        Get the worker pool size of the "ready_queue" scheduler
+
+        Returns:
+            Worker pool size (default: 10, or from AIPARTNERUPFLOW_SCHEDULER_MAX_WORKERS env var)
+        """
+        return self._scheduler_max_workers
+
+    def set_critical_path_scheduling(self, enabled: bool) -> None:
+        """
+        Enable or disable critical-path ordering in the "ready_queue" scheduler
+
+        When enabled, ready tasks with the same priority start in order of their
+        expected longest remaining path through the tree, estimated from recorded
+        executor durations (see core/execution/duration_stats.py).
+
+        Args:
+            enabled: Whether to order equal-priority tasks by critical path
+        """
+        self._critical_path_scheduling = bool(enabled)
+        logger.debug(f"Set critical_path_scheduling: {enabled}")
+
+    def get_critical_path_scheduling(self) -> bool:
+        """
+        Check whether critical-path ordering is enabled
+
+        Returns:
+            True if enabled (default, or from AIPARTNERUPFLOW_CRITICAL_PATH_SCHEDULING env var)
+        """
+        return self._critical_path_scheduling
+
+    def set_batch_max_concurrency(self, max_trees: int) -> None:
+        """
+        Set the number of trees of a batch execution that run at the same time
+
+        Args:
+            max_trees: Concurrently executing trees per batch (must be >= 1)
+
+        Raises:
+            ValueError: If max_trees is less than 1
+        """
+        if max_trees < 1:
+            raise ValueError(f"max_trees must be >= 1, got {max_trees}")
+        self._batch_max_concurrency = int(max_trees)
+        logger.debug(f"Set batch_max_concurrency: {max_trees}")
+
+    def get_batch_max_concurrency(self) -> int:
+        """
+        Get the number of trees of a batch execution that run at the same time
+
+        Returns:
+            Concurrent trees per batch (default: 10, or from AIPARTNERUPFLOW_BATCH_MAX_CONCURRENCY env var)
+        """
+        return self._batch_max_concurrency
+
+    @staticmethod
+    def _validate_limit(limit: Optional[int]) -> Optional[int]:
+        if limit is None:
+            return None
+        if int(limit) < 1:
+            raise ValueError(f"Concurrency limit must be >= 1 or None, got {limit}")
+        return int(limit)
+
+    def set_max_concurrency(self, limit: Optional[int]) -> None:
+        """
+        Set the process-wide limit of concurrently executing tasks
+
+        Tasks waiting for a slot stay in "pending" status.
+
+        Args:
+            limit: Maximum number of concurrent tasks, or None for unlimited
+
+        Raises:
+            ValueError: If limit is less than 1
+        """
+        self._max_concurrency = self._validate_limit(limit)
+        logger.debug(f"Set max_concurrency: {limit}")
+
+    def get_max_concurrency(self) -> Optional[int]:
+        """
+        Get the process-wide concurrency limit
+
+        Returns:
+            Limit, or None for unlimited (default, or from AIPARTNERUPFLOW_MAX_CONCURRENCY env var)
+        """
+        return self._max_concurrency
+
+    def set_user_max_concurrency(self, limit: Optional[int]) -> None:
+        """
+        Set the limit of concurrently executing tasks per user_id
+
+        The same limit applies to each user_id separately. Tasks without user_id are not limited.
+
+        Args:
+            limit: Maximum number of concurrent tasks per user, or None for unlimited
+
+        Raises:
+            ValueError: If limit is less than 1
+        """
+        self._user_max_concurrency = self._validate_limit(limit)
+        logger.debug(f"Set user_max_concurrency: {limit}")
+
+    def get_user_max_concurrency(self) -> Optional[int]:
+        """
+        Get the per-user concurrency limit
+
+        Returns:
+            Limit, or None for unlimited (default, or from AIPARTNERUPFLOW_USER_MAX_CONCURRENCY env var)
+        """
+        return self._user_max_concurrency
+
+    def set_executor_max_concurrency(self, executor_id: str, limit: Optional[int]) -> None:
+        """
+        Set the concurrency limit of one executor
+
+        Overrides the max_concurrency declared with executor_register().
+
+        Args:
+            executor_id: Executor ID (e.g., "rest_executor")
+            limit: Maximum number of concurrent executions, or None to remove the override
+
+        Raises:
+            ValueError: If limit is less than 1
+        """
+        limit = self._validate_limit(limit)
+        if limit is None:
+            self._executor_max_concurrency.pop(executor_id, None)
+        else:
+            self._executor_max_concurrency[executor_id] = limit
+        logger.debug(f"Set executor max_concurrency for '{executor_id}': {limit}")
+
+    def get_executor_max_concurrency(self, executor_id: str) -> Optional[int]:
+        """
+        Get the configured concurrency limit override of one executor
+
+        Args:
+            executor_id: Executor ID
+
+        Returns:
+            Limit override, or None if not configured
+        """
+        return self._executor_max_concurrency.get(executor_id)
+
+    def set_write_behind(
+        self,
+        enabled: bool,
+        max_pending: int = DEFAULT_WRITE_BEHIND_MAX_PENDING,
+        flush_interval: float = DEFAULT_WRITE_BEHIND_FLUSH_INTERVAL,
+    ) -> None:
+        """
+        Configure write-behind buffering of task status updates in TaskRepository
+
+        When enabled, non-terminal status/progress updates (pending, in_progress) are
+        coalesced per task and written as batched UPDATE statements. A flush happens
+        on terminal status updates, when max_pending tasks are buffered, when
+        flush_interval seconds have passed since the last flush, and before list queries.
+
+        Args:
+            enabled: Whether to buffer non-terminal status updates
+            max_pending: Number of buffered tasks that triggers a flush (>= 1)
+            flush_interval: Maximum age in seconds of buffered updates (>= 0)
+
+        Raises:
+            ValueError: If max_pending < 1 or flush_interval < 0
+        """
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be >= 1, got {max_pending}")
+        if flush_interval < 0:
+            raise ValueError(f"flush_interval must be >= 0, got {flush_interval}")
+        self._write_behind_enabled = bool(enabled)
+        self._write_behind_max_pending = int(max_pending)
+        self._write_behind_flush_interval = float(flush_interval)
+        logger.debug(
+            f"Set write_behind: enabled={enabled}, max_pending={max_pending}, flush_interval={flush_interval}"
+        )
+
+    def get_write_behind(self) -> Dict[str, Any]:
+        """
+        Get write-behind configuration
+
+        Returns:
+            Dictionary with "enabled", "max_pending" and "flush_interval"
+        """
+        return {
+            "enabled": self._write_behind_enabled,
+            "max_pending": self._write_behind_max_pending,
+            "flush_interval": self._write_behind_flush_interval,
+        }
+
+    def set_work_queue(
+        self,
+        enabled: bool,
+        poll_interval: float = DEFAULT_WORK_QUEUE_POLL_INTERVAL,
+        lease_seconds: float = DEFAULT_WORK_QUEUE_LEASE_SECONDS,
+        max_concurrent: int = DEFAULT_WORK_QUEUE_MAX_CONCURRENT,
+    ) -> None:
+        """
+        Configure the shared database work queue
+
+        When enabled, task executions requested through the API are written to the
+        task queue table and claimed by any worker process of the deployment. Running
+        state and cancellation requests are shared through the same table.
+
+        Args:
+            enabled: Whether executions go through the shared work queue
+            poll_interval: Seconds between queue polls and lease heartbeats (> 0)
+            lease_seconds: Seconds a claim stays valid without heartbeat (> poll_interval)
+            max_concurrent: Executions one worker process runs at the same time (>= 1)
+
+        Raises:
+            ValueError: If a value is out of range
+        """
+        if poll_interval <= 0:
+            raise ValueError(f"poll_interval must be > 0, got {poll_interval}")
+        if lease_seconds <= poll_interval:
+            raise ValueError(
+                f"lease_seconds must be greater than poll_interval, got {lease_seconds} <= {poll_interval}"
+            )
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be >= 1, got {max_concurrent}")
+        self._work_queue_enabled = bool(enabled)
+        self._work_queue_poll_interval = float(poll_interval)
+        self._work_queue_lease_seconds = float(lease_seconds)
+        self._work_queue_max_concurrent = int(max_concurrent)
+        logger.debug(
+            f"Set work_queue: enabled={enabled}, poll_interval={poll_interval}, "
+            f"lease_seconds={lease_seconds}, max_concurrent={max_concurrent}"
+        )
+
+    def get_work_queue(self) -> Dict[str, Any]:
+        """
+        Get work queue configuration
+
+        Returns:
+            Dictionary with "enabled", "poll_interval", "lease_seconds" and "max_concurrent"
+        """
+        return {
+            "enabled": self._work_queue_enabled,
+            "poll_interval": self._work_queue_poll_interval,
+            "lease_seconds": self._work_queue_lease_seconds,
+            "max_concurrent": self._work_queue_max_concurrent,
+        }
+
+    def set_result_cache(
+        self,
+        enabled: bool,
+        backend: Any = "memory",
+        ttl: Optional[float] = None,
+        max_entries: int = DEFAULT_RESULT_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """
+        Configure the executor result cache
+
+        When enabled, results of executors registered with
+        executor_register(cacheable=True) are stored under a hash of executor id,
+        executor version, params and resolved inputs, and reused by later executions
+        with the same key instead of calling the executor again.
+
+        Args:
+            enabled: Whether cacheable executor results are cached
+            backend: "memory" (per-process LRU), "database" (shared table), or a
+                ResultCacheBackend instance
+            ttl: Seconds a cached result stays valid (None = no expiry); an executor's
+                executor_register(cache_ttl=...) takes precedence
+            max_entries: Maximum entries of the "memory" backend (>= 1)
+
+        Raises:
+            ValueError: If backend is an unknown name, ttl <= 0 or max_entries < 1
+        """
+        if isinstance(backend, str) and backend not in RESULT_CACHE_BACKENDS:
+            raise ValueError(f"Unknown result cache backend '{backend}', expected one of {RESULT_CACHE_BACKENDS}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl must be > 0, got {ttl}")
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self._result_cache_enabled = bool(enabled)
+        self._result_cache_backend = backend
+        self._result_cache_ttl = None if ttl is None else float(ttl)
+        self._result_cache_max_entries = int(max_entries)
+        logger.debug(f"Set result_cache: enabled={enabled}, backend={backend}, ttl={ttl}, max_entries={max_entries}")
+
+    def get_result_cache(self) -> Dict[str, Any]:
+        """
+        Get result cache configuration
+
+        Returns:
+            Dictionary with "enabled", "backend", "ttl" and "max_entries"
+        """
+        return {
+            "enabled": self._result_cache_enabled,
+            "backend": self._result_cache_backend,
+            "ttl": self._result_cache_ttl,
+            "max_entries": self._result_cache_max_entries,
+        }
+
+    def set_incremental_reexecution(self, enabled: bool) -> None:
+        """
+        Set whether re-executed task trees only re-run what changed
+
+        When enabled, re-executing a tree runs failed tasks and tasks whose input
+        fingerprint (inputs, params, schemas and dependency result hashes) differs
+        from the one stored at their last completion. Dependents of a re-executed
+        task only run again if its result actually changed (early cutoff).
+        When disabled (default), all failed and completed tasks are re-executed.
+
+        Args:
+            enabled: Whether incremental re-execution is used
+        """
+        self._incremental_reexecution = bool(enabled)
+        logger.debug(f"Set incremental_reexecution: {enabled}")
+
+    def get_incremental_reexecution(self) -> bool:
+        """
+        Get whether incremental re-execution is enabled
+
+        Returns:
+            True if only changed tasks are re-executed
+        """
+        return self._incremental_reexecution
+
+    def set_dependency_result_mode(self, mode: str) -> None:
+        """
+        Set how dependency results are passed to dependent tasks by default
+
+        Modes:
+            - "copy": The dependency result is copied into the stored inputs of the
+              dependent task (default)
+            - "reference": The stored inputs hold a reference to the dependency result,
+              which is read when the executor runs and never written to the inputs
+
+        A dependency entry with its own "mode" overrides this default.
+
+        Args:
+            mode: Dependency result mode
+
+        Raises:
+            ValueError: If mode is not supported
+        """
+        if mode not in DEPENDENCY_RESULT_MODES:
+            raise ValueError(
+                f"Invalid dependency result mode '{mode}'. Valid modes: {list(DEPENDENCY_RESULT_MODES)}"
+            )
+        self._dependency_result_mode = mode
+        logger.debug(f"Set dependency_result_mode: {mode}")
+
+    def get_dependency_result_mode(self) -> str:
+        """
+        Get the default dependency result mode
+
+        Returns:
+            Mode (default: "copy", or from AIPARTNERUPFLOW_DEPENDENCY_RESULT_MODE env var)
+        """
+        return self._dependency_result_mode
+
+    def set_lane_workers(
+        self,
+        thread_workers: int = DEFAULT_THREAD_LANE_WORKERS,
+        process_workers: Optional[int] = None,
+    ) -> None:
+        """
+        Set the pool sizes of the execution lanes
+
+        Executors registered with executor_register(execution_lane="thread") run in a
+        bounded thread pool, executors with execution_lane="process" in a process pool,
+        so CPU-bound work does not block the event loop. Pools are created on first use;
+        changing the sizes replaces idle pools.
+
+        Args:
+            thread_workers: Threads of the "thread" lane (>= 1)
+            process_workers: Processes of the "process" lane (>= 1, None = CPU count)
+
+        Raises:
+            ValueError: If a pool size is < 1
+        """
+        if thread_workers < 1:
+            raise ValueError(f"thread_workers must be >= 1, got {thread_workers}")
+        if process_workers is not None and process_workers < 1:
+            raise ValueError(f"process_workers must be >= 1, got {process_workers}")
+        self._thread_lane_workers = int(thread_workers)
+        self._process_lane_workers = None if process_workers is None else int(process_workers)
+        logger.debug(f"Set execution_lanes: thread_workers={thread_workers}, process_workers={process_workers}")
+
+    def get_lane_workers(self) -> Dict[str, Any]:
+        """
+        Get execution lane pool sizes
+
+        Returns:
+            Dictionary with "thread_workers" and "process_workers" (None = CPU count)
+        """
+        return {
+            "thread_workers": self._thread_lane_workers,
+            "process_workers": self._process_lane_workers,
+        }
+
+    def set_cancellation_grace_period(self, seconds: float) -> None:
+        """
+        Set how long a cancelled executor may keep running
+
+        When a running task is cancelled, its executor sees cancellation_checker()
+        return True and gets this many seconds to return by itself. After that, the
+        asyncio task running executor.execute() is cancelled.
+
+        Args:
+            seconds: Grace period in seconds (>= 0, 0 = cancel immediately)
+
+        Raises:
+            ValueError: If seconds is negative
+        """
+        if seconds < 0:
+            raise ValueError(f"Cancellation grace period must be >= 0, got {seconds}")
+        self._cancellation_grace_period = float(seconds)
+        logger.debug(f"Set cancellation_grace_period: {seconds}")
+
+    def get_cancellation_grace_period(self) -> float:
+        """
+        Get the grace period of cancelled executors
+
+        Returns:
+            Grace period in seconds
+        """
+        return self._cancellation_grace_period
+
     def clear(self) -> None:
         """Clear all configuration (useful for testing)"""
         self._task_model_class = None
@@ -264,6 +835,29 @@ class ConfigRegistry:
         self._post_hooks.clear()
         self._use_task_creator = True  # Reset to default
         self._require_existing_tasks = False  # Reset to default
+        self._scheduler_mode = DEFAULT_SCHEDULER_MODE  # Reset to default
+        self._scheduler_max_workers = DEFAULT_SCHEDULER_MAX_WORKERS  # Reset to default
+        self._critical_path_scheduling = True  # Reset to default
+        self._batch_max_concurrency = DEFAULT_BATCH_MAX_CONCURRENCY  # Reset to default
+        self._max_concurrency = None  # Reset to default (unlimited)
+        self._user_max_concurrency = None  # Reset to default (unlimited)
+        self._executor_max_concurrency.clear()
+        self._write_behind_enabled = False  # Reset to default
+        self._write_behind_max_pending = DEFAULT_WRITE_BEHIND_MAX_PENDING
+        self._write_behind_flush_interval = DEFAULT_WRITE_BEHIND_FLUSH_INTERVAL
+        self._work_queue_enabled = False  # Reset to default
+        self._work_queue_poll_interval = DEFAULT_WORK_QUEUE_POLL_INTERVAL
+        self._work_queue_lease_seconds = DEFAULT_WORK_QUEUE_LEASE_SECONDS
+        self._work_queue_max_concurrent = DEFAULT_WORK_QUEUE_MAX_CONCURRENT
+        self._result_cache_enabled = False  # Reset to default
+        self._result_cache_backend = "memory"
+        self._result_cache_ttl = None
+        self._result_cache_max_entries = DEFAULT_RESULT_CACHE_MAX_ENTRIES
+        self._incremental_reexecution = False  # Reset to default
+        self._dependency_result_mode = DEFAULT_DEPENDENCY_RESULT_MODE  # Reset to default
+        self._thread_lane_workers = DEFAULT_THREAD_LANE_WORKERS
+        self._process_lane_workers = None
+        self._cancellation_grace_period = DEFAULT_CANCELLATION_GRACE_PERIOD
         # Clear task tree hooks
         for hook_list in self._task_tree_hooks.values():
             hook_list.clear()
@@ -478,6 +1072,356 @@ def get_demo_sleep_scale() -> float:
     return _get_registry().get_demo_sleep_scale()
 
 
+def set_scheduler_mode(mode: str) -> None:
+    """
+    Set the task tree scheduler mode used by TaskManager
+
+    Args:
+        mode: "recursive" (default) or "ready_queue"
+
+    Example:
+        from aipartnerupflow.core.config import set_scheduler_mode
+        set_scheduler_mode("ready_queue")
+    """
+    _get_registry().set_scheduler_mode(mode)
+
+
+def get_scheduler_mode() -> str:
+    """
+    Get the task tree scheduler mode
+
+    Returns:
+        Scheduler mode ("recursive" or "ready_queue")
+    """
+    return _get_registry().get_scheduler_mode()
+
+
+def set_scheduler_max_workers(max_workers: int) -> None:
+    """
+    Set the maximum number of tasks executed concurrently by the "ready_queue" scheduler
+
+    Args:
+        max_workers: Worker pool size (must be >= 1)
+    """
+    _get_registry().set_scheduler_max_workers(max_workers)
+
+
+def get_scheduler_max_workers() -> int:
+    """
+    Get the worker pool size of the "ready_queue" scheduler
+
+    Returns:
+        Worker pool size
+    """
+    return _get_registry().get_scheduler_max_workers()
+
+
+def set_critical_path_scheduling(enabled: bool) -> None:
+    """
+    Enable or disable critical-path ordering in the "ready_queue" scheduler
+
+    Args:
+        enabled: Whether to start equal-priority tasks on the longest expected path first
+    """
+    _get_registry().set_critical_path_scheduling(enabled)
+
+
+def get_critical_path_scheduling() -> bool:
+    """
+    Check whether critical-path ordering is enabled
+
+    Returns:
+        True if enabled
+    """
+    return _get_registry().get_critical_path_scheduling()
+
+
+def set_batch_max_concurrency(max_trees: int) -> None:
+    """
+    Set the number of trees of a batch execution that run at the same time
+
+    Args:
+        max_trees: Concurrently executing trees per batch (must be >= 1)
+    """
+    _get_registry().set_batch_max_concurrency(max_trees)
+
+
+def get_batch_max_concurrency() -> int:
+    """
+    Get the number of trees of a batch execution that run at the same time
+
+    Returns:
+        Concurrent trees per batch
+    """
+    return _get_registry().get_batch_max_concurrency()
+
+
+def set_max_concurrency(limit: Optional[int]) -> None:
+    """
+    Set the process-wide limit of concurrently executing tasks
+
+    Args:
+        limit: Maximum number of concurrent tasks, or None for unlimited
+
+    Example:
+        from aipartnerupflow.core.config import set_max_concurrency
+        set_max_concurrency(50)
+    """
+    _get_registry().set_max_concurrency(limit)
+
+
+def get_max_concurrency() -> Optional[int]:
+    """
+    Get the process-wide concurrency limit
+
+    Returns:
+        Limit, or None for unlimited
+    """
+    return _get_registry().get_max_concurrency()
+
+
+def set_user_max_concurrency(limit: Optional[int]) -> None:
+    """
+    Set the limit of concurrently executing tasks per user_id
+
+    Args:
+        limit: Maximum number of concurrent tasks per user, or None for unlimited
+    """
+    _get_registry().set_user_max_concurrency(limit)
+
+
+def get_user_max_concurrency() -> Optional[int]:
+    """
+    Get the per-user concurrency limit
+
+    Returns:
+        Limit, or None for unlimited
+    """
+    return _get_registry().get_user_max_concurrency()
+
+
+def set_executor_max_concurrency(executor_id: str, limit: Optional[int]) -> None:
+    """
+    Set the concurrency limit of one executor (overrides executor_register(max_concurrency=...))
+
+    Args:
+        executor_id: Executor ID (e.g., "rest_executor")
+        limit: Maximum number of concurrent executions, or None to remove the override
+
+    Example:
+        from aipartnerupflow.core.config import set_executor_max_concurrency
+        set_executor_max_concurrency("rest_executor", 20)
+    """
+    _get_registry().set_executor_max_concurrency(executor_id, limit)
+
+
+def get_executor_max_concurrency(executor_id: str) -> Optional[int]:
+    """
+    Get the configured concurrency limit override of one executor
+
+    Args:
+        executor_id: Executor ID
+
+    Returns:
+        Limit override, or None if not configured
+    """
+    return _get_registry().get_executor_max_concurrency(executor_id)
+
+
+def set_write_behind(
+    enabled: bool,
+    max_pending: int = DEFAULT_WRITE_BEHIND_MAX_PENDING,
+    flush_interval: float = DEFAULT_WRITE_BEHIND_FLUSH_INTERVAL,
+) -> None:
+    """
+    Configure write-behind buffering of task status updates in TaskRepository
+
+    Args:
+        enabled: Whether to buffer non-terminal status updates
+        max_pending: Number of buffered tasks that triggers a flush
+        flush_interval: Maximum age in seconds of buffered updates
+
+    Example:
+        from aipartnerupflow.core.config import set_write_behind
+        set_write_behind(True, max_pending=200, flush_interval=0.2)
+    """
+    _get_registry().set_write_behind(enabled, max_pending, flush_interval)
+
+
+def get_write_behind() -> Dict[str, Any]:
+    """
+    Get write-behind configuration
+
+    Returns:
+        Dictionary with "enabled", "max_pending" and "flush_interval"
+    """
+    return _get_registry().get_write_behind()
+
+
+def set_work_queue(
+    enabled: bool,
+    poll_interval: float = DEFAULT_WORK_QUEUE_POLL_INTERVAL,
+    lease_seconds: float = DEFAULT_WORK_QUEUE_LEASE_SECONDS,
+    max_concurrent: int = DEFAULT_WORK_QUEUE_MAX_CONCURRENT,
+) -> None:
+    """
+    Configure the shared database work queue
+
+    Args:
+        enabled: Whether executions go through the shared work queue
+        poll_interval: Seconds between queue polls and lease heartbeats
+        lease_seconds: Seconds a claim stays valid without heartbeat
+        max_concurrent: Executions one worker process runs at the same time
+
+    Example:
+        from aipartnerupflow.core.config import set_work_queue
+        set_work_queue(True, max_concurrent=8)
+    """
+    _get_registry().set_work_queue(enabled, poll_interval, lease_seconds, max_concurrent)
+
+
+def get_work_queue() -> Dict[str, Any]:
+    """
+    Get work queue configuration
+
+    Returns:
+        Dictionary with "enabled", "poll_interval", "lease_seconds" and "max_concurrent"
+    """
+    return _get_registry().get_work_queue()
+
+
+def set_result_cache(
+    enabled: bool,
+    backend: Any = "memory",
+    ttl: Optional[float] = None,
+    max_entries: int = DEFAULT_RESULT_CACHE_MAX_ENTRIES,
+) -> None:
+    """
+    Configure the executor result cache
+
+    Args:
+        enabled: Whether cacheable executor results are cached
+        backend: "memory", "database", or a ResultCacheBackend instance
+        ttl: Seconds a cached result stays valid (None = no expiry)
+        max_entries: Maximum entries of the "memory" backend
+
+    Example:
+        from aipartnerupflow.core.config import set_result_cache
+        set_result_cache(True, backend="database", ttl=24 * 3600)
+    """
+    _get_registry().set_result_cache(enabled, backend, ttl, max_entries)
+
+
+def get_result_cache() -> Dict[str, Any]:
+    """
+    Get result cache configuration
+
+    Returns:
+        Dictionary with "enabled", "backend", "ttl" and "max_entries"
+    """
+    return _get_registry().get_result_cache()
+
+
+def set_incremental_reexecution(enabled: bool) -> None:
+    """
+    Set whether re-executed task trees only re-run failed and changed tasks
+
+    Args:
+        enabled: Whether incremental re-execution is used
+
+    Example:
+        from aipartnerupflow.core.config import set_incremental_reexecution
+        set_incremental_reexecution(True)
+    """
+    _get_registry().set_incremental_reexecution(enabled)
+
+
+def get_incremental_reexecution() -> bool:
+    """
+    Get whether incremental re-execution is enabled
+
+    Returns:
+        True if only changed tasks are re-executed
+    """
+    return _get_registry().get_incremental_reexecution()
+
+
+def set_dependency_result_mode(mode: str) -> None:
+    """
+    Set how dependency results are passed to dependent tasks by default
+
+    Args:
+        mode: "copy" (default) or "reference"
+
+    Example:
+        from aipartnerupflow.core.config import set_dependency_result_mode
+        set_dependency_result_mode("reference")
+    """
+    _get_registry().set_dependency_result_mode(mode)
+
+
+def get_dependency_result_mode() -> str:
+    """
+    Get the default dependency result mode
+
+    Returns:
+        Mode ("copy" or "reference")
+    """
+    return _get_registry().get_dependency_result_mode()
+
+
+def set_lane_workers(
+    thread_workers: int = DEFAULT_THREAD_LANE_WORKERS,
+    process_workers: Optional[int] = None,
+) -> None:
+    """
+    Set the pool sizes of the "thread" and "process" execution lanes
+
+    Args:
+        thread_workers: Threads of the "thread" lane
+        process_workers: Processes of the "process" lane (None = CPU count)
+
+    Example:
+        from aipartnerupflow.core.config import set_lane_workers
+        set_lane_workers(thread_workers=8, process_workers=4)
+    """
+    _get_registry().set_lane_workers(thread_workers, process_workers)
+
+
+def get_lane_workers() -> Dict[str, Any]:
+    """
+    Get execution lane pool sizes
+
+    Returns:
+        Dictionary with "thread_workers" and "process_workers"
+    """
+    return _get_registry().get_lane_workers()
+
+
+def set_cancellation_grace_period(seconds: float) -> None:
+    """
+    Set how long a cancelled executor may keep running before its execution is cancelled
+
+    Args:
+        seconds: Grace period in seconds (0 = cancel immediately)
+
+    Example:
+        from aipartnerupflow.core.config import set_cancellation_grace_period
+        set_cancellation_grace_period(5.0)
+    """
+    _get_registry().set_cancellation_grace_period(seconds)
+
+
+def get_cancellation_grace_period() -> float:
+    """
+    Get the grace period of cancelled executors
+
+    Returns:
+        Grace period in seconds
+    """
+    return _get_registry().get_cancellation_grace_period()
+
+
 def get_require_existing_tasks() -> bool:
     """
     Get whether to require tasks to exist before execution
@@ -7,6 +7,7 @@ from aipartnerupflow.core.execution.task_creator import TaskCreator
 from aipartnerupflow.core.execution.streaming_callbacks import StreamingCallbacks
 from aipartnerupflow.core.execution.task_tracker import TaskTracker
 from aipartnerupflow.core.execution.task_executor import TaskExecutor
+from aipartnerupflow.core.execution.work_queue import TaskWorkQueue, QueueWorker
 from aipartnerupflow.core.execution.executor_registry import (
     ExecutorRegistry,
     get_registry,
@@ -19,6 +20,8 @@ __all__ = [
     "StreamingCallbacks",
     "TaskTracker",
     "TaskExecutor",
+    "TaskWorkQueue",
+    "QueueWorker",
     "ExecutorRegistry",
     "get_registry",
     "register_executor",
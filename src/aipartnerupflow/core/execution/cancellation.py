@@ -0,0 +1,238 @@
+"""
+Live cancellation tokens for running task trees
+
+TaskManager registers a CancellationToken for every task of a tree it distributes.
+Tokens form the same hierarchy as the tree, so cancelling a task also cancels its
+pending and running descendants. Tokens are process-wide (see
+get_cancellation_registry()), so TaskManager.cancel_task() called from the API, the
+work queue or any other TaskManager instance reaches the running execution.
+
+A cancelled token:
+- makes the executor's cancellation_checker return True (checked live, not cached)
+- stops TaskManager from starting the task or any of its cancelled descendants
+- after a grace period (set_cancellation_grace_period()), cancels the asyncio task
+  of an executor that did not return by itself
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Dict, List, Optional
+
+from aipartnerupflow.core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TaskCancelledError(Exception):
+    """Raised when an execution was stopped because its cancellation token was cancelled"""
+
+
+class CancellationToken:
+    """
+    Cancellation state of one task
+
+    is_cancelled() can be called from any thread (e.g. executors in the thread lane);
+    wait() can be awaited from the event loop the tree runs on.
+    """
+
+    def __init__(self, task_id: str, parent: Optional["CancellationToken"] = None):
+        self.task_id = task_id
+        self.parent = parent
+        self.children: List["CancellationToken"] = []
+        self.reason: Optional[str] = None
+        self._cancelled = False
+        self._event = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        if parent is not None:
+            parent.children.append(self)
+            if parent.is_cancelled():
+                self._cancelled = True
+                self.reason = parent.reason
+
+    def is_cancelled(self) -> bool:
+        """Check whether the task was cancelled (directly or through an ancestor)"""
+        return self._cancelled
+
+    def cancel(self, reason: Optional[str] = None) -> List[str]:
+        """
+        Cancel this token and all descendant tokens
+
+        Args:
+            reason: Cancellation reason (stored on every cancelled token)
+
+        Returns:
+            IDs of the tasks cancelled by this call (already cancelled tokens are skipped)
+        """
+        cancelled_ids = []
+        stack = [self]
+        while stack:
+            token = stack.pop()
+            if not token._cancelled:
+                token._cancelled = True
+                token.reason = reason
+                token._wake_waiters()
+                cancelled_ids.append(token.task_id)
+            stack.extend(token.children)
+        return cancelled_ids
+
+    def _wake_waiters(self) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._event.set()
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            self._event.set()
+        else:
+            loop.call_soon_threadsafe(self._event.set)
+
+    async def wait(self) -> None:
+        """Wait until the token is cancelled"""
+        self._loop = asyncio.get_running_loop()
+        if self._cancelled:
+            return
+        await self._event.wait()
+
+    async def run(self, awaitable: Awaitable[Any], grace_period: float = 0.0) -> Any:
+        """
+        Await an executor call, stopping it if the token is cancelled
+
+        When the token is cancelled, the call gets grace_period seconds to return by
+        itself (cooperative executors check their cancellation_checker); after that
+        its asyncio task is cancelled.
+
+        Args:
+            awaitable: Coroutine or future to run
+            grace_period: Seconds a cancelled call may still take before it is cancelled
+
+        Returns:
+            Result of the awaitable (also when it returned during the grace period)
+
+        Raises:
+            TaskCancelledError: If the call was cancelled
+        """
+        call = asyncio.ensure_future(awaitable)
+        waiter = asyncio.ensure_future(self.wait())
+        try:
+            done, _ = await asyncio.wait({call, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            if call not in done:
+                if grace_period > 0:
+                    await asyncio.wait({call}, timeout=grace_period)
+                if not call.done():
+                    logger.info(
+                        f"Task {self.task_id} did not stop within {grace_period}s after cancellation, "
+                        f"cancelling its execution"
+                    )
+                    call.cancel()
+                    await asyncio.wait({call}, timeout=max(grace_period, 1.0))
+                    raise TaskCancelledError(f"Task {self.task_id} was cancelled: {self.reason or 'cancelled'}")
+            if call.cancelled():
+                raise TaskCancelledError(f"Task {self.task_id} was cancelled: {self.reason or 'cancelled'}")
+            return call.result()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        finally:
+            waiter.cancel()
+
+
+class CancellationRegistry:
+    """
+    Process-wide registry of the cancellation tokens of running trees
+
+    Tokens are registered by TaskManager when a tree is distributed and removed when
+    it finishes. A task ID maps to the token of the execution that registered it last.
+    """
+
+    def __init__(self):
+        self._tokens: Dict[str, CancellationToken] = {}
+        self._lock = threading.Lock()
+
+    def register_tree(self, task_tree: Any) -> Dict[str, CancellationToken]:
+        """
+        Create tokens for all tasks of a tree
+
+        Args:
+            task_tree: Root TaskTreeNode
+
+        Returns:
+            Dictionary of task ID -> token for the tree
+        """
+        tokens: Dict[str, CancellationToken] = {}
+        stack = [(task_tree, None)]
+        while stack:
+            node, parent_token = stack.pop()
+            task_id = str(node.task.id)
+            token = CancellationToken(task_id, parent_token)
+            tokens[task_id] = token
+            stack.extend((child, token) for child in node.children)
+        with self._lock:
+            self._tokens.update(tokens)
+        return tokens
+
+    def unregister_tree(self, tokens: Dict[str, CancellationToken]) -> None:
+        """
+        Remove the tokens of a finished tree
+
+        Args:
+            tokens: Dictionary returned by register_tree()
+        """
+        with self._lock:
+            for task_id, token in tokens.items():
+                if self._tokens.get(task_id) is token:
+                    del self._tokens[task_id]
+
+    def get(self, task_id: str) -> Optional[CancellationToken]:
+        """
+        Get the token of a running task
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            Token, or None if the task is not part of a running tree in this process
+        """
+        return self._tokens.get(str(task_id))
+
+    def cancel(self, task_id: str, reason: Optional[str] = None) -> List[str]:
+        """
+        Cancel a running task and its descendants
+
+        Args:
+            task_id: Task ID
+            reason: Cancellation reason
+
+        Returns:
+            IDs of the tasks cancelled by this call (empty if the task is not running here)
+        """
+        token = self.get(task_id)
+        if token is None:
+            return []
+        cancelled_ids = token.cancel(reason)
+        if cancelled_ids:
+            logger.info(f"Cancelled tokens of task {task_id} and {len(cancelled_ids) - 1} descendants")
+        return cancelled_ids
+
+
+_cancellation_registry = CancellationRegistry()
+
+
+def get_cancellation_registry() -> CancellationRegistry:
+    """
+    Get the process-wide CancellationRegistry instance
+
+    Returns:
+        CancellationRegistry singleton
+    """
+    return _cancellation_registry
+
+
+__all__ = [
+    "CancellationToken",
+    "CancellationRegistry",
+    "TaskCancelledError",
+    "get_cancellation_registry",
+]
@@ -0,0 +1,162 @@
+"""
+Concurrency limits for task execution
+
+TaskManager acquires a ConcurrencyLease before a task moves to "in_progress" and
+releases it once the task has finished, so tasks waiting for a slot stay "pending".
+
+Three levels of limits are applied (all optional, see core.config):
+- per user_id: set_user_max_concurrency()
+- per executor id: set_executor_max_concurrency() or executor_register(max_concurrency=...)
+- process-wide: set_max_concurrency()
+
+Slots are acquired from the most specific to the least specific level, so a task
+waiting for a busy executor does not hold a process-wide slot. Semaphores are kept
+per event loop because asyncio primitives cannot be shared across loops.
+
+A task waiting for work that needs slots itself (e.g. map_executor waiting for the
+children it spawned) releases its lease meanwhile and re-acquires it afterwards,
+otherwise a parent holding the last slot would wait for its children forever.
+"""
+
+import asyncio
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from aipartnerupflow.core.config import (
+    get_max_concurrency,
+    get_user_max_concurrency,
+    get_executor_max_concurrency,
+)
+from aipartnerupflow.core.extensions import get_registry
+from aipartnerupflow.core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ConcurrencyLease:
+    """
+    Slots held by one task execution
+
+    release() is idempotent so it can be called both on the normal path (before
+    dependent tasks are triggered) and in a finally block. reacquire() takes the
+    released slots again, in the order they were first acquired.
+    """
+
+    def __init__(self, semaphores: List[asyncio.Semaphore]):
+        self._semaphores = semaphores
+        self._released: List[asyncio.Semaphore] = []
+
+    def release(self) -> None:
+        """Release all held slots (no-op if already released)"""
+        while self._semaphores:
+            semaphore = self._semaphores.pop()
+            semaphore.release()
+            self._released.append(semaphore)
+
+    async def reacquire(self) -> None:
+        """Wait for the released slots again (no-op if nothing was released)"""
+        released, self._released = self._released[::-1], []
+        try:
+            for semaphore in released:
+                await semaphore.acquire()
+                self._semaphores.append(semaphore)
+        except BaseException:
+            self.release()
+            raise
+
+
+class ConcurrencyLimiter:
+    """
+    Process-wide registry of execution slots
+
+    Limits are read from the config registry on every acquire, so changes apply to
+    tasks that start afterwards. When a limit changes, a new semaphore is created;
+    leases taken from the previous one still release it.
+    """
+
+    def __init__(self):
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], Tuple[int, asyncio.Semaphore]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get_executor_limit(self, executor_id: Optional[str]) -> Optional[int]:
+        """
+        Get the effective limit of an executor (config override, then executor_register metadata)
+
+        Args:
+            executor_id: Executor ID
+
+        Returns:
+            Limit, or None for unlimited
+        """
+        if not executor_id:
+            return None
+        limit = get_executor_max_concurrency(executor_id)
+        if limit is not None:
+            return limit
+        return get_registry().get_executor_options(executor_id).get("max_concurrency")
+
+    def _get_limits(self, executor_id: Optional[str], user_id: Optional[str]) -> List[Tuple[str, str, int]]:
+        limits = []
+        user_limit = get_user_max_concurrency()
+        if user_limit is not None and user_id:
+            limits.append(("user", user_id, user_limit))
+        executor_limit = self.get_executor_limit(executor_id)
+        if executor_limit is not None:
+            limits.append(("executor", executor_id, executor_limit))
+        global_limit = get_max_concurrency()
+        if global_limit is not None:
+            limits.append(("global", "", global_limit))
+        return limits
+
+    def _get_semaphore(self, scope: str, key: str, limit: int) -> asyncio.Semaphore:
+        loop_semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        entry = loop_semaphores.get((scope, key))
+        if entry is None or entry[0] != limit:
+            entry = (limit, asyncio.Semaphore(limit))
+            loop_semaphores[(scope, key)] = entry
+        return entry[1]
+
+    async def acquire(self, executor_id: Optional[str], user_id: Optional[str]) -> ConcurrencyLease:
+        """
+        Wait for a slot at every configured level
+
+        Args:
+            executor_id: Executor ID of the task (None if unknown)
+            user_id: User ID of the task (None if not set)
+
+        Returns:
+            ConcurrencyLease to release when the task has finished
+        """
+        acquired: List[asyncio.Semaphore] = []
+        try:
+            for scope, key, limit in self._get_limits(executor_id, user_id):
+                semaphore = self._get_semaphore(scope, key, limit)
+                if semaphore.locked():
+                    logger.debug(f"Waiting for {scope} concurrency slot '{key}' (limit {limit})")
+                await semaphore.acquire()
+                acquired.append(semaphore)
+        except BaseException:
+            ConcurrencyLease(acquired).release()
+            raise
+        return ConcurrencyLease(acquired)
+
+
+_limiter = ConcurrencyLimiter()
+
+
+def get_concurrency_limiter() -> ConcurrencyLimiter:
+    """
+    Get the process-wide ConcurrencyLimiter instance
+
+    Returns:
+        ConcurrencyLimiter singleton
+    """
+    return _limiter
+
+
+__all__ = [
+    "ConcurrencyLimiter",
+    "ConcurrencyLease",
+    "get_concurrency_limiter",
+]
@@ -0,0 +1,139 @@
+"""
+Per-task timeouts and tree deadlines
+
+Two limits bound how long a task tree can run:
+
+- schemas.timeout (seconds) on any task: maximum duration of its executor call
+- schemas.deadline on the root task: time budget of the whole tree, either seconds
+  from the start of the execution or an absolute ISO-8601 timestamp
+
+TaskManager wraps executor.execute() with the smaller of the task timeout and the
+time left before the tree deadline, and passes the resulting absolute deadline to
+the executor (BaseTask.get_timeout() shrinks an executor's own network or command
+timeout to it). Tasks that have not started when the tree deadline passes are
+failed without running.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+
+
+class TaskTimeoutError(Exception):
+    """Raised when a task exceeds its timeout or the deadline of its tree"""
+
+
+def _positive_seconds(value: Any, field: str) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"schemas.{field} must be a number of seconds, got {value!r}")
+    if seconds <= 0:
+        raise ValueError(f"schemas.{field} must be > 0, got {value!r}")
+    return seconds
+
+
+def get_task_timeout(task: TaskModel) -> Optional[float]:
+    """
+    Get the timeout of a task from schemas.timeout
+
+    Args:
+        task: Task
+
+    Returns:
+        Timeout in seconds, or None if the task has no timeout
+
+    Raises:
+        ValueError: If schemas.timeout is not a positive number
+    """
+    return _positive_seconds((task.schemas or {}).get("timeout"), "timeout")
+
+
+def get_tree_deadline(root_task: TaskModel, started_at: Optional[float] = None) -> Optional[float]:
+    """
+    Get the deadline of a tree from the root task's schemas.deadline
+
+    Args:
+        root_task: Root task of the tree
+        started_at: Start of the execution (epoch seconds, default: now)
+
+    Returns:
+        Deadline as epoch seconds, or None if the tree has no deadline
+
+    Raises:
+        ValueError: If schemas.deadline is neither a positive number nor an ISO-8601 timestamp
+    """
+    value = (root_task.schemas or {}).get("deadline")
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            deadline = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            deadline = None
+        if deadline is not None:
+            if deadline.tzinfo is None:
+                deadline = deadline.replace(tzinfo=timezone.utc)
+            return deadline.timestamp()
+    budget = _positive_seconds(value, "deadline")
+    return (started_at if started_at is not None else time.time()) + budget
+
+
+def get_remaining_time(deadline: Optional[float]) -> Optional[float]:
+    """
+    Get the seconds left before a deadline
+
+    Args:
+        deadline: Deadline as epoch seconds, or None
+
+    Returns:
+        Seconds left (may be negative), or None without deadline
+    """
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+async def run_with_timeout(awaitable: Any, timeout: float, message: str) -> Any:
+    """
+    Await a call, cancelling it when the timeout expires
+
+    Unlike asyncio.wait_for(), a TimeoutError raised by the call itself is passed
+    through unchanged, so executor errors are not mistaken for an expired budget.
+
+    Args:
+        awaitable: Coroutine or future to run
+        timeout: Seconds the call may take
+        message: Message of the TaskTimeoutError raised on expiry
+
+    Returns:
+        Result of the awaitable
+
+    Raises:
+        TaskTimeoutError: If the call did not finish in time
+    """
+    call = asyncio.ensure_future(awaitable)
+    try:
+        done, _ = await asyncio.wait({call}, timeout=max(0.0, timeout))
+    except asyncio.CancelledError:
+        call.cancel()
+        raise
+    if call not in done:
+        call.cancel()
+        await asyncio.wait({call}, timeout=1.0)
+        raise TaskTimeoutError(message)
+    return call.result()
+
+
+__all__ = [
+    "TaskTimeoutError",
+    "run_with_timeout",
+    "get_task_timeout",
+    "get_tree_deadline",
+    "get_remaining_time",
+]
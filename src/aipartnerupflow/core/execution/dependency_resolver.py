@@ -6,9 +6,15 @@ checking dependency satisfaction, and managing dependency-related operations.
 These functions can be used by TaskManager and other orchestration components.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
 from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
+from aipartnerupflow.core.execution.tree_state import TaskTreeState, get_dependency_id
+from aipartnerupflow.core.execution.result_references import (
+    get_dependency_mode,
+    make_result_reference,
+    project_fields,
+)
 from aipartnerupflow.core.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,7 +23,9 @@ logger = get_logger(__name__)
 async def are_dependencies_satisfied(
     task: TaskModel,
     task_repository: TaskRepository,
-    tasks_to_reexecute: set[str]
+    tasks_to_reexecute: set[str],
+    tree_state: Optional[TaskTreeState] = None,
+    unsettled_reexecution: Optional[set[str]] = None
 ) -> bool:
     """
     Check if all dependencies for a task are satisfied
@@ -33,6 +41,11 @@ async def are_dependencies_satisfied(
         task: Task to check dependencies for
         task_repository: TaskRepository instance for querying tasks
         tasks_to_reexecute: Set of task IDs marked for re-execution
+        tree_state: Optional in-memory index of the running tree. When it covers all
+            dependencies, no database query is issued.
+        unsettled_reexecution: Optional set of task IDs marked for incremental
+            re-execution that have not been re-executed (or kept) yet. A required
+            dependency in this set is not satisfied, even if it is completed.
         
     Returns:
         True if all dependencies are satisfied, False otherwise
@@ -42,9 +55,9 @@ async def are_dependencies_satisfied(
         logger.info(f"🔍 [DEBUG] No dependencies for task {task.id}, ready to execute")
         return True
     
-    # Get all completed tasks by id in the same task tree using repository
-    completed_tasks_by_id = await get_completed_tasks_by_id(task, task_repository)
-    logger.info(f"🔍 [DEBUG] Available tasks for {task.id}: {list(completed_tasks_by_id.keys())}")
+    # Get all completed tasks by id in the same task tree (index first, repository as fallback)
+    completed_tasks_by_id = await _get_completed_dependency_tasks(task, task_repository, tree_state)
+    logger.debug(f"🔍 [DEBUG] {len(completed_tasks_by_id)} completed tasks available for {task.id}")
     
     # Check each dependency
     for dep in task_dependencies:
@@ -54,8 +67,11 @@ async def are_dependencies_satisfied(
             
             logger.info(f"🔍 [DEBUG] Checking dependency {dep_id} (required: {dep_required}) for task {task.id}")
             
-            if dep_required and dep_id not in completed_tasks_by_id:
-                logger.info(f"❌ Task {task.id} dependency {dep_id} not satisfied (not found in tasks: {list(completed_tasks_by_id.keys())})")
+            if dep_required and unsettled_reexecution and dep_id in unsettled_reexecution:
+                logger.info(f"❌ Task {task.id} dependency {dep_id} not satisfied (waiting for its re-execution)")
+                return False
+            elif dep_required and dep_id not in completed_tasks_by_id:
+                logger.info(f"❌ Task {task.id} dependency {dep_id} not satisfied (not found in completed tasks)")
                 return False
             elif dep_required and dep_id in completed_tasks_by_id:
                 # Check if the dependency task is actually completed
@@ -79,6 +95,9 @@ async def are_dependencies_satisfied(
         elif isinstance(dep, str):
             # Simple string dependency (just the id) - backward compatibility
             dep_id = dep
+            if unsettled_reexecution and dep_id in unsettled_reexecution:
+                logger.info(f"❌ Task {task.id} dependency {dep_id} not satisfied (waiting for its re-execution)")
+                return False
             if dep_id not in completed_tasks_by_id:
                 logger.info(f"❌ Task {task.id} dependency {dep_id} not satisfied")
                 return False
@@ -104,14 +123,21 @@ async def are_dependencies_satisfied(
 
 async def resolve_task_dependencies(
     task: TaskModel,
-    task_repository: TaskRepository
+    task_repository: TaskRepository,
+    tree_state: Optional[TaskTreeState] = None
 ) -> Dict[str, Any]:
     """
     Resolve task dependencies by merging results from dependency tasks
     
+    A dependency with "fields" only passes those fields of its result. A dependency in
+    "reference" mode (its own "mode", or the configured default) passes references to
+    its result instead of the result itself; see core/execution/result_references.py.
+    
     Args:
         task: Task to resolve dependencies for
         task_repository: TaskRepository instance for querying tasks
+        tree_state: Optional in-memory index of the running tree. When it covers all
+            dependencies, no database query is issued.
         
     Returns:
         Resolved input data dictionary
@@ -124,11 +150,11 @@ async def resolve_task_dependencies(
         logger.debug(f"No dependencies found for task {task.id}")
         return inputs
     
-    # Get all completed tasks by id in the same task tree
-    completed_tasks_by_id = await get_completed_tasks_by_id(task, task_repository)
+    # Get all completed tasks by id in the same task tree (index first, repository as fallback)
+    completed_tasks_by_id = await _get_completed_dependency_tasks(task, task_repository, tree_state)
     
     logger.info(f"🔍 [Dependency Resolution] Task {task.id} (name: {task.name}) has dependencies: {task_dependencies}")
-    logger.info(f"🔍 [Dependency Resolution] Available completed tasks: {list(completed_tasks_by_id.keys())}")
+    logger.debug(f"🔍 [Dependency Resolution] {len(completed_tasks_by_id)} completed tasks available")
     logger.info(f"🔍 [Dependency Resolution] Initial inputs: {inputs}")
     
     # Resolve dependencies based on id
@@ -137,13 +163,15 @@ async def resolve_task_dependencies(
             dep_id = dep.get("id")  # This is the task id of the dependency
             dep_type = dep.get("type", "result")
             dep_required = dep.get("required", True)
+            dep_fields = dep.get("fields")
+            by_reference = get_dependency_mode(dep) == "reference"
             
             logger.info(f"🔍 [Dependency Resolution] Processing dependency: {dep_id} (type: {dep_type}, required: {dep_required})")
             
             if dep_id in completed_tasks_by_id:
-                # Found the dependency task, get its result
+                # Found the dependency task, get its result (projected to the requested fields)
                 source_task = completed_tasks_by_id[dep_id]
-                source_result = source_task.result
+                source_result = project_fields(source_task.result, dep_fields)
                 
                 logger.info(f"🔍 [Dependency Resolution] Found dependency {dep_id} in task {source_task.id}")
                 
@@ -152,8 +180,10 @@ async def resolve_task_dependencies(
                     if isinstance(source_result, dict):
                         # Check if the result is nested in a 'result' field
                         actual_result = source_result
+                        result_path = []
                         if "result" in source_result and isinstance(source_result["result"], dict):
                             actual_result = source_result["result"]
+                            result_path = ["result"]
                             logger.info(f"🔍 [Dependency Resolution] Using nested result from {dep_id}: {actual_result}")
                         else:
                             # Direct result structure
@@ -176,7 +206,12 @@ async def resolve_task_dependencies(
                             
                             for field_name, field_schema in schema_properties.items():
                                 if field_name in actual_result:
-                                    inputs[field_name] = actual_result[field_name]
+                                    if by_reference:
+                                        inputs[field_name] = make_result_reference(
+                                            dep_id, dep_fields, result_path + [field_name]
+                                        )
+                                    else:
+                                        inputs[field_name] = actual_result[field_name]
                                     mapped_count += 1
                                     logger.info(f"✅ Mapped {field_name} from {dep_id} result: {actual_result[field_name]}")
                             
@@ -184,11 +219,11 @@ async def resolve_task_dependencies(
                             logger.info(f"🔍 [Dependency Resolution] Final inputs after mapping: {inputs}")
                         else:
                             # No input schema or properties found, use the result as-is
-                            inputs[dep_id] = source_result
+                            inputs[dep_id] = make_result_reference(dep_id, dep_fields) if by_reference else source_result
                             logger.debug(f"✅ Resolved dependency {dep_id} with result from task {source_task.id} (no schema mapping)")
                     else:
                         # For non-dict results, use the result as-is
-                        inputs[dep_id] = source_result
+                        inputs[dep_id] = make_result_reference(dep_id) if by_reference else source_result
                         logger.debug(f"✅ Resolved dependency {dep_id} with result from task {source_task.id}")
                 else:
                     logger.warning(f"⚠️ Task {source_task.id} completed but has no result for dependency {dep_id}")
@@ -203,16 +238,48 @@ async def resolve_task_dependencies(
             dep_id = dep
             if dep_id in completed_tasks_by_id:
                 source_task = completed_tasks_by_id[dep_id]
+                by_reference = get_dependency_mode(dep) == "reference"
                 if source_task.result:
                     if isinstance(source_task.result, dict):
-                        inputs.update(source_task.result)
+                        if by_reference:
+                            inputs.update({
+                                key: make_result_reference(dep_id, path=[key]) for key in source_task.result
+                            })
+                        else:
+                            inputs.update(source_task.result)
                     else:
-                        inputs[dep_id] = source_task.result
+                        inputs[dep_id] = make_result_reference(dep_id) if by_reference else source_task.result
     
     logger.info(f"🔍 [Dependency Resolution] Final resolved inputs for task {task.id}: {inputs}")
     return inputs
 
 
+async def _get_completed_dependency_tasks(
+    task: TaskModel,
+    task_repository: TaskRepository,
+    tree_state: Optional[TaskTreeState]
+) -> Dict[str, Any]:
+    """
+    Get completed tasks for dependency checks, preferring the in-memory tree index
+    
+    The index is only used when every dependency of the task is part of the indexed
+    tree; otherwise the whole tree is loaded through the repository as before.
+    
+    Args:
+        task: Task whose dependencies are being checked
+        task_repository: TaskRepository instance for the fallback query
+        tree_state: Optional in-memory index of the running tree
+        
+    Returns:
+        Dictionary mapping task ids to completed tasks (TaskModel or TaskStateEntry)
+    """
+    if tree_state is not None:
+        dependency_ids = [get_dependency_id(dep) for dep in (task.dependencies or [])]
+        if tree_state.has_tasks([dep_id for dep_id in dependency_ids if dep_id]):
+            return tree_state.get_completed_tasks_by_id()
+    return await get_completed_tasks_by_id(task, task_repository)
+
+
 async def get_completed_tasks_by_id(
     task: TaskModel,
     task_repository: TaskRepository
@@ -0,0 +1,346 @@
+"""
+Executor duration statistics
+
+TaskManager records how long every executor call takes (cache hits, demo results
+and failed calls excluded) in a per-executor histogram with logarithmic buckets.
+The histograms give p50/p95/p99 estimates per executor id and are used by the
+ready-queue scheduler to start the tasks on the critical path of a tree first
+(see get_critical_path_lengths() and ReadyQueueScheduler).
+
+Statistics are kept in memory per process and persisted in the ExecutorStatsModel
+table: TaskManager loads the table before the first tree it schedules and adds the
+durations recorded since the last flush when a tree finishes. Both use a separate
+short-lived session, so the TaskManager's session is never committed or rolled
+back for them. The system API exposes them as system.executor_stats.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from aipartnerupflow.core.storage.factory import open_separate_session
+from aipartnerupflow.core.storage.sqlalchemy.models import ExecutorStatsModel
+from aipartnerupflow.core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds (seconds) of the histogram buckets: 10ms doubling up to ~23 hours;
+# longer durations fall into an overflow bucket
+DURATION_BUCKETS: List[float] = [0.01 * 2 ** i for i in range(24)]
+
+
+class DurationHistogram:
+    """Histogram of execution durations with logarithmic buckets"""
+
+    def __init__(self, buckets: Optional[List[int]] = None, count: int = 0, total_seconds: float = 0.0):
+        self.buckets = list(buckets) if buckets else [0] * (len(DURATION_BUCKETS) + 1)
+        if len(self.buckets) != len(DURATION_BUCKETS) + 1:
+            raise ValueError(
+                f"Expected {len(DURATION_BUCKETS) + 1} duration buckets, got {len(self.buckets)}"
+            )
+        self.count = count
+        self.total_seconds = total_seconds
+
+    def record(self, seconds: float) -> None:
+        """Add one duration"""
+        seconds = max(0.0, float(seconds))
+        index = len(DURATION_BUCKETS)
+        for position, upper_bound in enumerate(DURATION_BUCKETS):
+            if seconds <= upper_bound:
+                index = position
+                break
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_seconds += seconds
+
+    def merge(self, other: "DurationHistogram") -> None:
+        """Add the counts of another histogram"""
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.total_seconds += other.total_seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate a percentile, interpolating linearly inside its bucket
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Duration in seconds, or None if nothing was recorded
+        """
+        if self.count == 0:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = DURATION_BUCKETS[index - 1] if index > 0 else 0.0
+                if index == len(DURATION_BUCKETS):
+                    return lower
+                upper = DURATION_BUCKETS[index]
+                return lower + (upper - lower) * max(0.0, rank - seen) / bucket_count
+            seen += bucket_count
+        return DURATION_BUCKETS[-1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary with count, mean and p50/p95/p99 in seconds"""
+        return {
+            "count": self.count,
+            "mean": self.total_seconds / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class ExecutorStatsStore:
+    """
+    Process-wide executor duration statistics
+
+    Keeps the merged histograms (loaded rows plus local recordings) and, separately,
+    the recordings not yet written to the database.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[str, DurationHistogram] = {}
+        self._unflushed: Dict[str, DurationHistogram] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def record(self, executor_id: str, seconds: float) -> None:
+        """
+        Record the duration of one executor call
+
+        Args:
+            executor_id: Executor ID
+            seconds: Duration in seconds
+        """
+        with self._lock:
+            for histograms in (self._histograms, self._unflushed):
+                histograms.setdefault(executor_id, DurationHistogram()).record(seconds)
+
+    def get_expected_duration(self, executor_id: Optional[str]) -> Optional[float]:
+        """
+        Get the median duration of an executor
+
+        Args:
+            executor_id: Executor ID
+
+        Returns:
+            p50 in seconds, or None if no duration was recorded
+        """
+        histogram = self._histograms.get(executor_id) if executor_id else None
+        return histogram.percentile(50) if histogram is not None else None
+
+    def get_stats(self, executor_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get duration summaries
+
+        Args:
+            executor_id: Only return this executor (default: all)
+
+        Returns:
+            Dictionary of executor ID -> {count, mean, p50, p95, p99}
+        """
+        with self._lock:
+            return {
+                stats_executor_id: histogram.to_dict()
+                for stats_executor_id, histogram in sorted(self._histograms.items())
+                if executor_id is None or stats_executor_id == executor_id
+            }
+
+    @staticmethod
+    async def _execute(db: Union[Session, AsyncSession], stmt: Any) -> Any:
+        if isinstance(db, AsyncSession):
+            return await db.execute(stmt)
+        return db.execute(stmt)
+
+    @staticmethod
+    async def _commit(db: Union[Session, AsyncSession]) -> None:
+        if isinstance(db, AsyncSession):
+            await db.commit()
+        else:
+            db.commit()
+
+    @staticmethod
+    async def _rollback(db: Union[Session, AsyncSession]) -> None:
+        if isinstance(db, AsyncSession):
+            await db.rollback()
+        else:
+            db.rollback()
+
+    async def load(self, db: Union[Session, AsyncSession], force: bool = False) -> None:
+        """
+        Load the persisted histograms (once per process unless forced)
+
+        Recordings not flushed yet are kept on top of the loaded values.
+
+        Args:
+            db: Database session (only its engine is used)
+            force: Reload even if the table was already loaded
+        """
+        if self._loaded and not force:
+            return
+        table = ExecutorStatsModel.__table__
+        stmt = select(table.c.executor_id, table.c.count, table.c.total_seconds, table.c.buckets)
+        async with open_separate_session(db) as session:
+            try:
+                rows = (await self._execute(session, stmt)).all()
+            except Exception:
+                await self._rollback(session)
+                raise
+
+        histograms: Dict[str, DurationHistogram] = {}
+        for row in rows:
+            try:
+                histograms[row.executor_id] = DurationHistogram(row.buckets, row.count or 0, row.total_seconds or 0.0)
+            except ValueError as e:
+                logger.warning(f"Ignoring duration statistics of executor {row.executor_id}: {e}")
+        with self._lock:
+            for executor_id, histogram in self._unflushed.items():
+                histograms.setdefault(executor_id, DurationHistogram()).merge(histogram)
+            self._histograms = histograms
+            self._loaded = True
+
+    async def flush(self, db: Union[Session, AsyncSession]) -> int:
+        """
+        Add the recordings made since the last flush to the persisted histograms
+
+        Writes go through a separate session on the engine of db, so the caller's
+        transaction is neither committed nor rolled back. Count and total are
+        incremented in SQL; the buckets are merged with the row locked (PostgreSQL),
+        and DuckDB and SQLite reject a concurrent write, so workers flushing the
+        same executor never overwrite each other.
+
+        Args:
+            db: Database session (only its engine is used)
+
+        Returns:
+            Number of executors written
+        """
+        with self._lock:
+            unflushed, self._unflushed = self._unflushed, {}
+        if not unflushed:
+            return 0
+
+        try:
+            async with open_separate_session(db) as session:
+                try:
+                    for executor_id, histogram in unflushed.items():
+                        await self._add_to_row(session, executor_id, histogram)
+                    await self._commit(session)
+                except Exception:
+                    await self._rollback(session)
+                    raise
+        except Exception:
+            # Keep the recordings for the next flush
+            with self._lock:
+                for executor_id, histogram in unflushed.items():
+                    self._unflushed.setdefault(executor_id, DurationHistogram()).merge(histogram)
+            raise
+        return len(unflushed)
+
+    async def _add_to_row(
+        self,
+        db: Union[Session, AsyncSession],
+        executor_id: str,
+        histogram: DurationHistogram,
+    ) -> None:
+        """Add a histogram to the stored row of an executor, creating the row if missing"""
+        table = ExecutorStatsModel.__table__
+        dialect_name = (db.bind if isinstance(db, AsyncSession) else db.get_bind()).dialect.name
+        empty = {"executor_id": executor_id, "count": 0, "total_seconds": 0.0, "buckets": DurationHistogram().buckets}
+        if dialect_name in ("postgresql", "duckdb"):
+            await self._execute(db, postgresql.insert(table).values(**empty).on_conflict_do_nothing())
+        elif dialect_name == "sqlite":
+            await self._execute(db, sqlite.insert(table).values(**empty).on_conflict_do_nothing())
+
+        stmt = select(table.c.buckets).where(table.c.executor_id == executor_id)
+        if dialect_name == "postgresql":
+            stmt = stmt.with_for_update()
+        row = (await self._execute(db, stmt)).first()
+        if row is None:
+            # Dialects without ON CONFLICT; a concurrent insert fails this flush
+            await self._execute(db, table.insert().values(
+                executor_id=executor_id,
+                count=histogram.count,
+                total_seconds=histogram.total_seconds,
+                buckets=histogram.buckets,
+            ))
+            return
+        stored = DurationHistogram(row.buckets)
+        stored.merge(histogram)
+        await self._execute(db, update(table).where(table.c.executor_id == executor_id).values(
+            count=func.coalesce(table.c.count, 0) + histogram.count,
+            total_seconds=func.coalesce(table.c.total_seconds, 0.0) + histogram.total_seconds,
+            buckets=stored.buckets,
+        ))
+
+    def clear(self) -> None:
+        """Drop all in-memory statistics (useful for testing)"""
+        with self._lock:
+            self._histograms = {}
+            self._unflushed = {}
+            self._loaded = False
+
+
+_executor_stats = ExecutorStatsStore()
+
+
+def get_executor_stats() -> ExecutorStatsStore:
+    """
+    Get the process-wide ExecutorStatsStore instance
+
+    Returns:
+        ExecutorStatsStore singleton
+    """
+    return _executor_stats
+
+
+def get_critical_path_lengths(
+    durations: Dict[str, float],
+    successors: Dict[str, List[str]],
+) -> Dict[str, float]:
+    """
+    Compute the expected longest remaining path from every task
+
+    The length of a task is its own expected duration plus the longest length of
+    the tasks that wait for it. Tasks on a dependency cycle only count themselves.
+
+    Args:
+        durations: Task ID -> expected duration in seconds
+        successors: Task ID -> IDs of the tasks that wait for it
+
+    Returns:
+        Task ID -> expected seconds until the end of its longest path
+    """
+    in_degree = {task_id: 0 for task_id in durations}
+    for task_id, targets in successors.items():
+        for target_id in targets:
+            in_degree[target_id] += 1
+    order = [task_id for task_id, degree in in_degree.items() if degree == 0]
+    for task_id in order:
+        for target_id in successors.get(task_id, []):
+            in_degree[target_id] -= 1
+            if in_degree[target_id] == 0:
+                order.append(target_id)
+
+    lengths = {task_id: durations[task_id] for task_id in durations}
+    for task_id in reversed(order):
+        longest_successor = max((lengths[target_id] for target_id in successors.get(task_id, [])), default=0.0)
+        lengths[task_id] = durations[task_id] + longest_successor
+    return lengths
+
+
+__all__ = [
+    "DURATION_BUCKETS",
+    "DurationHistogram",
+    "ExecutorStatsStore",
+    "get_executor_stats",
+    "get_critical_path_lengths",
+]
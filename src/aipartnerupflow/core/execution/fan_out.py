@@ -0,0 +1,226 @@
+"""
+Runtime fan-out of child tasks
+
+Some executors only know how many subtasks they need once they run (e.g. map_executor,
+which creates one child task per item of a list). Such executors declare
+`spawns_children = True`; TaskManager then hands them a ChildTaskRunner bound to the
+running task as `executor.child_task_runner`, so the executor itself never touches
+the database.
+
+ChildTaskRunner.run() creates a batch of child tasks under the running task (one
+batched insert), executes them through the regular TaskManager path (hooks,
+streaming events, retries, concurrency lanes) with bounded concurrency and returns
+the finished tasks. The parent's concurrency slots are released while its children
+run, so children of the same user or executor never wait for their own parent.
+Batches are dropped from the in-memory tree index once returned, so a parent
+spawning many batches only keeps one batch of results in memory.
+
+Spawned children are tagged with schemas.spawned_by. When the parent runs again,
+the children of its previous run are deleted before new ones are created, and they
+are left out of tree execution (prune_spawned_children()) so that re-running a tree
+does not execute them on their own.
+"""
+
+import asyncio
+import uuid
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+from aipartnerupflow.core.types import TaskTreeNode
+from aipartnerupflow.core.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from aipartnerupflow.core.execution.task_manager import TaskManager
+
+logger = get_logger(__name__)
+
+# schemas key marking a child task created at runtime; the value is the parent task id
+SPAWNED_BY_KEY = "spawned_by"
+
+
+def is_spawned_child(task: TaskModel) -> bool:
+    """Check whether a task was created at runtime by its parent's executor"""
+    schemas = getattr(task, "schemas", None)
+    return isinstance(schemas, dict) and bool(schemas.get(SPAWNED_BY_KEY))
+
+
+def prune_spawned_children(task_tree: TaskTreeNode) -> int:
+    """
+    Remove spawned children from a task tree (in place)
+
+    They belong to a previous run of their parent, which replaces them when it runs again.
+
+    Args:
+        task_tree: Root TaskTreeNode
+
+    Returns:
+        Number of removed nodes (their own subtrees included)
+    """
+    removed = 0
+    stack = [task_tree]
+    while stack:
+        node = stack.pop()
+        kept = []
+        for child in node.children:
+            if is_spawned_child(child.task):
+                removed += 1 + _count_descendants(child)
+            else:
+                kept.append(child)
+        node.children = kept
+        stack.extend(kept)
+    if removed:
+        logger.debug(f"Left {removed} previously spawned tasks out of tree {task_tree.task.id}")
+    return removed
+
+
+def _count_descendants(node: TaskTreeNode) -> int:
+    count = 0
+    stack = list(node.children)
+    while stack:
+        child = stack.pop()
+        count += 1
+        stack.extend(child.children)
+    return count
+
+
+class ChildTaskRunner:
+    """
+    Creates and executes child tasks of a running task
+
+    Bound to one parent task; created by TaskManager for executors that declare
+    `spawns_children = True`.
+    """
+
+    def __init__(self, task_manager: "TaskManager", parent_task: TaskModel):
+        """
+        Initialize runner
+
+        Args:
+            task_manager: TaskManager executing the parent task
+            parent_task: Task whose executor spawns the children
+        """
+        self.task_manager = task_manager
+        self.parent_id = str(parent_task.id)
+        self.root_id = str(getattr(parent_task, "root_id", None) or parent_task.id)
+        self.user_id = parent_task.user_id
+        self.priority = parent_task.priority
+        self.spawned_count = 0
+        self._prepared = False
+
+    async def run(self, children: List[Dict[str, Any]], max_concurrency: int = 10) -> List[TaskModel]:
+        """
+        Create child tasks and execute them
+
+        Args:
+            children: Child task definitions with optional keys name, inputs, params,
+                schemas, priority and user_id (defaults come from the parent)
+            max_concurrency: Maximum number of children executing at the same time
+
+        Returns:
+            Finished child tasks, in the order of `children`
+        """
+        if not children:
+            return []
+        if not self._prepared:
+            await self._prepare()
+
+        repository = self.task_manager.task_repository
+        tasks = [self._build_child(child) for child in children]
+        self.spawned_count += len(tasks)
+        await repository.save_task_trees([TaskTreeNode(task) for task in tasks], check_existing=False)
+
+        tree_state = self.task_manager._tree_state
+        if tree_state is not None:
+            for task in tasks:
+                tree_state.add_task(task)
+
+        semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+
+        async def execute(task: TaskModel) -> Optional[TaskModel]:
+            async with semaphore:
+                return await self._execute_child(task)
+
+        # The children need the slots the parent holds (same user, possibly same executor)
+        lease = self.task_manager._concurrency_leases.get(self.parent_id)
+        if lease is not None:
+            lease.release()
+        try:
+            finished = await asyncio.gather(*(execute(task) for task in tasks))
+        finally:
+            self._forget(tasks)
+            if lease is not None:
+                await lease.reacquire()
+        return [finished_task or task for finished_task, task in zip(finished, tasks)]
+
+    async def _prepare(self) -> None:
+        """Delete children spawned by a previous run and mark the parent as having children"""
+        repository = self.task_manager.task_repository
+        previous = [
+            str(child.id)
+            for child in await repository.get_child_tasks_by_parent_id(self.parent_id)
+            if is_spawned_child(child)
+        ]
+        if previous:
+            await repository.delete_tasks(previous)
+            if self.task_manager._tree_state is not None:
+                for task_id in previous:
+                    self.task_manager._tree_state.remove_task(task_id)
+            logger.info(f"Deleted {len(previous)} children spawned by a previous run of task {self.parent_id}")
+
+        parent = await repository.get_task_by_id(self.parent_id)
+        if parent is not None and not parent.has_children:
+            # Committed together with the first batch of children
+            parent.has_children = True
+        self._prepared = True
+
+    def _build_child(self, child: Dict[str, Any]) -> TaskModel:
+        schemas = dict(child.get("schemas") or {})
+        schemas[SPAWNED_BY_KEY] = self.parent_id
+        return self.task_manager.task_repository.task_model_class(
+            id=str(uuid.uuid4()),
+            parent_id=self.parent_id,
+            root_id=self.root_id,
+            user_id=child.get("user_id", self.user_id),
+            name=str(child.get("name") or f"Child {self.spawned_count + 1} of {self.parent_id}"),
+            status="pending",
+            priority=child.get("priority", self.priority),
+            dependencies=[],
+            inputs=child.get("inputs") or {},
+            params=child.get("params") or {},
+            schemas=schemas,
+            progress=0.0,
+            has_children=False,
+            has_copy=False,
+            version=1,
+        )
+
+    async def _execute_child(self, task: TaskModel) -> Optional[TaskModel]:
+        """Execute one child, waiting out its retry delays (ready-queue mode hands them back)"""
+        task_manager = self.task_manager
+        task_id = str(task.id)
+        while True:
+            await task_manager._execute_single_task(task, use_callback=True)
+            delay = task_manager._retry_delays.pop(task_id, None)
+            if delay is None or not await task_manager._wait_for_retry(task_id, delay):
+                break
+            task = await task_manager.task_repository.get_task_by_id(task_id)
+            if task is None:
+                break
+        return await task_manager.task_repository.get_task_by_id(task_id)
+
+    def _forget(self, tasks: List[TaskModel]) -> None:
+        """Drop a finished batch from the in-memory execution state"""
+        tree_state = self.task_manager._tree_state
+        for task in tasks:
+            task_id = str(task.id)
+            if tree_state is not None:
+                tree_state.remove_task(task_id)
+            self.task_manager._retry_attempts.pop(task_id, None)
+
+
+__all__ = [
+    "ChildTaskRunner",
+    "SPAWNED_BY_KEY",
+    "is_spawned_child",
+    "prune_spawned_children",
+]
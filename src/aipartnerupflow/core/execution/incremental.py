@@ -0,0 +1,166 @@
+"""
+Incremental re-execution of task trees (make-style early cutoff)
+
+Every completed task stores an input fingerprint: a hash of its schemas, params,
+inputs and the result hashes of its dependencies at the time it ran. When a tree is
+re-executed with incremental re-execution enabled (set_incremental_reexecution() or
+AIPARTNERUPFLOW_INCREMENTAL_REEXECUTION=true):
+
+1. Failed tasks, and completed tasks whose fingerprint no longer matches, are dirty
+2. Completed tasks downstream of a dirty (or pending) task are scheduled as
+   candidates, together with the ancestors needed to reach them in the tree
+3. When a candidate's turn comes, its fingerprint is recomputed from the current
+   dependency results. It only runs if something changed; a re-executed task whose
+   result hash is unchanged therefore cuts off re-execution of its dependents
+
+Re-executing a 300-task tree where one leaf failed runs that leaf (and only the
+dependents whose inputs its new result changes). Tasks completed without a stored
+fingerprint (e.g. before upgrading) are treated as changed once.
+"""
+
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+
+from aipartnerupflow.core.execution.result_cache import make_cache_key
+from aipartnerupflow.core.execution.tree_state import get_dependency_id
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+from aipartnerupflow.core.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from aipartnerupflow.core.types import TaskTreeNode
+
+logger = get_logger(__name__)
+
+
+def compute_result_hash(result: Any) -> Optional[str]:
+    """
+    Hash a task result (dictionary key order does not matter)
+
+    Returns:
+        SHA-256 hex digest, or None if there is no result
+    """
+    if result is None:
+        return None
+    return make_cache_key("result", None, {"result": result})
+
+
+def compute_input_fingerprint(task: TaskModel, dependency_results: Dict[str, Any]) -> str:
+    """
+    Compute the input fingerprint of a task
+
+    Args:
+        task: Task (schemas, params and inputs are read)
+        dependency_results: Current result of each dependency, keyed by dependency id
+
+    Returns:
+        SHA-256 hex digest
+    """
+    dependency_hashes = {}
+    for dependency in task.dependencies or []:
+        dependency_id = get_dependency_id(dependency)
+        if dependency_id:
+            dependency_hashes[dependency_id] = compute_result_hash(dependency_results.get(dependency_id))
+    return make_cache_key(
+        "task",
+        task.params,
+        {"schemas": task.schemas, "inputs": task.inputs, "dependencies": dependency_hashes},
+    )
+
+
+def get_dependency_ids(task: TaskModel) -> List[str]:
+    """Get the ids of the dependencies of a task"""
+    dependency_ids = []
+    for dependency in task.dependencies or []:
+        dependency_id = get_dependency_id(dependency)
+        if dependency_id:
+            dependency_ids.append(dependency_id)
+    return dependency_ids
+
+
+def is_task_up_to_date(task: TaskModel, dependency_results: Dict[str, Any]) -> bool:
+    """
+    Check whether a completed task's stored result is still valid
+
+    Args:
+        task: Task to check
+        dependency_results: Current result of each dependency, keyed by dependency id
+
+    Returns:
+        True if the task is completed and its stored fingerprint matches
+    """
+    if task.status != "completed" or not task.input_fingerprint:
+        return False
+    return task.input_fingerprint == compute_input_fingerprint(task, dependency_results)
+
+
+def select_tasks_for_incremental_reexecution(task_tree: "TaskTreeNode") -> Set[str]:
+    """
+    Select the tasks of a tree that may need re-execution
+
+    Returns failed tasks, completed tasks whose fingerprint changed, completed tasks
+    downstream of those (or of pending tasks), and the completed ancestors of all of
+    them. Candidates whose inputs turn out unchanged when their dependencies settled
+    are skipped at execution time (see TaskManager).
+
+    Args:
+        task_tree: Root TaskTreeNode
+
+    Returns:
+        Set of task IDs to mark for re-execution
+    """
+    tasks: Dict[str, TaskModel] = {}
+    parents: Dict[str, Optional[str]] = {}
+    dependents: Dict[str, List[str]] = {}
+    stack: List[Any] = [(task_tree, None)]
+    while stack:
+        node, parent_id = stack.pop()
+        task_id = str(node.task.id)
+        tasks[task_id] = node.task
+        parents[task_id] = parent_id
+        for dependency_id in get_dependency_ids(node.task):
+            dependents.setdefault(dependency_id, []).append(task_id)
+        stack.extend((child, task_id) for child in node.children)
+
+    results = {task_id: task.result for task_id, task in tasks.items()}
+    sources: List[str] = []
+    for task_id, task in tasks.items():
+        if task.status == "failed":
+            sources.append(task_id)
+        elif task.status == "completed":
+            if not is_task_up_to_date(task, results):
+                sources.append(task_id)
+        elif task.status == "pending":
+            sources.append(task_id)
+
+    # Everything downstream of a task that will run may see a new dependency result
+    affected: Set[str] = set(sources)
+    queue = list(sources)
+    while queue:
+        for dependent_id in dependents.get(queue.pop(), ()):
+            if dependent_id in tasks and dependent_id not in affected:
+                affected.add(dependent_id)
+                queue.append(dependent_id)
+
+    # Ancestors must be scheduled so that tree traversal reaches their subtree
+    reachable = set(affected)
+    for task_id in affected:
+        parent_id = parents.get(task_id)
+        while parent_id is not None and parent_id not in reachable:
+            reachable.add(parent_id)
+            parent_id = parents.get(parent_id)
+
+    # Pending tasks execute without a re-execution marker
+    marked = {task_id for task_id in reachable if tasks[task_id].status in ("failed", "completed")}
+    logger.info(
+        f"Incremental re-execution: {len(sources)} changed, failed or pending tasks, "
+        f"{len(marked)} of {len(tasks)} tasks marked for re-execution"
+    )
+    return marked
+
+
+__all__ = [
+    "compute_result_hash",
+    "compute_input_fingerprint",
+    "get_dependency_ids",
+    "is_task_up_to_date",
+    "select_tasks_for_incremental_reexecution",
+]
@@ -0,0 +1,331 @@
+"""
+Execution lanes for CPU-bound executors
+
+By default TaskManager awaits executor.execute() on the event loop, so an executor
+that computes for seconds stalls every other tree, SSE stream and API request of the
+process. Executors can move their execute() off the loop with
+executor_register(execution_lane=...):
+
+- "event_loop": await on the event loop (default)
+- "thread": run in a bounded thread pool, each call in its own event loop. Suited to
+  blocking I/O and to CPU work in libraries that release the GIL. Pooled HTTP clients
+  the call created are closed before its loop ends (also in the process lane).
+- "process": run in a managed ProcessPoolExecutor, so pure Python CPU work uses more
+  than one core. The executor class is instantiated again in the worker process from
+  its params (without the task object); class, params, inputs and result must be
+  picklable.
+
+Cancellation: TaskManager.cancel_task() cancels the lane call. A queued call never
+starts; a running call sees its cancellation_checker return True (also inside worker
+processes) and TaskManager stops waiting for it immediately.
+
+Pool sizes: set_lane_workers() or AIPARTNERUPFLOW_THREAD_LANE_WORKERS /
+AIPARTNERUPFLOW_PROCESS_LANE_WORKERS. Queue depth and counters of each lane are
+available from ExecutionLanes.get_metrics() (also reported by system.health).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from aipartnerupflow.core.config import get_lane_workers
+from aipartnerupflow.core.extensions import get_registry
+from aipartnerupflow.core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EVENT_LOOP_LANE = "event_loop"
+THREAD_LANE = "thread"
+PROCESS_LANE = "process"
+
+
+class LaneCancelledError(Exception):
+    """Raised when a lane call was cancelled through ExecutionLanes.cancel()"""
+
+
+def get_execution_lane(executor_id: Optional[str]) -> str:
+    """
+    Get the execution lane declared by an executor
+
+    Args:
+        executor_id: Executor ID
+
+    Returns:
+        "event_loop", "thread" or "process"
+    """
+    if not executor_id:
+        return EVENT_LOOP_LANE
+    return get_registry().get_executor_options(executor_id).get("execution_lane", EVENT_LOOP_LANE)
+
+
+async def _close_loop_resources() -> None:
+    """Close the pooled HTTP clients bound to the running event loop, which ends with the call"""
+    try:
+        from aipartnerupflow.extensions.http.client_pool import close_http_clients
+    except ImportError:
+        # httpx not installed: no pooled clients
+        return
+    await close_http_clients()
+
+
+async def _execute_in_own_loop(executor: Any, inputs: Dict[str, Any]) -> Any:
+    """Run executor.execute() and release what it bound to this call's event loop"""
+    try:
+        return await executor.execute(inputs)
+    finally:
+        await _close_loop_resources()
+
+
+def _run_executor(executor: Any, inputs: Dict[str, Any]) -> Any:
+    """Run executor.execute() to completion in a new event loop (thread lane)"""
+    return asyncio.run(_execute_in_own_loop(executor, inputs))
+
+
+def _run_executor_in_process(
+    executor_class: Type[Any],
+    init_kwargs: Dict[str, Any],
+    inputs: Dict[str, Any],
+    cancel_event: Any,
+) -> Any:
+    """Instantiate the executor in the worker process and run it (process lane)"""
+    kwargs = dict(init_kwargs)
+    if cancel_event is not None:
+        kwargs["cancellation_checker"] = cancel_event.is_set
+    try:
+        executor = executor_class(inputs=inputs, **kwargs)
+    except TypeError:
+        executor = executor_class(**{**inputs, **kwargs})
+    return asyncio.run(_execute_in_own_loop(executor, inputs))
+
+
+class _LaneCall:
+    """One submitted call: its pool future and cancellation state"""
+
+    def __init__(self, lane: str, cancel_event: Any):
+        self.lane = lane
+        self.cancel_event = cancel_event
+        self.future: Optional[asyncio.Future] = None
+        self.cancel_requested = False
+
+
+class _LaneStats:
+    """Counters of one lane"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+
+class ExecutionLanes:
+    """
+    Process-wide thread and process pools for executors that must not run on the event loop
+
+    Pools are created on first use with the sizes from get_lane_workers(). When the
+    configured size changes, the previous pool is shut down without waiting for calls
+    still running in it.
+    """
+
+    def __init__(self):
+        self._pools: Dict[str, Tuple[int, Executor]] = {}
+        self._manager: Any = None
+        self._calls: Dict[str, _LaneCall] = {}
+        self._stats: Dict[str, _LaneStats] = {THREAD_LANE: _LaneStats(), PROCESS_LANE: _LaneStats()}
+        self._lock = threading.Lock()
+
+    def _get_pool_size(self, lane: str) -> int:
+        config = get_lane_workers()
+        if lane == THREAD_LANE:
+            return config["thread_workers"]
+        return config["process_workers"] or os.cpu_count() or 1
+
+    def _get_pool(self, lane: str) -> Executor:
+        size = self._get_pool_size(lane)
+        with self._lock:
+            current = self._pools.get(lane)
+            if current is not None and current[0] == size:
+                return current[1]
+            if current is not None:
+                current[1].shutdown(wait=False)
+            if lane == THREAD_LANE:
+                pool: Executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="apflow-lane")
+            else:
+                pool = ProcessPoolExecutor(max_workers=size)
+            self._pools[lane] = (size, pool)
+            logger.info(f"Started {lane} execution lane with {size} workers")
+            return pool
+
+    def _create_cancel_event(self, lane: str) -> Any:
+        if lane == THREAD_LANE:
+            return threading.Event()
+        # Worker processes read the flag through a manager proxy (picklable)
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.Manager()
+            return self._manager.Event()
+
+    async def run(
+        self,
+        lane: str,
+        executor: Any,
+        inputs: Dict[str, Any],
+        task_id: Optional[str] = None,
+        init_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Run executor.execute(inputs) in a lane and wait for the result
+
+        Args:
+            lane: "thread" or "process"
+            executor: Executor instance created by TaskManager. The thread lane runs this
+                instance; the process lane creates a new instance of its class.
+            inputs: Execution inputs
+            task_id: Task ID, used by cancel()
+            init_kwargs: Executor initialization parameters (process lane)
+
+        Returns:
+            Executor result
+
+        Raises:
+            ValueError: If the call cannot be transferred to a worker process
+            LaneCancelledError: If the call was cancelled with cancel()
+        """
+        if lane not in (THREAD_LANE, PROCESS_LANE):
+            raise ValueError(f"Unknown execution lane '{lane}'")
+
+        if lane == PROCESS_LANE:
+            executor_class = type(executor)
+            init_kwargs = dict(init_kwargs or {})
+            try:
+                pickle.dumps((executor_class, init_kwargs, inputs))
+            except Exception as e:
+                raise ValueError(
+                    f"Executor {executor_class.__name__} cannot run in the process lane: "
+                    f"class, params and inputs must be picklable ({str(e)})"
+                ) from e
+
+        call = _LaneCall(lane, self._create_cancel_event(lane))
+        stats = self._stats[lane]
+        loop = asyncio.get_running_loop()
+        if lane == THREAD_LANE:
+            self._chain_cancellation_checker(executor, call.cancel_event)
+            call.future = loop.run_in_executor(self._get_pool(lane), _run_executor, executor, inputs)
+        else:
+            call.future = loop.run_in_executor(
+                self._get_pool(lane), _run_executor_in_process, executor_class, init_kwargs, inputs, call.cancel_event
+            )
+        stats.submitted += 1
+        stats.in_flight += 1
+        if task_id is not None:
+            self._calls[str(task_id)] = call
+
+        try:
+            result = await call.future
+            stats.completed += 1
+            return result
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            call.cancel_event.set()
+            if call.cancel_requested:
+                raise LaneCancelledError(f"Execution of task {task_id} in the {lane} lane was cancelled") from None
+            raise
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            if task_id is not None and self._calls.get(str(task_id)) is call:
+                del self._calls[str(task_id)]
+
+    @staticmethod
+    def _chain_cancellation_checker(executor: Any, cancel_event: threading.Event) -> None:
+        """Make the executor's cancellation_checker also report lane cancellation"""
+        if not hasattr(executor, "cancellation_checker"):
+            return
+        previous: Optional[Callable[[], bool]] = executor.cancellation_checker
+
+        def cancellation_checker() -> bool:
+            return cancel_event.is_set() or bool(previous and previous())
+
+        executor.cancellation_checker = cancellation_checker
+
+    def cancel(self, task_id: str) -> bool:
+        """
+        Cancel the lane call of a task
+
+        Args:
+            task_id: Task ID passed to run()
+
+        Returns:
+            True if a call was found and cancelled
+        """
+        call = self._calls.get(str(task_id))
+        if call is None or call.future is None:
+            return False
+        call.cancel_requested = True
+        call.cancel_event.set()
+        call.future.cancel()
+        logger.info(f"Cancelled {call.lane} lane execution of task {task_id}")
+        return True
+
+    def get_metrics(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-lane metrics
+
+        Returns:
+            {lane: {"workers", "queued", "running", "submitted", "completed", "failed", "cancelled"}}
+            "queued" counts calls in flight beyond the number of workers (queue depth).
+        """
+        metrics = {}
+        for lane, stats in self._stats.items():
+            workers = self._get_pool_size(lane)
+            metrics[lane] = {
+                "workers": workers,
+                "queued": max(0, stats.in_flight - workers),
+                "running": min(stats.in_flight, workers),
+                "submitted": stats.submitted,
+                "completed": stats.completed,
+                "failed": stats.failed,
+                "cancelled": stats.cancelled,
+            }
+        return metrics
+
+    def shutdown(self) -> None:
+        """Shut down the pools (new pools are created on next use)"""
+        with self._lock:
+            for _, pool in self._pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+            self._pools.clear()
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+
+
+_lanes = ExecutionLanes()
+
+
+def get_execution_lanes() -> ExecutionLanes:
+    """
+    Get the process-wide ExecutionLanes instance
+
+    Returns:
+        ExecutionLanes singleton
+    """
+    return _lanes
+
+
+__all__ = [
+    "ExecutionLanes",
+    "LaneCancelledError",
+    "get_execution_lane",
+    "get_execution_lanes",
+    "EVENT_LOOP_LANE",
+    "THREAD_LANE",
+    "PROCESS_LANE",
+]
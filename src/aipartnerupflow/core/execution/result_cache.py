@@ -0,0 +1,356 @@
+"""
+Content-addressed result cache for deterministic executors
+
+Executors declare that their results only depend on their params and inputs with
+executor_register(cacheable=True). When the cache is enabled (set_result_cache() or
+AIPARTNERUPFLOW_RESULT_CACHE=memory|database), TaskManager looks up the result of such
+an executor under a hash of (executor id, executor version, user id, params, resolved
+inputs) before calling it, so re-executed or copied trees skip unchanged work. Results
+are only reused for tasks of the same user.
+
+Cached results returned to tasks carry "cache_hit": True and the "cache_key".
+
+Backends:
+- InMemoryResultCache: per-process LRU with optional TTL (default)
+- DatabaseResultCache: TaskResultCacheModel table shared by all processes. Reads and
+  writes use their own short-lived session on the engine of the caller's session, so
+  they never commit or roll back the TaskManager's transaction
+- Custom: subclass ResultCacheBackend and pass an instance to set_result_cache()
+
+Environment variables:
+- AIPARTNERUPFLOW_RESULT_CACHE: "memory" or "database" enables the cache (default disabled)
+- AIPARTNERUPFLOW_RESULT_CACHE_TTL: seconds a result stays valid (default no expiry)
+"""
+
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple, Union
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from aipartnerupflow.core.config import get_result_cache
+from aipartnerupflow.core.extensions import get_registry
+from aipartnerupflow.core.storage.factory import open_separate_session
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskResultCacheModel
+from aipartnerupflow.core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def make_cache_key(
+    executor_id: str,
+    params: Optional[Dict[str, Any]],
+    inputs: Optional[Dict[str, Any]],
+    version: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> str:
+    """
+    Build a stable cache key for an executor call
+
+    Dictionary key order does not matter; values that are not JSON types are
+    included by their string representation.
+
+    Args:
+        executor_id: Executor ID
+        params: Executor initialization parameters
+        inputs: Resolved execution inputs (including dependency results)
+        version: Executor version (cache_version option)
+        user_id: Owner of the task; results are never shared between users
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = json.dumps(
+        {
+            "executor_id": executor_id,
+            "version": version,
+            "user_id": user_id,
+            "params": params or {},
+            "inputs": inputs or {},
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCacheBackend:
+    """
+    Base class of result cache backends
+
+    Backends receive the database session of the executing TaskManager; backends
+    that do not store results in the database ignore it.
+    """
+
+    async def get(self, key: str, db: Optional[Union[Session, AsyncSession]] = None) -> Optional[Any]:
+        """
+        Get a cached result
+
+        Returns:
+            Cached result, or None on a miss or when the entry expired
+        """
+        raise NotImplementedError
+
+    async def set(
+        self,
+        key: str,
+        result: Any,
+        executor_id: str,
+        ttl: Optional[float] = None,
+        db: Optional[Union[Session, AsyncSession]] = None,
+    ) -> None:
+        """
+        Store a result
+
+        Args:
+            key: Cache key (see make_cache_key())
+            result: Executor result (JSON-serializable)
+            executor_id: Executor ID
+            ttl: Seconds the result stays valid (None = no expiry)
+            db: Database session of the caller
+        """
+        raise NotImplementedError
+
+    async def clear(self, db: Optional[Union[Session, AsyncSession]] = None) -> None:
+        """Remove all cached results"""
+        raise NotImplementedError
+
+
+class InMemoryResultCache(ResultCacheBackend):
+    """
+    Per-process LRU cache with optional TTL
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize InMemoryResultCache
+
+        Args:
+            max_entries: Maximum number of results; the least recently used is evicted first
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.max_entries = max_entries
+        # key -> (expires_at monotonic time or None, result)
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    async def get(self, key: str, db: Optional[Union[Session, AsyncSession]] = None) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(result)
+
+    async def set(
+        self,
+        key: str,
+        result: Any,
+        executor_id: str,
+        ttl: Optional[float] = None,
+        db: Optional[Union[Session, AsyncSession]] = None,
+    ) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (expires_at, copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self, db: Optional[Union[Session, AsyncSession]] = None) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DatabaseResultCache(ResultCacheBackend):
+    """
+    Result cache stored in the TaskResultCacheModel table, shared by all processes
+
+    Entries are written with INSERT ... ON CONFLICT DO UPDATE (PostgreSQL, DuckDB,
+    SQLite), so two tasks storing the same key at the same time do not fail.
+    """
+
+    def __init__(self):
+        self.table = TaskResultCacheModel.__table__
+
+    @staticmethod
+    async def _execute(db: Union[Session, AsyncSession], stmt: Any) -> Any:
+        if isinstance(db, AsyncSession):
+            return await db.execute(stmt)
+        return db.execute(stmt)
+
+    @staticmethod
+    async def _commit(db: Union[Session, AsyncSession]) -> None:
+        if isinstance(db, AsyncSession):
+            await db.commit()
+        else:
+            db.commit()
+
+    @staticmethod
+    async def _rollback(db: Union[Session, AsyncSession]) -> None:
+        if isinstance(db, AsyncSession):
+            await db.rollback()
+        else:
+            db.rollback()
+
+    def _upsert(self, db: Union[Session, AsyncSession], values: Dict[str, Any]) -> Optional[Any]:
+        """Build an INSERT ... ON CONFLICT DO UPDATE for the dialect, None if unsupported"""
+        engine = db.bind if isinstance(db, AsyncSession) else db.get_bind()
+        dialect_name = engine.dialect.name
+        if dialect_name in ("postgresql", "duckdb"):
+            stmt = postgresql.insert(self.table).values(**values)
+        elif dialect_name == "sqlite":
+            stmt = sqlite.insert(self.table).values(**values)
+        else:
+            return None
+        return stmt.on_conflict_do_update(
+            index_elements=[self.table.c.cache_key],
+            set_={column: stmt.excluded[column] for column in values if column != "cache_key"},
+        )
+
+    async def get(self, key: str, db: Optional[Union[Session, AsyncSession]] = None) -> Optional[Any]:
+        if db is None:
+            return None
+        stmt = select(self.table.c.result).where(
+            self.table.c.cache_key == key,
+            or_(
+                self.table.c.expires_at.is_(None),
+                self.table.c.expires_at > datetime.now(timezone.utc),
+            ),
+        )
+        async with open_separate_session(db) as session:
+            result = await self._execute(session, stmt)
+            row = result.first()
+        return row[0] if row is not None else None
+
+    async def set(
+        self,
+        key: str,
+        result: Any,
+        executor_id: str,
+        ttl: Optional[float] = None,
+        db: Optional[Union[Session, AsyncSession]] = None,
+    ) -> None:
+        if db is None:
+            return
+        now = datetime.now(timezone.utc)
+        values = {
+            "cache_key": key,
+            "executor_id": executor_id,
+            "result": result,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=ttl) if ttl is not None else None,
+        }
+        async with open_separate_session(db) as session:
+            try:
+                upsert = self._upsert(session, values)
+                if upsert is not None:
+                    await self._execute(session, upsert)
+                else:
+                    # Replace an expired entry with the same key
+                    await self._execute(session, delete(self.table).where(self.table.c.cache_key == key))
+                    await self._execute(session, self.table.insert().values(**values))
+                await self._commit(session)
+            except IntegrityError:
+                # Written concurrently with the same key (dialects without upsert): keep that entry
+                await self._rollback(session)
+            except Exception:
+                await self._rollback(session)
+                raise
+
+    async def clear(self, db: Optional[Union[Session, AsyncSession]] = None) -> None:
+        if db is None:
+            return
+        async with open_separate_session(db) as session:
+            await self._execute(session, delete(self.table))
+            await self._commit(session)
+
+
+_backends: Dict[Tuple[str, int], ResultCacheBackend] = {}
+
+
+def get_result_cache_backend() -> Optional[ResultCacheBackend]:
+    """
+    Get the configured result cache backend
+
+    Returns:
+        ResultCacheBackend, or None if the result cache is disabled
+    """
+    config = get_result_cache()
+    if not config["enabled"]:
+        return None
+    backend = config["backend"]
+    if isinstance(backend, ResultCacheBackend):
+        return backend
+    cache_id = (backend, config["max_entries"])
+    if cache_id not in _backends:
+        if backend == "database":
+            _backends[cache_id] = DatabaseResultCache()
+        else:
+            _backends[cache_id] = InMemoryResultCache(max_entries=config["max_entries"])
+    return _backends[cache_id]
+
+
+def reset_result_cache_backends() -> None:
+    """Drop the built-in backend instances and their in-memory results (for tests)"""
+    _backends.clear()
+
+
+def get_cache_options(executor_id: str, inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Get the caching options of an executor call
+
+    Args:
+        executor_id: Executor ID
+        inputs: Resolved inputs (passed to a cacheable predicate)
+
+    Returns:
+        {"version": ..., "ttl": ...} if the call is cacheable, otherwise None
+    """
+    options = get_registry().get_executor_options(executor_id)
+    cacheable = options.get("cacheable", False)
+    if callable(cacheable):
+        try:
+            cacheable = cacheable(inputs)
+        except Exception as e:
+            logger.warning(f"cacheable check of executor {executor_id} failed: {str(e)}")
+            cacheable = False
+    if not cacheable:
+        return None
+    ttl = options.get("cache_ttl")
+    if ttl is None:
+        ttl = get_result_cache()["ttl"]
+    return {"version": options.get("cache_version"), "ttl": ttl}
+
+
+def is_cacheable_result(result: Any) -> bool:
+    """Only successful results are cached (no "error", no "success": False)"""
+    if isinstance(result, dict):
+        return "error" not in result and result.get("success", True) is not False
+    return result is not None
+
+
+__all__ = [
+    "make_cache_key",
+    "ResultCacheBackend",
+    "InMemoryResultCache",
+    "DatabaseResultCache",
+    "get_result_cache_backend",
+    "reset_result_cache_backends",
+    "get_cache_options",
+    "is_cacheable_result",
+]
@@ -0,0 +1,195 @@
+"""
+Dependency field projection and result references
+
+By default, dependency resolution copies the result of every dependency into the
+inputs of the dependent task, and TaskManager stores those inputs. Large results
+(LLM transcripts, scraped pages) are then stored once more per consumer.
+
+Two dependency options reduce that:
+
+- "fields": Only the listed fields of the dependency result are passed on. Dotted
+  names select nested fields and keep their nesting:
+  {"id": "fetch", "fields": ["status", "page.title"]} passes
+  {"status": ..., "page": {"title": ...}}
+- "mode": "reference": The stored inputs hold a small reference instead of the result,
+  {"$result_ref": {"task_id": "fetch", "fields": [...], "path": [...]}}. TaskManager
+  replaces references with the (projected) dependency results right before the
+  executor is called, in memory only, so the result is never written to the inputs.
+
+The default mode of dependencies without a "mode" is set with
+set_dependency_result_mode() (AIPARTNERUPFLOW_DEPENDENCY_RESULT_MODE), "copy" by default.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from aipartnerupflow.core.config import get_dependency_result_mode
+from aipartnerupflow.core.config.registry import DEPENDENCY_RESULT_MODES
+
+RESULT_REF_KEY = "$result_ref"
+
+# Dependency entry keys handled here, kept as-is when task trees are created
+DEPENDENCY_OPTION_KEYS = ("fields", "mode")
+
+
+def validate_dependency_options(dependency: Dict[str, Any]) -> None:
+    """
+    Validate the "fields" and "mode" options of a dependency entry
+
+    Args:
+        dependency: Dependency entry (dict form)
+
+    Raises:
+        ValueError: If an option is invalid
+    """
+    fields = dependency.get("fields")
+    if fields is not None:
+        if not isinstance(fields, list) or not fields or not all(
+            isinstance(field, str) and field.strip(".") for field in fields
+        ):
+            raise ValueError("Dependency 'fields' must be a non-empty list of field names")
+    mode = dependency.get("mode")
+    if mode is not None and mode not in DEPENDENCY_RESULT_MODES:
+        raise ValueError(f"Invalid dependency mode '{mode}'. Valid modes: {list(DEPENDENCY_RESULT_MODES)}")
+
+
+def get_dependency_options(dependency: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the "fields" and "mode" options set on a dependency entry"""
+    return {key: dependency[key] for key in DEPENDENCY_OPTION_KEYS if dependency.get(key) is not None}
+
+
+def get_dependency_mode(dependency: Any) -> str:
+    """Get the mode of a dependency entry ("copy" or "reference"), falling back to the configured default"""
+    if isinstance(dependency, dict) and dependency.get("mode"):
+        return dependency["mode"]
+    return get_dependency_result_mode()
+
+
+def project_fields(value: Any, fields: Optional[List[str]]) -> Any:
+    """
+    Keep only the given fields of a result
+
+    Args:
+        value: Dependency result; non-dict results are returned unchanged
+        fields: Field names, dotted names for nested fields; None keeps everything
+
+    Returns:
+        New dict with the selected fields (missing fields are left out)
+    """
+    if not fields or not isinstance(value, dict):
+        return value
+    projected: Dict[str, Any] = {}
+    for field in fields:
+        parts = field.split(".")
+        source = value
+        for part in parts:
+            if not isinstance(source, dict) or part not in source:
+                break
+            source = source[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+                if not isinstance(target, dict):
+                    # An enclosing field was already selected as a whole
+                    break
+            else:
+                target[parts[-1]] = source
+    return projected
+
+
+def make_result_reference(
+    task_id: str,
+    fields: Optional[List[str]] = None,
+    path: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Build a reference to the result of a task
+
+    Args:
+        task_id: Task whose result is referenced
+        fields: Fields to project the result to
+        path: Keys leading from the (projected) result to the referenced value
+
+    Returns:
+        Reference value to store in inputs
+    """
+    reference: Dict[str, Any] = {"task_id": task_id}
+    if fields:
+        reference["fields"] = list(fields)
+    if path:
+        reference["path"] = list(path)
+    return {RESULT_REF_KEY: reference}
+
+
+def is_result_reference(value: Any) -> bool:
+    """Check whether a value is a result reference"""
+    return (
+        isinstance(value, dict)
+        and len(value) == 1
+        and isinstance(value.get(RESULT_REF_KEY), dict)
+        and "task_id" in value[RESULT_REF_KEY]
+    )
+
+
+def has_result_references(value: Any) -> bool:
+    """Check whether a JSON value contains result references"""
+    if is_result_reference(value):
+        return True
+    if isinstance(value, dict):
+        return any(has_result_references(item) for item in value.values())
+    if isinstance(value, list):
+        return any(has_result_references(item) for item in value)
+    return False
+
+
+def materialize_result_references(value: Any, results: Dict[str, Any]) -> Any:
+    """
+    Replace result references with the values they point to
+
+    Args:
+        value: JSON value (a new value is returned where references are replaced)
+        results: Task id -> result of the referenced tasks
+
+    Returns:
+        Value with references replaced (None for unknown tasks or missing fields)
+    """
+    if is_result_reference(value):
+        reference = value[RESULT_REF_KEY]
+        resolved = project_fields(results.get(reference["task_id"]), reference.get("fields"))
+        for key in reference.get("path") or []:
+            resolved = resolved.get(key) if isinstance(resolved, dict) else None
+        return resolved
+    if isinstance(value, dict):
+        return {key: materialize_result_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [materialize_result_references(item, results) for item in value]
+    return value
+
+
+def get_referenced_task_ids(value: Any) -> List[str]:
+    """Get the ids of the tasks referenced in a JSON value"""
+    if is_result_reference(value):
+        return [value[RESULT_REF_KEY]["task_id"]]
+    task_ids: List[str] = []
+    if isinstance(value, dict):
+        for item in value.values():
+            task_ids.extend(get_referenced_task_ids(item))
+    elif isinstance(value, list):
+        for item in value:
+            task_ids.extend(get_referenced_task_ids(item))
+    return task_ids
+
+
+__all__ = [
+    "RESULT_REF_KEY",
+    "DEPENDENCY_OPTION_KEYS",
+    "validate_dependency_options",
+    "get_dependency_options",
+    "get_dependency_mode",
+    "project_fields",
+    "make_result_reference",
+    "is_result_reference",
+    "has_result_references",
+    "materialize_result_references",
+    "get_referenced_task_ids",
+]
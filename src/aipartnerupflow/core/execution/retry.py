@@ -0,0 +1,217 @@
+"""
+Per-task retry policies
+
+A task opts into retries with schemas.retry:
+
+    {
+        "max_attempts": 3,         # total executor attempts (first run included)
+        "backoff": 1.0,            # seconds before the first retry, doubled per retry
+        "max_backoff": 60.0,       # upper bound of the delay
+        "jitter": 0.5,             # random +/- fraction of the delay (true = 0.5)
+        "retry_on": ["timeout", "5xx", "rate_limit"]
+    }
+
+A failed attempt is a task timeout, an exception raised by the executor (which
+TaskManager turns into an {"error": ...} result) or a result with "success": false.
+retry_on selects which failures are retried (default: all of them):
+
+- "error": any failure
+- "timeout": task timeouts and timeout errors
+- "5xx": HTTP status codes 500-599
+- "rate_limit": HTTP 429 or a "rate limit" error message
+- an integer: that HTTP status code
+- any other string: substring of the error message
+
+Between attempts the task is back to "pending" with its attempt count and last
+error recorded, so dependents keep waiting. TaskManager schedules the next attempt
+on a timer after releasing its concurrency slots and scheduler worker slot.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Union
+
+from aipartnerupflow.core.execution.deadlines import TaskTimeoutError
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+
+RETRY_CONDITIONS = ("error", "timeout", "5xx", "rate_limit")
+
+
+@dataclass
+class RetryPolicy:
+    """Retry policy of one task (parsed from schemas.retry)"""
+
+    max_attempts: int = 3
+    backoff: float = 1.0
+    max_backoff: float = 60.0
+    jitter: float = 0.0
+    retry_on: List[Union[str, int]] = field(default_factory=lambda: ["error"])
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Get the delay before the attempt following a failed one
+
+        Args:
+            attempt: Number of the failed attempt (1-based)
+
+        Returns:
+            Delay in seconds (exponential backoff with jitter)
+        """
+        delay = min(self.backoff * (2 ** (attempt - 1)), self.max_backoff)
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+    def should_retry(
+        self,
+        attempt: int,
+        error: Optional[BaseException] = None,
+        result: Any = None,
+    ) -> bool:
+        """
+        Check whether a failed attempt is retried
+
+        Args:
+            attempt: Number of the failed attempt (1-based)
+            error: Exception raised by the attempt, if any
+            result: Result returned by the attempt, if no exception was raised
+
+        Returns:
+            True if attempts are left and the failure matches retry_on
+        """
+        if attempt >= self.max_attempts:
+            return False
+        return any(_matches(condition, error, result) for condition in self.retry_on)
+
+
+def _get_status_code(error: Optional[BaseException], result: Any) -> Optional[int]:
+    if isinstance(result, dict) and isinstance(result.get("status_code"), int):
+        return result["status_code"]
+    for source in (error, getattr(error, "response", None)):
+        status_code = getattr(source, "status_code", None)
+        if isinstance(status_code, int):
+            return status_code
+    return None
+
+
+def get_failure_message(error: Optional[BaseException] = None, result: Any = None) -> str:
+    """
+    Get the error message of a failed attempt
+
+    Args:
+        error: Exception raised by the attempt, if any
+        result: Result returned by the attempt, if no exception was raised
+
+    Returns:
+        Error message
+    """
+    if error is not None:
+        return str(error) or type(error).__name__
+    if isinstance(result, dict):
+        if result.get("error"):
+            return str(result["error"])
+        if result.get("status_code") is not None:
+            return f"Executor returned status code {result['status_code']}"
+    return "Executor returned an unsuccessful result"
+
+
+def _matches(condition: Union[str, int], error: Optional[BaseException], result: Any) -> bool:
+    message = get_failure_message(error, result).lower()
+    if isinstance(condition, int):
+        return _get_status_code(error, result) == condition
+    if condition == "error":
+        return True
+    if condition == "timeout":
+        return (
+            isinstance(error, (TaskTimeoutError, asyncio.TimeoutError, TimeoutError))
+            or "timeout" in message
+            or "timed out" in message
+        )
+    if condition == "5xx":
+        status_code = _get_status_code(error, result)
+        return status_code is not None and 500 <= status_code < 600
+    if condition == "rate_limit":
+        return _get_status_code(error, result) == 429 or "rate limit" in message
+    condition = condition.lower()
+    return condition in message or (error is not None and condition in type(error).__name__.lower())
+
+
+def is_error_result(result: Any) -> bool:
+    """
+    Check whether an executor result reports a failure
+
+    Args:
+        result: Result returned by executor.execute()
+
+    Returns:
+        True for dict results with "success": false, or with an "error" and no "success"
+    """
+    if not isinstance(result, dict):
+        return False
+    success = result.get("success")
+    return success is False or (success is None and bool(result.get("error")))
+
+
+def get_retry_policy(task: TaskModel) -> Optional[RetryPolicy]:
+    """
+    Get the retry policy of a task from schemas.retry
+
+    Args:
+        task: Task
+
+    Returns:
+        RetryPolicy, or None if the task has no retry policy
+
+    Raises:
+        ValueError: If schemas.retry is invalid
+    """
+    config = (task.schemas or {}).get("retry")
+    if config is None:
+        return None
+    if not isinstance(config, dict):
+        raise ValueError(f"schemas.retry must be an object, got {config!r}")
+
+    policy = RetryPolicy()
+    try:
+        if "max_attempts" in config:
+            policy.max_attempts = int(config["max_attempts"])
+        if "backoff" in config:
+            policy.backoff = float(config["backoff"])
+        if "max_backoff" in config:
+            policy.max_backoff = float(config["max_backoff"])
+        if "jitter" in config:
+            jitter = config["jitter"]
+            policy.jitter = 0.5 if jitter is True else float(jitter or 0)
+    except (TypeError, ValueError):
+        raise ValueError(f"schemas.retry has invalid values: {config!r}")
+
+    if policy.max_attempts < 1:
+        raise ValueError(f"schemas.retry.max_attempts must be >= 1, got {policy.max_attempts}")
+    if policy.backoff < 0 or policy.max_backoff < 0:
+        raise ValueError("schemas.retry.backoff and max_backoff must be >= 0")
+    if not 0 <= policy.jitter <= 1:
+        raise ValueError(f"schemas.retry.jitter must be between 0 and 1, got {policy.jitter}")
+
+    retry_on = config.get("retry_on")
+    if retry_on is not None:
+        if isinstance(retry_on, (str, int)):
+            retry_on = [retry_on]
+        if not isinstance(retry_on, list) or not retry_on:
+            raise ValueError(f"schemas.retry.retry_on must be a non-empty list, got {retry_on!r}")
+        for condition in retry_on:
+            if isinstance(condition, bool) or not isinstance(condition, (str, int)):
+                raise ValueError(
+                    f"schemas.retry.retry_on entries must be one of {RETRY_CONDITIONS}, "
+                    f"an HTTP status code or a message substring, got {condition!r}"
+                )
+        policy.retry_on = list(retry_on)
+    return policy
+
+
+__all__ = [
+    "RetryPolicy",
+    "get_retry_policy",
+    "get_failure_message",
+    "is_error_result",
+]
@@ -0,0 +1,247 @@
+"""
+Ready-queue scheduler for task tree execution
+
+Alternative to TaskManager._execute_task_tree_recursive(). Instead of walking the
+tree by priority groups and rescanning the tree after every completion, the
+scheduler does a single Kahn-style pass:
+
+1. Collect the tasks that need to run (same selection rules as the recursive mode)
+2. Count, per task, the unfinished tasks it waits for (in-degree):
+   - its dependencies that are part of the scheduled set
+   - its scheduled children (a parent runs after its children, as in the recursive mode)
+3. Push tasks with in-degree 0 on a priority heap and dispatch them to a bounded
+   worker pool; when a task settles, decrement its successors and push the ones
+   that reach zero
+
+Among tasks with the same priority, the heap starts the task with the longest
+expected remaining path first (critical-path ordering, see
+set_critical_path_scheduling()). Expected durations are the recorded median
+durations of each task's executor (core/execution/duration_stats.py); tasks whose
+executor has no statistics count as zero, so without statistics tasks keep tree order.
+
+A task whose required dependency did not complete (failed, cancelled or skipped) is
+not executed, and neither are its own dependents (they stay pending, like in the
+recursive mode). Cancelled tasks are settled without being dispatched. A failed
+attempt retried by its retry policy (schemas.retry) is not settled: it waits for its
+backoff delay outside the worker pool and is then pushed back on the heap. Scheduling
+overhead is linear in the number of tasks and dependency edges.
+"""
+
+import asyncio
+import heapq
+from typing import Dict, List, Set, Tuple, TYPE_CHECKING
+
+from aipartnerupflow.core.config import get_critical_path_scheduling
+from aipartnerupflow.core.execution.duration_stats import get_critical_path_lengths
+from aipartnerupflow.core.execution.tree_state import get_dependency_id, is_required_dependency
+from aipartnerupflow.core.types import TaskTreeNode
+from aipartnerupflow.core.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from aipartnerupflow.core.execution.task_manager import TaskManager
+
+logger = get_logger(__name__)
+
+
+class ReadyQueueScheduler:
+    """
+    Dependency-counted ready-queue scheduler for one task tree
+
+    Edge kinds:
+    - "required": successor only runs if the predecessor completed
+    - "settle": successor waits for the predecessor to finish, whatever its outcome
+      (optional dependencies and parent-after-children ordering)
+    """
+
+    def __init__(self, task_manager: "TaskManager", max_workers: int):
+        """
+        Initialize scheduler
+
+        Args:
+            task_manager: TaskManager that owns the tree (provides execution and tree state)
+            max_workers: Maximum number of tasks executed concurrently
+        """
+        self.task_manager = task_manager
+        self.max_workers = max(1, int(max_workers))
+        self._nodes: Dict[str, TaskTreeNode] = {}
+        self._order: Dict[str, int] = {}
+        self._successors: Dict[str, List[Tuple[str, bool]]] = {}
+        self._in_degree: Dict[str, int] = {}
+        self._blocked: Set[str] = set()
+        self._critical_path: Dict[str, float] = {}
+        self._heap: List[Tuple[int, float, int, str]] = []
+
+    async def run(self, task_tree: TaskTreeNode, use_callback: bool = True) -> None:
+        """
+        Execute all pending tasks of the tree
+
+        Args:
+            task_tree: Root task tree node
+            use_callback: Whether to use callbacks
+        """
+        self._collect(task_tree)
+        self._build_graph()
+        if get_critical_path_scheduling():
+            self._compute_critical_path()
+
+        for task_id, degree in self._in_degree.items():
+            if degree == 0:
+                self._push(task_id)
+
+        logger.info(
+            f"Ready-queue scheduler: {len(self._nodes)} tasks to run, "
+            f"{len(self._heap)} initially ready, max_workers={self.max_workers}"
+        )
+
+        running: Dict[asyncio.Task, str] = {}
+        # Tasks waiting for a retry (they do not count against max_workers)
+        retrying: Dict[asyncio.Task, str] = {}
+        settled: Set[str] = set()
+        try:
+            while self._heap or running or retrying:
+                while self._heap and len(running) < self.max_workers and not self.task_manager.streaming_final:
+                    task_id = heapq.heappop(self._heap)[-1]
+                    if task_id in self._blocked:
+                        logger.info(f"Task {task_id} not executed: a required dependency did not complete")
+                        self._settle(task_id, succeeded=False)
+                        settled.add(task_id)
+                        continue
+                    if self.task_manager._is_cancelled(task_id):
+                        logger.info(f"Task {task_id} not executed: it was cancelled")
+                        self._settle(task_id, succeeded=False)
+                        settled.add(task_id)
+                        continue
+                    running[asyncio.create_task(self._run_task(task_id, use_callback))] = task_id
+
+                if not running and not retrying:
+                    break
+
+                done, _ = await asyncio.wait(
+                    [*running.keys(), *retrying.keys()], return_when=asyncio.FIRST_COMPLETED
+                )
+                for finished in done:
+                    if finished in retrying:
+                        self._push(retrying.pop(finished))
+                        continue
+                    task_id = running.pop(finished)
+                    if finished.exception() is not None:
+                        logger.error(f"Error executing task {task_id} in ready-queue scheduler: {finished.exception()}")
+                    retry_delay = self.task_manager._retry_delays.pop(task_id, None)
+                    if retry_delay is not None:
+                        retry = asyncio.create_task(self.task_manager._wait_for_retry(task_id, retry_delay))
+                        retrying[retry] = task_id
+                        continue
+                    succeeded = self.task_manager._tree_state.get_status(task_id) == "completed"
+                    self._settle(task_id, succeeded)
+                    settled.add(task_id)
+        finally:
+            for pending in [*running, *retrying]:
+                pending.cancel()
+
+        unsettled = set(self._nodes) - settled
+        if unsettled and not self.task_manager.streaming_final:
+            logger.warning(
+                f"Ready-queue scheduler left {len(unsettled)} tasks pending "
+                f"(dependency cycle): {sorted(unsettled)}"
+            )
+
+    def _collect(self, task_tree: TaskTreeNode) -> None:
+        """
+        Collect tasks to schedule (preorder), using the recursive mode's selection rules
+
+        The root is scheduled unless it is completed; other tasks are scheduled if they
+        are not completed, or completed and marked for re-execution. Subtrees of tasks
+        that are not scheduled are skipped.
+        """
+        tasks_to_reexecute = self.task_manager._tasks_to_reexecute
+        root_id = str(task_tree.task.id)
+        if task_tree.task.status != "completed" or root_id in tasks_to_reexecute:
+            self._add_node(task_tree)
+
+        stack = list(reversed(task_tree.children))
+        while stack:
+            node = stack.pop()
+            task_id = str(node.task.id)
+            if node.task.status == "completed" and task_id not in tasks_to_reexecute:
+                continue
+            self._add_node(node)
+            stack.extend(reversed(node.children))
+
+    def _add_node(self, node: TaskTreeNode) -> None:
+        task_id = str(node.task.id)
+        self._order[task_id] = len(self._nodes)
+        self._nodes[task_id] = node
+        self._successors[task_id] = []
+        self._in_degree[task_id] = 0
+
+    def _build_graph(self) -> None:
+        """Build successor lists and in-degree counters for the scheduled tasks"""
+        tree_state = self.task_manager._tree_state
+        edges: Dict[Tuple[str, str], bool] = {}
+
+        for task_id in self._nodes:
+            dependency_ids = set()
+            for dependency in tree_state.get_dependencies(task_id):
+                dependency_id = get_dependency_id(dependency)
+                if dependency_id not in self._nodes or dependency_id == task_id:
+                    continue
+                dependency_ids.add(dependency_id)
+                key = (dependency_id, task_id)
+                edges[key] = edges.get(key, False) or is_required_dependency(dependency)
+
+            # Parent runs after its scheduled children, unless the child waits for the parent
+            parent_id = tree_state.get_parent_id(task_id)
+            if parent_id in self._nodes and parent_id not in dependency_ids:
+                edges.setdefault((task_id, parent_id), False)
+
+        for (source_id, target_id), required in edges.items():
+            self._successors[source_id].append((target_id, required))
+            self._in_degree[target_id] += 1
+
+    def _compute_critical_path(self) -> None:
+        """Compute the expected longest remaining path of every scheduled task"""
+        durations = {
+            task_id: self.task_manager._get_expected_duration(node.task) or 0.0
+            for task_id, node in self._nodes.items()
+        }
+        successors = {
+            task_id: [successor_id for successor_id, _ in edges]
+            for task_id, edges in self._successors.items()
+        }
+        self._critical_path = get_critical_path_lengths(durations, successors)
+
+    def _push(self, task_id: str) -> None:
+        priority = self._nodes[task_id].task.priority
+        heapq.heappush(
+            self._heap,
+            (
+                priority if priority is not None else 999,
+                -self._critical_path.get(task_id, 0.0),
+                self._order[task_id],
+                task_id,
+            ),
+        )
+
+    def _settle(self, task_id: str, succeeded: bool) -> None:
+        """Release successors of a finished (or skipped) task"""
+        for successor_id, required in self._successors[task_id]:
+            if required and not succeeded:
+                self._blocked.add(successor_id)
+            self._in_degree[successor_id] -= 1
+            if self._in_degree[successor_id] == 0:
+                self._push(successor_id)
+
+    async def _run_task(self, task_id: str, use_callback: bool) -> None:
+        """Execute one ready task after checking dependencies outside the scheduled set"""
+        task = self._nodes[task_id].task
+        task_manager = self.task_manager
+        deps_satisfied = await task_manager._are_dependencies_satisfied(task)
+        if not deps_satisfied:
+            logger.info(f"Task {task_id} not executed: dependencies not satisfied")
+            return
+        await task_manager._execute_single_task(task, use_callback)
+
+
+__all__ = [
+    "ReadyQueueScheduler",
+]
@@ -35,9 +35,12 @@ from typing import List, Dict, Any, Optional, Union, Set
 import copy
 import uuid
 from datetime import datetime, timezone
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
 from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.execution.result_references import get_dependency_options, validate_dependency_options
 from aipartnerupflow.core.types import TaskTreeNode
 from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
 from aipartnerupflow.core.utils.logger import get_logger
@@ -125,8 +128,162 @@ class TaskCreator:
             raise ValueError("Tasks array cannot be empty")
         
         logger.info(f"Creating task tree from {len(tasks)} tasks")
+        root_node = (await self.create_task_trees_from_arrays([tasks]))[0]
         
-        # Step 1: Extract and validate task identifiers (id or name)
+        logger.info(f"Created task tree: root task {root_node.task.name} "
+                    f"with {len(root_node.children)} direct children")
+        return root_node
+    
+    async def create_task_trees_from_arrays(
+        self,
+        task_arrays: List[List[Dict[str, Any]]],
+    ) -> List[TaskTreeNode]:
+        """
+        Create several independent task trees in one transaction
+        
+        Every array is validated before anything is written (same format and rules as
+        create_task_tree_from_array()). The tasks of all trees are then built in memory
+        and inserted with one executemany INSERT and a single commit
+        (TaskRepository.save_task_trees()).
+        
+        Provided task ids that already exist in the database, or in an earlier array of
+        the same batch, are replaced by generated UUIDs.
+        
+        Args:
+            task_arrays: One tasks array per tree
+            
+        Returns:
+            Root task nodes, in the order of task_arrays
+            
+        Raises:
+            ValueError: If an array is empty or invalid (the message starts with the
+                index of the array when several arrays are given)
+        """
+        if not task_arrays:
+            raise ValueError("No task arrays provided")
+        
+        # Steps 1-2: Validate identifiers, references, cycles and the hierarchy of every
+        # array before creating anything
+        root_indexes: List[int] = []
+        for tree_index, tasks in enumerate(task_arrays):
+            try:
+                if not tasks:
+                    raise ValueError("Tasks array cannot be empty")
+                root_indexes.append(self._validate_task_array(tasks))
+            except ValueError as e:
+                if len(task_arrays) == 1:
+                    raise
+                raise ValueError(f"Tree {tree_index}: {e}") from e
+        
+        # Step 3: Build the task trees in memory (ids resolved, parent_id and dependencies
+        # pointing to actual task ids)
+        task_repository = self.task_manager.task_repository
+        taken_ids = await task_repository.get_existing_task_ids([
+            task_data["id"] for tasks in task_arrays for task_data in tasks if task_data.get("id")
+        ])
+        root_nodes = [
+            await self._build_new_task_tree(tasks, root_index, taken_ids)
+            for tasks, root_index in zip(task_arrays, root_indexes)
+        ]
+        
+        # Step 4: Insert all trees (root_id is set while saving)
+        await task_repository.save_task_trees(root_nodes, check_existing=False)
+        return root_nodes
+    
+    async def _build_new_task_tree(
+        self,
+        tasks: List[Dict[str, Any]],
+        root_index: int,
+        taken_ids: Set[str],
+    ) -> TaskTreeNode:
+        """
+        Build the unsaved task tree of a validated tasks array
+        
+        Args:
+            tasks: Validated tasks array
+            root_index: Index of the root task in the array
+            taken_ids: Task IDs that cannot be used; the IDs of this tree are added
+            
+        Returns:
+            TaskTreeNode: Root task node
+        """
+        task_model_class = self.task_manager.task_repository.task_model_class
+        created_tasks: List[TaskModel] = []
+        identifier_to_task: Dict[str, TaskModel] = {}  # id or name -> TaskModel
+        
+        for task_data in tasks:
+            provided_id = task_data.get("id")
+            actual_id = provided_id
+            if not provided_id or provided_id in taken_ids:
+                actual_id = str(uuid.uuid4())
+                if provided_id:
+                    logger.warning(
+                        f"Task ID '{provided_id}' already exists in database. "
+                        f"Generating new ID '{actual_id}' to avoid conflict."
+                    )
+            taken_ids.add(actual_id)
+            
+            # Same initial values as TaskRepository.create_task()
+            task = task_model_class(
+                id=actual_id,
+                name=task_data.get("name"),
+                user_id=task_data.get("user_id"),
+                priority=task_data.get("priority", 1),
+                inputs=task_data.get("inputs") or {},
+                schemas=task_data.get("schemas") or {},
+                params=task_data.get("params") or {},
+                status="pending",
+                progress=0.0,
+                has_children=False,
+                original_task_id=None,
+                has_copy=False,
+                version=1,
+            )
+            created_tasks.append(task)
+            identifier_to_task[provided_id or task_data.get("name")] = task
+        
+        # Resolve parent_id and dependency references (id or name) to actual task ids
+        for task_data, task in zip(tasks, created_tasks):
+            parent_ref = task_data.get("parent_id")
+            if parent_ref:
+                parent_task = identifier_to_task[parent_ref]
+                task.parent_id = parent_task.id
+                parent_task.has_children = True
+            
+            # Final structure is always: {"id": "actual_task_id", "required": bool, "type": str}
+            dependencies = []
+            for dep in task_data.get("dependencies") or []:
+                if isinstance(dep, dict):
+                    dependencies.append({
+                        "id": identifier_to_task[dep.get("id") or dep.get("name")].id,
+                        "required": dep.get("required", True),
+                        "type": dep.get("type", "result"),
+                        **get_dependency_options(dep),
+                    })
+                else:
+                    dependencies.append({"id": identifier_to_task[str(dep)].id, "required": True, "type": "result"})
+            task.dependencies = dependencies
+        
+        return await self._build_task_tree(created_tasks[root_index], created_tasks)
+    
+    def _validate_task_array(self, tasks: List[Dict[str, Any]]) -> int:
+        """
+        Validate a tasks array before any task is created
+        
+        Builds the identifier maps, the dependency graph and the parent links once and
+        checks, in this order: names and id mode, unique identifiers, parent_id and
+        dependency references, circular dependencies, dependent task inclusion, a single
+        root and that every task is reachable from it. Runs in O(tasks + dependencies).
+        
+        Args:
+            tasks: Array of task objects (see create_task_tree_from_array())
+            
+        Returns:
+            Index of the root task in the array
+            
+        Raises:
+            ValueError: If the array is invalid
+        """
         # Rule: Either all tasks have id, or all tasks don't have id (use name)
         # Mixed mode is not supported for clarity and consistency
         provided_ids: Set[str] = set()
@@ -137,19 +294,14 @@ class TaskCreator:
         # First pass: check if all tasks have id or all don't have id
         tasks_with_id = 0
         tasks_without_id = 0
-        
         for index, task_data in enumerate(tasks):
-            task_name = task_data.get("name")
-            if not task_name:
+            if not task_data.get("name"):
                 raise ValueError(f"Task at index {index} must have a 'name' field")
-            
-            provided_id = task_data.get("id")
-            if provided_id:
+            if task_data.get("id"):
                 tasks_with_id += 1
             else:
                 tasks_without_id += 1
         
-        # Validate: either all have id or all don't have id
         if tasks_with_id > 0 and tasks_without_id > 0:
             raise ValueError(
                 "Mixed mode not supported: either all tasks must have 'id', or all tasks must not have 'id'. "
@@ -157,18 +309,17 @@ class TaskCreator:
             )
         
         # Second pass: build identifier maps
+        identifiers: List[str] = []  # index -> identifier (id, or name when tasks have no id)
         for index, task_data in enumerate(tasks):
             task_name = task_data.get("name")
             provided_id = task_data.get("id")
-            
             if provided_id:
-                # Task has id - validate uniqueness
                 if provided_id in provided_ids:
                     raise ValueError(f"Duplicate task id '{provided_id}' at index {index}")
                 provided_ids.add(provided_id)
                 provided_id_to_index[provided_id] = index
+                identifiers.append(provided_id)
             else:
-                # Task has no id - must use name, and name must be unique
                 if task_name in task_names:
                     raise ValueError(
                         f"Task at index {index} has no 'id' but name '{task_name}' is not unique. "
@@ -176,15 +327,19 @@ class TaskCreator:
                     )
                 task_names.add(task_name)
                 task_name_to_index[task_name] = index
+                identifiers.append(task_name)
         
-        # Step 2: Validate all tasks first (parent_id, dependencies)
+        # Third pass: validate parent_id and dependencies, building the graphs
+        # parent_id must reference a task within the same array, or be None for root tasks
+        dependency_graph: Dict[str, List[str]] = {}  # identifier -> identifiers it depends on
+        identifier_to_name: Dict[str, str] = {}  # identifier -> task name for error messages
+        root_indexes: List[int] = []
+        children_indexes: Dict[str, List[int]] = {}  # parent identifier -> child indexes
         for index, task_data in enumerate(tasks):
             task_name = task_data.get("name")
-            provided_id = task_data.get("id")
+            identifier = identifiers[index]
+            identifier_to_name[identifier] = task_name
             
-            # Validate parent_id exists in the array (if provided)
-            # parent_id can be either id (if tasks have id) or name (if tasks don't have id)
-            # parent_id must reference a task within the same array, or be None for root tasks
             parent_id = task_data.get("parent_id")
             if parent_id:
                 if parent_id not in provided_ids and parent_id not in task_names:
@@ -193,238 +348,62 @@ class TaskCreator:
                         f"which is not in the tasks array (not found as id or name). "
                         f"parent_id must reference a task within the same array."
                     )
+                children_indexes.setdefault(parent_id, []).append(index)
+            else:
+                root_indexes.append(index)
             
-            # Validate dependencies exist in the array
             dependencies = task_data.get("dependencies")
+            dependency_refs: Dict[str, None] = {}
             if dependencies:
                 self._validate_dependencies(
                     dependencies, task_name, index, provided_ids, provided_id_to_index,
                     task_names, task_name_to_index
                 )
+                for dep in dependencies:
+                    dep_ref = (dep.get("id") or dep.get("name")) if isinstance(dep, dict) else str(dep)
+                    dependency_refs[dep_ref] = None
+            dependency_graph[identifier] = list(dependency_refs)
         
-        # Step 2.5: Detect circular dependencies before creating tasks
-        self._detect_circular_dependencies(
-            tasks, provided_ids, provided_id_to_index, task_names, task_name_to_index
-        )
+        self._detect_circular_dependencies(dependency_graph, identifier_to_name)
         
-        # Step 2.6: Validate dependent task inclusion
         # Ensure all tasks that depend on tasks in the tree are also included
-        self._validate_dependent_task_inclusion(
-            tasks, provided_ids, task_names
-        )
+        self._validate_dependent_task_inclusion(tasks, identifiers, dependency_graph)
         
-        # Step 3: Create all tasks
-        created_tasks: List[TaskModel] = []
-        identifier_to_task: Dict[str, TaskModel] = {}  # id or name -> TaskModel
-        
-        for index, task_data in enumerate(tasks):
-            task_name = task_data.get("name")
-            provided_id = task_data.get("id")
-            
-            # user_id is optional (can be None) - get directly from task_data
-            task_user_id = task_data.get("user_id")
-            
-            # Check if provided_id already exists in database
-            # If it exists, generate a new UUID to avoid primary key conflict
-            actual_id = provided_id
-            if provided_id:
-                existing_task = await self.task_manager.task_repository.get_task_by_id(provided_id)
-                if existing_task:
-                    # ID already exists, generate new UUID
-                    import uuid
-                    actual_id = str(uuid.uuid4())
-                    logger.warning(
-                        f"Task ID '{provided_id}' already exists in database. "
-                        f"Generating new ID '{actual_id}' to avoid conflict."
-                    )
-                    # Update the task_data to use the new ID for internal reference tracking
-                    # Note: We'll still use provided_id for identifier_to_task mapping
-                    # but create the task with actual_id
-            
-            # Create task (parent_id and dependencies will be set in step 4)
-            # Use actual_id (may be different from provided_id if conflict detected)
-            logger.debug(f"Creating task: name={task_name}, provided_id={provided_id}, actual_id={actual_id}")
-            task = await self.task_manager.task_repository.create_task(
-                name=task_name,
-                user_id=task_user_id,
-                parent_id=None,  # Will be set in step 4
-                priority=task_data.get("priority", 1),
-                dependencies=None,  # Will be set in step 4
-                inputs=task_data.get("inputs"),
-                schemas=task_data.get("schemas"),
-                params=task_data.get("params"),
-                id=actual_id  # Use actual_id (may be auto-generated if provided_id conflicts)
-            )
-            
-            logger.debug(f"Task created: id={task.id}, name={task.name}, provided_id={provided_id}, actual_id={actual_id}")
-            
-            # Verify the task was created with the expected ID
-            # If actual_id was generated due to conflict, task.id should match actual_id (not provided_id)
-            expected_id = actual_id if actual_id else provided_id
-            if expected_id and task.id != expected_id:
-                logger.error(
-                    f"Task ID mismatch: expected {expected_id}, got {task.id}. "
-                    f"This indicates an issue with ID assignment."
-                )
-                raise ValueError(
-                    f"Task ID mismatch: expected {expected_id}, got {task.id}. "
-                    f"Task was not created with the expected ID."
-                )
-            
-            # Note: TaskRepository.create_task already commits and refreshes the task
-            # No need to commit again here
-            
-            created_tasks.append(task)
-            
-            # Map identifier (id or name) to created task
-            if provided_id:
-                identifier_to_task[provided_id] = task
-            else:
-                # Use name as identifier when id is not provided
-                identifier_to_task[task_name] = task
-        
-        # Step 4: Set parent_id and dependencies using actual task ids
-        for index, (task_data, task) in enumerate(zip(tasks, created_tasks)):
-            # Resolve parent_id (can be id or name, depending on whether tasks have id)
-            # If tasks have id: parent_id should be an id
-            # If tasks don't have id: parent_id should be a name (name must be unique)
-            parent_id = task_data.get("parent_id")
-            actual_parent_id = None
-            
-            if parent_id:
-                # Find the actual task that corresponds to the parent_id (id or name)
-                parent_task = identifier_to_task.get(parent_id)
-                if parent_task:
-                    actual_parent_id = parent_task.id
-                    # Update parent's has_children flag
-                    parent_task.has_children = True
-                    # Update parent task in database
-                    if self.task_manager.is_async:
-                        await self.db.commit()
-                        await self.db.refresh(parent_task)
-                    else:
-                        self.db.commit()
-                        self.db.refresh(parent_task)
-                else:
-                    raise ValueError(
-                        f"Task '{task.name}' at index {index} has parent_id '{parent_id}' "
-                        f"which does not map to any created task"
-                    )
-            
-            # Resolve dependencies to actual task ids
-            # Whether user provides id or name, we convert to actual task id
-            # If user provided id, use it; otherwise use system-generated UUID
-            dependencies = task_data.get("dependencies")
-            actual_dependencies = None
-            if dependencies:
-                actual_dependencies = []
-                for dep in dependencies:
-                    if isinstance(dep, dict):
-                        # Support both "id" and "name" for dependency reference
-                        # User can provide either id or name, we'll map it to actual task id
-                        dep_ref = dep.get("id") or dep.get("name")
-                        if dep_ref:
-                            # Find the actual task that corresponds to the dependency reference (id or name)
-                            dep_task = identifier_to_task.get(dep_ref)
-                            if dep_task:
-                                # Use actual task id (user-provided if provided, otherwise system-generated)
-                                # Final structure is always: {"id": "actual_task_id", "required": bool, "type": str}
-                                actual_dependencies.append({
-                                    "id": dep_task.id,  # Use actual task id (user-provided or system-generated)
-                                    "required": dep.get("required", True),
-                                    "type": dep.get("type", "result"),
-                                })
-                            else:
-                                raise ValueError(
-                                    f"Task '{task.name}' at index {index} has dependency reference '{dep_ref}' "
-                                    f"which does not map to any created task"
-                                )
-                        else:
-                            raise ValueError(f"Task '{task.name}' dependency must have 'id' or 'name' field")
-                    else:
-                        # Simple string dependency (can be id or name)
-                        dep_ref = str(dep)
-                        dep_task = identifier_to_task.get(dep_ref)
-                        if dep_task:
-                            # Use actual task id (user-provided or system-generated)
-                            actual_dependencies.append({
-                                "id": dep_task.id,  # Use actual task id
-                                "required": True,
-                                "type": "result",
-                            })
-                        else:
-                            raise ValueError(
-                                f"Task '{task.name}' at index {index} has dependency '{dep_ref}' "
-                                f"which does not map to any created task"
-                            )
-                
-                actual_dependencies = actual_dependencies if actual_dependencies else None
-            
-            # Update task with parent_id and dependencies
-            if actual_parent_id is not None or actual_dependencies is not None:
-                task.parent_id = actual_parent_id
-                task.dependencies = actual_dependencies
-                # Update in database
-                if self.task_manager.is_async:
-                    await self.db.commit()
-                    await self.db.refresh(task)
-                else:
-                    self.db.commit()
-                    self.db.refresh(task)
-        
-        # Step 5: Build task tree structure
-        # Find root task (task with no parent_id)
-        root_tasks = [task for task in created_tasks if task.parent_id is None]
-        
-        if not root_tasks:
+        # Single root task, and every task reachable from it via the parent_id chain
+        if not root_indexes:
             raise ValueError(
                 "No root task found (task with no parent_id). "
                 "At least one task in the array must have parent_id=None or no parent_id field."
             )
-        
-        if len(root_tasks) > 1:
-            root_task_names = [task.name for task in root_tasks]
+        if len(root_indexes) > 1:
+            root_task_names = [tasks[index].get("name") for index in root_indexes]
             raise ValueError(
                 f"Multiple root tasks found: {root_task_names}. "
                 f"All tasks must be in a single task tree. "
                 f"Only one task should have parent_id=None or no parent_id field."
             )
         
-        root_task = root_tasks[0]
-        
-        # Verify all tasks are reachable from the root task (in the same tree)
-        # Build a set of all task IDs that are reachable from root
-        reachable_task_ids: Set[str] = {root_task.id}
-        
-        def collect_reachable_tasks(task_id: str):
-            """Recursively collect all tasks reachable from the given task via parent_id chain"""
-            for task in created_tasks:
-                if task.parent_id == task_id and task.id not in reachable_task_ids:
-                    reachable_task_ids.add(task.id)
-                    collect_reachable_tasks(task.id)
-        
-        collect_reachable_tasks(root_task.id)
-        
-        # Check if all tasks are reachable
-        all_task_ids = {task.id for task in created_tasks}
-        unreachable_task_ids = all_task_ids - reachable_task_ids
-        
-        if unreachable_task_ids:
+        root_index = root_indexes[0]
+        reachable = [False] * len(tasks)
+        reachable[root_index] = True
+        pending = [root_index]
+        while pending:
+            index = pending.pop()
+            for child_index in children_indexes.get(identifiers[index], []):
+                if not reachable[child_index]:
+                    reachable[child_index] = True
+                    pending.append(child_index)
+        
+        if not all(reachable):
             unreachable_task_names = [
-                task.name for task in created_tasks 
-                if task.id in unreachable_task_ids
+                task_data.get("name") for index, task_data in enumerate(tasks) if not reachable[index]
             ]
             raise ValueError(
                 f"Tasks not in the same tree: {unreachable_task_names}. "
                 f"All tasks must be reachable from the root task via parent_id chain. "
-                f"These tasks are not connected to the root task '{root_task.name}'."
+                f"These tasks are not connected to the root task '{tasks[root_index].get('name')}'."
             )
-        
-        root_node = await self._build_task_tree(root_task, created_tasks)
-        
-        logger.info(f"Created task tree: root task {root_node.task.name} "
-                    f"with {len(root_node.children)} direct children")
-        return root_node
+        return root_index
     
     def _validate_dependencies(
         self,
@@ -470,6 +449,12 @@ class TaskCreator:
                         f"which is not in the tasks array (not found as id or name)"
                     )
                 
+                # Validate result passing options (fields projection, copy/reference mode)
+                try:
+                    validate_dependency_options(dep)
+                except ValueError as e:
+                    raise ValueError(f"Task '{task_name}' at index {task_index} dependency '{dep_ref}': {e}")
+                
                 # Validate hierarchy: dependency should be at an earlier index (or same level)
                 if dep_index is not None and dep_index >= task_index:
                     # This is allowed for same-level dependencies, but log a warning
@@ -488,108 +473,56 @@ class TaskCreator:
     
     def _detect_circular_dependencies(
         self,
-        tasks: List[Dict[str, Any]],
-        provided_ids: Set[str],
-        id_to_index: Dict[str, int],
-        task_names: Set[str],
-        name_to_index: Dict[str, int]
+        dependency_graph: Dict[str, List[str]],
+        identifier_to_name: Dict[str, str]
     ) -> None:
         """
-        Detect circular dependencies in task array using DFS.
+        Detect circular dependencies using an iterative DFS.
+        
+        Every task and dependency edge is visited once; the cycle path is only
+        extracted when a cycle is found.
         
         Args:
-            tasks: List of task dictionaries
-            provided_ids: Set of all provided task IDs
-            id_to_index: Map of id -> index in array
-            task_names: Set of all task names
-            name_to_index: Map of name -> index in array
+            dependency_graph: Task identifier -> identifiers it depends on
+            identifier_to_name: Task identifier -> task name for error messages
             
         Raises:
             ValueError: If circular dependencies are detected
         """
-        # Build dependency graph: identifier -> set of identifiers it depends on
-        dependency_graph: Dict[str, Set[str]] = {}
-        identifier_to_name: Dict[str, str] = {}  # identifier -> task name for error messages
-        
-        for index, task_data in enumerate(tasks):
-            task_name = task_data.get("name")
-            provided_id = task_data.get("id")
-            
-            # Use id if provided, otherwise use name as identifier
-            identifier = provided_id if provided_id else task_name
-            identifier_to_name[identifier] = task_name
-            
-            # Initialize empty set for this task
-            dependency_graph[identifier] = set()
-            
-            # Collect all dependencies for this task
-            dependencies = task_data.get("dependencies")
-            if dependencies:
-                for dep in dependencies:
-                    if isinstance(dep, dict):
-                        dep_ref = dep.get("id") or dep.get("name")
-                        if dep_ref:
-                            dependency_graph[identifier].add(dep_ref)
-                    else:
-                        dep_ref = str(dep)
-                        dependency_graph[identifier].add(dep_ref)
+        # on_path: nodes in the current DFS path (indicates potential cycle)
+        # done: nodes completely processed, no cycle from here
+        on_path, done = 1, 2
+        state: Dict[str, int] = {}
         
-        # DFS to detect cycles
-        # visited: all nodes we've visited (completely processed)
-        # rec_stack: nodes in current recursion stack (path from root, indicates potential cycle)
-        visited: Set[str] = set()
-        
-        def dfs(node: str, path: List[str]) -> Optional[List[str]]:
-            """
-            DFS to detect cycles.
-            
-            Args:
-                node: Current node being visited
-                path: Current path from root to this node
-            
-            Returns:
-                Cycle path if cycle detected, None otherwise
-            """
-            if node in path:
-                # Found a cycle - extract the cycle path
-                cycle_start = path.index(node)
-                cycle = path[cycle_start:] + [node]  # Complete the cycle
-                return cycle
-            
-            if node in visited:
-                # Already processed this node completely, no cycle from here
-                return None
-            
-            # Mark as visited and add to current path
-            visited.add(node)
-            path.append(node)
-            
-            # Visit all dependencies
-            # Only visit dependencies that exist in the graph (should have been validated already)
-            node_deps = dependency_graph.get(node, set())
-            for dep in node_deps:
+        for start in dependency_graph:
+            if start in state:
+                continue
+            state[start] = on_path
+            path = [start]
+            stack = [iter(dependency_graph[start])]
+            while stack:
+                dep = next(stack[-1], None)
+                if dep is None:
+                    # Backtrack
+                    state[path.pop()] = done
+                    stack.pop()
+                    continue
                 # Skip if dependency is not in the graph (shouldn't happen after validation, but be safe)
                 if dep not in dependency_graph:
                     continue
-                cycle = dfs(dep, path)
-                if cycle:
-                    return cycle
-            
-            # Remove from current path (backtrack)
-            path.pop()
-            return None
-        
-        # Check all nodes for cycles
-        for identifier in dependency_graph.keys():
-            if identifier not in visited:
-                cycle_path = dfs(identifier, [])
-                if cycle_path:
-                    # Format cycle path with task names for better error message
-                    cycle_names = [identifier_to_name.get(id, id) for id in cycle_path]
+                dep_state = state.get(dep)
+                if dep_state == on_path:
+                    # Found a cycle - extract the cycle path and complete it
+                    cycle_path = path[path.index(dep):] + [dep]
+                    cycle_names = [identifier_to_name.get(node, node) for node in cycle_path]
                     raise ValueError(
                         f"Circular dependency detected: {' -> '.join(cycle_names)}. "
                         f"Tasks cannot have circular dependencies as this would cause infinite loops."
                     )
+                if dep_state is None:
+                    state[dep] = on_path
+                    path.append(dep)
+                    stack.append(iter(dependency_graph[dep]))
     
     def _find_dependent_tasks(
         self,
@@ -651,102 +584,82 @@ class TaskCreator:
         Returns:
             List of tasks that depend on any of the specified task identifiers (directly or transitively)
         """
-        # Track all dependent tasks found (to avoid duplicates)
-        found_dependents: Set[int] = set()  # Track by index to avoid duplicates
+        # Reverse index built once: identifier -> indexes of the tasks that depend on it
+        dependents_by_identifier: Dict[str, List[int]] = {}
+        for index, task_data in enumerate(all_tasks):
+            for dep in task_data.get("dependencies") or []:
+                dep_ref = (dep.get("id") or dep.get("name")) if isinstance(dep, dict) else str(dep)
+                if dep_ref:
+                    dependents_by_identifier.setdefault(dep_ref, []).append(index)
+        
+        # Track all dependent tasks found by index (to avoid duplicates)
+        found_dependents: Set[int] = set()
         dependent_tasks: List[Dict[str, Any]] = []
-        
-        # Start with the initial set of task identifiers
-        current_identifiers = task_identifiers.copy()
         processed_identifiers: Set[str] = set()
-        
-        # Recursively find all transitive dependents
-        while current_identifiers:
-            next_identifiers: Set[str] = set()
-            
-            for identifier in current_identifiers:
-                if identifier in processed_identifiers:
+        pending = list(task_identifiers)
+        while pending:
+            identifier = pending.pop()
+            if identifier in processed_identifiers:
+                continue
+            processed_identifiers.add(identifier)
+            for index in dependents_by_identifier.get(identifier, []):
+                if index in found_dependents:
                     continue
-                processed_identifiers.add(identifier)
-                
-                # Find direct dependents
-                for index, task_data in enumerate(all_tasks):
-                    if index in found_dependents:
-                        continue
-                    
-                    dependencies = task_data.get("dependencies")
-                    if not dependencies:
-                        continue
-                    
-                    # Check if this task depends on the current identifier
-                    depends_on_identifier = False
-                    for dep in dependencies:
-                        if isinstance(dep, dict):
-                            dep_ref = dep.get("id") or dep.get("name")
-                            if dep_ref == identifier:
-                                depends_on_identifier = True
-                                break
-                        else:
-                            dep_ref = str(dep)
-                            if dep_ref == identifier:
-                                depends_on_identifier = True
-                                break
-                    
-                    if depends_on_identifier:
-                        found_dependents.add(index)
-                        dependent_tasks.append(task_data)
-                        
-                        # Add this task's identifier to next iteration
-                        task_identifier = task_data.get("id") or task_data.get("name")
-                        if task_identifier and task_identifier not in processed_identifiers:
-                            next_identifiers.add(task_identifier)
-            
-            current_identifiers = next_identifiers
+                found_dependents.add(index)
+                task_data = all_tasks[index]
+                dependent_tasks.append(task_data)
+                task_identifier = task_data.get("id") or task_data.get("name")
+                if task_identifier and task_identifier not in processed_identifiers:
+                    pending.append(task_identifier)
         
         return dependent_tasks
     
     def _validate_dependent_task_inclusion(
         self,
         tasks: List[Dict[str, Any]],
-        provided_ids: Set[str],
-        task_names: Set[str]
+        identifiers: List[str],
+        dependency_graph: Dict[str, List[str]]
     ) -> None:
         """
         Validate that all tasks that depend on tasks in the tree are also included.
         
         Args:
             tasks: List of task dictionaries
-            provided_ids: Set of all provided task IDs
-            task_names: Set of all task names
+            identifiers: Identifier (id or name) of each task, by index
+            dependency_graph: Task identifier -> identifiers it depends on
             
         Raises:
             ValueError: If dependent tasks are missing
         """
-        # Collect all task identifiers in the current tree
-        tree_identifiers: Set[str] = set()
-        for task_data in tasks:
-            provided_id = task_data.get("id")
-            task_name = task_data.get("name")
-            if provided_id:
-                tree_identifiers.add(provided_id)
-            else:
-                tree_identifiers.add(task_name)
+        # All task identifiers in the current tree
+        tree_identifiers: Set[str] = set(identifiers)
         
-        # Find all tasks that depend on tasks in the tree (including transitive)
-        all_dependent_tasks = self._find_transitive_dependents(
-            tree_identifiers, tasks, provided_ids, task_names
-        )
+        # Find all tasks that depend on tasks in the tree (including transitive),
+        # walking the reverse dependency graph once
+        dependents_by_identifier: Dict[str, List[str]] = {}
+        for identifier, dep_refs in dependency_graph.items():
+            for dep_ref in dep_refs:
+                dependents_by_identifier.setdefault(dep_ref, []).append(identifier)
         
-        # Check if all dependent tasks are included in the tree
-        included_identifiers = tree_identifiers.copy()
+        index_by_identifier = {identifier: index for index, identifier in enumerate(identifiers)}
         missing_dependents = []
-        
-        for dep_task in all_dependent_tasks:
-            dep_identifier = dep_task.get("id") or dep_task.get("name")
-            if dep_identifier and dep_identifier not in included_identifiers:
-                missing_dependents.append(dep_task)
+        found: Set[str] = set()
+        pending = list(tree_identifiers)
+        while pending:
+            for dependent in dependents_by_identifier.get(pending.pop(), []):
+                if dependent in found:
+                    continue
+                found.add(dependent)
+                pending.append(dependent)
+                if dependent not in tree_identifiers:
+                    missing_dependents.append(dependent)
         
         if missing_dependents:
-            missing_names = [task.get("name", "Unknown") for task in missing_dependents]
+            missing_names = [
+                tasks[index_by_identifier[identifier]].get("name", "Unknown")
+                if identifier in index_by_identifier else identifier
+                for identifier in missing_dependents
+            ]
             raise ValueError(
                 f"Missing dependent tasks: {missing_names}. "
                 f"All tasks that depend on tasks in the tree must be included. "
@@ -768,18 +681,22 @@ class TaskCreator:
         Returns:
             TaskTreeNode: Root task node with children
         """
-        # Create task node
-        task_node = TaskTreeNode(task=root_task)
-        
-        # Find children (tasks with parent_id == root_task.id)
-        children = [task for task in all_tasks if task.parent_id == root_task.id]
-        
-        # Recursively build children
-        for child_task in children:
-            child_node = await self._build_task_tree(child_task, all_tasks)
-            task_node.add_child(child_node)
+        # Group tasks by parent_id once
+        children_by_parent_id: Dict[str, List[TaskModel]] = {}
+        for task in all_tasks:
+            if task.parent_id is not None:
+                children_by_parent_id.setdefault(task.parent_id, []).append(task)
+        
+        root_node = TaskTreeNode(task=root_task)
+        pending = [root_node]
+        while pending:
+            task_node = pending.pop()
+            for child_task in children_by_parent_id.get(task_node.task.id, []):
+                child_node = TaskTreeNode(task=child_task)
+                task_node.add_child(child_node)
+                pending.append(child_node)
         
-        return task_node
+        return root_node
     
     def tree_to_flat_list(self, root_node: TaskTreeNode) -> List[TaskModel]:
         """
@@ -801,6 +718,16 @@ class TaskCreator:
         collect_children(root_node)
         return tasks
     
+    def _get_tree_nodes(self, root_node: TaskTreeNode) -> List[TaskTreeNode]:
+        """Get all nodes of a tree in pre-order (parents before children)"""
+        nodes = []
+        stack = [root_node]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(reversed(node.children))
+        return nodes
+    
     async def create_task_copy(
         self,
         original_task: TaskModel,
@@ -1004,7 +931,7 @@ class TaskCreator:
             return new_tree
         
         # Step 8: Save copied tree to database
-        await self._save_copied_task_tree(new_tree, None)
+        await self._save_copied_task_tree(new_tree)
         
         # Step 9: Mark all original tasks as having copies
         await self._mark_original_tasks_has_copy(minimal_tree)
@@ -1057,67 +984,42 @@ class TaskCreator:
         if not task_identifiers:
             return []
         
-        # Find tasks that directly depend on any of these identifiers
-        dependent_tasks = []
+        # Reverse index built once: identifier (id or name) -> tasks that depend on it
+        dependents_by_identifier: Dict[str, List[TaskModel]] = {}
         for task in all_tasks:
             dependencies = getattr(task, 'dependencies', None)
-            if dependencies and isinstance(dependencies, list):
-                for dep in dependencies:
-                    if isinstance(dep, dict):
-                        dep_id = dep.get("id")
-                        dep_name = dep.get("name")
-                        if dep_id in task_identifiers or dep_name in task_identifiers:
-                            dependent_tasks.append(task)
-                            break
-                    else:
-                        # Simple string dependency
-                        dep_ref = str(dep)
-                        if dep_ref in task_identifiers:
-                            dependent_tasks.append(task)
-                            break
-        
-        # Recursively find tasks that depend on the dependent tasks
-        all_dependent_tasks = set(dependent_tasks)
-        processed_identifiers = set(task_identifiers)
+            if not dependencies or not isinstance(dependencies, list):
+                continue
+            for dep in dependencies:
+                if isinstance(dep, dict):
+                    dep_refs = {dep.get("id"), dep.get("name")} - {None}
+                else:
+                    # Simple string dependency
+                    dep_refs = {str(dep)}
+                for dep_ref in dep_refs:
+                    dependents_by_identifier.setdefault(dep_ref, []).append(task)
         
-        async def find_transitive_dependents(current_dependent_tasks: List[TaskModel]):
-            """Recursively find tasks that depend on current dependent tasks"""
-            new_dependents = []
-            for dep_task in current_dependent_tasks:
-                dep_id = str(dep_task.id)
-                dep_name = dep_task.name if dep_task.name else None
-                dep_identifiers = {dep_id}
-                if dep_name:
-                    dep_identifiers.add(dep_name)
-                
-                # Only process if not already processed
-                if not dep_identifiers.intersection(processed_identifiers):
-                    processed_identifiers.update(dep_identifiers)
-                    # Find tasks that depend on this dependent task
-                    for task in all_tasks:
-                        if task in all_dependent_tasks:
-                            continue  # Already in the set
-                        task_deps = getattr(task, 'dependencies', None)
-                        if task_deps and isinstance(task_deps, list):
-                            for dep in task_deps:
-                                if isinstance(dep, dict):
-                                    dep_id = dep.get("id")
-                                    dep_name = dep.get("name")
-                                    if dep_id in dep_identifiers or dep_name in dep_identifiers:
-                                        new_dependents.append(task)
-                                        all_dependent_tasks.add(task)
-                                        break
-                                else:
-                                    dep_ref = str(dep)
-                                    if dep_ref in dep_identifiers:
-                                        new_dependents.append(task)
-                                        all_dependent_tasks.add(task)
-                                        break
-            
-            if new_dependents:
-                await find_transitive_dependents(new_dependents)
+        # Find tasks that directly depend on any of these identifiers
+        all_dependent_tasks: Set[TaskModel] = set()
+        for identifier in task_identifiers:
+            all_dependent_tasks.update(dependents_by_identifier.get(identifier, []))
         
-        await find_transitive_dependents(dependent_tasks)
+        # Walk the reverse index to find transitive dependents
+        processed_identifiers = set(task_identifiers)
+        pending = list(all_dependent_tasks)
+        while pending:
+            dep_task = pending.pop()
+            dep_identifiers = {str(dep_task.id)}
+            if dep_task.name:
+                dep_identifiers.add(dep_task.name)
+            if dep_identifiers.intersection(processed_identifiers):
+                continue
+            processed_identifiers.update(dep_identifiers)
+            for identifier in dep_identifiers:
+                for task in dependents_by_identifier.get(identifier, []):
+                    if task not in all_dependent_tasks:
+                        all_dependent_tasks.add(task)
+                        pending.append(task)
         
         return list(all_dependent_tasks)
     
@@ -1139,59 +1041,53 @@ class TaskCreator:
         if not task_identifiers:
             return []
         
-        # Build a map of task identifier to task for quick lookup
+        # Build a map of task identifier to task for quick lookup, and the reverse:
+        # identifier -> tasks known by it (a name may be shared by several tasks)
         tasks_by_identifier: Dict[str, TaskModel] = {}
+        tasks_with_identifier: Dict[str, List[TaskModel]] = {}
         for task in all_tasks:
             task_id = str(task.id)
             tasks_by_identifier[task_id] = task
+            tasks_with_identifier.setdefault(task_id, []).append(task)
             if task.name:
                 tasks_by_identifier[task.name] = task
+                if task.name != task_id:
+                    tasks_with_identifier.setdefault(task.name, []).append(task)
         
-        # Find tasks that directly depend on any of these identifiers (these are the upstream dependencies)
+        # Walk the dependencies level by level, visiting each identifier once
         dependency_tasks = []
+        seen_dependency_tasks: Set[int] = set()
         processed_identifiers = set(task_identifiers)
-        identifiers_to_process = set(task_identifiers)
-        
-        async def find_transitive_dependencies(current_identifiers: Set[str]):
-            """Recursively find tasks that current identifiers depend on"""
-            new_dependency_identifiers = set()
-            
-            # For each task with an identifier in current_identifiers, find its dependencies
-            for task in all_tasks:
-                task_id = str(task.id)
-                task_name = task.name if task.name else None
-                
-                # Check if this task is in current_identifiers
-                if task_id not in current_identifiers and task_name not in current_identifiers:
-                    continue
-                
-                # Get dependencies for this task
-                dependencies = getattr(task, 'dependencies', None)
-                if dependencies and isinstance(dependencies, list):
+        current_identifiers = list(task_identifiers)
+        while current_identifiers:
+            new_dependency_identifiers = []
+            visited_tasks: Set[int] = set()
+            for identifier in current_identifiers:
+                for task in tasks_with_identifier.get(identifier, []):
+                    if id(task) in visited_tasks:
+                        continue
+                    visited_tasks.add(id(task))
+                    
+                    dependencies = getattr(task, 'dependencies', None)
+                    if not dependencies or not isinstance(dependencies, list):
+                        continue
                     for dep in dependencies:
                         if isinstance(dep, dict):
-                            dep_id = dep.get("id")
-                            dep_name = dep.get("name")
-                            dep_identifier = dep_id or dep_name
+                            dep_identifier = dep.get("id") or dep.get("name")
                         else:
                             dep_identifier = str(dep)
                         
                         if dep_identifier and dep_identifier not in processed_identifiers:
                             # Found a new dependency identifier
                             processed_identifiers.add(dep_identifier)
-                            new_dependency_identifiers.add(dep_identifier)
+                            new_dependency_identifiers.append(dep_identifier)
                             
                             # If this dependency identifier corresponds to a task, add it to dependency_tasks
-                            if dep_identifier in tasks_by_identifier:
-                                dep_task = tasks_by_identifier[dep_identifier]
-                                if dep_task not in dependency_tasks:
-                                    dependency_tasks.append(dep_task)
-            
-            # Recursively process new dependency identifiers
-            if new_dependency_identifiers:
-                await find_transitive_dependencies(new_dependency_identifiers)
-        
-        await find_transitive_dependencies(identifiers_to_process)
+                            dep_task = tasks_by_identifier.get(dep_identifier)
+                            if dep_task is not None and id(dep_task) not in seen_dependency_tasks:
+                                seen_dependency_tasks.add(id(dep_task))
+                                dependency_tasks.append(dep_task)
+            current_identifiers = new_dependency_identifiers
         
         return dependency_tasks
     
@@ -1211,38 +1107,27 @@ class TaskCreator:
         Returns:
             Minimal TaskTreeNode containing all required tasks, or None
         """
-        def collect_task_ids(node: TaskTreeNode) -> Set[str]:
-            """Collect all task IDs in the tree"""
-            task_ids = {str(node.task.id)}
-            for child in node.children:
-                task_ids.update(collect_task_ids(child))
-            return task_ids
-        
         # Check if all required tasks are in the tree
-        all_task_ids = collect_task_ids(root_tree)
+        nodes = self._get_tree_nodes(root_tree)
+        all_task_ids = {str(node.task.id) for node in nodes}
         if not required_task_ids.issubset(all_task_ids):
             return None
         
-        def build_minimal_subtree(node: TaskTreeNode) -> Optional[TaskTreeNode]:
+        # A node is kept if it or any descendant is required (children before parents)
+        kept: Set[int] = set()
+        for node in reversed(nodes):
+            if str(node.task.id) in required_task_ids or any(id(child) in kept for child in node.children):
+                kept.add(id(node))
+        
+        def build_minimal_subtree(node: TaskTreeNode) -> TaskTreeNode:
             """Build minimal subtree containing required tasks"""
-            # Collect task IDs in this subtree
-            subtree_task_ids = collect_task_ids(node)
-            
-            # Check if this subtree contains any required tasks
-            if not subtree_task_ids.intersection(required_task_ids):
-                return None
-            
-            # If this node is required or has required descendants, include it
             new_node = TaskTreeNode(task=node.task)
-            
             for child in node.children:
-                child_subtree = build_minimal_subtree(child)
-                if child_subtree:
-                    new_node.add_child(child_subtree)
-            
+                if id(child) in kept:
+                    new_node.add_child(build_minimal_subtree(child))
             return new_node
         
-        return build_minimal_subtree(root_tree)
+        return build_minimal_subtree(root_tree) if id(root_tree) in kept else None
     
     async def create_task_copy_custom(
         self,
@@ -1357,7 +1242,7 @@ class TaskCreator:
             return new_tree
         
         # Step 6: Save copied tree to database
-        await self._save_copied_task_tree(new_tree, None)
+        await self._save_copied_task_tree(new_tree)
         
         # Step 7: Mark all original tasks as having copies
         await self._mark_original_tasks_has_copy(minimal_tree)
@@ -1468,7 +1353,7 @@ class TaskCreator:
             return new_tree
         
         # Step 7: Save copied tree to database
-        await self._save_copied_task_tree(new_tree, None)
+        await self._save_copied_task_tree(new_tree)
         
         # Step 8: Mark all original tasks as having copies
         await self._mark_original_tasks_has_copy(root_tree)
@@ -1505,7 +1390,8 @@ class TaskCreator:
                                    others will be marked as completed with preserved token_usage.
             reset_fields: Optional list of field names to reset.
                          If None, use default reset behavior.
-            save: If True, save to database. If False, create in-memory instances only.
+            save: If True, the copies are prepared for _save_copied_task_tree(), which
+                  inserts the whole tree at once. If False, create preview instances only.
             
         Returns:
             New TaskTreeNode with copied task tree
@@ -1598,7 +1484,8 @@ class TaskCreator:
             root_original_task_id: Root task ID for original_task_id linkage
             parent_id: Parent task ID (will be set after saving)
             reset_fields: Optional list of field names to reset.
-            save: If True, save to database. If False, create in-memory instance only.
+            save: If True, the copy is prepared for _save_copied_task_tree() (not saved yet).
+                  If False, create a preview instance only.
             
         Returns:
             New TaskModel instance ready for execution (status="pending")
@@ -1634,7 +1521,8 @@ class TaskCreator:
                          If None, use default reset behavior.
                          Valid fields: "status", "progress", "result", "error",
                                       "started_at", "completed_at", "updated_at"
-            save: If True, save to database. If False, create in-memory instance only.
+            save: If True, the copy is prepared for _save_copied_task_tree() (not saved yet).
+                  If False, create a preview instance only.
             
         Returns:
             New TaskModel instance with appropriate status
@@ -1646,265 +1534,168 @@ class TaskCreator:
         params_value = getattr(original_task, 'params', None)
         result_value = getattr(original_task, 'result', None)
         
-        # Get current time for new task timestamps
-        current_time = datetime.now(timezone.utc)
-        
-        # Get TaskModel class
-        task_model_class = get_task_model_class()
+        # Use original_task.id as original_task_id (not root_original_task_id) so dependencies can be correctly mapped
+        # Explicitly generate UUID for task.id to ensure uniqueness and clear task tree relationships
+        task_fields: Dict[str, Any] = dict(
+            id=str(uuid.uuid4()),
+            name=original_task.name,
+            user_id=original_task.user_id,
+            parent_id=parent_id,
+            priority=original_task.priority,
+            dependencies=copy.deepcopy(dependencies_value) if dependencies_value else None,
+            inputs=copy.deepcopy(inputs_value) if inputs_value else None,
+            schemas=copy.deepcopy(schemas_value) if schemas_value else None,
+            params=copy.deepcopy(params_value) if params_value else None,
+            original_task_id=str(original_task.id),
+        )
+        if save:
+            # Same initial values as TaskRepository.create_task(); the copied tree is
+            # inserted in one batch by _save_copied_task_tree()
+            task_model_class = self.task_manager.task_repository.task_model_class
+            task_fields.update(
+                dependencies=task_fields["dependencies"] or [],
+                inputs=task_fields["inputs"] or {},
+                schemas=task_fields["schemas"] or {},
+                params=task_fields["params"] or {},
+                status="pending",
+                progress=0.0,
+                has_children=False,
+                has_copy=False,
+                version=1,
+            )
+        else:
+            # In-memory TaskModel instance, never saved
+            task_model_class = get_task_model_class()
+        task = task_model_class(**task_fields)
         
         if should_re_execute:
             # Task needs re-execution: reset to pending, clear all execution results
-            # Use original_task.id as original_task_id (not root_original_task_id) so dependencies can be correctly mapped
-            # Explicitly generate UUID for task.id to ensure uniqueness and clear task tree relationships
-            task_id = str(uuid.uuid4())
-            if save:
-                task = await self.task_manager.task_repository.create_task(
-                    id=task_id,
-                    name=original_task.name,
-                    user_id=original_task.user_id,
-                    parent_id=parent_id,
-                    priority=original_task.priority,
-                    dependencies=copy.deepcopy(dependencies_value) if dependencies_value else None,
-                    inputs=copy.deepcopy(inputs_value) if inputs_value else None,
-                    schemas=copy.deepcopy(schemas_value) if schemas_value else None,
-                    params=copy.deepcopy(params_value) if params_value else None,
-                    original_task_id=str(original_task.id),
-                )
-            else:
-                # Create in-memory TaskModel instance without saving to database
-                task = task_model_class(
-                    id=task_id,
-                    name=original_task.name,
-                    user_id=original_task.user_id,
-                    parent_id=parent_id,
-                    priority=original_task.priority,
-                    dependencies=copy.deepcopy(dependencies_value) if dependencies_value else None,
-                    inputs=copy.deepcopy(inputs_value) if inputs_value else None,
-                    schemas=copy.deepcopy(schemas_value) if schemas_value else None,
-                    params=copy.deepcopy(params_value) if params_value else None,
-                    original_task_id=str(original_task.id),
-                )
-            # Apply field reset logic
             self._reset_task_fields(task, reset_fields)
             return task
+        
+        # Unrelated successful task: preserve completed status and token_usage
+        # Get token_usage from result.token_usage (direct access, no hooks)
+        token_usage = None
+        if isinstance(result_value, dict):
+            token_usage = result_value.get('token_usage')
+        
+        # Preserve result with token_usage if available
+        preserved_result = None
+        if result_value:
+            preserved_result = copy.deepcopy(result_value)
+            # Ensure token_usage is in result if we have it
+            if token_usage and isinstance(preserved_result, dict):
+                preserved_result['token_usage'] = token_usage
+        
+        # Set status and preserve result/token_usage (unless reset_fields specifies otherwise)
+        if reset_fields is None:
+            # Default: preserve completed status
+            task.status = "completed"
+            task.progress = 1.0
+            task.result = preserved_result
+            
+            # Preserve timestamps if available
+            if hasattr(original_task, 'started_at') and original_task.started_at:
+                task.started_at = original_task.started_at
+            if hasattr(original_task, 'completed_at') and original_task.completed_at:
+                task.completed_at = original_task.completed_at
         else:
-            # Unrelated successful task: preserve completed status and token_usage
-            # Get token_usage from result.token_usage (direct access, no hooks)
-            token_usage = None
-            if isinstance(result_value, dict):
-                token_usage = result_value.get('token_usage')
-            
-            # Preserve result with token_usage if available
-            preserved_result = None
-            if result_value:
-                preserved_result = copy.deepcopy(result_value)
-                # Ensure token_usage is in result if we have it
-                if token_usage and isinstance(preserved_result, dict):
-                    preserved_result['token_usage'] = token_usage
-            
-            # Create task with completed status
-            # Use original_task.id as original_task_id (not root_original_task_id) so dependencies can be correctly mapped
-            # Explicitly generate UUID for task.id to ensure uniqueness and clear task tree relationships
-            task_id = str(uuid.uuid4())
-            if save:
-                task = await self.task_manager.task_repository.create_task(
-                    id=task_id,
-                    name=original_task.name,
-                    user_id=original_task.user_id,
-                    parent_id=parent_id,
-                    priority=original_task.priority,
-                    dependencies=copy.deepcopy(dependencies_value) if dependencies_value else None,
-                    inputs=copy.deepcopy(inputs_value) if inputs_value else None,
-                    schemas=copy.deepcopy(schemas_value) if schemas_value else None,
-                    params=copy.deepcopy(params_value) if params_value else None,
-                    original_task_id=str(original_task.id),
-                )
-            else:
-                # Create in-memory TaskModel instance without saving to database
-                task = task_model_class(
-                    id=task_id,
-                    name=original_task.name,
-                    user_id=original_task.user_id,
-                    parent_id=parent_id,
-                    priority=original_task.priority,
-                    dependencies=copy.deepcopy(dependencies_value) if dependencies_value else None,
-                    inputs=copy.deepcopy(inputs_value) if inputs_value else None,
-                    schemas=copy.deepcopy(schemas_value) if schemas_value else None,
-                    params=copy.deepcopy(params_value) if params_value else None,
-                    original_task_id=str(original_task.id),
-                )
-            
-            # Set status and preserve result/token_usage (unless reset_fields specifies otherwise)
-            if reset_fields is None:
-                # Default: preserve completed status
+            # Only reset specified fields, preserve others
+            if "status" not in reset_fields:
                 task.status = "completed"
+            if "progress" not in reset_fields:
                 task.progress = 1.0
+            if "result" not in reset_fields:
                 task.result = preserved_result
-                
-                # Preserve timestamps if available
+            if "started_at" not in reset_fields:
                 if hasattr(original_task, 'started_at') and original_task.started_at:
                     task.started_at = original_task.started_at
+            if "completed_at" not in reset_fields:
                 if hasattr(original_task, 'completed_at') and original_task.completed_at:
                     task.completed_at = original_task.completed_at
-            else:
-                # Only reset specified fields, preserve others
-                if "status" not in reset_fields:
-                    task.status = "completed"
-                if "progress" not in reset_fields:
-                    task.progress = 1.0
-                if "result" not in reset_fields:
-                    task.result = preserved_result
-                if "started_at" not in reset_fields:
-                    if hasattr(original_task, 'started_at') and original_task.started_at:
-                        task.started_at = original_task.started_at
-                if "completed_at" not in reset_fields:
-                    if hasattr(original_task, 'completed_at') and original_task.completed_at:
-                        task.completed_at = original_task.completed_at
-                # Apply reset_fields for fields that should be reset
-                self._reset_task_fields(task, reset_fields)
-            
-            # Update in database only if saving
-            if save:
-                if self.task_manager.is_async:
-                    await self.db.commit()
-                    await self.db.refresh(task)
-                else:
-                    self.db.commit()
-                    self.db.refresh(task)
-            
-            return task
+            # Apply reset_fields for fields that should be reset
+            self._reset_task_fields(task, reset_fields)
+        
+        return task
     
-    async def _save_copied_task_tree(self, node: TaskTreeNode, parent_id: Optional[str] = None):
+    async def _save_copied_task_tree(self, node: TaskTreeNode):
         """
-        Update parent_id and dependencies references for copied task tree.
-        Tasks are already saved by create_task, we need to update parent_id and dependencies
-        to reference tasks within the new copied tree (not the original tree).
+        Link a copied task tree to its new task IDs and save it in one batch.
         
-        IMPORTANT: To avoid db session cache issues, we:
-        1. First, ensure all tasks are flushed/committed so IDs are available
-        2. Build the ID mapping after all tasks are saved
-        3. Update dependencies and parent_id
-        4. Commit and refresh to ensure changes are persisted
+        The copies are in-memory instances whose dependencies still reference the
+        original task IDs. The original -> new ID mapping is built once for the whole
+        tree and every dependency is rewritten from it; the tree is then inserted by
+        TaskRepository.save_task_tree() (parent_id, root_id, one INSERT, one commit).
         
         Args:
-            node: Task tree node to update
-            parent_id: Parent task ID
+            node: Root node of the copied task tree
         """
-        # Step 1: First, ensure all tasks in the tree are flushed to database
-        # This ensures all task IDs are available and avoids cache issues
-        # Tasks are already added to session by create_task, we just need to flush
-        # Flush to database (but don't commit yet) to ensure all IDs are generated
-        if self.task_manager.is_async:
-            await self.db.flush()
-        else:
-            self.db.flush()
+        nodes = self._get_tree_nodes(node)
         
-        # Step 2: Refresh all tasks to ensure we have latest data from database after flush
-        # This avoids cache issues where we might read stale data
-        async def refresh_all_tasks(current_node: TaskTreeNode):
-            """Refresh all tasks to get latest data from database"""
-            task = current_node.task
-            if self.task_manager.is_async:
-                await self.db.refresh(task)
-            else:
-                self.db.refresh(task)
-            for child in current_node.children:
-                await refresh_all_tasks(child)
-        
-        await refresh_all_tasks(node)
-        
-        # Step 3: Build mapping: original_task_id -> new task id for all tasks in the tree
-        # After flush and refresh, all task IDs should be available and up-to-date
-        def build_original_to_new_id_mapping(current_node: TaskTreeNode, mapping: Dict[str, str]):
-            """Build mapping from original_task_id to new task id"""
+        # Mapping: original_task_id -> new task id for all tasks in the tree
+        original_to_new_id: Dict[str, str] = {}
+        for current_node in nodes:
             task = current_node.task
             if task.original_task_id:
-                original_id = str(task.original_task_id)
-                new_id = str(task.id)
-                mapping[original_id] = new_id
-            for child in current_node.children:
-                build_original_to_new_id_mapping(child, mapping)
+                original_to_new_id[str(task.original_task_id)] = str(task.id)
         
-        original_to_new_id: Dict[str, str] = {}
-        build_original_to_new_id_mapping(node, original_to_new_id)
-        
-        # Step 4: Update dependencies to reference new task IDs
-        def update_dependencies(current_node: TaskTreeNode, id_mapping: Dict[str, str]):
-            """Update dependencies to reference new task IDs within the copied tree"""
+        # Update dependencies to reference new task IDs within the copied tree
+        for current_node in nodes:
             task = current_node.task
-            
             dependencies = getattr(task, 'dependencies', None)
-            if dependencies and isinstance(dependencies, list):
-                updated_deps = []
-                for dep in dependencies:
-                    if isinstance(dep, dict):
-                        dep_copy = dep.copy()
-                        # Convert dependency id from original task ID to new task ID
-                        if "id" in dep_copy:
-                            dep_id = str(dep_copy["id"])
-                            if dep_id in id_mapping:
-                                # Map to new task ID in the copied tree
-                                dep_copy["id"] = id_mapping[dep_id]
-                            else:
-                                # If not found in mapping, this dependency references a task outside the copied tree
-                                # This should not happen if the copy logic is correct, but we'll keep it as-is
-                                # and log a warning
-                                logger.warning(
-                                    f"Task {task.id} has dependency {dep_id} that is not in the copied tree. "
-                                    f"Keeping original reference."
-                                )
-                        updated_deps.append(dep_copy)
-                    else:
-                        # String or other format - try to convert
-                        dep_str = str(dep)
-                        if dep_str in id_mapping:
-                            updated_deps.append({"id": id_mapping[dep_str]})
+            if not dependencies or not isinstance(dependencies, list):
+                continue
+            updated_deps = []
+            for dep in dependencies:
+                if isinstance(dep, dict):
+                    dep_copy = dep.copy()
+                    if "id" in dep_copy:
+                        dep_id = str(dep_copy["id"])
+                        if dep_id in original_to_new_id:
+                            dep_copy["id"] = original_to_new_id[dep_id]
                         else:
-                            # Keep original if not found
-                            updated_deps.append(dep)
-                task.dependencies = updated_deps
-            # Recursively update children
-            for child in current_node.children:
-                update_dependencies(child, id_mapping)
-        
-        # Update all dependencies in the tree
-        update_dependencies(node, original_to_new_id)
-        
-        # Step 5: Update parent_id
-        task = node.task
-        if parent_id is not None:
-            task.parent_id = parent_id
-        
-        # Step 6: Save task with updated dependencies and parent_id
-        if self.task_manager.is_async:
-            await self.db.commit()
-            await self.db.refresh(task)
-        else:
-            self.db.commit()
-            self.db.refresh(task)
+                            # References a task outside the copied tree; should not happen
+                            # if the copy logic is correct, keep it as-is
+                            logger.warning(
+                                f"Task {task.id} has dependency {dep_id} that is not in the copied tree. "
+                                f"Keeping original reference."
+                            )
+                    updated_deps.append(dep_copy)
+                else:
+                    # String or other format - try to convert, keep original if not found
+                    dep_str = str(dep)
+                    if dep_str in original_to_new_id:
+                        updated_deps.append({"id": original_to_new_id[dep_str]})
+                    else:
+                        updated_deps.append(dep)
+            task.dependencies = updated_deps
         
-        # Recursively update children
-        for child_node in node.children:
-            await self._save_copied_task_tree(child_node, task.id)
+        await self.task_manager.task_repository.save_task_tree(node)
     
     async def _mark_original_tasks_has_copy(self, node: TaskTreeNode):
         """
-        Recursively mark all original tasks as having copies.
+        Mark all original tasks of a tree as having copies.
+        
+        Sets has_copy with one UPDATE per 1000 tasks; the caller commits.
         
         Args:
             node: Task tree node to mark
         """
-        node.task.has_copy = True
-        if self.task_manager.is_async:
-            await self.db.commit()
-            await self.db.refresh(node.task)
-        else:
-            self.db.commit()
-            self.db.refresh(node.task)
-        
-        # Recursively mark children
-        for child_node in node.children:
-            await self._mark_original_tasks_has_copy(child_node)
+        tasks = [current_node.task for current_node in self._get_tree_nodes(node)]
+        task_model_class = self.task_manager.task_repository.task_model_class
+        task_ids = list({str(task.id) for task in tasks})
+        for offset in range(0, len(task_ids), 1000):
+            stmt = (
+                update(task_model_class.__table__)
+                .where(task_model_class.__table__.c.id.in_(task_ids[offset:offset + 1000]))
+                .values(has_copy=True)
+            )
+            if self.task_manager.is_async:
+                await self.db.execute(stmt)
+            else:
+                self.db.execute(stmt)
+        for task in tasks:
+            set_committed_value(task, "has_copy", True)
     
     def _tree_to_task_array(self, node: TaskTreeNode) -> List[Dict[str, Any]]:
         """
@@ -2022,20 +1813,14 @@ class TaskCreator:
         # Dependencies in copied tasks may reference original task IDs from the original tree
         # We need to map those original IDs to the new IDs of the corresponding copied tasks
         # Strategy: For each dependency ID that's not yet mapped, find the task in the new tree
-        # that corresponds to that original ID (by checking original_task_id or task.id)
-        def find_task_by_original_id(current_node: TaskTreeNode, target_original_id: str) -> Optional[TaskTreeNode]:
-            """Find a task in the tree that corresponds to the given original task ID"""
+        # that corresponds to that original ID (by checking original_task_id or task.id),
+        # using an index built once: original ID -> first task (pre-order) that matches it
+        nodes_by_original_id: Dict[str, TaskTreeNode] = {}
+        for current_node in self._get_tree_nodes(node):
             task = current_node.task
-            # Check if this task's original_task_id matches, or if task.id matches (for direct references)
-            if (task.original_task_id and str(task.original_task_id) == target_original_id) or \
-               str(task.id) == target_original_id:
-                return current_node
-            # Recursively check children
-            for child in current_node.children:
-                result = find_task_by_original_id(child, target_original_id)
-                if result:
-                    return result
-            return None
+            if task.original_task_id:
+                nodes_by_original_id.setdefault(str(task.original_task_id), current_node)
+            nodes_by_original_id.setdefault(str(task.id), current_node)
         
         def map_dependency_ids(current_node: TaskTreeNode):
             """Map all dependency IDs in the tree to new task IDs"""
@@ -2047,7 +1832,7 @@ class TaskCreator:
                         dep_id = str(dep["id"])
                         # If this dependency ID is not yet mapped, find the corresponding task in the new tree
                         if dep_id not in task_id_to_new_id:
-                            found_node = find_task_by_original_id(node, dep_id)
+                            found_node = nodes_by_original_id.get(dep_id)
                             if found_node:
                                 # Map the dependency ID to the new ID of the found task
                                 found_new_id = task_id_to_new_id[str(found_node.task.id)]
@@ -2057,6 +1842,13 @@ class TaskCreator:
                 map_dependency_ids(child)
         map_dependency_ids(node)
         
+        # Name -> new id of the first mapped task with that name (for name-based references)
+        new_id_by_name: Dict[str, str] = {}
+        for orig_id, new_id in task_id_to_new_id.items():
+            name = task_id_to_name.get(orig_id)
+            if name is not None:
+                new_id_by_name.setdefault(name, new_id)
+        
         # Fourth pass: build task array with id and name-based references
         def collect_tasks(current_node: TaskTreeNode, parent_name: Optional[str] = None, parent_id: Optional[str] = None):
             task = current_node.task
@@ -2078,8 +1870,11 @@ class TaskCreator:
             
             # Get all TaskModel fields and their values
             for column_name in task_columns:
-                # Skip id (already set above), parent_id (handled separately above), created_at, updated_at, has_copy (these are auto-generated or not needed for create)
-                if column_name in ("id", "parent_id", "created_at", "updated_at", "has_copy"):
+                # Skip id (already set above), parent_id (handled separately above), created_at, updated_at, has_copy, version, root_id, input_fingerprint, attempts, last_error (these are auto-generated or not needed for create)
+                if column_name in (
+                    "id", "parent_id", "created_at", "updated_at", "has_copy", "version", "root_id",
+                    "input_fingerprint", "attempts", "last_error",
+                ):
                     continue
                 
                 # Get value from task
@@ -2116,13 +1911,10 @@ class TaskCreator:
                                 elif "name" in dep_copy:
                                     dep_name = dep_copy["name"]
                                     # Find task with this name and use its new id
-                                    found = False
-                                    for orig_id, new_id in task_id_to_new_id.items():
-                                        if task_id_to_name.get(orig_id) == dep_name:
-                                            dep_copy["id"] = new_id
-                                            del dep_copy["name"]
-                                            found = True
-                                            break
+                                    found = dep_name in new_id_by_name
+                                    if found:
+                                        dep_copy["id"] = new_id_by_name[dep_name]
+                                        del dep_copy["name"]
                                     if not found:
                                         raise ValueError(
                                             f"Dependency name '{dep_name}' not found in task tree. "
@@ -2136,12 +1928,9 @@ class TaskCreator:
                                     converted_deps.append({"id": task_id_to_new_id[dep_str]})
                                 else:
                                     # Try to find by name
-                                    found = False
-                                    for orig_id, new_id in task_id_to_new_id.items():
-                                        if task_id_to_name.get(orig_id) == dep_str:
-                                            converted_deps.append({"id": new_id})
-                                            found = True
-                                            break
+                                    found = dep_str in new_id_by_name
+                                    if found:
+                                        converted_deps.append({"id": new_id_by_name[dep_str]})
                                     if not found:
                                         raise ValueError(
                                             f"Dependency '{dep_str}' not found in task tree. "
@@ -1,12 +1,12 @@
 """
 Task executor for AIPartnerUpFlow that manages task tree execution
 """
+import asyncio
 import uuid
 import copy
 from typing import Dict, Any, List, Optional, Union
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from aipartnerupflow.core.execution.task_manager import TaskManager
 from aipartnerupflow.core.execution.task_tracker import TaskTracker
 from aipartnerupflow.core.types import TaskTreeNode
@@ -18,7 +18,10 @@ from aipartnerupflow.core.config import (
     get_post_hooks,
     get_use_task_creator,
     get_require_existing_tasks,
+    get_incremental_reexecution,
+    get_batch_max_concurrency,
 )
+from aipartnerupflow.core.execution.incremental import select_tasks_for_incremental_reexecution
 from aipartnerupflow.core.utils.logger import get_logger
 
 # Auto-import extensions to register extensions and tools when TaskExecutor is imported
@@ -97,7 +100,7 @@ class TaskExecutor:
             f"post_hooks: {len(self.post_hooks)})"
         )
 
-    def _mark_tasks_for_reexecution(self, task_tree: TaskTreeNode) -> set[str]:
+    def _mark_tasks_for_reexecution(self, task_tree: TaskTreeNode, incremental: bool = False) -> set[str]:
         """
         Mark tasks in the task tree that need re-execution
         
@@ -107,12 +110,20 @@ class TaskExecutor:
         
         Does NOT mark pending tasks (newly created tasks should execute normally).
         
+        With incremental=True, only failed tasks, completed tasks whose input fingerprint
+        changed and the completed tasks that may be affected by them are marked (see
+        core.execution.incremental).
+        
         Args:
             task_tree: Root TaskTreeNode to mark
+            incremental: Whether to select tasks by input fingerprint
             
         Returns:
             Set of task IDs marked for re-execution
         """
+        if incremental:
+            return select_tasks_for_incremental_reexecution(task_tree)
+        
         tasks_to_reexecute = set()
         
         def collect_task_ids(node: TaskTreeNode):
@@ -190,7 +201,9 @@ class TaskExecutor:
         try:
             # Mark all tasks in the tree for re-execution
             # This ensures failed tasks and their dependencies are re-executed
-            tasks_to_reexecute = self._mark_tasks_for_reexecution(task_tree)
+            # (incremental mode: only failed tasks and tasks whose inputs may have changed)
+            incremental = get_incremental_reexecution()
+            tasks_to_reexecute = self._mark_tasks_for_reexecution(task_tree, incremental=incremental)
             
             # Create TaskManager with hooks (cached at initialization)
             # In production, hooks are registered at application startup before TaskExecutor creation
@@ -201,7 +214,8 @@ class TaskExecutor:
                 pre_hooks=self.pre_hooks,
                 post_hooks=self.post_hooks,
                 executor_instances=self._executor_instances,  # Pass shared executor instances
-                use_demo=use_demo  # Pass use_demo flag
+                use_demo=use_demo,  # Pass use_demo flag
+                incremental_reexecution=incremental
             )
             
             # Set tasks to re-execute in TaskManager
@@ -466,14 +480,12 @@ class TaskExecutor:
             task_tree: Root task tree node
             db_session: Database session
         """
-        is_async = isinstance(db_session, AsyncSession)
-        
         # Get all column names from the model class (supports custom TaskModel)
         # This avoids hardcoding field names and makes the code maintainable
         model_columns = set(self.task_model_class.__table__.columns.keys())
         
         # Fields that should never be updated (read-only or auto-managed)
-        readonly_fields = {'id', 'created_at', 'updated_at'}
+        readonly_fields = {'id', 'created_at', 'updated_at', 'version', 'root_id'}
         
         def should_update_field(key: str, value: Any, existing_value: Any) -> bool:
             """
@@ -550,78 +562,31 @@ class TaskExecutor:
             merged.update(copy.deepcopy(new))
             return merged
         
-        async def save_node_async(node: TaskTreeNode):
-            """Recursively save tasks (async)"""
-            # Check if task already exists
-            existing = await db_session.get(self.task_model_class, node.task.id)
-            
-            if not existing:
-                # New task: add directly
-                db_session.add(node.task)
-            else:
-                # Existing task: update fields intelligently
-                for key, value in node.task.__dict__.items():
-                    if not hasattr(existing, key):
-                        continue
-                    
-                    if not should_update_field(key, value, getattr(existing, key, None)):
-                        continue
-                    
-                    # Special handling for inputs: deep merge instead of overwrite
-                    # This preserves pre-hook modifications
-                    if key == 'inputs':
-                        existing_value = existing.inputs or {}
-                        new_value = value  # Keep original value (could be None or {})
-                        merged_value = merge_inputs(existing_value, new_value, existing.id)
-                        setattr(existing, key, merged_value)
-                    else:
-                        # For other fields: direct update
-                        setattr(existing, key, value)
-            
-            # Recursively save children
-            for child in node.children:
-                await save_node_async(child)
-        
-        def save_node_sync(node: TaskTreeNode):
-            """Recursively save tasks (sync)"""
-            # Check if task already exists
-            result = db_session.execute(select(self.task_model_class).filter(self.task_model_class.id == node.task.id))
-            existing = result.scalar_one_or_none()
-            
-            if not existing:
-                # New task: add directly
-                db_session.add(node.task)
-            else:
-                # Existing task: update fields intelligently
-                for key, value in node.task.__dict__.items():
-                    if not hasattr(existing, key):
-                        continue
-                    
-                    if not should_update_field(key, value, getattr(existing, key, None)):
-                        continue
-                    
-                    # Special handling for inputs: deep merge instead of overwrite
-                    # This preserves pre-hook modifications
-                    if key == 'inputs':
-                        existing_value = existing.inputs or {}
-                        new_value = value  # Keep original value (could be None or {})
-                        merged_value = merge_inputs(existing_value, new_value, existing.id)
-                        setattr(existing, key, merged_value)
-                    else:
-                        # For other fields: direct update
-                        setattr(existing, key, value)
-            
-            # Recursively save children
-            for child in node.children:
-                save_node_sync(child)
-        
-        # Save all tasks
-        if is_async:
-            await save_node_async(task_tree)
-            await db_session.commit()
-        else:
-            save_node_sync(task_tree)
-            db_session.commit()
+        def update_existing(existing: Any, task: Any) -> None:
+            """Update an existing task intelligently from its tree node task"""
+            for key, value in task.__dict__.items():
+                if not hasattr(existing, key):
+                    continue
+                
+                if not should_update_field(key, value, getattr(existing, key, None)):
+                    continue
+                
+                # Special handling for inputs: deep merge instead of overwrite
+                # This preserves pre-hook modifications
+                if key == 'inputs':
+                    existing_value = existing.inputs or {}
+                    new_value = value  # Keep original value (could be None or {})
+                    merged_value = merge_inputs(existing_value, new_value, existing.id)
+                    setattr(existing, key, merged_value)
+                else:
+                    # For other fields: direct update
+                    setattr(existing, key, value)
+        
+        # Save all tasks: one IN query for the existing ids, one INSERT for the new
+        # tasks and a single commit (see TaskRepository.save_task_tree())
+        from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
+        task_repository = TaskRepository(db_session, task_model_class=self.task_model_class)
+        await task_repository.save_task_tree(task_tree, update_existing=update_existing)
         
         logger.info(f"Saved task tree to database: root {task_tree.task.id}")
 
@@ -740,6 +705,100 @@ class TaskExecutor:
         
         return execution_result
 
+    async def execute_task_batch(
+        self,
+        task_arrays: List[List[Dict[str, Any]]],
+        use_demo: bool = False,
+        max_concurrency: Optional[int] = None,
+        db_session: Optional[Union[Session, AsyncSession]] = None
+    ) -> Dict[str, Any]:
+        """
+        Create several independent task trees in one transaction and execute them together
+
+        All arrays are validated before anything is written; see
+        TaskCreator.create_task_trees_from_arrays() and execute_task_trees().
+
+        Args:
+            task_arrays: One task array per tree
+            use_demo: If True, executors return demo data instead of executing (default: False)
+            max_concurrency: Maximum number of trees executed at once
+                           (default: get_batch_max_concurrency())
+            db_session: Optional database session used to create the trees
+
+        Returns:
+            Dictionary with status ("completed" if every tree completed, otherwise "partial"),
+            root_task_ids and the execution result of every tree
+        """
+        if not task_arrays:
+            raise ValueError("No task trees provided")
+
+        if db_session is None:
+            async with create_pooled_session() as session:
+                return await self.execute_task_batch(
+                    task_arrays=task_arrays,
+                    use_demo=use_demo,
+                    max_concurrency=max_concurrency,
+                    db_session=session,
+                )
+
+        from aipartnerupflow.core.execution.task_creator import TaskCreator
+        task_trees = await TaskCreator(db_session).create_task_trees_from_arrays(task_arrays)
+        root_task_ids = [task_tree.task.id for task_tree in task_trees]
+
+        results = await self.execute_task_trees(
+            root_task_ids, use_demo=use_demo, max_concurrency=max_concurrency
+        )
+        all_completed = all(result.get("status") == "completed" for result in results)
+        return {
+            "status": "completed" if all_completed else "partial",
+            "root_task_ids": root_task_ids,
+            "results": results,
+        }
+
+    async def execute_task_trees(
+        self,
+        root_task_ids: List[str],
+        use_streaming: bool = False,
+        streaming_callbacks_contexts: Optional[Dict[str, Any]] = None,
+        use_demo: bool = False,
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute several existing task trees concurrently
+
+        Every tree runs in its own pooled session; at most max_concurrency trees run
+        at once so the batch stays within the session pool limit. A tree that fails
+        to start does not stop the others.
+
+        Args:
+            root_task_ids: Root task IDs of the trees
+            use_streaming: Whether to use streaming mode
+            streaming_callbacks_contexts: Root task ID -> streaming context (if use_streaming is True)
+            use_demo: If True, executors return demo data instead of executing (default: False)
+            max_concurrency: Maximum number of trees executed at once
+                           (default: get_batch_max_concurrency())
+
+        Returns:
+            Execution result of every tree, in the order of root_task_ids
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or get_batch_max_concurrency()))
+        streaming_callbacks_contexts = streaming_callbacks_contexts or {}
+
+        async def execute_one(root_task_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.execute_task_by_id(
+                        root_task_id,
+                        use_streaming=use_streaming,
+                        streaming_callbacks_context=streaming_callbacks_contexts.get(root_task_id),
+                        use_demo=use_demo,
+                    )
+                except Exception as e:
+                    logger.error(f"Error executing task tree {root_task_id}: {str(e)}", exc_info=True)
+                    return {"status": "failed", "root_task_id": root_task_id, "error": str(e)}
+
+        return list(await asyncio.gather(*(execute_one(root_task_id) for root_task_id in root_task_ids)))
+
     async def _load_existing_task_tree(
         self,
         tasks: List[Union[str, Dict[str, Any]]],
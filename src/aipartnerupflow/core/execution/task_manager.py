@@ -5,8 +5,9 @@ Task management service for orchestrating and executing tasks
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List, Union, Callable, Awaitable
+from typing import Dict, Any, Optional, List, Tuple, Union, Callable, Awaitable
 import asyncio
+import time
 from decimal import Decimal
 from inspect import iscoroutinefunction
 from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
@@ -19,12 +20,66 @@ from aipartnerupflow.core.types import (
     TaskPostHook,
     TaskStatus,
 )
-from aipartnerupflow.core.config import get_pre_hooks, get_post_hooks, get_task_model_class, get_task_tree_hooks
+from aipartnerupflow.core.config import (
+    get_pre_hooks,
+    get_post_hooks,
+    get_task_model_class,
+    get_task_tree_hooks,
+    get_scheduler_mode,
+    get_scheduler_max_workers,
+    get_incremental_reexecution,
+    get_cancellation_grace_period,
+    get_critical_path_scheduling,
+)
 from aipartnerupflow.core.execution.dependency_resolver import (
     are_dependencies_satisfied,
     resolve_task_dependencies,
     get_completed_tasks_by_id,
 )
+from aipartnerupflow.core.execution.tree_state import TaskTreeState
+from aipartnerupflow.core.execution.result_references import (
+    get_referenced_task_ids,
+    has_result_references,
+    materialize_result_references,
+)
+from aipartnerupflow.core.execution.incremental import (
+    compute_input_fingerprint,
+    get_dependency_ids,
+    is_task_up_to_date,
+)
+from aipartnerupflow.core.execution.scheduler import ReadyQueueScheduler
+from aipartnerupflow.core.execution.fan_out import ChildTaskRunner, prune_spawned_children
+from aipartnerupflow.core.execution.concurrency import ConcurrencyLease, get_concurrency_limiter
+from aipartnerupflow.core.execution.deadlines import (
+    TaskTimeoutError,
+    get_remaining_time,
+    get_task_timeout,
+    get_tree_deadline,
+    run_with_timeout,
+)
+from aipartnerupflow.core.execution.cancellation import (
+    CancellationToken,
+    TaskCancelledError,
+    get_cancellation_registry,
+)
+from aipartnerupflow.core.execution.retry import (
+    RetryPolicy,
+    get_failure_message,
+    get_retry_policy,
+    is_error_result,
+)
+from aipartnerupflow.core.execution.lanes import (
+    EVENT_LOOP_LANE,
+    get_execution_lane,
+    get_execution_lanes,
+)
+from aipartnerupflow.core.execution.duration_stats import get_executor_stats
+from aipartnerupflow.core.execution.result_cache import (
+    get_cache_options,
+    get_result_cache_backend,
+    is_cacheable_result,
+    make_cache_key,
+)
 from aipartnerupflow.core.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -75,7 +130,9 @@ class TaskManager:
         pre_hooks: Optional[List[TaskPreHook]] = None,
         post_hooks: Optional[List[TaskPostHook]] = None,
         executor_instances: Optional[Dict[str, Any]] = None,
-        use_demo: bool = False
+        use_demo: bool = False,
+        scheduler_mode: Optional[str] = None,
+        incremental_reexecution: Optional[bool] = None
     ):
         """
         Initialize TaskManager
@@ -107,6 +164,14 @@ class TaskManager:
             use_demo: If True, executors return demo data instead of executing (default: False)
                 This is an execution option, not a task input. It's passed as a parameter to TaskManager
                 and used by TaskManager._execute_task_with_schemas() to determine whether to return demo data.
+            scheduler_mode: Optional scheduler mode ("recursive" or "ready_queue")
+                Falls back to the config registry (see set_scheduler_mode()).
+                "ready_queue" dispatches tasks from a dependency-counted priority heap
+                to a bounded worker pool instead of walking the tree by priority groups.
+            incremental_reexecution: Optional incremental re-execution flag
+                Falls back to the config registry (see set_incremental_reexecution()).
+                When enabled, tasks marked for re-execution are only executed again if
+                their input fingerprint changed once their dependencies settled.
         """
         self.db = db
         self.is_async = isinstance(db, AsyncSession)
@@ -128,6 +193,30 @@ class TaskManager:
         # Track tasks that should be re-executed (even if they are completed or failed)
         # This allows re-executing failed tasks and ensures dependencies are also re-executed
         self._tasks_to_reexecute: set[str] = set()
+        # Incremental re-execution: marked tasks not settled yet (dependents wait for them)
+        # and marked tasks already started in this run (built in _execute_task_tree)
+        self.incremental_reexecution = (
+            incremental_reexecution if incremental_reexecution is not None else get_incremental_reexecution()
+        )
+        self._reexecution_unsettled: Optional[set[str]] = None
+        self._reexecution_started: set[str] = set()
+        # In-memory state index of the tree being distributed (built in distribute_task_tree*)
+        self._tree_state: Optional[TaskTreeState] = None
+        # Cancellation tokens of the tree being executed (registered in _execute_task_tree)
+        self._cancellation_tokens: Dict[str, CancellationToken] = {}
+        # Deadline of the tree being executed (epoch seconds, from the root's schemas.deadline)
+        self._tree_deadline: Optional[float] = None
+        # Retry policies (schemas.retry): attempts per task in this run, delays handed to the
+        # ready-queue scheduler, and tasks currently waiting for their next attempt
+        self._retry_attempts: Dict[str, int] = {}
+        self._retry_delays: Dict[str, float] = {}
+        self._retry_waiting: set[str] = set()
+        # Concurrency leases of running tasks (released by ChildTaskRunner while children run)
+        self._concurrency_leases: Dict[str, ConcurrencyLease] = {}
+        # Scheduler mode - provided value or config registry
+        self.scheduler_mode = scheduler_mode or get_scheduler_mode()
+        # True while the ready-queue scheduler owns dependent task triggering
+        self._ready_queue_active = False
         # Demo mode flag - if True, executors return demo data instead of executing
         self.use_demo = use_demo
     
@@ -143,6 +232,9 @@ class TaskManager:
         1. Checks if task is running
         2. If executor supports cancellation, calls executor.cancel() to get cancellation result
         3. Updates database with cancelled status and token_usage from cancellation result
+        4. Cancels the task's cancellation token, so the running executor sees its
+           cancellation_checker return True (and is stopped after the grace period)
+        5. Cancels all pending and in_progress descendants the same way
         
         Args:
             task_id: Task ID to cancel
@@ -154,6 +246,7 @@ class TaskManager:
                 "status": "cancelled" | "failed",
                 "message": str,
                 "token_usage": Dict,  # Optional token usage from executor
+                "cancelled_descendants": List[str],  # Optional descendant task IDs cancelled too
             }
         """
         try:
@@ -175,84 +268,21 @@ class TaskManager:
                 }
             
             logger.info(f"Cancelling task {task_id} (current status: {task.status})")
-            
-            # If task is in_progress and executor supports cancellation, call executor.cancel()
-            cancel_result = None
-            token_usage = None
-            result_data = None
-            executor_cancelled = False  # Track if executor.cancel() was actually called
-            
-            if task.status == "in_progress":
-                executor = self._executor_instances.get(task_id)
-                if executor and hasattr(executor, 'cancel'):
-                    try:
-                        logger.info(f"Calling executor.cancel() for task {task_id}")
-                        cancel_result = await executor.cancel()
-                        executor_cancelled = True
-                        logger.info(f"Executor {executor.__class__.__name__} cancel() returned: {cancel_result}")
-                        
-                        if cancel_result and cancel_result.get("status") == "cancelled":
-                            token_usage = cancel_result.get("token_usage")
-                            # Use result if available, otherwise use partial_result
-                            result_data = cancel_result.get("result") or cancel_result.get("partial_result")
-                    except Exception as e:
-                        logger.warning(f"Failed to call executor.cancel() for task {task_id}: {str(e)}")
-                        cancel_result = {
-                            "status": "failed",
-                            "message": f"Failed to cancel executor: {str(e)}",
-                            "error": str(e)
-                        }
-            
-            # Update database with cancelled status
-            error_msg = error_message or (cancel_result.get("message") if cancel_result else "Cancelled by user")
-            
-            # Prepare update data - merge all fields in one update
-            update_data = {
-                "status": "cancelled",
-                "error": error_msg,
-                "completed_at": datetime.now(timezone.utc)
-            }
-            
-            # If we have result data (from executor.cancel()), save it
-            if result_data:
-                update_data["result"] = result_data
-            
-            # If token_usage is available, merge it into result
-            # If result_data exists, merge token_usage into it; otherwise create new dict
-            if token_usage:
-                if result_data and isinstance(result_data, dict):
-                    # Merge token_usage into existing result
-                    result_with_token = result_data.copy()
-                    result_with_token["token_usage"] = token_usage
-                    update_data["result"] = result_with_token
-                else:
-                    # Create new result dict with token_usage
-                    update_data["result"] = {"token_usage": token_usage}
-            
-            # Update task status in one call (combines status, error, result, token_usage)
-            await self.task_repository.update_task_status(
-                task_id=task_id,
-                **update_data
-            )
-            
-            # Clear executor reference
-            # Clear executor reference and task context to prevent memory leaks
-            executor = self._executor_instances.pop(task_id, None)
-            if executor and hasattr(executor, 'clear_task_context'):
-                executor.clear_task_context()
-                logger.debug(f"Cleared task context for task {task_id} during cancellation")
-            
-            # Build return result
-            result = {
-                "status": "cancelled",
-                "message": error_msg,
-            }
-            
-            if token_usage:
-                result["token_usage"] = token_usage
-            
-            if result_data:
-                result["result"] = result_data
+            result = await self._cancel_task_execution(task, error_message)
+            
+            # Wake the running execution of the task and its descendants (live tokens)
+            get_cancellation_registry().cancel(task_id, result["message"])
+            
+            # Cancelling a parent cancels all its pending and running descendants
+            cancelled_descendants = []
+            for descendant in await self.task_repository.get_all_children_recursive(task_id):
+                if descendant.status not in ["pending", "in_progress"]:
+                    continue
+                await self._cancel_task_execution(descendant, f"Parent task {task_id} was cancelled")
+                cancelled_descendants.append(str(descendant.id))
+            if cancelled_descendants:
+                result["cancelled_descendants"] = cancelled_descendants
+                logger.info(f"Cancelled {len(cancelled_descendants)} descendants of task {task_id}")
             
             logger.info(f"Task {task_id} cancelled successfully")
             return result
@@ -264,6 +294,104 @@ class TaskManager:
                 "message": f"Failed to cancel task {task_id}",
                 "error": str(e)
             }
+    
+    async def _cancel_task_execution(
+        self,
+        task: TaskModel,
+        error_message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Cancel one task: call executor.cancel(), store the cancelled status and stop its lane call
+        
+        Args:
+            task: Pending or in_progress task
+            error_message: Optional error message for cancellation
+            
+        Returns:
+            Cancellation result ("status", "message", optional "token_usage" and "result")
+        """
+        task_id = str(task.id)
+        
+        # If task is in_progress and executor supports cancellation, call executor.cancel()
+        cancel_result = None
+        token_usage = None
+        result_data = None
+        
+        if task.status == "in_progress":
+            executor = self._executor_instances.get(task_id)
+            if executor and hasattr(executor, 'cancel'):
+                try:
+                    logger.info(f"Calling executor.cancel() for task {task_id}")
+                    cancel_result = await executor.cancel()
+                    logger.info(f"Executor {executor.__class__.__name__} cancel() returned: {cancel_result}")
+                    
+                    if cancel_result and cancel_result.get("status") == "cancelled":
+                        token_usage = cancel_result.get("token_usage")
+                        # Use result if available, otherwise use partial_result
+                        result_data = cancel_result.get("result") or cancel_result.get("partial_result")
+                except Exception as e:
+                    logger.warning(f"Failed to call executor.cancel() for task {task_id}: {str(e)}")
+                    cancel_result = {
+                        "status": "failed",
+                        "message": f"Failed to cancel executor: {str(e)}",
+                        "error": str(e)
+                    }
+        
+        # Update database with cancelled status
+        error_msg = error_message or (cancel_result.get("message") if cancel_result else "Cancelled by user")
+        
+        # Prepare update data - merge all fields in one update
+        update_data = {
+            "status": "cancelled",
+            "error": error_msg,
+            "completed_at": datetime.now(timezone.utc)
+        }
+        
+        # If we have result data (from executor.cancel()), save it
+        if result_data:
+            update_data["result"] = result_data
+        
+        # If token_usage is available, merge it into result
+        # If result_data exists, merge token_usage into it; otherwise create new dict
+        if token_usage:
+            if result_data and isinstance(result_data, dict):
+                # Merge token_usage into existing result
+                result_with_token = result_data.copy()
+                result_with_token["token_usage"] = token_usage
+                update_data["result"] = result_with_token
+            else:
+                # Create new result dict with token_usage
+                update_data["result"] = {"token_usage": token_usage}
+        
+        # Update task status in one call (combines status, error, result, token_usage)
+        await self._update_task_status(
+            task_id=task_id,
+            **update_data
+        )
+        
+        # Stop waiting for an execution running in a thread/process lane
+        # (after the status is stored, so the waiting task sees "cancelled")
+        get_execution_lanes().cancel(task_id)
+        
+        # Clear executor reference and task context to prevent memory leaks
+        executor = self._executor_instances.pop(task_id, None)
+        if executor and hasattr(executor, 'clear_task_context'):
+            executor.clear_task_context()
+            logger.debug(f"Cleared task context for task {task_id} during cancellation")
+        
+        # Build return result
+        result = {
+            "status": "cancelled",
+            "message": error_msg,
+        }
+        
+        if token_usage:
+            result["token_usage"] = token_usage
+        
+        if result_data:
+            result["result"] = result_data
+        
+        return result
 
     
     async def distribute_task_tree(
@@ -283,6 +411,12 @@ class TaskManager:
         """
         logger.info(f"Distributing task tree with root task: {task_tree.task.id}")
         
+        # Children spawned by a previous run are replaced when their parent runs again
+        prune_spawned_children(task_tree)
+        
+        # Build the in-memory state index once; dependency checks read from it
+        self._tree_state = TaskTreeState.from_task_tree(task_tree)
+        
         root_task = task_tree.task
         
         # Call on_tree_created hook
@@ -293,7 +427,7 @@ class TaskManager:
         
         try:
             # Execute task tree
-            await self._execute_task_tree_recursive(task_tree, use_callback)
+            await self._execute_task_tree(task_tree, use_callback)
             
             # Check final status
             final_status = task_tree.calculate_status()
@@ -310,6 +444,9 @@ class TaskManager:
             # Call on_tree_failed hook
             await self._call_task_tree_hooks("on_tree_failed", root_task, str(e))
             raise
+        finally:
+            # Write any buffered (write-behind) status updates
+            await self.task_repository.flush_pending_updates()
     
     async def distribute_task_tree_with_streaming(
         self,
@@ -325,6 +462,12 @@ class TaskManager:
         """
         logger.info(f"Distributing task tree with streaming, root task: {task_tree.task.id}")
         
+        # Children spawned by a previous run are replaced when their parent runs again
+        prune_spawned_children(task_tree)
+        
+        # Build the in-memory state index once; dependency checks read from it
+        self._tree_state = TaskTreeState.from_task_tree(task_tree)
+        
         # Enable streaming mode and set root task ID
         self.stream = True
         self.streaming_final = False
@@ -347,7 +490,7 @@ class TaskManager:
             task_tree_root_id = task_tree.task.id
             
             # Execute task tree with progress streaming
-            await self._execute_task_tree_recursive(task_tree, use_callback)
+            await self._execute_task_tree(task_tree, use_callback)
             
             # Check final status
             final_progress = task_tree.calculate_progress()
@@ -387,6 +530,61 @@ class TaskManager:
             # Call on_tree_failed hook
             await self._call_task_tree_hooks("on_tree_failed", root_task, str(e))
             raise
+        finally:
+            # Write any buffered (write-behind) status updates
+            await self.task_repository.flush_pending_updates()
+    
+    async def _execute_task_tree(
+        self,
+        task_tree: TaskTreeNode,
+        use_callback: bool = True
+    ) -> None:
+        """
+        Execute task tree with the configured scheduler mode
+        
+        Args:
+            task_tree: Root task tree node
+            use_callback: Whether to use callbacks
+        """
+        if self.incremental_reexecution:
+            self._reexecution_unsettled = set(self._tasks_to_reexecute)
+            self._reexecution_started = set()
+        
+        # Time budget of the whole tree (schemas.deadline of the root task)
+        self._tree_deadline = get_tree_deadline(task_tree.task)
+        self._retry_attempts = {}
+        self._retry_delays = {}
+        
+        # Live cancellation tokens, reachable from cancel_task() of any TaskManager
+        self._cancellation_tokens = get_cancellation_registry().register_tree(task_tree)
+        try:
+            if self.scheduler_mode != "ready_queue":
+                await self._execute_task_tree_recursive(task_tree, use_callback)
+            else:
+                # Expected executor durations for critical-path ordering
+                if get_critical_path_scheduling():
+                    try:
+                        await get_executor_stats().load(self.db)
+                    except Exception as e:
+                        logger.warning(f"Failed to load executor duration statistics: {str(e)}")
+                # Dependent tasks are released by the scheduler, not by execute_after_task
+                self._ready_queue_active = True
+                try:
+                    scheduler = ReadyQueueScheduler(self, max_workers=get_scheduler_max_workers())
+                    await scheduler.run(task_tree, use_callback)
+                finally:
+                    self._ready_queue_active = False
+            
+            # Tasks still waiting when the deadline passed can no longer finish in time
+            if self._is_past_deadline():
+                await self._fail_unfinished_tasks(task_tree)
+        finally:
+            get_cancellation_registry().unregister_tree(self._cancellation_tokens)
+            self._cancellation_tokens = {}
+            try:
+                await get_executor_stats().flush(self.db)
+            except Exception as e:
+                logger.warning(f"Failed to store executor duration statistics: {str(e)}")
     
     async def _execute_task_tree_recursive(
         self,
@@ -438,6 +636,9 @@ class TaskManager:
             # Allow re-execution of failed tasks and pending tasks
             # Skip only completed and in_progress tasks (unless marked for re-execution)
             task_id = str(node.task.id)
+            if self._is_cancelled(task_id):
+                logger.info(f"Task {task_id} was cancelled, skipping its subtree")
+                return
             if node.task.status in ["completed", "in_progress"]:
                 # Check if task is marked for re-execution
                 if task_id not in self._tasks_to_reexecute:
@@ -477,9 +678,7 @@ class TaskManager:
                 # No children to execute - check if task should be executed based on dependencies
                 # Note: Parent-child relationship is only for organization, not execution order
                 # Task execution depends on dependencies, not children status
-                deps_satisfied = await are_dependencies_satisfied(
-                    node.task, self.task_repository, self._tasks_to_reexecute
-                )
+                deps_satisfied = await self._are_dependencies_satisfied(node.task)
                 if deps_satisfied and node.task.status != "completed":
                     logger.debug(f"All dependencies for task {node.task.id} are satisfied, executing task")
                     await self._execute_single_task(node.task, use_callback)
@@ -502,9 +701,7 @@ class TaskManager:
                 
                 for child_node in children_with_same_priority:
                     child_task = child_node.task
-                    deps_satisfied = await are_dependencies_satisfied(
-                        child_task, self.task_repository, self._tasks_to_reexecute
-                    )
+                    deps_satisfied = await self._are_dependencies_satisfied(child_task)
                     if deps_satisfied:
                         ready_tasks.append(child_node)
                     else:
@@ -542,9 +739,7 @@ class TaskManager:
             # Only dependencies affect execution order - if a task's dependencies are satisfied, it can execute
             # This handles both pending tasks and failed tasks that need re-execution
             # Tasks execute when their dependencies are satisfied, regardless of children status
-            deps_satisfied = await are_dependencies_satisfied(
-                node.task, self.task_repository, self._tasks_to_reexecute
-            )
+            deps_satisfied = await self._are_dependencies_satisfied(node.task)
             if deps_satisfied and node.task.status != "completed":
                 logger.debug(f"All dependencies for task {node.task.id} are satisfied, executing task")
                 await self._execute_single_task(node.task, use_callback)
@@ -556,7 +751,7 @@ class TaskManager:
             try:
                 # Update task status using repository (only if we have a valid task ID)
                 if node_task_id_for_error_handling:
-                    await self.task_repository.update_task_status(
+                    await self._update_task_status(
                         task_id=node_task_id_for_error_handling,
                         status="failed",
                         error=str(e),
@@ -604,7 +799,11 @@ class TaskManager:
             True if all dependencies are satisfied, False otherwise
         """
         return await are_dependencies_satisfied(
-            task, self.task_repository, self._tasks_to_reexecute
+            task,
+            self.task_repository,
+            self._tasks_to_reexecute,
+            self._tree_state,
+            self._reexecution_unsettled,
         )
     
     async def _execute_single_task(
@@ -613,12 +812,46 @@ class TaskManager:
         use_callback: bool = True
     ):
         """
-        Execute a single task
+        Execute a single task, retrying failed attempts according to schemas.retry
+        
+        Between attempts the task is pending and holds no concurrency slot. In
+        ready-queue mode the retry delay is handed to the scheduler (which re-dispatches
+        the task when it expires, freeing its worker slot meanwhile); otherwise the
+        delay is awaited here.
         
         Args:
             task: Task to execute
             use_callback: Whether to use callbacks
         """
+        while True:
+            retry_delay = await self._execute_task_attempt(task, use_callback)
+            if retry_delay is None:
+                return
+            task_id = str(task.id)
+            if self._ready_queue_active:
+                self._retry_delays[task_id] = retry_delay
+                return
+            if not await self._wait_for_retry(task_id, retry_delay):
+                return
+            task = await self.task_repository.get_task_by_id(task_id)
+            if not task:
+                return
+    
+    async def _execute_task_attempt(
+        self,
+        task: TaskModel,
+        use_callback: bool = True
+    ) -> Optional[float]:
+        """
+        Execute one attempt of a single task
+        
+        Args:
+            task: Task to execute
+            use_callback: Whether to use callbacks
+            
+        Returns:
+            Delay in seconds before the next attempt if the task is retried, else None
+        """
         # Save task ID at the beginning to avoid accessing it after session rollback
         # Use SQLAlchemy inspect to safely get ID without triggering lazy loading
         from sqlalchemy import inspect as sa_inspect
@@ -642,6 +875,12 @@ class TaskManager:
                 # If all methods fail, set to None
                 task_id_for_error_handling = None
         
+        # Concurrency slots held while the task runs (acquired while still pending)
+        concurrency_lease = None
+        # Retry policy and number of this attempt (set once the task is started)
+        retry_policy: Optional[RetryPolicy] = None
+        attempt: Optional[int] = None
+        retry_delay: Optional[float] = None
         try:
             # Check if streaming has been marked as final
             if self.streaming_final:
@@ -676,6 +915,44 @@ class TaskManager:
                 logger.info(f"Task {task_id} already in_progress, skipping execution")
                 return
             
+            # Cancelled through its token (the task itself or an ancestor)
+            if self._is_cancelled(task_id):
+                logger.info(f"Task {task_id} was cancelled, skipping execution")
+                return
+            
+            # Pending between two attempts: the next attempt is started by the retry timer
+            if task_id in self._retry_waiting:
+                logger.info(f"Task {task_id} is waiting for its next attempt, skipping execution")
+                return
+            
+            # Incremental re-execution: run each marked task at most once, and keep the
+            # result of completed tasks whose inputs did not change (early cutoff)
+            if self._reexecution_unsettled is not None and task_id in self._tasks_to_reexecute:
+                if task_id in self._reexecution_started:
+                    logger.info(f"Task {task_id} was already re-executed in this run, skipping execution")
+                    return
+                self._reexecution_started.add(task_id)
+                if task.status == "completed" and await self._is_task_up_to_date(task):
+                    self._reexecution_unsettled.discard(task_id)
+                    logger.info(f"Task {task_id} inputs unchanged, keeping its result")
+                    try:
+                        await self._trigger_dependent_tasks(task)
+                    except Exception as e:
+                        logger.error(f"Error triggering dependent tasks for {task_id}: {str(e)}")
+                    return
+            
+            # Wait for a concurrency slot (global / executor / user limits) while still pending
+            concurrency_lease = await get_concurrency_limiter().acquire(
+                self._get_task_executor_id(task), task.user_id
+            )
+            self._concurrency_leases[task_id] = concurrency_lease
+            
+            # Fail fast: a task cannot start once the tree deadline has passed
+            if self._is_past_deadline():
+                logger.info(f"Task {task_id} not started: tree deadline exceeded")
+                await self._fail_task_past_deadline(task_id)
+                return
+            
             # Check if task was cancelled before starting (double-check after potential race condition)
             # Refresh task from database to get latest status
             # Use saved task_id_for_error_handling to avoid accessing task.id after potential session rollback
@@ -694,20 +971,23 @@ class TaskManager:
             # Use saved task_id_for_error_handling for all task.id accesses to avoid session rollback issues
             current_task_id = task_id_for_error_handling if task_id_for_error_handling else (task.id if task else None)
             
+            retry_policy = get_retry_policy(task)
+            attempt = self._retry_attempts.get(str(current_task_id), 0) + 1
+            self._retry_attempts[str(current_task_id)] = attempt
+            
             if self.stream:
                 self.streaming_callbacks.task_start(current_task_id)
             
             # Update task status to in_progress using repository
-            await self.task_repository.update_task_status(
+            await self._update_task_status(
                 task_id=current_task_id,
                 status="in_progress",
                 error=None,
-                started_at=datetime.now(timezone.utc)
+                started_at=datetime.now(timezone.utc),
+                attempts=attempt
             )
-            # Refresh task object
-            task = await self.task_repository.get_task_by_id(current_task_id)
-            if not task:
-                raise ValueError(f"Task {current_task_id} not found after status update")
+            # Our own write updated the loaded instance; reload only if another writer changed it
+            task = await self._reload_task_if_changed(task, current_task_id)
             
             # Final check: if task was cancelled between status update and refresh
             if task.status == "cancelled":
@@ -717,12 +997,10 @@ class TaskManager:
             logger.info(f"Task {current_task_id} status updated to in_progress")
             
             # Resolve dependencies first (merge dependency results into inputs)
-            resolved_inputs = await resolve_task_dependencies(task, self.task_repository)
+            resolved_inputs = await resolve_task_dependencies(task, self.task_repository, self._tree_state)
             
             # Check cancellation before proceeding
-            task = await self.task_repository.get_task_by_id(current_task_id)
-            if not task:
-                raise ValueError(f"Task {current_task_id} not found")
+            task = await self._reload_task_if_changed(task, current_task_id)
             if task.status == "cancelled":
                 logger.info(f"Task {current_task_id} was cancelled during dependency resolution, stopping execution")
                 return
@@ -730,10 +1008,7 @@ class TaskManager:
             if resolved_inputs != (task.inputs or {}):
                 # Update inputs using repository
                 await self.task_repository.update_task_inputs(current_task_id, resolved_inputs)
-                # Refresh task object
-                task = await self.task_repository.get_task_by_id(current_task_id)
-                if not task:
-                    raise ValueError(f"Task {current_task_id} not found after input data update")
+                task = await self._reload_task_if_changed(task, current_task_id)
                 
                 # Check cancellation again
                 if task.status == "cancelled":
@@ -761,18 +1036,12 @@ class TaskManager:
                     f"after_keys={list(inputs_after_pre_hooks.keys())}"
                 )
                 await self.task_repository.update_task_inputs(current_task_id, inputs_to_save)
-                # Refresh task object to get latest state from database
-                task = await self.task_repository.get_task_by_id(current_task_id)
-                if not task:
-                    raise ValueError(f"Task {current_task_id} not found after pre-hook inputs update")
                 logger.info(f"Pre-hooks modified inputs for task {current_task_id}, updated in database")
             else:
                 logger.debug(f"Pre-hooks did not modify inputs for task {current_task_id}")
             
             # Check cancellation before executing
-            task = await self.task_repository.get_task_by_id(current_task_id)
-            if not task:
-                raise ValueError(f"Task {current_task_id} not found")
+            task = await self._reload_task_if_changed(task, current_task_id)
             if task.status == "cancelled":
                 logger.info(f"Task {current_task_id} was cancelled before execution, stopping")
                 return
@@ -782,6 +1051,14 @@ class TaskManager:
             final_inputs = task.inputs or {}
             logger.info(f"Task {current_task_id} execution - calling agent executor (name: {task.name})")
             
+            # Fingerprint of what the result is computed from (for incremental re-execution)
+            dependency_results = await self._get_dependency_results(task)
+            input_fingerprint = compute_input_fingerprint(task, dependency_results)
+            
+            # Result references (dependencies in "reference" mode) are read now, for the executor only
+            if has_result_references(final_inputs):
+                final_inputs = self._materialize_result_references(task, final_inputs, dependency_results)
+            
             # Execute task based on schemas
             # Note: For long-running executors, cancellation check should be done inside executor
             # TaskManager can only check before and after executor execution
@@ -790,9 +1067,10 @@ class TaskManager:
             # Check cancellation after execution (in case it was cancelled during execution)
             # Note: If task was cancelled, cancel_task() was already called by external source,
             # so we just need to stop execution and preserve the cancelled status
-            task = await self.task_repository.get_task_by_id(current_task_id)
-            if task and task.status == "cancelled":
+            task = await self._reload_task_if_changed(task, current_task_id)
+            if task.status == "cancelled" or self._is_cancelled(str(current_task_id)):
                 logger.info(f"Task {current_task_id} was cancelled during execution, stopping")
+                await self._mark_cancelled(task, current_task_id)
                 
                 # Clear executor reference
                 # Also clear task context to prevent memory leaks
@@ -817,24 +1095,44 @@ class TaskManager:
                 executor.clear_task_context()
                 logger.debug(f"Cleared task context for task {current_task_id} after successful execution")
             
+            # With a retry policy, an unsuccessful result is a failed attempt
+            if retry_policy is not None and is_error_result(task_result):
+                retry_delay = await self._schedule_retry(current_task_id, attempt, retry_policy, result=task_result)
+                if retry_delay is None:
+                    error_message = get_failure_message(result=task_result)
+                    await self._update_task_status(
+                        task_id=current_task_id,
+                        status="failed",
+                        result=task_result,
+                        error=error_message,
+                        last_error=error_message,
+                        completed_at=datetime.now(timezone.utc)
+                    )
+                    if self.stream:
+                        self.streaming_callbacks.task_failed(current_task_id, error_message)
+                return retry_delay
+            
             # Update task status using repository
             # Clear error field when task completes successfully (for re-execution scenarios)
-            await self.task_repository.update_task_status(
+            await self._update_task_status(
                 task_id=current_task_id,
                 status="completed",
                 progress=1.0,
                 result=task_result,
                 error=None,  # Clear error when task completes successfully
-                completed_at=datetime.now(timezone.utc)
+                completed_at=datetime.now(timezone.utc),
+                input_fingerprint=input_fingerprint
             )
-            # Refresh task object
-            task = await self.task_repository.get_task_by_id(current_task_id)
-            if not task:
-                raise ValueError(f"Task {current_task_id} not found after completion update")
+            task = await self._reload_task_if_changed(task, current_task_id)
+            if self._reexecution_unsettled is not None:
+                self._reexecution_unsettled.discard(str(current_task_id))
             
             if self.stream:
                 self.streaming_callbacks.task_completed(current_task_id, result=task.result)
             
+            # Release concurrency slots before triggering dependent tasks (they may need them)
+            concurrency_lease.release()
+            
             # System-internal dependency task triggering
             # execute_after_task is always executed to trigger dependent tasks
             # This is independent of use_callback (which controls external URL notifications)
@@ -854,13 +1152,23 @@ class TaskManager:
             task_id_str = str(task_id_for_error_handling) if task_id_for_error_handling else "unknown"
             logger.error(f"Error executing task {task_id_str}: {str(e)}", exc_info=True)
             
+            # Attempts that failed after the task started may be retried
+            if retry_policy is not None and attempt is not None and task_id_for_error_handling:
+                try:
+                    retry_delay = await self._schedule_retry(task_id_for_error_handling, attempt, retry_policy, error=e)
+                except Exception as update_error:
+                    logger.warning(f"Failed to schedule retry for {task_id_str}: {update_error}")
+                if retry_delay is not None:
+                    return retry_delay
+            
             # Update task status using repository (only if we have a valid task ID)
             if task_id_for_error_handling:
                 try:
-                    await self.task_repository.update_task_status(
+                    await self._update_task_status(
                         task_id=task_id_for_error_handling,
                         status="failed",
                         error=str(e),
+                        last_error=str(e) if attempt is not None else None,
                         completed_at=datetime.now(timezone.utc)
                     )
                 except Exception as update_error:
@@ -873,6 +1181,330 @@ class TaskManager:
                 except Exception as callback_error:
                     # If callback fails (e.g., accessing task.id triggers session reload), log but don't fail
                     logger.warning(f"Failed to call task_failed callback for {task_id_str}: {callback_error}")
+        finally:
+            if concurrency_lease is not None:
+                concurrency_lease.release()
+                self._concurrency_leases.pop(task_id, None)
+            if self._reexecution_unsettled is not None and task_id_for_error_handling:
+                self._reexecution_unsettled.discard(str(task_id_for_error_handling))
+    
+    async def _schedule_retry(
+        self,
+        task_id: str,
+        attempt: int,
+        retry_policy: RetryPolicy,
+        error: Optional[BaseException] = None,
+        result: Any = None
+    ) -> Optional[float]:
+        """
+        Put a task back to pending after a failed attempt, if its retry policy allows it
+        
+        Args:
+            task_id: Task ID
+            attempt: Number of the failed attempt
+            retry_policy: Retry policy of the task
+            error: Exception raised by the attempt, if any
+            result: Unsuccessful result returned by the attempt, if no exception was raised
+            
+        Returns:
+            Delay before the next attempt, or None if the task is not retried
+        """
+        if self.streaming_final or not retry_policy.should_retry(attempt, error, result):
+            return None
+        delay = retry_policy.get_delay(attempt)
+        remaining = get_remaining_time(self._tree_deadline)
+        if remaining is not None and delay >= remaining:
+            logger.info(f"Task {task_id} not retried: the next attempt would start after the tree deadline")
+            return None
+        
+        error_message = get_failure_message(error, result)
+        logger.info(
+            f"Task {task_id} attempt {attempt}/{retry_policy.max_attempts} failed ({error_message}), "
+            f"retrying in {delay:.2f}s"
+        )
+        await self._update_task_status(
+            task_id=task_id,
+            status="pending",
+            error=error_message,
+            last_error=error_message,
+            attempts=attempt
+        )
+        # Incremental re-execution runs a marked task once per run; a retry is the same run
+        self._reexecution_started.discard(str(task_id))
+        return delay
+    
+    async def _wait_for_retry(self, task_id: str, delay: float) -> bool:
+        """
+        Wait for the retry delay of a task, stopping early if it is cancelled
+        
+        Args:
+            task_id: Task ID
+            delay: Delay in seconds
+            
+        Returns:
+            True if the task should be attempted again, False if it was cancelled
+        """
+        self._retry_waiting.add(task_id)
+        try:
+            token = self._get_cancellation_token(task_id)
+            if token is None:
+                await asyncio.sleep(delay)
+            else:
+                waiter = asyncio.ensure_future(token.wait())
+                try:
+                    await asyncio.wait({waiter}, timeout=delay)
+                finally:
+                    waiter.cancel()
+        finally:
+            self._retry_waiting.discard(task_id)
+        if self._is_cancelled(task_id):
+            logger.info(f"Task {task_id} was cancelled while waiting for its next attempt")
+            return False
+        return True
+    
+    async def _is_task_up_to_date(self, task: TaskModel) -> bool:
+        """
+        Check whether a completed task's result is still valid for its current inputs
+        
+        Args:
+            task: Completed task marked for re-execution
+            
+        Returns:
+            True if the stored input fingerprint matches the current one
+        """
+        return is_task_up_to_date(task, await self._get_dependency_results(task))
+    
+    async def _get_dependency_results(self, task: TaskModel) -> Dict[str, Any]:
+        """
+        Get the current results of a task's dependencies (tree state first, repository as fallback)
+        
+        Args:
+            task: Task whose dependencies are looked up
+            
+        Returns:
+            Dictionary of dependency id -> result (None if unknown)
+        """
+        dependency_results: Dict[str, Any] = {}
+        for dependency_id in get_dependency_ids(task):
+            if self._tree_state is not None and self._tree_state.has_task(dependency_id):
+                dependency_results[dependency_id] = self._tree_state.get_result(dependency_id)
+            else:
+                dependency_task = await self.task_repository.get_task_by_id(dependency_id)
+                dependency_results[dependency_id] = dependency_task.result if dependency_task else None
+        return dependency_results
+    
+    def _materialize_result_references(
+        self,
+        task: TaskModel,
+        inputs: Dict[str, Any],
+        dependency_results: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Replace result references in inputs with the referenced results
+        
+        Only results of the task's own dependencies are resolved. A reference to any
+        other task (e.g. written into inputs by hand) resolves to None, so inputs
+        cannot be used to read results the task owner has no access to.
+        The stored task inputs keep the references; only the returned copy holds results.
+        
+        Args:
+            task: Task being executed
+            inputs: Task inputs containing result references
+            dependency_results: Results of the task's dependencies, by id
+            
+        Returns:
+            Inputs for the executor
+        """
+        foreign_ids = sorted(set(get_referenced_task_ids(inputs)) - set(dependency_results))
+        if foreign_ids:
+            logger.warning(
+                f"Task {task.id}: ignoring result references to tasks that are not its dependencies: {foreign_ids}"
+            )
+        return materialize_result_references(inputs, dependency_results)
+    
+    def _is_awaiting_reexecution(self, task_id: str) -> bool:
+        """Check whether a completed task is marked for incremental re-execution and not started yet"""
+        return (
+            self._reexecution_unsettled is not None
+            and task_id in self._reexecution_unsettled
+            and task_id not in self._reexecution_started
+        )
+    
+    def _is_past_deadline(self) -> bool:
+        """Check whether the deadline of the tree being executed has passed"""
+        remaining = get_remaining_time(self._tree_deadline)
+        return remaining is not None and remaining <= 0
+    
+    def _get_expected_duration(self, task: TaskModel) -> Optional[float]:
+        """Get the median recorded duration of a task's executor (None if unknown)"""
+        return get_executor_stats().get_expected_duration(self._get_task_executor_id(task))
+    
+    def _get_execution_timeout(self, task: TaskModel) -> Tuple[Optional[float], Optional[str]]:
+        """
+        Get the time limit of a task's executor call
+        
+        Args:
+            task: Task about to execute
+            
+        Returns:
+            Tuple of (seconds or None, TaskTimeoutError message)
+            
+        Raises:
+            ValueError: If schemas.timeout is invalid
+        """
+        timeout = get_task_timeout(task)
+        remaining = get_remaining_time(self._tree_deadline)
+        if remaining is not None and (timeout is None or remaining < timeout):
+            return max(0.0, remaining), f"Task {task.id} exceeded the tree deadline"
+        if timeout is not None:
+            return timeout, f"Task {task.id} timed out after {timeout:g} seconds"
+        return None, None
+    
+    async def _fail_task_past_deadline(self, task_id: str) -> None:
+        """Fail a task that could not start before the tree deadline"""
+        error = "Tree deadline exceeded before the task started"
+        await self._update_task_status(
+            task_id=task_id,
+            status="failed",
+            error=error,
+            completed_at=datetime.now(timezone.utc)
+        )
+        if self.stream:
+            self.streaming_callbacks.task_failed(task_id, error)
+    
+    async def _fail_unfinished_tasks(self, task_tree: TaskTreeNode) -> None:
+        """
+        Fail the tasks of a tree still pending after its deadline passed
+        
+        These are tasks whose dependencies did not finish in time; they would
+        otherwise stay pending.
+        """
+        stack = [task_tree]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children)
+            task_id = str(node.task.id)
+            status = self._tree_state.get_status(task_id) if self._tree_state is not None else node.task.status
+            if status == "pending":
+                await self._fail_task_past_deadline(task_id)
+    
+    def _get_cancellation_token(self, task_id: str) -> Optional[CancellationToken]:
+        """Get the cancellation token of a task (this tree first, then any running tree)"""
+        token = self._cancellation_tokens.get(task_id)
+        if token is None:
+            token = get_cancellation_registry().get(task_id)
+        return token
+    
+    def _is_cancelled(self, task_id: str) -> bool:
+        """Check whether a task's cancellation token was cancelled"""
+        token = self._get_cancellation_token(task_id)
+        return token is not None and token.is_cancelled()
+    
+    async def _mark_cancelled(self, task: TaskModel, task_id: str) -> None:
+        """
+        Record the cancelled status of a task stopped through its token
+        
+        cancel_task() stores the status before cancelling tokens; this covers tokens
+        cancelled directly and keeps the tree state index in sync.
+        """
+        if task.status != "cancelled":
+            token = self._get_cancellation_token(str(task_id))
+            await self._update_task_status(
+                task_id=task_id,
+                status="cancelled",
+                error=(token.reason if token is not None else None) or "Cancelled",
+                completed_at=datetime.now(timezone.utc)
+            )
+        elif self._tree_state is not None and self._tree_state.has_task(str(task_id)):
+            self._tree_state.update(str(task_id), "cancelled")
+    
+    async def _reload_task_if_changed(self, task: TaskModel, task_id: str) -> TaskModel:
+        """
+        Return the task instance, reloading it only if another writer changed it
+        
+        TaskManager's own writes go through the repository and update the same
+        identity-mapped instance. A reload is only needed when the stored version
+        differs, e.g. after the cancel API wrote from another session.
+        
+        Args:
+            task: Currently held task instance
+            task_id: Task ID
+            
+        Returns:
+            The same instance, or a freshly loaded one
+            
+        Raises:
+            ValueError: If the task no longer exists
+        """
+        stored_version = await self.task_repository.get_task_version(task_id)
+        if stored_version is not None and stored_version == getattr(task, "version", None):
+            return task
+        reloaded = await self.task_repository.get_task_by_id(task_id)
+        if not reloaded:
+            raise ValueError(f"Task {task_id} not found")
+        return reloaded
+    
+    async def _update_task_status(self, task_id: str, **kwargs) -> bool:
+        """
+        Update task status in the database and mirror it into the tree state index
+        
+        All status transitions in TaskManager go through this method so that the
+        in-memory index never diverges from what was written (write-through).
+        
+        Args:
+            task_id: Task ID
+            **kwargs: Fields passed to TaskRepository.update_task_status()
+            
+        Returns:
+            Result of TaskRepository.update_task_status()
+        """
+        updated = await self.task_repository.update_task_status(task_id=task_id, **kwargs)
+        if self._tree_state is not None and "status" in kwargs:
+            self._tree_state.update(str(task_id), kwargs["status"], kwargs.get("result"))
+        return updated
+    
+    async def _get_waiting_tasks(self, completed_task: TaskModel) -> List[TaskModel]:
+        """
+        Get pending/in_progress tasks that may be unblocked by a completed task
+        
+        With incremental re-execution, completed dependents still awaiting their
+        re-execution check are included as well.
+        
+        With a tree state index, only the direct dependents of the completed task are
+        loaded. Without one (e.g. execute_after_task called outside distribute_task_tree),
+        the whole tree is scanned.
+        
+        Args:
+            completed_task: Task that just completed
+            
+        Returns:
+            List of waiting tasks to re-check
+        """
+        completed_task_id = str(completed_task.id)
+        if self._tree_state is not None and self._tree_state.has_task(completed_task_id):
+            waiting_tasks = []
+            for dependent_id in sorted(self._tree_state.get_dependents(completed_task_id)):
+                if (
+                    self._tree_state.get_status(dependent_id) not in ["pending", "in_progress"]
+                    and not self._is_awaiting_reexecution(dependent_id)
+                ):
+                    continue
+                dependent_task = await self.task_repository.get_task_by_id(dependent_id)
+                if dependent_task and (
+                    dependent_task.status in ["pending", "in_progress"]
+                    or self._is_awaiting_reexecution(dependent_id)
+                ):
+                    waiting_tasks.append(dependent_task)
+            return waiting_tasks
+        
+        # Get all tasks in the tree
+        root_task = await self._get_root_task(completed_task)
+        all_tasks = await self._get_all_tasks_in_tree(root_task)
+        return [
+            t for t in all_tasks
+            if (t.status in ["pending", "in_progress"] or self._is_awaiting_reexecution(str(t.id)))
+            and t.id != completed_task.id
+        ]
     
     async def _execute_pre_hooks(self, task: TaskModel) -> None:
         """
@@ -951,7 +1583,7 @@ class TaskManager:
         Returns:
             Resolved input data dictionary
         """
-        return await resolve_task_dependencies(task, self.task_repository)
+        return await resolve_task_dependencies(task, self.task_repository, self._tree_state)
     
     async def _get_completed_tasks_by_id(self, task: TaskModel) -> Dict[str, TaskModel]:
         """
@@ -1072,91 +1704,80 @@ class TaskManager:
             else:
                 logger.warning(f"Task {completed_task.id} not found or not completed, skipping post-hooks")
             
-            logger.info(f"🔍 Checking for dependent tasks after completion of {completed_task.id} (name: {completed_task.name})")
-            
-            # Get all tasks in the tree
-            root_task = await self._get_root_task(completed_task)
-            all_tasks = await self._get_all_tasks_in_tree(root_task)
-            
-            # Find tasks that are waiting and might have their dependencies satisfied
-            waiting_tasks = [
-                t for t in all_tasks 
-                if t.status in ["pending", "in_progress"] and t.id != completed_task.id
-            ]
-            
-            # Trigger dependent tasks if any
-            if waiting_tasks:
-                logger.info(f"Found {len(waiting_tasks)} waiting tasks to check for dependencies")
-                
-                # Check each waiting task to see if its dependencies are now satisfied
-                triggered_tasks = []
-                for task in waiting_tasks:
-                    logger.debug(f"Checking dependencies for task {task.id} (name: {task.name})")
-                    deps_satisfied = await are_dependencies_satisfied(
-                        task, self.task_repository, self._tasks_to_reexecute
-                    )
-                    
-                    if deps_satisfied:
-                        logger.info(f"🚀 Task {task.id} (name: {task.name}) dependencies now satisfied, executing")
-                        triggered_tasks.append(task)
-                        try:
-                            await self._execute_single_task(task, use_callback=True)
-                        except Exception as e:
-                            logger.error(f"❌ Failed to execute dependent task {task.id}: {str(e)}")
-                            # Update task status using repository
-                            await self.task_repository.update_task_status(
-                                task_id=task.id,
-                                status="failed",
-                                error=str(e)
-                            )
-                    else:
-                        logger.debug(f"Task {task.id} (name: {task.name}) dependencies not yet satisfied")
+            await self._trigger_dependent_tasks(completed_task)
+        except Exception as e:
+            logger.error(f"Error in execute_after_task for {completed_task.id}: {str(e)}", exc_info=True)
+    
+    async def _trigger_dependent_tasks(self, completed_task: TaskModel) -> None:
+        """
+        Execute waiting tasks whose dependencies are satisfied by a completed task
+        
+        Args:
+            completed_task: Task that just completed (or kept its result)
+        """
+        if self._ready_queue_active:
+            # Ready-queue scheduler releases dependent tasks itself
+            return
+        
+        logger.info(f"🔍 Checking for dependent tasks after completion of {completed_task.id} (name: {completed_task.name})")
+        
+        # Find tasks that are waiting and might have their dependencies satisfied
+        waiting_tasks = await self._get_waiting_tasks(completed_task)
+        
+        # Trigger dependent tasks if any
+        if waiting_tasks:
+            logger.info(f"Found {len(waiting_tasks)} waiting tasks to check for dependencies")
+            
+            # Check each waiting task to see if its dependencies are now satisfied
+            triggered_tasks = []
+            for task in waiting_tasks:
+                if self._is_cancelled(str(task.id)):
+                    logger.debug(f"Task {task.id} was cancelled, not triggering it")
+                    continue
+                logger.debug(f"Checking dependencies for task {task.id} (name: {task.name})")
+                deps_satisfied = await self._are_dependencies_satisfied(task)
                 
-                if triggered_tasks:
-                    logger.info(f"Successfully triggered {len(triggered_tasks)} dependent tasks")
+                if deps_satisfied:
+                    logger.info(f"🚀 Task {task.id} (name: {task.name}) dependencies now satisfied, executing")
+                    triggered_tasks.append(task)
+                    try:
+                        await self._execute_single_task(task, use_callback=True)
+                    except Exception as e:
+                        logger.error(f"❌ Failed to execute dependent task {task.id}: {str(e)}")
+                        # Update task status using repository
+                        await self._update_task_status(
+                            task_id=task.id,
+                            status="failed",
+                            error=str(e)
+                        )
                 else:
-                    logger.debug("No tasks were triggered by this completion")
+                    logger.debug(f"Task {task.id} (name: {task.name}) dependencies not yet satisfied")
+            
+            if triggered_tasks:
+                logger.info(f"Successfully triggered {len(triggered_tasks)} dependent tasks")
             else:
-                logger.debug("No waiting tasks found")
-        except Exception as e:
-            logger.error(f"Error in execute_after_task for {completed_task.id}: {str(e)}", exc_info=True)
+                logger.debug("No tasks were triggered by this completion")
+        else:
+            logger.debug("No waiting tasks found")
     
-    async def _execute_task_with_schemas(
+    def _find_executor_extension(
         self,
-        task: TaskModel,
-        inputs: Dict[str, Any]
-    ) -> Dict[str, Any]:
+        executor_id: Optional[str],
+        task_type: Optional[str],
+        task_method: Optional[str]
+    ) -> Tuple[Optional[Any], Optional[str], Optional[str], Optional[str]]:
         """
-        Execute task based on schemas configuration
-        
-        Uses the executor registry to find and instantiate the appropriate executor
-        based on task_type in schemas. Supports both built-in and third-party executors.
+        Find the executor extension for a task
         
         Args:
-            task: Task to execute
-            inputs: Input parameters for task execution
+            executor_id: Executor id from params (may be None)
+            task_type: schemas.type (may be None)
+            task_method: schemas.method
             
         Returns:
-            Task execution result
-            
-        Raises:
-            ValueError: If task_type is not registered in executor registry
+            Tuple of (extension, extension_id, executor_id, task_type). extension is None
+            if no executor is registered for the task.
         """
-        schemas = task.schemas or {}
-        task_type = schemas.get("type")  # Optional: only used if method is not an executor id
-        task_method = schemas.get("method", "command")
-        
-        # ============================================================
-        # 1. get executor id from params (check this FIRST, before logging)
-        # ============================================================
-        params = task.params or {}
-        executor_id = params.get("executor_id")
-        
-        # Log after we have executor_id info
-        logger.info(f"Executing task {task.id} with type={task_type}, method={task_method}, executor_id={executor_id}")
-        logger.debug(f"Task {task.id} params: {params}, executor_id from params: {executor_id}")
-
-        # Get executor from unified extension registry
         registry = get_registry()
         
         # Strategy: Try to use method as executor id first, then fall back to type-based lookup
@@ -1171,7 +1792,7 @@ class TaskManager:
             extension = registry.get_by_id(executor_id)
             if extension and extension.category == ExtensionCategory.EXECUTOR:
                 extension_id = executor_id
-                logger.info(f"Using executor_id '{executor_id}' from params (task {task.id})")
+                logger.info(f"Using executor_id '{executor_id}' from params")
         
         # If not found, try to use method as executor id
         if extension is None or (extension and extension.category != ExtensionCategory.EXECUTOR):
@@ -1194,6 +1815,68 @@ class TaskManager:
                 executor_id = extension_id
                 logger.debug(f"Using type '{task_type}' to find executor '{extension_id}'")
         
+        return extension, extension_id, executor_id, task_type
+    
+    def _get_task_executor_id(self, task: TaskModel) -> Optional[str]:
+        """
+        Get the executor id a task will run with (without creating the executor)
+        
+        Args:
+            task: Task
+            
+        Returns:
+            Executor id, or None if no executor is registered for the task
+        """
+        schemas = task.schemas or {}
+        params = task.params or {}
+        extension, extension_id, executor_id, _ = self._find_executor_extension(
+            params.get("executor_id"), schemas.get("type"), schemas.get("method", "command")
+        )
+        if extension is None or extension.category != ExtensionCategory.EXECUTOR:
+            return None
+        return executor_id or extension_id
+    
+    async def _execute_task_with_schemas(
+        self,
+        task: TaskModel,
+        inputs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Execute task based on schemas configuration
+        
+        Uses the executor registry to find and instantiate the appropriate executor
+        based on task_type in schemas. Supports both built-in and third-party executors.
+        
+        Args:
+            task: Task to execute
+            inputs: Input parameters for task execution
+            
+        Returns:
+            Task execution result
+            
+        Raises:
+            ValueError: If task_type is not registered in executor registry
+        """
+        schemas = task.schemas or {}
+        task_type = schemas.get("type")  # Optional: only used if method is not an executor id
+        task_method = schemas.get("method", "command")
+        
+        # ============================================================
+        # 1. get executor id from params (check this FIRST, before logging)
+        # ============================================================
+        params = task.params or {}
+        executor_id = params.get("executor_id")
+        
+        # Log after we have executor_id info
+        logger.info(f"Executing task {task.id} with type={task_type}, method={task_method}, executor_id={executor_id}")
+        logger.debug(f"Task {task.id} params: {params}, executor_id from params: {executor_id}")
+
+        # Get executor from unified extension registry
+        registry = get_registry()
+        extension, extension_id, executor_id, task_type = self._find_executor_extension(
+            executor_id, task_type, task_method
+        )
+        
         if extension is None or extension.category != ExtensionCategory.EXECUTOR:
             # Task type not registered
             registered_extensions = registry.list_by_category(ExtensionCategory.EXECUTOR)
@@ -1251,12 +1934,41 @@ class TaskManager:
         
         
         # ============================================================
-        # 3. create executor instance
+        # 3. reuse cached result (cacheable executors, result cache enabled)
+        # ============================================================
+        cache_backend = None if self.use_demo else get_result_cache_backend()
+        cache_options = get_cache_options(executor_id, inputs) if cache_backend is not None else None
+        cache_key = None
+        if cache_options is not None:
+            cache_key = make_cache_key(
+                executor_id, init_params, inputs, cache_options["version"], user_id=task.user_id
+            )
+            try:
+                cached_result = await cache_backend.get(cache_key, db=self.db)
+            except Exception as e:
+                logger.warning(f"Result cache lookup failed for task {task.id}: {str(e)}")
+                cached_result = None
+            if cached_result is not None:
+                logger.info(f"Task {task.id}: reusing cached result of executor {executor_id} (key {cache_key[:12]})")
+                if isinstance(cached_result, dict):
+                    return {**cached_result, "cache_hit": True, "cache_key": cache_key}
+                return {"result": cached_result, "cache_hit": True, "cache_key": cache_key}
+        
+        # ============================================================
+        # 4. create executor instance
         # ============================================================
-        # Create cancellation checker
-        cached_cancelled = task.status == "cancelled"
-        def cancellation_checker() -> bool:
-            return cached_cancelled
+        # Time limit of the executor call: schemas.timeout and the time left before the tree deadline
+        timeout, timeout_message = self._get_execution_timeout(task)
+        deadline_kwargs = {"deadline": time.time() + timeout} if timeout is not None else {}
+        
+        # Create cancellation checker (live: reflects cancel_task() calls made during execution)
+        cancellation_token = self._get_cancellation_token(str(task.id))
+        if cancellation_token is not None:
+            cancellation_checker = cancellation_token.is_cancelled
+        else:
+            cached_cancelled = task.status == "cancelled"
+            def cancellation_checker() -> bool:
+                return cached_cancelled
         
         # Create executor: inputs as inputs parameter, other as **kwargs
         # Note: Input validation is now handled by executor itself (in BaseTask or executor.execute)
@@ -1271,6 +1983,7 @@ class TaskManager:
             task=task,  # Pass task context (TaskModel instance) - supports custom TaskModel classes
             user_id=task.user_id,  # Also pass user_id for backward compatibility
             **init_params,  # initialization parameters (works, name, inputs_schema, etc.)
+            **deadline_kwargs,  # absolute deadline, lets executors shrink their own timeouts
             cancellation_checker=cancellation_checker
         )
         
@@ -1283,13 +1996,17 @@ class TaskManager:
                 "executor_id": executor_id
             }
         
+        # Executors that expand into child tasks at runtime (e.g. map_executor) get a runner
+        if getattr(executor, "spawns_children", False):
+            executor.child_task_runner = ChildTaskRunner(self, task)
+        
         # Store executor for cancellation support
         if hasattr(executor, 'cancel'):
             self._executor_instances[task.id] = executor
             logger.debug(f"Stored executor instance for task {task.id} (supports cancellation)")
         
         # ============================================================
-        # 4. execute executor (with hooks)
+        # 5. execute executor (with hooks)
         # ============================================================
         # Note: Input validation and any executor-specific input processing
         # should be handled by the executor itself (in BaseTask or executor.execute)
@@ -1370,7 +2087,30 @@ class TaskManager:
                     logger.warning(f"Pre_hook failed for executor {executor_id}: {str(e)}. Continuing with execution.")
         
         try:
-            result = await executor.execute(inputs)
+            execution_started = time.monotonic()
+            execution_lane = get_execution_lane(executor_id)
+            if execution_lane == EVENT_LOOP_LANE:
+                execution = executor.execute(inputs)
+            else:
+                # CPU-bound executors run in a thread or process pool (see core.execution.lanes)
+                execution = get_execution_lanes().run(
+                    execution_lane,
+                    executor,
+                    inputs,
+                    task_id=task.id,
+                    init_kwargs={**init_params, **deadline_kwargs, "user_id": task.user_id},
+                )
+            if cancellation_token is not None:
+                # Stops executors that do not return by themselves once cancelled
+                execution = cancellation_token.run(execution, get_cancellation_grace_period())
+            if timeout is not None:
+                result = await run_with_timeout(execution, timeout, timeout_message)
+            else:
+                result = await execution
+            
+            # Duration statistics of the executor (used for critical-path scheduling)
+            if not is_error_result(result):
+                get_executor_stats().record(executor_id, time.monotonic() - execution_started)
             
             # Call executor-specific post_hook if available
             if hasattr(executor_class, '_executor_hooks'):
@@ -1385,6 +2125,15 @@ class TaskManager:
                     except Exception as e:
                         logger.warning(f"Post_hook failed for executor {executor_id}: {str(e)}")
             
+            # Store successful results of cacheable executors
+            if cache_key is not None and is_cacheable_result(result):
+                try:
+                    await cache_backend.set(
+                        cache_key, result, executor_id, ttl=cache_options["ttl"], db=self.db
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to cache result of task {task.id}: {str(e)}")
+            
             # Explicitly clear task context to prevent memory leaks
             # This is important for long-running executors and memory management
             if hasattr(executor, 'clear_task_context'):
@@ -1392,6 +2141,24 @@ class TaskManager:
                 logger.debug(f"Cleared task context for executor {executor_id} on task {task.id}")
             
             return result
+        except TaskTimeoutError as e:
+            # Timeouts fail the task (raised to _execute_single_task)
+            logger.warning(str(e))
+            if hasattr(executor, 'clear_task_context'):
+                executor.clear_task_context()
+            self._executor_instances.pop(task.id, None)
+            raise
+        except TaskCancelledError as e:
+            logger.info(str(e))
+            if hasattr(executor, 'clear_task_context'):
+                executor.clear_task_context()
+            self._executor_instances.pop(task.id, None)
+            return {
+                "error": str(e),
+                "task_id": task.id,
+                "executor_id": executor_id,
+                "cancelled": True
+            }
         except Exception as e:
             logger.error(f"Error executing task {task.id} with executor {executor.__class__.__name__}: {e}", exc_info=True)
             # Explicitly clear task context on error to prevent memory leaks
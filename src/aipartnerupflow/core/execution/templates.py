@@ -0,0 +1,385 @@
+"""
+Precompiled task tree templates
+
+A template is a tasks array (same format as TaskCreator.create_task_tree_from_array())
+that is validated once and stored in compiled form in the task template table
+(TaskTemplateModel). Instantiating a template builds the tree straight from the
+compiled nodes, substitutes the parameters and inserts all tasks with one INSERT
+(TaskRepository.save_task_tree()): no validation, identifier resolution or per-task
+commit happens at instantiation time.
+
+Parameters are declared when the template is created and referenced in task names,
+inputs, params and schemas as "{{name}}":
+
+- a string that is exactly "{{name}}" is replaced by the parameter value (any JSON value)
+- "{{name}}" inside a longer string is replaced by str(value)
+
+Placeholders of undeclared names are left as they are, so prompt templates and
+similar strings in inputs are not touched.
+
+Usage:
+    from aipartnerupflow.core.execution.templates import TaskTemplateRegistry
+
+    registry = TaskTemplateRegistry(db_session)
+    template = await registry.create_template(tasks, name="crawl", parameters=["url"])
+    task_tree = await registry.instantiate(template.id, {"url": "https://example.com"})
+"""
+
+import copy
+import re
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Type, Union
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from aipartnerupflow.core.config import get_task_model_class
+from aipartnerupflow.core.execution.result_references import get_dependency_options
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel, TaskTemplateModel
+from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
+from aipartnerupflow.core.types import TaskTreeNode
+from aipartnerupflow.core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Task fields that may contain parameter placeholders
+TEMPLATE_FIELDS = ("name", "inputs", "params", "schemas")
+
+_PARAMETER_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+
+@dataclass
+class CompiledTaskTemplate:
+    """
+    Compiled template as used by TaskTemplateRegistry.instantiate()
+
+    nodes are in parent-before-children order (index 0 is the root). Each node has
+    the task fields (name, user_id, priority, inputs, params, schemas), "parent"
+    (node index or None), "dependencies" ([{"node": index, "required", "type", optional "fields"/"mode"}]),
+    "has_children" and "parameterized" (the fields containing placeholders).
+    """
+
+    id: str
+    name: Optional[str]
+    user_id: Optional[str]
+    parameters: List[str]
+    nodes: List[Dict[str, Any]]
+
+
+def _contains_placeholder(value: Any, parameters: set) -> bool:
+    if isinstance(value, str):
+        return any(match.group(1) in parameters for match in _PLACEHOLDER.finditer(value))
+    if isinstance(value, dict):
+        return any(_contains_placeholder(item, parameters) for item in value.values())
+    if isinstance(value, list):
+        return any(_contains_placeholder(item, parameters) for item in value)
+    return False
+
+
+def substitute_parameters(value: Any, values: Dict[str, Any]) -> Any:
+    """
+    Replace "{{name}}" placeholders of the given parameters in a JSON value
+
+    Args:
+        value: JSON value (a new value is returned, the input is not modified)
+        values: Parameter name -> value
+
+    Returns:
+        Value with placeholders replaced
+    """
+    if isinstance(value, str):
+        match = _PLACEHOLDER.fullmatch(value.strip())
+        if match and match.group(1) in values:
+            return copy.deepcopy(values[match.group(1)])
+        return _PLACEHOLDER.sub(
+            lambda m: str(values[m.group(1)]) if m.group(1) in values else m.group(0), value
+        )
+    if isinstance(value, dict):
+        return {key: substitute_parameters(item, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [substitute_parameters(item, values) for item in value]
+    return value
+
+
+def compile_task_template(
+    tasks: List[Dict[str, Any]],
+    root_index: int,
+    parameters: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compile a validated tasks array into template nodes
+
+    Resolves parent_id and dependency references (ids or names) to node indexes and
+    orders the nodes parent before children, so instantiation is a single pass.
+
+    Args:
+        tasks: Tasks array, already validated by TaskCreator
+        root_index: Index of the root task in the array
+        parameters: Declared parameter names
+
+    Returns:
+        Nodes in parent-before-children order (see CompiledTaskTemplate)
+    """
+    declared = set(parameters or [])
+    identifier_to_index = {
+        (task_data.get("id") or task_data.get("name")): index for index, task_data in enumerate(tasks)
+    }
+    children_indexes: Dict[int, List[int]] = {}
+    for index, task_data in enumerate(tasks):
+        if task_data.get("parent_id"):
+            children_indexes.setdefault(identifier_to_index[task_data["parent_id"]], []).append(index)
+
+    order = [root_index]
+    for index in order:
+        order.extend(children_indexes.get(index, []))
+    position = {index: node_index for node_index, index in enumerate(order)}
+
+    nodes = []
+    for index in order:
+        task_data = tasks[index]
+        dependencies = []
+        for dep in task_data.get("dependencies") or []:
+            if isinstance(dep, dict):
+                dep_ref = dep.get("id") or dep.get("name")
+                required, dependency_type = dep.get("required", True), dep.get("type", "result")
+            else:
+                dep_ref, required, dependency_type = str(dep), True, "result"
+            dependencies.append({
+                "node": position[identifier_to_index[dep_ref]],
+                "required": required,
+                "type": dependency_type,
+                **(get_dependency_options(dep) if isinstance(dep, dict) else {}),
+            })
+        node = {
+            "name": task_data.get("name"),
+            "user_id": task_data.get("user_id"),
+            "priority": task_data.get("priority", 1),
+            "inputs": task_data.get("inputs") or {},
+            "params": task_data.get("params") or {},
+            "schemas": task_data.get("schemas") or {},
+            "parent": position[identifier_to_index[task_data["parent_id"]]] if task_data.get("parent_id") else None,
+            "dependencies": dependencies,
+            "has_children": bool(children_indexes.get(index)),
+        }
+        node["parameterized"] = [
+            field for field in TEMPLATE_FIELDS if declared and _contains_placeholder(node[field], declared)
+        ]
+        nodes.append(node)
+    return nodes
+
+
+_compiled_templates: Dict[str, CompiledTaskTemplate] = {}
+
+
+def clear_template_cache() -> None:
+    """Drop the compiled templates cached by this process (useful for testing)"""
+    _compiled_templates.clear()
+
+
+class TaskTemplateRegistry:
+    """
+    Create task tree templates and instantiate trees from them
+
+    Compiled templates are cached per process once created or loaded (templates
+    are immutable, so the cache never goes stale).
+    """
+
+    def __init__(
+        self,
+        db: Union[Session, AsyncSession],
+        task_model_class: Optional[Type[TaskModel]] = None,
+    ):
+        """
+        Initialize TaskTemplateRegistry
+
+        Args:
+            db: Database session (sync or async)
+            task_model_class: TaskModel class of instantiated tasks (default: get_task_model_class())
+        """
+        self.db = db
+        self.is_async = isinstance(db, AsyncSession)
+        self.task_model_class = task_model_class or get_task_model_class()
+
+    async def create_template(
+        self,
+        tasks: List[Dict[str, Any]],
+        name: Optional[str] = None,
+        parameters: Optional[List[str]] = None,
+        user_id: Optional[str] = None,
+        template_id: Optional[str] = None,
+    ) -> CompiledTaskTemplate:
+        """
+        Validate a tasks array and store it as a template
+
+        Args:
+            tasks: Tasks array (see TaskCreator.create_task_tree_from_array())
+            name: Template name (optional)
+            parameters: Names of the "{{name}}" placeholders to substitute at instantiation
+            user_id: Owner of the template
+            template_id: Template ID (default: generated UUID)
+
+        Returns:
+            Compiled template
+
+        Raises:
+            ValueError: If the tasks array or the parameters are invalid, or the
+                template ID already exists
+        """
+        from aipartnerupflow.core.execution.task_creator import TaskCreator
+
+        if not tasks:
+            raise ValueError("Tasks array cannot be empty")
+        parameters = list(parameters or [])
+        for parameter in parameters:
+            if not isinstance(parameter, str) or not _PARAMETER_NAME.match(parameter):
+                raise ValueError(f"Invalid template parameter name: {parameter!r}")
+        if len(set(parameters)) != len(parameters):
+            raise ValueError("Template parameter names must be unique")
+
+        root_index = TaskCreator(self.db)._validate_task_array(tasks)
+        nodes = compile_task_template(tasks, root_index, parameters)
+
+        template_id = template_id or str(uuid.uuid4())
+        if await self._get_model(template_id) is not None:
+            raise ValueError(f"Task template {template_id} already exists")
+        self.db.add(TaskTemplateModel(
+            id=template_id,
+            name=name,
+            user_id=user_id,
+            parameters=parameters,
+            tasks=tasks,
+            compiled={"nodes": nodes},
+            task_count=len(nodes),
+        ))
+        try:
+            if self.is_async:
+                await self.db.commit()
+            else:
+                self.db.commit()
+        except Exception:
+            if self.is_async:
+                await self.db.rollback()
+            else:
+                self.db.rollback()
+            raise
+
+        template = CompiledTaskTemplate(template_id, name, user_id, parameters, nodes)
+        _compiled_templates[template_id] = template
+        logger.info(f"Created task template {template_id} with {len(nodes)} tasks")
+        return template
+
+    async def _get_model(self, template_id: str) -> Optional[TaskTemplateModel]:
+        stmt = select(TaskTemplateModel).where(TaskTemplateModel.id == template_id)
+        result = (await self.db.execute(stmt)) if self.is_async else self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_template(self, template_id: str) -> Optional[CompiledTaskTemplate]:
+        """
+        Get a compiled template (from the process cache, or loaded once from the database)
+
+        Args:
+            template_id: Template ID
+
+        Returns:
+            Compiled template, or None if not found
+        """
+        template = _compiled_templates.get(template_id)
+        if template is not None:
+            return template
+        model = await self._get_model(template_id)
+        if model is None:
+            return None
+        template = CompiledTaskTemplate(
+            model.id,
+            model.name,
+            model.user_id,
+            list(model.parameters or []),
+            (model.compiled or {}).get("nodes", []),
+        )
+        _compiled_templates[template_id] = template
+        return template
+
+    async def instantiate(
+        self,
+        template_id: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+    ) -> TaskTreeNode:
+        """
+        Create a task tree from a template
+
+        Args:
+            template_id: Template ID
+            parameters: Parameter name -> value (all declared parameters are required;
+                undeclared names are ignored)
+            user_id: User ID of the new tasks (default: the user_id of each template task)
+
+        Returns:
+            Root node of the new (saved) task tree
+
+        Raises:
+            ValueError: If the template does not exist or parameters are missing
+        """
+        template = await self.get_template(template_id)
+        if template is None:
+            raise ValueError(f"Task template {template_id} not found")
+        parameters = parameters or {}
+        missing = [name for name in template.parameters if name not in parameters]
+        if missing:
+            raise ValueError(f"Missing template parameters: {', '.join(missing)}")
+        values = {name: parameters[name] for name in template.parameters}
+
+        task_ids = [str(uuid.uuid4()) for _ in template.nodes]
+        tree_nodes: List[TaskTreeNode] = []
+        for node_index, node in enumerate(template.nodes):
+            fields = {
+                field: substitute_parameters(node[field], values)
+                if field in node["parameterized"]
+                else copy.deepcopy(node[field])
+                for field in TEMPLATE_FIELDS
+            }
+            task = self.task_model_class(
+                id=task_ids[node_index],
+                name=str(fields["name"]),
+                user_id=user_id if user_id is not None else node["user_id"],
+                parent_id=task_ids[node["parent"]] if node["parent"] is not None else None,
+                priority=node["priority"],
+                dependencies=[
+                    {
+                        "id": task_ids[dep["node"]],
+                        "required": dep["required"],
+                        "type": dep["type"],
+                        **get_dependency_options(dep),
+                    }
+                    for dep in node["dependencies"]
+                ],
+                inputs=fields["inputs"],
+                params=fields["params"],
+                schemas=fields["schemas"],
+                status="pending",
+                progress=0.0,
+                has_children=node["has_children"],
+                has_copy=False,
+                version=1,
+            )
+            tree_node = TaskTreeNode(task=task)
+            if node["parent"] is not None:
+                tree_nodes[node["parent"]].add_child(tree_node)
+            tree_nodes.append(tree_node)
+
+        repository = TaskRepository(self.db, task_model_class=self.task_model_class)
+        await repository.save_task_tree(tree_nodes[0], check_existing=False)
+        logger.debug(f"Instantiated task template {template_id}: root task {task_ids[0]}")
+        return tree_nodes[0]
+
+
+__all__ = [
+    "CompiledTaskTemplate",
+    "TaskTemplateRegistry",
+    "compile_task_template",
+    "substitute_parameters",
+    "clear_template_cache",
+]
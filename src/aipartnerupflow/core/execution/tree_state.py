@@ -0,0 +1,220 @@
+"""
+In-memory state index for a running task tree
+
+TaskManager keeps one TaskTreeState per distributed tree so that dependency checks
+and dependent-task lookups do not have to reload the whole tree from the database.
+The database stays the source of record: every status transition is written through
+the repository first and then mirrored here.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+
+if TYPE_CHECKING:
+    from aipartnerupflow.core.types import TaskTreeNode
+
+
+@dataclass
+class TaskStateEntry:
+    """
+    Snapshot of the execution-relevant fields of one task
+
+    Exposes the same attribute names as TaskModel (id, status, result) so it can be
+    used wherever dependency resolution reads a completed task.
+    """
+
+    id: str
+    status: str
+    result: Any = None
+
+
+def get_dependency_id(dependency: Any) -> Optional[str]:
+    """
+    Extract the dependency task id from a dependency entry
+
+    Args:
+        dependency: Dependency entry, either {"id": ...} dict or plain id string
+
+    Returns:
+        Dependency task id, or None if the entry has no id
+    """
+    if isinstance(dependency, dict):
+        return dependency.get("id")
+    if isinstance(dependency, str):
+        return dependency
+    return None
+
+
+def is_required_dependency(dependency: Any) -> bool:
+    """
+    Check whether a dependency entry must be completed before its dependent can run
+
+    String dependencies are always required; dict dependencies default to required.
+    """
+    if isinstance(dependency, dict):
+        return bool(dependency.get("required", True))
+    return True
+
+
+class TaskTreeState:
+    """
+    Authoritative in-memory index of a task tree being executed
+
+    Maintains:
+    - id -> status/result snapshot (TaskStateEntry)
+    - id -> parent_id map
+    - id -> dependency entries, and the reverse map id -> ids of tasks depending on it
+    - a live view of completed tasks with a result (what dependency resolution consumes)
+
+    All lookups are O(1). Updates must be applied after the corresponding database
+    write succeeds (write-through), see TaskManager._update_task_status().
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, TaskStateEntry] = {}
+        self._parents: Dict[str, Optional[str]] = {}
+        self._dependencies: Dict[str, List[Any]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._completed: Dict[str, TaskStateEntry] = {}
+
+    @classmethod
+    def from_task_tree(cls, task_tree: "TaskTreeNode") -> "TaskTreeState":
+        """
+        Build the index from a task tree
+
+        Args:
+            task_tree: Root TaskTreeNode (tasks are read once, no database access)
+
+        Returns:
+            Populated TaskTreeState
+        """
+        state = cls()
+        stack = [task_tree]
+        while stack:
+            node = stack.pop()
+            state.add_task(node.task)
+            stack.extend(node.children)
+        return state
+
+    def add_task(self, task: TaskModel) -> None:
+        """
+        Add or replace a task in the index
+
+        Args:
+            task: Task to index
+        """
+        task_id = str(task.id)
+        previous_dependencies = self._dependencies.get(task_id, [])
+        for dependency in previous_dependencies:
+            dependency_id = get_dependency_id(dependency)
+            if dependency_id in self._dependents:
+                self._dependents[dependency_id].discard(task_id)
+
+        self._parents[task_id] = task.parent_id
+        dependencies = list(task.dependencies or [])
+        self._dependencies[task_id] = dependencies
+        for dependency in dependencies:
+            dependency_id = get_dependency_id(dependency)
+            if dependency_id:
+                self._dependents.setdefault(dependency_id, set()).add(task_id)
+
+        self._set_entry(TaskStateEntry(id=task_id, status=task.status, result=task.result))
+
+    def remove_task(self, task_id: str) -> None:
+        """
+        Remove a task from the index
+
+        Used for tasks spawned at runtime once their results have been consumed, so
+        the index does not keep every child result alive. Unknown task ids are ignored.
+
+        Args:
+            task_id: Task id
+        """
+        task_id = str(task_id)
+        for dependency in self._dependencies.pop(task_id, []):
+            dependency_id = get_dependency_id(dependency)
+            if dependency_id in self._dependents:
+                self._dependents[dependency_id].discard(task_id)
+        self._parents.pop(task_id, None)
+        self._entries.pop(task_id, None)
+        self._completed.pop(task_id, None)
+
+    def update(
+        self,
+        task_id: str,
+        status: str,
+        result: Optional[Any] = None,
+    ) -> None:
+        """
+        Apply a status transition to the index
+
+        Mirrors TaskRepository.update_task_status() semantics: result is only
+        replaced when provided. Unknown task ids are ignored.
+
+        Args:
+            task_id: Task id
+            status: New status
+            result: New result (None means unchanged)
+        """
+        entry = self._entries.get(str(task_id))
+        if entry is None:
+            return
+        entry.status = status
+        if result is not None:
+            entry.result = result
+        self._set_entry(entry)
+
+    def _set_entry(self, entry: TaskStateEntry) -> None:
+        self._entries[entry.id] = entry
+        if entry.status == "completed" and entry.result is not None:
+            self._completed[entry.id] = entry
+        else:
+            self._completed.pop(entry.id, None)
+
+    def has_task(self, task_id: str) -> bool:
+        """Check whether a task is part of the indexed tree"""
+        return task_id in self._entries
+
+    def has_tasks(self, task_ids: List[str]) -> bool:
+        """Check whether all given task ids are part of the indexed tree"""
+        return all(task_id in self._entries for task_id in task_ids)
+
+    def get_status(self, task_id: str) -> Optional[str]:
+        """Get the indexed status of a task, or None if unknown"""
+        entry = self._entries.get(task_id)
+        return entry.status if entry else None
+
+    def get_result(self, task_id: str) -> Any:
+        """Get the indexed result of a task, or None if unknown"""
+        entry = self._entries.get(task_id)
+        return entry.result if entry else None
+
+    def get_parent_id(self, task_id: str) -> Optional[str]:
+        """Get the parent id of a task, or None for the root or unknown tasks"""
+        return self._parents.get(task_id)
+
+    def get_dependencies(self, task_id: str) -> List[Any]:
+        """Get the dependency entries of a task"""
+        return self._dependencies.get(task_id, [])
+
+    def get_dependents(self, task_id: str) -> Set[str]:
+        """Get ids of tasks that declare a dependency on the given task"""
+        return set(self._dependents.get(task_id, ()))
+
+    def get_completed_tasks_by_id(self) -> Dict[str, TaskStateEntry]:
+        """
+        Get completed tasks that have a result, keyed by id
+
+        Returns the live mapping (no copy); callers must treat it as read-only.
+        """
+        return self._completed
+
+
+__all__ = [
+    "TaskTreeState",
+    "TaskStateEntry",
+    "get_dependency_id",
+    "is_required_dependency",
+]
@@ -0,0 +1,747 @@
+"""
+Shared work queue for multi-worker deployments
+
+`apflow serve --workers N` starts N processes, each with its own TaskExecutor and
+TaskTracker. With the work queue enabled (set_work_queue() or
+AIPARTNERUPFLOW_WORK_QUEUE=true), task executions are written to the task queue
+table (TaskQueueModel) instead of being run by the process that received the request:
+
+- Every worker process runs a QueueWorker that claims queued executions (up to
+  max_concurrent at a time) and runs them with TaskExecutor.execute_task_by_id().
+- A claim is a lease that the owning worker extends on every heartbeat. When a worker
+  dies its leases expire and another worker claims the executions again.
+- Running state (tasks.running.*) and cancellation go through the table, so they work
+  no matter which worker receives the request. A cancellation for an execution owned
+  by another worker is stored on its row and carried out by that worker.
+
+Granularity: a queue row is one tree execution (the task id passed to tasks.execute,
+with its whole tree), not one ready task. The worker that claims a row runs every task
+of that tree in its own TaskManager, so load is spread across workers tree by tree;
+the tasks of a single large tree do not spread over several workers.
+
+Claiming:
+- PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers neither wait for
+  nor claim the same rows.
+- Other databases (DuckDB, SQLite): per-row compare-and-set UPDATE on status and lease.
+  DuckDB allows a single writing process per database file, so deployments with several
+  worker processes should use PostgreSQL.
+
+Environment variables:
+- AIPARTNERUPFLOW_WORK_QUEUE: enable the work queue (default false)
+- AIPARTNERUPFLOW_WORK_QUEUE_MAX_CONCURRENT: executions per worker process (default 4)
+- AIPARTNERUPFLOW_TASK_QUEUE_TABLE_NAME: queue table name (default "apflow_task_queue")
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from aipartnerupflow.core.config import get_work_queue
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskQueueModel
+from aipartnerupflow.core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TaskWorkQueue:
+    """
+    Database operations on the task queue table
+
+    All methods commit their own changes, so the queue state is visible to other
+    worker processes as soon as a method returns.
+    """
+
+    def __init__(self, db: Union[Session, AsyncSession], lease_seconds: Optional[float] = None):
+        """
+        Initialize TaskWorkQueue
+
+        Args:
+            db: Database session (sync or async)
+            lease_seconds: Lease length of claims and heartbeats
+                (default: from the config registry, see set_work_queue())
+        """
+        self.db = db
+        self.is_async = isinstance(db, AsyncSession)
+        self.lease_seconds = (
+            get_work_queue()["lease_seconds"] if lease_seconds is None else float(lease_seconds)
+        )
+        self.table = TaskQueueModel.__table__
+
+    @property
+    def dialect_name(self) -> str:
+        """Database dialect name (e.g. "postgresql", "duckdb")"""
+        try:
+            return self.db.get_bind().dialect.name
+        except Exception:
+            return ""
+
+    async def _execute(self, stmt: Any) -> Any:
+        if self.is_async:
+            return await self.db.execute(stmt)
+        return self.db.execute(stmt)
+
+    async def _commit(self) -> None:
+        if self.is_async:
+            await self.db.commit()
+        else:
+            self.db.commit()
+
+    async def _rollback(self) -> None:
+        if self.is_async:
+            await self.db.rollback()
+        else:
+            self.db.rollback()
+
+    async def _fetch(self, *conditions: Any) -> List[Dict[str, Any]]:
+        stmt = select(self.table).where(*conditions)
+        result = await self._execute(stmt)
+        return [dict(row._mapping) for row in result.fetchall()]
+
+    def _live_lease(self, now: datetime) -> Any:
+        """Condition: running with an unexpired lease"""
+        return and_(self.table.c.status == RUNNING, self.table.c.lease_expires_at >= now)
+
+    def _claimable(self, now: datetime) -> Any:
+        """Condition: queued, or running under a lease that expired (worker died)"""
+        return or_(
+            self.table.c.status == QUEUED,
+            and_(
+                self.table.c.status == RUNNING,
+                or_(self.table.c.lease_expires_at.is_(None), self.table.c.lease_expires_at < now),
+            ),
+        )
+
+    async def _insert(self, values: Dict[str, Any]) -> bool:
+        existing = await self._execute(
+            select(self.table.c.task_id).where(self.table.c.task_id == values["task_id"])
+        )
+        if existing.first() is not None:
+            return False
+        try:
+            await self._execute(insert(self.table).values(**values))
+            await self._commit()
+        except IntegrityError:
+            # Inserted concurrently by another worker
+            await self._rollback()
+            return False
+        return True
+
+    async def enqueue(
+        self,
+        task_id: str,
+        root_task_id: str,
+        priority: Optional[int] = None,
+        use_demo: bool = False,
+    ) -> bool:
+        """
+        Queue a task execution for any worker
+
+        The claiming worker executes the task together with its tree (see
+        TaskExecutor.execute_task_by_id); tasks of the tree are not queued separately.
+
+        Args:
+            task_id: Task to execute (root or child task, see TaskExecutor.execute_task_by_id)
+            root_task_id: Root task ID of its tree
+            priority: Claim order, smaller numbers first (default: 2)
+            use_demo: Execute in demo mode
+
+        Returns:
+            True if queued, False if the task is already queued or running
+        """
+        return await self._insert(
+            {
+                "task_id": task_id,
+                "root_task_id": root_task_id,
+                "status": QUEUED,
+                "priority": 2 if priority is None else priority,
+                "use_demo": bool(use_demo),
+                "enqueued_at": _utcnow(),
+            }
+        )
+
+    async def register_running(
+        self,
+        task_id: str,
+        root_task_id: str,
+        worker_id: str,
+        use_demo: bool = False,
+    ) -> bool:
+        """
+        Record an execution that a worker runs itself (e.g. with SSE streaming)
+
+        The row shares running state and cancellation like a claimed execution.
+
+        Returns:
+            True if recorded, False if the task is already queued or running
+        """
+        now = _utcnow()
+        return await self._insert(
+            {
+                "task_id": task_id,
+                "root_task_id": root_task_id,
+                "status": RUNNING,
+                "use_demo": bool(use_demo),
+                "worker_id": worker_id,
+                "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                "attempts": 1,
+                "enqueued_at": now,
+                "claimed_at": now,
+            }
+        )
+
+    async def claim(self, worker_id: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """
+        Claim queued executions (and executions whose lease expired)
+
+        Args:
+            worker_id: Claiming worker
+            limit: Maximum number of executions to claim
+
+        Returns:
+            Claimed rows as dictionaries, in claim order
+        """
+        if limit < 1:
+            return []
+        now = _utcnow()
+        claim_values = {
+            "status": RUNNING,
+            "worker_id": worker_id,
+            "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+            "claimed_at": now,
+            "attempts": self.table.c.attempts + 1,
+        }
+        candidates_stmt = (
+            select(self.table.c.task_id)
+            .where(self._claimable(now))
+            .order_by(self.table.c.priority.asc(), self.table.c.enqueued_at.asc())
+            .limit(limit)
+        )
+        try:
+            if self.dialect_name == "postgresql":
+                # Rows locked by other workers' claims are skipped instead of waited for
+                result = await self._execute(candidates_stmt.with_for_update(skip_locked=True))
+                claimed_ids = list(result.scalars().all())
+                if claimed_ids:
+                    await self._execute(
+                        update(self.table)
+                        .where(self.table.c.task_id.in_(claimed_ids))
+                        .values(**claim_values)
+                    )
+            else:
+                result = await self._execute(candidates_stmt)
+                claimed_ids = []
+                for task_id in result.scalars().all():
+                    # Compare-and-set: only succeeds if the row is still claimable
+                    update_result = await self._execute(
+                        update(self.table)
+                        .where(self.table.c.task_id == task_id, self._claimable(now))
+                        .values(**claim_values)
+                    )
+                    if update_result.rowcount is not None and update_result.rowcount >= 0:
+                        if update_result.rowcount == 1:
+                            claimed_ids.append(task_id)
+                        continue
+                    # Driver without rowcount (DuckDB): check that our claim stamp is on the row
+                    check = await self._execute(
+                        select(self.table.c.task_id).where(
+                            self.table.c.task_id == task_id,
+                            self.table.c.worker_id == worker_id,
+                            self.table.c.claimed_at == now,
+                        )
+                    )
+                    if check.first() is not None:
+                        claimed_ids.append(task_id)
+            claimed = await self._fetch(self.table.c.task_id.in_(claimed_ids)) if claimed_ids else []
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+        order = {task_id: index for index, task_id in enumerate(claimed_ids)}
+        claimed.sort(key=lambda row: order[row["task_id"]])
+        return claimed
+
+    async def heartbeat(self, worker_id: str, task_ids: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Extend the leases of a worker's executions and collect cancellation requests
+
+        Collected requests are removed from the rows.
+
+        Args:
+            worker_id: Worker owning the executions
+            task_ids: Executions (queue task ids) the worker is running
+
+        Returns:
+            Queue task id -> {task_id: error_message} for executions with pending cancellations
+        """
+        if not task_ids:
+            return {}
+        owned = and_(self.table.c.task_id.in_(task_ids), self.table.c.worker_id == worker_id)
+        try:
+            await self._execute(
+                update(self.table)
+                .where(owned)
+                .values(lease_expires_at=_utcnow() + timedelta(seconds=self.lease_seconds))
+            )
+            rows = await self._fetch(owned, self.table.c.cancel_requests.isnot(None))
+            cancellations = {row["task_id"]: row["cancel_requests"] for row in rows if row["cancel_requests"]}
+            if rows:
+                await self._execute(
+                    update(self.table)
+                    .where(self.table.c.task_id.in_([row["task_id"] for row in rows]))
+                    .values(cancel_requests=None)
+                )
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+        return cancellations
+
+    async def complete(self, task_id: str, worker_id: Optional[str] = None) -> None:
+        """
+        Remove a finished execution from the queue
+
+        Args:
+            task_id: Queue task id
+            worker_id: Only remove the row if this worker still owns it
+        """
+        conditions = [self.table.c.task_id == task_id]
+        if worker_id is not None:
+            conditions.append(self.table.c.worker_id == worker_id)
+        await self._execute(delete(self.table).where(*conditions))
+        await self._commit()
+
+    async def release(self, worker_id: str, task_ids: List[str]) -> None:
+        """
+        Put a worker's executions back in the queue (e.g. on shutdown)
+
+        Args:
+            worker_id: Worker owning the executions
+            task_ids: Queue task ids to release
+        """
+        if not task_ids:
+            return
+        await self._execute(
+            update(self.table)
+            .where(self.table.c.task_id.in_(task_ids), self.table.c.worker_id == worker_id)
+            .values(status=QUEUED, worker_id=None, lease_expires_at=None)
+        )
+        await self._commit()
+
+    async def request_cancel(
+        self,
+        task_id: str,
+        root_task_id: str,
+        error_message: Optional[str] = None,
+        local_worker_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Route a cancellation through the queue
+
+        - Executions of the tree running on other workers get a cancellation request,
+          which their worker carries out with TaskExecutor.cancel_task().
+        - Queued executions of the task (or all of the tree when the root is cancelled)
+          are removed so no worker starts them.
+
+        Args:
+            task_id: Task to cancel
+            root_task_id: Root task ID of its tree
+            error_message: Cancellation message
+            local_worker_id: Worker handling the request; its own executions are left to the caller
+
+        Returns:
+            {"status": "requested", "worker_ids": [...]} if other workers will cancel,
+            {"status": "dequeued", "task_ids": [...]} if queued executions were removed,
+            None if the queue has nothing to do for this task
+        """
+        now = _utcnow()
+        rows = await self._fetch(self.table.c.root_task_id == root_task_id)
+        remote = [
+            row for row in rows
+            if row["status"] == RUNNING
+            and row["lease_expires_at"] is not None
+            and row["lease_expires_at"] >= now
+            and row["worker_id"] != local_worker_id
+        ]
+        if remote:
+            for row in remote:
+                requests = dict(row["cancel_requests"] or {})
+                requests[task_id] = error_message or "Cancelled by user"
+                await self._execute(
+                    update(self.table)
+                    .where(self.table.c.task_id == row["task_id"])
+                    .values(cancel_requests=requests)
+                )
+            await self._commit()
+            return {"status": "requested", "worker_ids": sorted({row["worker_id"] for row in remote})}
+
+        queued_ids = [
+            row["task_id"] for row in rows
+            if row["status"] == QUEUED and (task_id == root_task_id or row["task_id"] == task_id)
+        ]
+        if queued_ids:
+            await self._execute(
+                delete(self.table).where(
+                    self.table.c.task_id.in_(queued_ids), self.table.c.status == QUEUED
+                )
+            )
+            await self._commit()
+            return {"status": "dequeued", "task_ids": queued_ids}
+        return None
+
+    async def get_running(self) -> List[Dict[str, Any]]:
+        """
+        Get executions running on any worker (unexpired leases)
+
+        Returns:
+            Running rows as dictionaries
+        """
+        return await self._fetch(self._live_lease(_utcnow()))
+
+    async def get_running_root_ids(self) -> List[str]:
+        """
+        Get root task IDs of trees running on any worker
+
+        Returns:
+            Root task IDs (unique, in claim order)
+        """
+        rows = await self.get_running()
+        rows.sort(key=lambda row: row["claimed_at"] or row["enqueued_at"] or _utcnow())
+        return list(dict.fromkeys(row["root_task_id"] for row in rows))
+
+    async def is_running(self, task_id: str) -> bool:
+        """
+        Check whether a task (or the tree it is the root of) is running on any worker
+
+        Args:
+            task_id: Task ID or root task ID
+
+        Returns:
+            True if running under an unexpired lease
+        """
+        rows = await self._fetch(
+            or_(self.table.c.task_id == task_id, self.table.c.root_task_id == task_id),
+            self._live_lease(_utcnow()),
+        )
+        return bool(rows)
+
+    async def is_active(self, task_id: str) -> bool:
+        """
+        Check whether a task (or the tree it is the root of) is queued or running on any worker
+
+        Args:
+            task_id: Task ID or root task ID
+
+        Returns:
+            True if queued or running
+        """
+        rows = await self._fetch(
+            or_(self.table.c.task_id == task_id, self.table.c.root_task_id == task_id),
+            or_(self.table.c.status == QUEUED, self._live_lease(_utcnow())),
+        )
+        return bool(rows)
+
+
+SessionFactory = Callable[[], Any]
+
+
+def _default_session_factory() -> Any:
+    from aipartnerupflow.core.storage import factory
+
+    return factory.create_pooled_session()
+
+
+def make_worker_id() -> str:
+    """Unique worker id: host, process id and a random suffix"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class QueueWorker:
+    """
+    Per-process worker claiming and running executions from the work queue
+
+    One loop polls the queue every poll_interval seconds (or sooner after notify()),
+    claims executions for its free slots, renews the leases of its running executions
+    and carries out cancellation requests addressed to them.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+        session_factory: Optional[SessionFactory] = None,
+    ):
+        """
+        Initialize QueueWorker
+
+        Args:
+            worker_id: Worker id stored on claimed rows (default: make_worker_id())
+            poll_interval: Seconds between polls and heartbeats (default: config registry)
+            lease_seconds: Lease length (default: config registry)
+            max_concurrent: Executions run at the same time (default: config registry)
+            session_factory: Async context manager factory yielding database sessions
+                (default: create_pooled_session)
+        """
+        config = get_work_queue()
+        self.worker_id = worker_id or make_worker_id()
+        self.poll_interval = config["poll_interval"] if poll_interval is None else float(poll_interval)
+        self.lease_seconds = config["lease_seconds"] if lease_seconds is None else float(lease_seconds)
+        self.max_concurrent = config["max_concurrent"] if max_concurrent is None else int(max_concurrent)
+        self.session_factory = session_factory or _default_session_factory
+        # Queue task id -> asyncio task of the execution
+        self._active: Dict[str, asyncio.Task] = {}
+        self._local: set[str] = set()  # Executions registered with run_local()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker loop is running"""
+        return self._loop_task is not None and not self._loop_task.done()
+
+    def get_active_task_ids(self) -> List[str]:
+        """Queue task ids of the executions this worker runs"""
+        return list(self._active)
+
+    @asynccontextmanager
+    async def _queue(self) -> AsyncIterator[TaskWorkQueue]:
+        async with self.session_factory() as db_session:
+            yield TaskWorkQueue(db_session, lease_seconds=self.lease_seconds)
+
+    async def start(self) -> None:
+        """Start the worker loop in the running event loop"""
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._loop_task = asyncio.create_task(self._run())
+        logger.info(f"Started work queue worker {self.worker_id} (max_concurrent={self.max_concurrent})")
+
+    async def stop(self) -> None:
+        """
+        Stop the worker loop
+
+        Claimed executions still running are cancelled and put back in the queue so
+        another worker takes them over.
+        """
+        self._stopping = True
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._loop_task = None
+
+        claimed = [task_id for task_id in self._active if task_id not in self._local]
+        tasks = list(self._active.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if claimed:
+            try:
+                async with self._queue() as queue:
+                    await queue.release(self.worker_id, claimed)
+            except Exception as e:
+                logger.warning(f"Failed to release queued executions of worker {self.worker_id}: {str(e)}")
+        logger.info(f"Stopped work queue worker {self.worker_id}")
+
+    def notify(self) -> None:
+        """Poll the queue now instead of waiting for the next poll interval"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Work queue poll failed on worker {self.worker_id}: {str(e)}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def poll(self) -> List[Dict[str, Any]]:
+        """
+        Renew leases, carry out cancellation requests and claim executions for free slots
+
+        Returns:
+            Rows claimed by this poll
+        """
+        async with self._queue() as queue:
+            cancellations = await queue.heartbeat(self.worker_id, list(self._active))
+            free_slots = self.max_concurrent - len(self._active)
+            claimed = await queue.claim(self.worker_id, free_slots) if free_slots > 0 else []
+
+        for requests in cancellations.values():
+            for task_id, error_message in requests.items():
+                await self._cancel(task_id, error_message)
+
+        for row in claimed:
+            self._track(row["task_id"], asyncio.create_task(self._execute(row)))
+        return claimed
+
+    def _track(self, task_id: str, task: asyncio.Task) -> None:
+        self._active[task_id] = task
+
+        def done(_: asyncio.Task) -> None:
+            if self._active.get(task_id) is task:
+                del self._active[task_id]
+            self._local.discard(task_id)
+            self.notify()
+
+        task.add_done_callback(done)
+
+    async def _execute(self, row: Dict[str, Any]) -> None:
+        from aipartnerupflow.core.execution.task_executor import TaskExecutor
+
+        task_id = row["task_id"]
+        logger.info(f"Worker {self.worker_id} executing queued task {task_id} (attempt {row['attempts']})")
+        try:
+            async with self.session_factory() as db_session:
+                await TaskExecutor().execute_task_by_id(
+                    task_id=task_id,
+                    use_demo=bool(row.get("use_demo")),
+                    db_session=db_session,
+                )
+        except asyncio.CancelledError:
+            # Worker shutdown: stop() puts the execution back in the queue
+            raise
+        except Exception as e:
+            logger.error(f"Error executing queued task {task_id}: {str(e)}", exc_info=True)
+        await self._complete(task_id)
+
+    async def _complete(self, task_id: str) -> None:
+        try:
+            async with self._queue() as queue:
+                await queue.complete(task_id, self.worker_id)
+        except Exception as e:
+            logger.warning(f"Failed to remove task {task_id} from the work queue: {str(e)}")
+
+    async def _cancel(self, task_id: str, error_message: Optional[str]) -> None:
+        from aipartnerupflow.core.execution.task_executor import TaskExecutor
+
+        logger.info(f"Worker {self.worker_id} cancelling task {task_id} on request")
+        try:
+            async with self.session_factory() as db_session:
+                await TaskExecutor().cancel_task(task_id, error_message, db_session=db_session)
+        except Exception as e:
+            logger.warning(f"Failed to cancel task {task_id}: {str(e)}")
+
+    async def run_local(
+        self,
+        task_id: str,
+        root_task_id: str,
+        execution: Awaitable[Any],
+        use_demo: bool = False,
+    ) -> Any:
+        """
+        Run an execution in this process and share its state through the queue
+
+        Used for executions that cannot move to another worker (e.g. SSE streaming,
+        whose events are delivered by this process). The execution is recorded as
+        running on this worker, so other workers see it and can cancel it.
+
+        Args:
+            task_id: Task being executed
+            root_task_id: Root task ID of its tree
+            execution: Awaitable running the execution
+            use_demo: Demo mode flag stored on the row
+
+        Returns:
+            Result of the execution
+        """
+        try:
+            async with self._queue() as queue:
+                await queue.register_running(task_id, root_task_id, self.worker_id, use_demo=use_demo)
+        except Exception as e:
+            logger.warning(f"Failed to record local execution of task {task_id}: {str(e)}")
+
+        task = asyncio.ensure_future(execution)
+        self._local.add(task_id)
+        self._track(task_id, task)
+        try:
+            return await task
+        finally:
+            await self._complete(task_id)
+
+
+_worker: Optional[QueueWorker] = None
+
+
+def get_queue_worker() -> QueueWorker:
+    """
+    Get the QueueWorker of this process
+
+    Returns:
+        QueueWorker singleton (not started until start() is called)
+    """
+    global _worker
+    if _worker is None:
+        _worker = QueueWorker()
+    return _worker
+
+
+def reset_queue_worker() -> None:
+    """Drop the QueueWorker of this process without stopping it (for tests)"""
+    global _worker
+    _worker = None
+
+
+def run_queue_worker_on_startup(app: Any) -> None:
+    """
+    Run this process's QueueWorker for the lifetime of a Starlette/FastAPI app
+
+    Does nothing unless the work queue is enabled (see set_work_queue()).
+
+    Args:
+        app: Starlette or FastAPI application
+    """
+    if not get_work_queue()["enabled"]:
+        return
+    original_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(lifespan_app: Any) -> AsyncIterator[Any]:
+        worker = get_queue_worker()
+        await worker.start()
+        try:
+            async with original_lifespan(lifespan_app) as state:
+                yield state
+        finally:
+            await worker.stop()
+
+    app.router.lifespan_context = lifespan
+
+
+__all__ = [
+    "TaskWorkQueue",
+    "QueueWorker",
+    "make_worker_id",
+    "get_queue_worker",
+    "reset_queue_worker",
+    "run_queue_worker_on_startup",
+]
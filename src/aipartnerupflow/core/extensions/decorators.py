@@ -11,7 +11,7 @@ Type-specific decorators:
 - @hook_register() - for hooks
 """
 
-from typing import Callable, Optional, Dict, Any, Type, TYPE_CHECKING
+from typing import Callable, Optional, Dict, Any, Type, Union, TYPE_CHECKING
 from functools import wraps
 from aipartnerupflow.core.extensions import get_registry
 from aipartnerupflow.core.extensions.base import Extension
@@ -166,6 +166,11 @@ def executor_register(
     override: bool = False,
     pre_hook: Optional[Callable] = None,
     post_hook: Optional[Callable] = None,
+    max_concurrency: Optional[int] = None,
+    cacheable: Union[bool, Callable[[Dict[str, Any]], bool]] = False,
+    cache_version: Optional[str] = None,
+    cache_ttl: Optional[float] = None,
+    execution_lane: Optional[str] = None,
 ):
     """
     Decorator for executor registration (type-specific)
@@ -189,6 +194,21 @@ def executor_register(
         )
         class MyExecutor(BaseTask):
             ...
+        
+        # Or with a concurrency limit (at most 20 executions at the same time)
+        @executor_register(max_concurrency=20)
+        class MyExecutor(BaseTask):
+            ...
+        
+        # Or with cacheable results (reused when the result cache is enabled)
+        @executor_register(cacheable=True, cache_version="2")
+        class MyExecutor(BaseTask):
+            ...
+        
+        # Or CPU-bound work in a worker process (does not block the event loop)
+        @executor_register(execution_lane="process")
+        class MyExecutor(BaseTask):
+            ...
     
     Args:
         factory: Optional factory function to create executor instances.
@@ -199,6 +219,18 @@ def executor_register(
                  If returns non-None, skips executor execution and uses returned value.
         post_hook: Optional hook function called after executor.execute().
                   Signature: async def post_hook(executor, task, inputs, result) -> None
+        max_concurrency: Optional maximum number of concurrent executions of this executor
+                        (process-wide). Can be overridden with set_executor_max_concurrency().
+        cacheable: Whether results only depend on params and inputs, so they can be reused
+                  by the result cache (see set_result_cache()). Either a bool or a function
+                  of the resolved inputs, e.g. lambda inputs: inputs.get("method") == "GET".
+        cache_version: Optional version included in cache keys; change it when the executor's
+                      behavior changes to stop reusing older results.
+        cache_ttl: Optional seconds cached results of this executor stay valid
+                  (overrides the result cache ttl).
+        execution_lane: Where execute() runs: "event_loop" (default), "thread" (bounded
+                       thread pool) or "process" (process pool; the executor class, its
+                       params, inputs and result must be picklable). See set_lane_workers().
     
     Returns:
         Decorated class (same class, registered automatically)
@@ -227,6 +259,30 @@ def executor_register(
         if post_hook:
             registered_cls._executor_hooks['post_hook'] = post_hook
         
+        # Store execution options in executor class metadata (own dict, not inherited from base class)
+        if '_executor_options' not in registered_cls.__dict__:
+            registered_cls._executor_options = dict(getattr(registered_cls, '_executor_options', {}))
+        
+        if max_concurrency is not None:
+            if max_concurrency < 1:
+                raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+            registered_cls._executor_options['max_concurrency'] = max_concurrency
+        
+        if cacheable:
+            registered_cls._executor_options['cacheable'] = cacheable
+        if cache_version is not None:
+            registered_cls._executor_options['cache_version'] = str(cache_version)
+        if cache_ttl is not None:
+            if cache_ttl <= 0:
+                raise ValueError(f"cache_ttl must be > 0, got {cache_ttl}")
+            registered_cls._executor_options['cache_ttl'] = float(cache_ttl)
+        
+        if execution_lane is not None:
+            from aipartnerupflow.core.config.registry import EXECUTION_LANES
+            if execution_lane not in EXECUTION_LANES:
+                raise ValueError(f"Unknown execution_lane '{execution_lane}', expected one of {EXECUTION_LANES}")
+            registered_cls._executor_options['execution_lane'] = execution_lane
+        
         return registered_cls
     return decorator
 
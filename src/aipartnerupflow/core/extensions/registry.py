@@ -490,6 +490,23 @@ class ExtensionRegistry:
         """
         return [ext.id for ext in self.get_all_by_category(category)]
     
+    def get_executor_options(self, executor_id: str) -> Dict[str, Any]:
+        """
+        Get execution options declared with @executor_register() (e.g., max_concurrency)
+        
+        Args:
+            executor_id: Executor ID
+        
+        Returns:
+            Copy of the options dictionary (empty if executor is unknown or has no options)
+        """
+        # Executors registered with a factory have no class entry; the registered
+        # template instance delegates attribute lookup to the executor class
+        source = self._executor_classes.get(executor_id) or self._by_id.get(executor_id)
+        if source is None:
+            return {}
+        return dict(getattr(source, '_executor_options', None) or {})
+    
     def add_executor_hook(self, executor_id: str, hook_type: str, hook_func: Callable) -> None:
         """
         Add hook to an already registered executor
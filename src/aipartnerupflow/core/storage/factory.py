@@ -11,8 +11,15 @@ from contextlib import asynccontextmanager
 from threading import Lock
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker, AsyncEngine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy import create_engine, Engine
-from aipartnerupflow.core.storage.sqlalchemy.models import Base
+from sqlalchemy import Column, DDL, Table, create_engine, Engine, inspect, literal, update
+from sqlalchemy.exc import CompileError
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
+from aipartnerupflow.core.storage.sqlalchemy.models import (
+    Base,
+    TASK_TABLE_NAME,
+    TASK_DEPENDENCY_TABLE_NAME,
+    rebuild_dependency_edges,
+)
 from aipartnerupflow.core.storage.dialects.registry import get_dialect_config
 from aipartnerupflow.core.utils.logger import get_logger
 
@@ -282,7 +289,7 @@ class SessionPoolManager:
                         # For async, tables will be created on first use
                         logger.debug("Async engine created, tables will be created on first use")
                     else:
-                        Base.metadata.create_all(self._engine)
+                        _create_tables(self._engine)
                 except Exception as e:
                     logger.warning(f"Could not create tables automatically: {str(e)}")
     
@@ -473,6 +480,83 @@ def _get_database_url_from_env() -> Optional[str]:
     return None
 
 
+def _create_tables(bind: Union[Engine, Any], commit_each: bool = False) -> None:
+    """
+    Create missing tables and add columns introduced after a table was created
+    
+    Base.metadata.create_all() does not alter existing tables, so databases created
+    by an older version would miss new columns (e.g. TaskModel.version). Missing
+    columns are added with their scalar default so existing rows stay valid, and a
+    newly created dependency edge table is filled from the existing tasks.
+    
+    Args:
+        bind: Engine or Connection (also usable with AsyncConnection.run_sync)
+        commit_each: Commit after each statement (DuckDB rejects several ALTERs of
+            a non-empty table in one transaction). Used automatically for engines.
+    """
+    if isinstance(bind, Engine):
+        with bind.connect() as connection:
+            _create_tables(connection, commit_each=True)
+        return
+    
+    existing_tables = set(inspect(bind).get_table_names())
+    Base.metadata.create_all(bind)
+    if commit_each:
+        bind.commit()
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            logger.info(f"Adding missing column {table.name}.{column.name}")
+            _add_column(bind, table, column)
+            if commit_each:
+                bind.commit()
+    
+    # Dependency edge table added to an existing database: index existing tasks
+    if TASK_TABLE_NAME in existing_tables and TASK_DEPENDENCY_TABLE_NAME not in existing_tables:
+        edge_count = rebuild_dependency_edges(bind, Base.metadata.tables[TASK_TABLE_NAME])
+        logger.info(f"Indexed {edge_count} dependency edges of existing tasks")
+        if commit_each:
+            bind.commit()
+
+
+def _add_column(bind: Any, table: Table, column: Column) -> None:
+    """
+    Add a column to an existing table, filling existing rows with its scalar default
+    
+    Identifiers are quoted by the dialect. A scalar default becomes the column's
+    DEFAULT clause; defaults the dialect cannot render as a literal (e.g. JSON) are
+    written to the existing rows with a bound UPDATE instead. Callable defaults are
+    left to the ORM.
+    
+    Args:
+        bind: Connection
+        table: Table the column belongs to
+        column: Column missing from the database table
+    """
+    dialect = bind.dialect
+    preparer = dialect.identifier_preparer
+    statement = (
+        f"ALTER TABLE {preparer.format_table(table)} "
+        f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=dialect)}"
+    )
+    fill_existing_rows = False
+    if column.default is not None and column.default.is_scalar:
+        try:
+            default = literal(column.default.arg, type_=column.type).compile(
+                dialect=dialect, compile_kwargs={"literal_binds": True}
+            )
+            statement += f" DEFAULT {default}"
+        except CompileError:
+            fill_existing_rows = True
+    # DDL applies %-formatting to the statement
+    bind.execute(DDL(statement.replace("%", "%%")))
+    if fill_existing_rows:
+        bind.execute(update(table).values({column.name: column.default.arg}))
+
+
 def _ensure_database_directory_exists(db_path: Union[str, Path]) -> None:
     """
     Ensure database directory exists before creating connection.
@@ -686,7 +770,7 @@ def create_session(
                 import asyncio
                 async def create_tables_async():
                     async with engine.begin() as conn:
-                        await conn.run_sync(Base.metadata.create_all)
+                        await conn.run_sync(_create_tables)
                 # Check if we're already in an event loop
                 try:
                     loop = asyncio.get_running_loop()
@@ -701,7 +785,7 @@ def create_session(
                     except Exception as e:
                         logger.warning(f"Could not create tables automatically (async): {str(e)}")
             else:
-                Base.metadata.create_all(engine)
+                _create_tables(engine)
         except Exception as e:
             logger.warning(f"Could not create tables automatically: {str(e)}")
     
@@ -1033,6 +1117,35 @@ def create_pooled_session(
     )
 
 
+@asynccontextmanager
+async def open_separate_session(db: Union[Session, AsyncSession]):
+    """
+    Open a short-lived session on the engine of an existing session
+    
+    Used for bookkeeping writes (result cache, executor statistics) that must
+    neither commit nor roll back the caller's transaction. Engines holding a single
+    connection (in-memory databases) cannot serve a second session; the caller's
+    session is yielded for them.
+    
+    Args:
+        db: Caller's session (sync or async)
+    
+    Yields:
+        Session of the same kind as db
+    """
+    engine = db.bind if isinstance(db, AsyncSession) else db.get_bind()
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if isinstance(sync_engine.pool, (SingletonThreadPool, StaticPool)):
+        yield db
+        return
+    if isinstance(db, AsyncSession):
+        async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+            yield session
+    else:
+        with Session(bind=engine, expire_on_commit=False) as session:
+            yield session
+
+
 # Aliases for backward compatibility
 TaskTreeSession = PooledSessionContext
 create_task_tree_session = create_pooled_session
@@ -2,12 +2,12 @@
 SQLAlchemy models for task storage
 """
 
-from sqlalchemy import Column, String, Integer, DateTime, JSON, ForeignKey, Text, Boolean, Numeric
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, ForeignKey, Text, Boolean, Numeric, event, inspect, select
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import uuid
 import os
 
@@ -18,6 +18,28 @@ Base = declarative_base()
 # Can be overridden via AIPARTNERUPFLOW_TASK_TABLE_NAME environment variable
 TASK_TABLE_NAME = os.getenv("AIPARTNERUPFLOW_TASK_TABLE_NAME", "apflow_tasks")
 
+# Dependency edge table name - supports environment variable override
+# Default: "apflow_task_dependencies"
+TASK_DEPENDENCY_TABLE_NAME = os.getenv("AIPARTNERUPFLOW_TASK_DEPENDENCY_TABLE_NAME", "apflow_task_dependencies")
+
+# Work queue table name - supports environment variable override
+# Default: "apflow_task_queue"
+TASK_QUEUE_TABLE_NAME = os.getenv("AIPARTNERUPFLOW_TASK_QUEUE_TABLE_NAME", "apflow_task_queue")
+
+# Result cache table name - supports environment variable override
+# Default: "apflow_task_result_cache"
+TASK_RESULT_CACHE_TABLE_NAME = os.getenv(
+    "AIPARTNERUPFLOW_TASK_RESULT_CACHE_TABLE_NAME", "apflow_task_result_cache"
+)
+
+# Executor duration statistics table name - supports environment variable override
+# Default: "apflow_executor_stats"
+EXECUTOR_STATS_TABLE_NAME = os.getenv("AIPARTNERUPFLOW_EXECUTOR_STATS_TABLE_NAME", "apflow_executor_stats")
+
+# Task template table name - supports environment variable override
+# Default: "apflow_task_templates"
+TASK_TEMPLATE_TABLE_NAME = os.getenv("AIPARTNERUPFLOW_TASK_TEMPLATE_TABLE_NAME", "apflow_task_templates")
+
 
 class TaskModel(Base):
     """
@@ -49,6 +71,7 @@ class TaskModel(Base):
     
     # === Task Tree Structure (TaskManager) ===
     parent_id = Column(String(255), nullable=True, index=True)  # Parent task ID (for task tree hierarchy)
+    root_id = Column(String(255), nullable=True, index=True)  # Root task ID of the tree (materialized for single-query tree loading)
     
     # === User Identification (Optional, Multi-user Support) ===
     user_id = Column(String(255), nullable=True, index=True)  # User ID (optional, for multi-user scenarios)
@@ -87,6 +110,16 @@ class TaskModel(Base):
     original_task_id = Column(String(255), nullable=True, index=True)  # Original task ID (if this is a copy for re-execution)
     has_copy = Column(Boolean, default=False, index=True)  # Whether this task has copies (for efficient querying)
     
+    # === Incremental Re-execution ===
+    input_fingerprint = Column(String(64), nullable=True)  # Hash of inputs, params, schemas and dependency results at last completion
+    
+    # === Retry Policy ===
+    attempts = Column(Integer, default=0)  # Executor attempts in the latest execution (> 1 after retries, see schemas.retry)
+    last_error = Column(Text, nullable=True)  # Error of the latest failed attempt (kept when a retry succeeds)
+    
+    # === Concurrency Control ===
+    version = Column(Integer, default=1)  # Incremented by every TaskRepository write; lets TaskManager skip reloads when unchanged
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary"""
         return {
@@ -94,6 +127,7 @@ class TaskModel(Base):
             "id": self.id,
             # Task tree structure
             "parent_id": self.parent_id,
+            "root_id": self.root_id,
             # User identification
             "user_id": self.user_id,
             # Task basic information
@@ -120,8 +154,251 @@ class TaskModel(Base):
             # Task copy fields
             "original_task_id": self.original_task_id,
             "has_copy": self.has_copy,
+            # Incremental re-execution
+            "input_fingerprint": self.input_fingerprint,
+            # Retry policy
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            # Concurrency control
+            "version": self.version,
         }
     
     def __repr__(self):
         return f"<TaskModel(id='{self.id}', name='{self.name}', status='{self.status}')>"
 
+
+class TaskDependencyModel(Base):
+    """
+    Dependency edge index - one row per entry of TaskModel.dependencies
+    
+    Normalized copy of the JSON dependencies field, kept in sync by ORM events on
+    TaskModel (insert, update of dependencies, delete). Indexed in both directions so
+    reverse lookups (which tasks depend on X) do not scan the task table.
+    
+    Only id-based dependencies are indexed; name-based references are resolved to
+    ids when task trees are created.
+    """
+    __tablename__ = TASK_DEPENDENCY_TABLE_NAME
+    
+    task_id = Column(String(255), primary_key=True, index=True)  # Task that declares the dependency
+    depends_on_id = Column(String(255), primary_key=True, index=True)  # Task it depends on
+    required = Column(Boolean, default=True)
+    type = Column(String(50), default="result")
+    
+    def __repr__(self):
+        return f"<TaskDependencyModel(task_id='{self.task_id}', depends_on_id='{self.depends_on_id}')>"
+
+
+class TaskQueueModel(Base):
+    """
+    Work queue entry - one row per task execution queued or running in any worker process
+    
+    Rows are inserted by TaskWorkQueue.enqueue() (or when a worker runs an execution
+    itself), claimed by exactly one worker, kept alive by that worker's heartbeat and
+    deleted when the execution ends. A running row whose lease expired belongs to a
+    dead worker and can be claimed again.
+    
+    cancel_requests maps task ids of the running tree to cancellation messages; the
+    owning worker picks them up on its next heartbeat.
+    """
+    __tablename__ = TASK_QUEUE_TABLE_NAME
+    
+    task_id = Column(String(255), primary_key=True)  # Task passed to TaskExecutor.execute_task_by_id
+    root_task_id = Column(String(255), nullable=False, index=True)  # Root of the tree (shared running state)
+    status = Column(String(20), default="queued", index=True)  # queued, running
+    priority = Column(Integer, default=2)  # Same order as TaskModel.priority: smaller numbers are claimed first
+    use_demo = Column(Boolean, default=False)
+    worker_id = Column(String(255), nullable=True, index=True)  # Worker holding the lease
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, default=0)  # Number of claims (> 1 after a worker died)
+    cancel_requests = Column(JSON, nullable=True)  # {task_id: error_message}
+    enqueued_at = Column(DateTime(timezone=True), server_default=func.now())
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert model to dictionary"""
+        return {
+            "task_id": self.task_id,
+            "root_task_id": self.root_task_id,
+            "status": self.status,
+            "priority": self.priority,
+            "use_demo": self.use_demo,
+            "worker_id": self.worker_id,
+            "lease_expires_at": self.lease_expires_at.isoformat() if self.lease_expires_at else None,
+            "attempts": self.attempts,
+            "cancel_requests": self.cancel_requests,
+            "enqueued_at": self.enqueued_at.isoformat() if self.enqueued_at else None,
+            "claimed_at": self.claimed_at.isoformat() if self.claimed_at else None,
+        }
+    
+    def __repr__(self):
+        return f"<TaskQueueModel(task_id='{self.task_id}', status='{self.status}', worker_id='{self.worker_id}')>"
+
+
+class TaskResultCacheModel(Base):
+    """
+    Cached executor result - one row per cache key (see core/execution/result_cache.py)
+    
+    The key is a hash of executor id, executor version, params and resolved inputs,
+    so rows are shared by all tasks (and copies) executing the same work.
+    """
+    __tablename__ = TASK_RESULT_CACHE_TABLE_NAME
+    
+    cache_key = Column(String(64), primary_key=True)  # SHA-256 hex digest
+    executor_id = Column(String(255), nullable=False, index=True)
+    result = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=True)  # None = no expiry
+    
+    def __repr__(self):
+        return f"<TaskResultCacheModel(cache_key='{self.cache_key}', executor_id='{self.executor_id}')>"
+
+
+class ExecutorStatsModel(Base):
+    """
+    Duration histogram of one executor (see core/execution/duration_stats.py)
+    
+    Shared by all processes: each process adds the durations it recorded since its
+    last flush, so counts accumulate across workers.
+    """
+    __tablename__ = EXECUTOR_STATS_TABLE_NAME
+    
+    executor_id = Column(String(255), primary_key=True)
+    count = Column(Integer, default=0)  # Number of recorded executions
+    total_seconds = Column(Float, default=0.0)  # Sum of durations (for the mean)
+    buckets = Column(JSON, nullable=True)  # Counts per duration bucket (DURATION_BUCKETS + overflow)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<ExecutorStatsModel(executor_id='{self.executor_id}', count={self.count})>"
+
+
+class TaskTemplateModel(Base):
+    """
+    Precompiled task tree template (see core/execution/templates.py)
+    
+    Stores the validated tasks array in compiled form, so trees can be instantiated
+    from it without validating the array again. Templates are immutable once created.
+    """
+    __tablename__ = TASK_TEMPLATE_TABLE_NAME
+    
+    id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
+    name = Column(String(255), nullable=True, index=True)
+    user_id = Column(String(255), nullable=True, index=True)  # Owner (None = no user restriction)
+    parameters = Column(JSON, nullable=True)  # Declared parameter names
+    tasks = Column(JSON, nullable=True)  # Tasks array the template was created from
+    compiled = Column(JSON, nullable=True)  # Nodes in parent-before-children order (see compile_task_template())
+    task_count = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert model to dictionary (without the compiled form)"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "user_id": self.user_id,
+            "parameters": self.parameters or [],
+            "tasks": self.tasks,
+            "task_count": self.task_count,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+    
+    def __repr__(self):
+        return f"<TaskTemplateModel(id='{self.id}', name='{self.name}', task_count={self.task_count})>"
+
+
+def dependency_edge_rows(task_id: str, dependencies: Optional[List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert a TaskModel.dependencies value to dependency edge rows
+    
+    Args:
+        task_id: Task that declares the dependencies
+        dependencies: Dependencies list ([{"id": ..., "required": ..., "type": ...}] or task ID strings)
+        
+    Returns:
+        Edge rows for TaskDependencyModel (one per dependency id)
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    for dependency in dependencies or []:
+        if isinstance(dependency, dict):
+            depends_on_id = dependency.get("id")
+            required = dependency.get("required", True)
+            dependency_type = dependency.get("type", "result")
+        elif isinstance(dependency, str):
+            depends_on_id, required, dependency_type = dependency, True, "result"
+        else:
+            continue
+        if not depends_on_id or str(depends_on_id) in rows:
+            continue
+        rows[str(depends_on_id)] = {
+            "task_id": task_id,
+            "depends_on_id": str(depends_on_id),
+            "required": bool(required),
+            "type": dependency_type or "result",
+        }
+    return list(rows.values())
+
+
+def rebuild_dependency_edges(connection: Any, task_table: Any = None, batch_size: int = 1000) -> int:
+    """
+    Rebuild the dependency edge table from the tasks' dependencies fields
+    
+    Reads tasks in id order, batch_size rows at a time, so memory use does not
+    grow with the table.
+    
+    Args:
+        connection: SQLAlchemy Connection
+        task_table: Task table (default: TaskModel.__table__)
+        batch_size: Number of tasks read per query
+        
+    Returns:
+        Number of edges written
+    """
+    task_table = task_table if task_table is not None else TaskModel.__table__
+    edge_table = TaskDependencyModel.__table__
+    connection.execute(edge_table.delete())
+    
+    edge_count = 0
+    last_id = None
+    while True:
+        stmt = select(task_table.c.id, task_table.c.dependencies).order_by(task_table.c.id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(task_table.c.id > last_id)
+        rows = connection.execute(stmt).all()
+        if not rows:
+            break
+        edges = []
+        for task_id, dependencies in rows:
+            edges.extend(dependency_edge_rows(task_id, dependencies))
+        if edges:
+            connection.execute(edge_table.insert(), edges)
+            edge_count += len(edges)
+        last_id = rows[-1][0]
+    return edge_count
+
+
+def _replace_dependency_edges(connection: Any, task_id: str, dependencies: Optional[List[Any]]) -> None:
+    edge_table = TaskDependencyModel.__table__
+    connection.execute(edge_table.delete().where(edge_table.c.task_id == task_id))
+    edges = dependency_edge_rows(task_id, dependencies)
+    if edges:
+        connection.execute(edge_table.insert(), edges)
+
+
+@event.listens_for(TaskModel, "after_insert", propagate=True)
+def _index_dependencies_after_insert(mapper, connection, target) -> None:
+    edges = dependency_edge_rows(target.id, getattr(target, "dependencies", None))
+    if edges:
+        connection.execute(TaskDependencyModel.__table__.insert(), edges)
+
+
+@event.listens_for(TaskModel, "after_update", propagate=True)
+def _index_dependencies_after_update(mapper, connection, target) -> None:
+    if inspect(target).attrs.dependencies.history.has_changes():
+        _replace_dependency_edges(connection, target.id, target.dependencies)
+
+
+@event.listens_for(TaskModel, "after_delete", propagate=True)
+def _index_dependencies_after_delete(mapper, connection, target) -> None:
+    edge_table = TaskDependencyModel.__table__
+    connection.execute(edge_table.delete().where(edge_table.c.task_id == target.id))
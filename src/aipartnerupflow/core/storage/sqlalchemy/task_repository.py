@@ -7,10 +7,21 @@ for tasks. TaskManager should use TaskRepository instead of directly operating o
 
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
-from typing import List, Dict, Any, Optional, Union, TYPE_CHECKING, Type, TypeVar
+from sqlalchemy import select, delete, update, insert, bindparam, literal, inspect as sa_inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.sql import functions
+from typing import Callable, List, Dict, Any, Optional, Set, Union, TYPE_CHECKING, Type, TypeVar
 from datetime import datetime, timezone
-from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+import time
+import uuid
+from aipartnerupflow.core.storage.sqlalchemy.models import (
+    TaskModel,
+    TaskDependencyModel,
+    dependency_edge_rows,
+    rebuild_dependency_edges,
+)
 from aipartnerupflow.core.utils.logger import get_logger
 
 if TYPE_CHECKING:
@@ -21,6 +32,15 @@ logger = get_logger(__name__)
 # Type variable for TaskModel subclasses
 TaskModelType = TypeVar("TaskModelType", bound=TaskModel)
 
+# Statuses whose updates are written immediately (and flush the write-behind buffer)
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# Server defaults evaluated client-side in batched inserts (all rows get the current time)
+_NOW_FUNCTIONS = (functions.now, functions.current_timestamp, functions.localtimestamp)
+
+# Marks a column left out of a batched insert so that the database computes its server default
+_SERVER_DEFAULT = object()
+
 
 class TaskRepository:
     """
@@ -49,7 +69,8 @@ class TaskRepository:
     def __init__(
         self,
         db: Union[Session, AsyncSession],
-        task_model_class: Type[TaskModelType] = TaskModel
+        task_model_class: Type[TaskModelType] = TaskModel,
+        write_behind: Optional[bool] = None
     ):
         """
         Initialize TaskRepository
@@ -60,10 +81,21 @@ class TaskRepository:
                 Users can pass their custom TaskModel subclass that inherits TaskModel
                 to add custom fields (e.g., project_id, department, etc.)
                 Example: TaskRepository(db, task_model_class=MyTaskModel)
+            write_behind: Whether to buffer non-terminal status updates (see
+                update_task_status()). Defaults to the config registry (set_write_behind()).
         """
         self.db = db
         self.is_async = isinstance(db, AsyncSession)
         
+        # Write-behind buffer: task_id -> column values not yet written to the database
+        from aipartnerupflow.core.config import get_write_behind
+        write_behind_config = get_write_behind()
+        self.write_behind = write_behind_config["enabled"] if write_behind is None else write_behind
+        self._write_behind_max_pending: int = write_behind_config["max_pending"]
+        self._write_behind_flush_interval: float = write_behind_config["flush_interval"]
+        self._pending_updates: Dict[str, Dict[str, Any]] = {}
+        self._last_flush_time = time.monotonic()
+        
         # Check if task_model_class mapper has custom columns that might not exist in the database
         # This can happen if Base.metadata was polluted by custom TaskModel tests
         from sqlalchemy.inspection import inspect as sa_inspect
@@ -234,6 +266,8 @@ class TaskRepository:
             task_data["original_task_id"] = None
         if 'has_copy' in available_columns:
             task_data["has_copy"] = False
+        if 'version' in available_columns:
+            task_data["version"] = 1
         
         # Set id if provided (otherwise TaskModel will use its default)
         if id is not None and 'id' in available_columns:
@@ -274,6 +308,14 @@ class TaskRepository:
                     f"Available columns: {[c.name for c in self.task_model_class.__table__.columns]}"
                 )
         
+        # Materialize the tree root for single-query tree loading (not taken from kwargs)
+        if 'root_id' in available_columns:
+            if parent_id:
+                task_data["root_id"] = await self._get_root_id_for_parent(parent_id)
+            else:
+                task_data.setdefault("id", str(uuid.uuid4()))
+                task_data["root_id"] = task_data["id"]
+        
         # Use clean TaskModel if mapper is polluted (already determined above)
         task_model_to_use = clean_task_model if use_clean_task_model else self.task_model_class
         task = task_model_to_use(**task_data)
@@ -301,12 +343,22 @@ class TaskRepository:
         """
         Get a task by ID
         
+        Buffered (write-behind) status updates of the task are applied to the returned
+        instance, unless the stored task was cancelled in the meantime.
+        
         Args:
             task_id: Task ID
             
         Returns:
             TaskModel instance (or custom TaskModel subclass) or None if not found
         """
+        task = await self._load_task_by_id(task_id)
+        if task is not None and self._pending_updates:
+            self._apply_pending_updates(task)
+        return task
+    
+    async def _load_task_by_id(self, task_id: str) -> Optional[TaskModelType]:
+        """Load a task from the database (see get_task_by_id())"""
         try:
             # Check if task_model_class's __table__ or Base.metadata has custom columns
             # This can happen if Base.metadata was polluted by custom TaskModel tests
@@ -413,7 +465,8 @@ class TaskRepository:
                     'id', 'parent_id', 'user_id', 'name', 'status', 'priority',
                     'dependencies', 'inputs', 'params', 'result', 'error', 'schemas',
                     'progress', 'created_at', 'started_at', 'updated_at', 'completed_at',
-                    'has_children', 'original_task_id', 'has_copy'
+                    'has_children', 'original_task_id', 'has_copy', 'version', 'root_id',
+                    'input_fingerprint', 'attempts', 'last_error'
                 ]
                 columns_str = ', '.join(standard_columns)
                 
@@ -457,7 +510,8 @@ class TaskRepository:
                             'id', 'parent_id', 'user_id', 'name', 'status', 'priority',
                             'dependencies', 'inputs', 'params', 'result', 'error', 'schemas',
                             'progress', 'created_at', 'started_at', 'updated_at', 'completed_at',
-                            'has_children', 'original_task_id', 'has_copy'
+                            'has_children', 'original_task_id', 'has_copy', 'version', 'root_id',
+                            'input_fingerprint', 'attempts', 'last_error'
                         ]
                         columns_str = ', '.join(standard_columns)
                         
@@ -508,6 +562,7 @@ class TaskRepository:
         Returns:
             List of child TaskModel instances (or custom TaskModel subclass), ordered by priority
         """
+        await self._flush_before_read()
         try:
             if self.is_async:
                 stmt = select(self.task_model_class).filter(
@@ -528,48 +583,140 @@ class TaskRepository:
         """
         Get root task (traverse up the tree until parent_id is None)
         
+        Ancestors are walked with a single recursive query. If an ancestor is
+        missing, the topmost task found is returned.
+        
         Args:
             task: Starting task
             
         Returns:
             Root TaskModel instance (or custom TaskModel subclass)
         """
-        current_task = task
+        if not task.parent_id:
+            return task
         
-        # Traverse up to find root
-        while current_task.parent_id:
-            parent = await self.get_task_by_id(current_task.parent_id)
-            if not parent:
-                break
-            current_task = parent
+        table = self.task_model_class.__table__
+        ancestors = select(
+            table.c.id, table.c.parent_id, literal(0).label("depth")
+        ).where(table.c.id == task.parent_id).cte("ancestors", recursive=True)
+        ancestors = ancestors.union_all(
+            select(table.c.id, table.c.parent_id, (ancestors.c.depth + 1).label("depth"))
+            .join(ancestors, table.c.id == ancestors.c.parent_id)
+        )
+        stmt = select(ancestors.c.id).order_by(ancestors.c.depth.desc()).limit(1)
+        try:
+            if self.is_async:
+                result = await self.db.execute(stmt)
+            else:
+                result = self.db.execute(stmt)
+            top_id = result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f"Error getting root task for {task.id}: {str(e)}")
+            return task
         
-        return current_task
+        if top_id is None:
+            return task
+        root_task = await self.get_task_by_id(top_id)
+        return root_task if root_task is not None else task
     
-    async def get_all_tasks_in_tree(self, root_task: TaskModelType) -> List[TaskModelType]:
+    async def _get_children_by_parent_id(self, task: TaskModelType) -> Dict[str, List[TaskModelType]]:
         """
-        Get all tasks in the task tree (recursive)
+        Load all descendants of a task with a single query
+        
+        For a root task with a materialized root_id, rows are selected by root_id,
+        together with the children of those rows. A child whose root_id differs means
+        parent_id was reassigned outside the repository; the tree is then loaded with
+        a WITH RECURSIVE query over parent_id links (works on DuckDB and PostgreSQL),
+        which is also used for subtrees and for trees created before root_id existed.
         
         Args:
-            root_task: Root task of the tree
+            task: Task whose descendants to load
             
         Returns:
-            List of all tasks in the tree (or custom TaskModel subclass)
+            Mapping parent_id -> children, each list ordered by priority
         """
-        all_tasks = [root_task]
+        await self._flush_before_read()
+        model = self.task_model_class
+        table = model.__table__
         
-        # Get all child tasks recursively
-        async def get_children(parent_id: str):
-            children = await self.get_child_tasks_by_parent_id(parent_id)
-            for child in children:
-                all_tasks.append(child)
-                await get_children(child.id)
+        if not task.parent_id and getattr(task, "root_id", None) == task.id:
+            tree_ids = select(table.c.id).where(table.c.root_id == task.id)
+            stmt = select(model).where(
+                model.id != task.id,
+                (model.root_id == task.id) | model.parent_id.in_(tree_ids.scalar_subquery()),
+            ).order_by(model.priority.asc())
+            descendants_list = await self._execute_tree_query(stmt, task.id)
+            if descendants_list is None:
+                return {}
+            if all(descendant.root_id == task.id for descendant in descendants_list):
+                return self._group_by_parent_id(descendants_list)
+            logger.debug(f"Stale root_id found in tree {task.id}, loading tree by parent_id links")
+        
+        descendants = select(table.c.id).where(table.c.parent_id == task.id).cte(
+            "descendants", recursive=True
+        )
+        descendants = descendants.union_all(
+            select(table.c.id).join(descendants, table.c.parent_id == descendants.c.id)
+        )
+        stmt = select(model).join(descendants, model.id == descendants.c.id).order_by(model.priority.asc())
+        descendants_list = await self._execute_tree_query(stmt, task.id)
+        if descendants_list is None:
+            return {}
+        return self._group_by_parent_id(descendants_list)
+    
+    async def _execute_tree_query(self, stmt: Any, task_id: str) -> Optional[List[TaskModelType]]:
+        """Run a descendants query, returning None on error"""
+        try:
+            if self.is_async:
+                result = await self.db.execute(stmt)
+            else:
+                result = self.db.execute(stmt)
+            return list(result.scalars().unique().all())
+        except Exception as e:
+            logger.error(f"Error loading descendants of task {task_id}: {str(e)}")
+            return None
+    
+    def _group_by_parent_id(self, tasks: List[TaskModelType]) -> Dict[str, List[TaskModelType]]:
+        children_by_parent: Dict[str, List[TaskModelType]] = {}
+        for child in tasks:
+            children_by_parent.setdefault(child.parent_id, []).append(child)
+        return children_by_parent
+    
+    def _walk_descendants(
+        self, task_id: str, children_by_parent: Dict[str, List[TaskModelType]]
+    ) -> List[TaskModelType]:
+        """Return descendants in depth-first preorder (children by priority)"""
+        ordered: List[TaskModelType] = []
+        visited = {task_id}
+        stack = list(reversed(children_by_parent.get(task_id, [])))
+        while stack:
+            child = stack.pop()
+            if child.id in visited:
+                continue
+            visited.add(child.id)
+            ordered.append(child)
+            stack.extend(reversed(children_by_parent.get(child.id, [])))
+        return ordered
+    
+    async def get_all_tasks_in_tree(self, root_task: TaskModelType) -> List[TaskModelType]:
+        """
+        Get all tasks in the task tree (single query, see _get_children_by_parent_id())
         
-        await get_children(root_task.id)
-        return all_tasks
+        Args:
+            root_task: Root task of the tree
+            
+        Returns:
+            List of all tasks in the tree (or custom TaskModel subclass), root first,
+            then descendants in depth-first order
+        """
+        children_by_parent = await self._get_children_by_parent_id(root_task)
+        return [root_task] + self._walk_descendants(root_task.id, children_by_parent)
     
     async def build_task_tree(self, task: TaskModelType) -> "TaskTreeNode":
         """
-        Build TaskTreeNode for a task with its children (recursive)
+        Build TaskTreeNode for a task with its children
+        
+        All descendants are loaded with a single query and assembled in memory.
         
         Args:
             task: Root task (or custom TaskModel subclass)
@@ -580,19 +727,49 @@ class TaskRepository:
         # Lazy import to avoid circular dependency
         from aipartnerupflow.core.types import TaskTreeNode
         
-        # Get all child tasks
-        child_tasks = await self.get_child_tasks_by_parent_id(task.id)
+        children_by_parent = await self._get_children_by_parent_id(task)
         
-        # Create the main task node
         task_node = TaskTreeNode(task=task)
-        
-        # Add child tasks recursively
-        for child_task in child_tasks:
-            child_node = await self.build_task_tree(child_task)
-            task_node.add_child(child_node)
+        visited = {task.id}
+        stack = [task_node]
+        while stack:
+            node = stack.pop()
+            for child_task in children_by_parent.get(node.task.id, []):
+                if child_task.id in visited:
+                    continue
+                visited.add(child_task.id)
+                child_node = TaskTreeNode(task=child_task)
+                node.add_child(child_node)
+                stack.append(child_node)
         
         return task_node
     
+    async def _get_root_id_for_parent(self, parent_id: str) -> Optional[str]:
+        """Get the root_id a new child of parent_id should store"""
+        model = self.task_model_class
+        stmt = select(model.root_id, model.parent_id).where(model.id == parent_id)
+        try:
+            if self.is_async:
+                result = await self.db.execute(stmt)
+            else:
+                result = self.db.execute(stmt)
+            row = result.first()
+        except Exception as e:
+            logger.debug(f"Could not read root_id of parent {parent_id}: {str(e)}")
+            return None
+        if row is None:
+            return None
+        root_id, grandparent_id = row
+        if root_id:
+            return root_id
+        if not grandparent_id:
+            return parent_id
+        # Parent created before root_id existed: resolve its root once
+        parent = await self.get_task_by_id(parent_id)
+        if parent is None:
+            return None
+        return (await self.get_root_task(parent)).id
+    
     async def update_task_status(
         self,
         task_id: str,
@@ -602,6 +779,9 @@ class TaskRepository:
         progress: Optional[float] = None,
         started_at: Optional[datetime] = None,
         completed_at: Optional[datetime] = None,
+        input_fingerprint: Optional[str] = None,
+        attempts: Optional[int] = None,
+        last_error: Optional[str] = None,
     ) -> bool:
         """
         Update task status and related fields
@@ -614,11 +794,37 @@ class TaskRepository:
             progress: Task progress (0.0 to 1.0)
             started_at: Task start time
             completed_at: Task completion time
+            input_fingerprint: Fingerprint of the inputs the result was computed from
+                (see core.execution.incremental)
+            attempts: Number of executor attempts in the current execution
+            last_error: Error of the latest failed attempt (see core.execution.retry)
             
         Returns:
             True if successful, False if task not found
+            
+        Note:
+            With write-behind enabled, non-terminal updates (e.g. "in_progress") are only
+            buffered and True is returned without checking that the task exists. Terminal
+            updates (completed, failed, cancelled) flush the buffer in the same commit.
         """
+        if self.write_behind and status not in TERMINAL_STATUSES:
+            return await self._buffer_task_update(
+                task_id,
+                status=status,
+                error=error,
+                result=result,
+                progress=progress,
+                started_at=started_at,
+                completed_at=completed_at,
+                input_fingerprint=input_fingerprint,
+                attempts=attempts,
+                last_error=last_error,
+            )
+        
         try:
+            # Write buffered updates in the same transaction (forced flush on terminal states)
+            await self.flush_pending_updates(commit=False)
+            
             task = await self.get_task_by_id(task_id)
             if not task:
                 return False
@@ -640,6 +846,13 @@ class TaskRepository:
                 task.started_at = started_at
             if completed_at is not None:
                 task.completed_at = completed_at
+            if input_fingerprint is not None:
+                task.input_fingerprint = input_fingerprint
+            if attempts is not None:
+                task.attempts = attempts
+            if last_error is not None:
+                task.last_error = last_error
+            await self._bump_version(task)
             
             if self.is_async:
                 await self.db.commit()
@@ -656,6 +869,189 @@ class TaskRepository:
                 self.db.rollback()
             return False
     
+    async def _buffer_task_update(self, task_id: str, **fields: Any) -> bool:
+        """
+        Coalesce a non-terminal status update into the write-behind buffer
+        
+        Follows update_task_status() semantics: None values leave the column unchanged.
+        Flushes when the buffer is full or the flush interval has elapsed.
+        """
+        pending = self._pending_updates.setdefault(str(task_id), {})
+        pending["status"] = fields.pop("status")
+        for key, value in fields.items():
+            if value is not None:
+                pending[key] = value
+        
+        # Keep an already loaded instance in sync (read-your-writes without a reload)
+        loaded_task = self._get_loaded_task(str(task_id))
+        if loaded_task is not None:
+            self._apply_pending_updates(loaded_task)
+        
+        if (
+            len(self._pending_updates) >= self._write_behind_max_pending
+            or time.monotonic() - self._last_flush_time >= self._write_behind_flush_interval
+        ):
+            await self.flush_pending_updates()
+        return True
+    
+    def _get_loaded_task(self, task_id: str) -> Optional[TaskModelType]:
+        """Get a task instance from the session identity map without querying the database"""
+        try:
+            session = self.db.sync_session if self.is_async else self.db
+            return session.identity_map.get(identity_key(self.task_model_class, task_id))
+        except Exception:
+            return None
+    
+    async def _bump_version(self, *tasks: TaskModelType) -> None:
+        """
+        Increment the version of tasks that are about to be committed
+        
+        The increment runs in SQL (version = version + 1) in the caller's transaction,
+        so two sessions writing the same task never commit the same version. The
+        stored values are copied back to the instances without marking them dirty.
+        """
+        task_ids = [str(task.id) for task in tasks if hasattr(task, "version")]
+        if not task_ids:
+            return
+        table = self.task_model_class.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id.in_(task_ids))
+            .values(version=table.c.version + 1)
+            .returning(table.c.id, table.c.version)
+        )
+        result = (await self.db.execute(stmt)) if self.is_async else self.db.execute(stmt)
+        versions = {str(task_id): version for task_id, version in result.all()}
+        for task in tasks:
+            if str(task.id) in versions:
+                set_committed_value(task, "version", versions[str(task.id)])
+    
+    async def get_task_version(self, task_id: str) -> Optional[int]:
+        """
+        Get the stored version of a task without loading the task
+        
+        Every write through TaskRepository increments the version, so callers holding
+        a task instance can compare versions to decide whether a reload is needed.
+        
+        Args:
+            task_id: Task ID
+            
+        Returns:
+            Stored version, or None if the task is not found (or the query failed)
+        """
+        try:
+            stmt = select(self.task_model_class.version).where(self.task_model_class.id == task_id)
+            if self.is_async:
+                result = await self.db.execute(stmt)
+            else:
+                result = self.db.execute(stmt)
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.debug(f"Error getting version for task {task_id}: {str(e)}")
+            return None
+    
+    def _apply_pending_updates(self, task: TaskModelType) -> None:
+        """
+        Overlay buffered values on a loaded task without marking it dirty
+        
+        If the stored task is already cancelled, buffered values are dropped
+        (a cancellation must not be hidden by a buffered "in_progress").
+        """
+        task_id = str(task.id)
+        pending = self._pending_updates.get(task_id)
+        if not pending:
+            return
+        if task.status == "cancelled":
+            self._pending_updates.pop(task_id, None)
+            return
+        for key, value in pending.items():
+            set_committed_value(task, key, value)
+    
+    async def _refresh_loaded_versions(self, task_ids: List[str]) -> None:
+        """
+        Copy the stored version of just-updated tasks to their loaded instances
+        
+        Read in the writing transaction, so the version is the one written there.
+        Cancelled rows were not updated; their instances keep the old version, so the
+        next version check reloads them.
+        """
+        loaded = {task_id: task for task_id in task_ids if (task := self._get_loaded_task(task_id)) is not None}
+        if not loaded or not hasattr(self.task_model_class, "version"):
+            return
+        table = self.task_model_class.__table__
+        stmt = (
+            select(table.c.id, table.c.version)
+            .where(table.c.id.in_(list(loaded)))
+            .where(table.c.status != "cancelled")
+        )
+        result = (await self.db.execute(stmt)) if self.is_async else self.db.execute(stmt)
+        for task_id, version in result.all():
+            set_committed_value(loaded[str(task_id)], "version", version)
+    
+    async def _flush_before_read(self) -> None:
+        """Flush buffered updates so that queries see them"""
+        if self._pending_updates:
+            await self.flush_pending_updates()
+    
+    async def flush_pending_updates(self, commit: bool = True) -> int:
+        """
+        Write buffered status updates to the database
+        
+        Buffered tasks are grouped by the set of changed columns; each group is written
+        with one executemany UPDATE. Rows that are already cancelled are not updated.
+        
+        Args:
+            commit: Whether to commit after the UPDATE statements. Pass False to write
+                the updates in the caller's transaction.
+        
+        Returns:
+            Number of tasks written (0 if the flush failed; the updates stay buffered)
+        """
+        self._last_flush_time = time.monotonic()
+        if not self._pending_updates:
+            return 0
+        
+        pending, self._pending_updates = self._pending_updates, {}
+        table = self.task_model_class.__table__
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for task_id, values in pending.items():
+            columns = tuple(sorted(values))
+            row = {f"b_{column}": values[column] for column in columns}
+            row["b_task_id"] = task_id
+            groups.setdefault(columns, []).append(row)
+        
+        try:
+            for columns, rows in groups.items():
+                stmt = (
+                    update(table)
+                    .where(table.c.id == bindparam("b_task_id"))
+                    .where(table.c.status != "cancelled")
+                    .values({column: bindparam(f"b_{column}") for column in columns})
+                    .values(version=table.c.version + 1)
+                )
+                if self.is_async:
+                    await self.db.execute(stmt, rows)
+                else:
+                    self.db.execute(stmt, rows)
+            await self._refresh_loaded_versions(list(pending))
+            if commit:
+                if self.is_async:
+                    await self.db.commit()
+                else:
+                    self.db.commit()
+            logger.debug(f"Flushed buffered updates for {len(pending)} tasks in {len(groups)} statements")
+            return len(pending)
+        except Exception as e:
+            logger.error(f"Error flushing buffered task updates: {str(e)}")
+            if self.is_async:
+                await self.db.rollback()
+            else:
+                self.db.rollback()
+            # Keep the updates for the next flush (values buffered since then win)
+            for task_id, values in pending.items():
+                self._pending_updates[task_id] = {**values, **self._pending_updates.get(task_id, {})}
+            return 0
+    
     async def update_task_inputs(self, task_id: str, inputs: Dict[str, Any]) -> bool:
         """
         Update task inputs
@@ -673,6 +1069,7 @@ class TaskRepository:
                 return False
             
             task.inputs = inputs
+            await self._bump_version(task)
             
             if self.is_async:
                 await self.db.commit()
@@ -714,6 +1111,7 @@ class TaskRepository:
                 return False
             
             task.dependencies = dependencies
+            await self._bump_version(task)
             
             if self.is_async:
                 await self.db.commit()
@@ -750,6 +1148,7 @@ class TaskRepository:
                 return False
             
             task.name = name
+            await self._bump_version(task)
             
             if self.is_async:
                 await self.db.commit()
@@ -786,6 +1185,7 @@ class TaskRepository:
                 return False
             
             task.priority = priority
+            await self._bump_version(task)
             
             if self.is_async:
                 await self.db.commit()
@@ -822,6 +1222,7 @@ class TaskRepository:
                 return False
             
             task.params = params
+            await self._bump_version(task)
             
             if self.is_async:
                 await self.db.commit()
@@ -858,6 +1259,7 @@ class TaskRepository:
                 return False
             
             task.schemas = schemas
+            await self._bump_version(task)
             
             if self.is_async:
                 await self.db.commit()
@@ -890,6 +1292,7 @@ class TaskRepository:
         if not task_ids:
             return {}
         
+        await self._flush_before_read()
         try:
             if self.is_async:
                 stmt = select(self.task_model_class).filter(
@@ -910,6 +1313,31 @@ class TaskRepository:
             logger.error(f"Error getting completed tasks by IDs: {str(e)}")
             return {}
     
+    async def get_existing_task_ids(self, task_ids: List[str], batch_size: int = 1000) -> Set[str]:
+        """
+        Get which of the given task IDs exist in the database
+        
+        Args:
+            task_ids: List of task IDs
+            batch_size: Number of ids per IN query
+            
+        Returns:
+            Set of the IDs that exist
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        if not task_ids:
+            return set()
+        
+        await self._flush_before_read()
+        existing: Set[str] = set()
+        for offset in range(0, len(task_ids), batch_size):
+            stmt = select(self.task_model_class.id).where(
+                self.task_model_class.id.in_(task_ids[offset:offset + batch_size])
+            )
+            result = (await self.db.execute(stmt)) if self.is_async else self.db.execute(stmt)
+            existing.update(str(task_id) for task_id in result.scalars().all())
+        return existing
+    
     async def query_tasks(
         self,
         user_id: Optional[str] = None,
@@ -935,6 +1363,7 @@ class TaskRepository:
         Returns:
             List of TaskModel instances (or custom TaskModel subclass) matching the criteria
         """
+        await self._flush_before_read()
         try:
             # Build query
             if self.is_async:
@@ -1017,53 +1446,268 @@ class TaskRepository:
         Note: Tasks should already be created via create_task(),
         so this method mainly ensures the hierarchy is properly saved.
         """
-        # Import here to avoid circular dependency
-        from aipartnerupflow.core.types import TaskTreeNode
+        try:
+            await self.save_task_tree(task_tree)
+            logger.info(
+                f"Saved task tree: root task {task_tree.task.id} with {len(task_tree.children)} direct children"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error saving task hierarchy to database: {str(e)}")
+            return False
+    
+    async def save_task_tree(
+        self,
+        task_tree: "TaskTreeNode",
+        update_existing: Optional[Callable[[TaskModelType, TaskModelType], None]] = None,
+        batch_size: int = 1000,
+        check_existing: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Save all tasks of a tree in one transaction
+        
+        Children get their parent's id as parent_id and every task gets the tree root
+        as root_id. Task instances already attached to the session are written by the
+        commit. For the other instances, the ids that already exist are fetched with
+        IN queries (batch_size ids each); new tasks are inserted with one executemany
+        INSERT (plus one for their dependency edges) and then attached to the session,
+        so the tree nodes keep working as persistent instances.
+        
+        Args:
+            task_tree: Root task node of the task tree
+            update_existing: Called as update_existing(stored_task, tree_task) for tree
+                tasks whose id already exists in the database. Default: copy the column
+                values that are not None (except id, created_at and version).
+            batch_size: Number of ids per IN query
+            check_existing: If False, skip the IN queries and insert all unsaved tasks
+                (for trees whose ids were just generated)
+            
+        Returns:
+            {"inserted": ..., "updated": ...} task counts
+            
+        Raises:
+            Exception: Database errors (the transaction is rolled back)
+        """
+        return await self.save_task_trees(
+            [task_tree], update_existing=update_existing, batch_size=batch_size, check_existing=check_existing
+        )
+    
+    async def save_task_trees(
+        self,
+        task_trees: List["TaskTreeNode"],
+        update_existing: Optional[Callable[[TaskModelType, TaskModelType], None]] = None,
+        batch_size: int = 1000,
+        check_existing: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Save the tasks of several trees in one transaction
+        
+        Same as save_task_tree(), with the new tasks of all trees inserted by the same
+        executemany INSERT and a single commit for the whole batch.
+        
+        Args:
+            task_trees: Root task nodes
+            update_existing: See save_task_tree()
+            batch_size: Number of ids per IN query
+            check_existing: See save_task_tree()
+            
+        Returns:
+            {"inserted": ..., "updated": ...} task counts
+            
+        Raises:
+            Exception: Database errors (the transaction is rolled back)
+        """
+        await self.flush_pending_updates(commit=False)
+        mapper = sa_inspect(self.task_model_class)
+        id_column = self.task_model_class.__table__.c.id
         
+        # Link each tree (parent before children) and assign missing ids
+        nodes = []
+        tree_ids = []
+        for task_tree in task_trees:
+            if task_tree.task.id is None:
+                task_tree.task.id = self._get_column_default(id_column)
+            tree_ids.append(task_tree.task.id)
+            root_id = self._get_node_root_id(task_tree.task) if hasattr(task_tree.task, "root_id") else None
+            stack = [(task_tree, None)]
+            while stack:
+                node, parent_task = stack.pop()
+                task = node.task
+                if task.id is None:
+                    task.id = self._get_column_default(id_column)
+                if parent_task is not None:
+                    task.parent_id = parent_task.id
+                if root_id and task.root_id != root_id:
+                    task.root_id = root_id
+                nodes.append(node)
+                stack.extend((child, task) for child in reversed(node.children))
+        tree_label = tree_ids[0] if len(tree_ids) == 1 else f"batch of {len(tree_ids)} trees"
+        
+        attached = []
+        unsaved: Dict[str, TaskModelType] = {}
+        for node in nodes:
+            state = sa_inspect(node.task)
+            if state.persistent:
+                attached.append(node.task)
+            else:
+                unsaved.setdefault(str(node.task.id), node.task)
+        
+        new_tasks: List[TaskModelType] = []
+        existing: Dict[str, TaskModelType] = {}
         try:
-            # Save root task first
-            root_task = task_tree.task
-            self.db.add(root_task)
+            task_ids = list(unsaved) if check_existing else []
+            for offset in range(0, len(task_ids), batch_size):
+                stmt = select(self.task_model_class).where(
+                    self.task_model_class.id.in_(task_ids[offset:offset + batch_size])
+                )
+                result = (await self.db.execute(stmt)) if self.is_async else self.db.execute(stmt)
+                existing.update((str(task.id), task) for task in result.scalars().all())
+            
+            new_tasks = [task for task_id, task in unsaved.items() if task_id not in existing]
+            if new_tasks:
+                rows = [self._get_insert_row(mapper, task) for task in new_tasks]
+                edges = [
+                    edge
+                    for row in rows
+                    for edge in dependency_edge_rows(row["id"], row.get("dependencies"))
+                ]
+                table = self.task_model_class.__table__
+                # One executemany per set of columns (rows leaving server defaults to the database)
+                row_groups: Dict[tuple, List[Dict[str, Any]]] = {}
+                for row in rows:
+                    row_groups.setdefault(tuple(row), []).append(row)
+                for group in row_groups.values():
+                    if self.is_async:
+                        await self.db.execute(insert(table), group)
+                    else:
+                        self.db.execute(insert(table), group)
+                if edges:
+                    if self.is_async:
+                        await self.db.execute(insert(TaskDependencyModel.__table__), edges)
+                    else:
+                        self.db.execute(insert(TaskDependencyModel.__table__), edges)
+                for task, row in zip(new_tasks, rows):
+                    if sa_inspect(task).pending:
+                        self.db.expunge(task)
+                    for key, value in row.items():
+                        setattr(task, key, value)
+                    make_transient_to_detached(task)
+                    self.db.add(task)
+            
+            for task_id, stored in existing.items():
+                (update_existing or self._copy_task_values)(stored, unsaved[task_id])
+            await self._bump_version(
+                *(task for task in attached + list(existing.values()) if sa_inspect(task).modified)
+            )
             
             if self.is_async:
                 await self.db.commit()
-                await self.db.refresh(root_task)
             else:
                 self.db.commit()
-                self.db.refresh(root_task)
-            
-            # Recursively save children with proper parent_id
-            await self._save_children_recursive(task_tree)
-            
-            logger.info(f"Saved task tree: root task {root_task.id} with {len(task_tree.children)} direct children")
-            return True
-            
         except Exception as e:
-            logger.error(f"Error saving task hierarchy to database: {str(e)}")
+            logger.error(f"Error saving task tree {tree_label}: {str(e)}")
             if self.is_async:
                 await self.db.rollback()
             else:
                 self.db.rollback()
-            return False
+            raise
+        
+        logger.debug(
+            f"Saved task tree {tree_label}: {len(new_tasks)} inserted, {len(existing)} updated"
+        )
+        return {"inserted": len(new_tasks), "updated": len(existing)}
     
-    async def _save_children_recursive(self, parent_node: "TaskTreeNode"):
-        """Recursively save children tasks with proper parent_id"""
-        for child_node in parent_node.children:
-            child_task = child_node.task
-            # Set parent_id to the parent task's actual ID
-            child_task.parent_id = parent_node.task.id
-            self.db.add(child_task)
-            
-            if self.is_async:
-                await self.db.commit()
-                await self.db.refresh(child_task)
-            else:
-                self.db.commit()
-                self.db.refresh(child_task)
+    def _get_column_default(self, column: Any) -> Any:
+        """
+        Evaluate the client-side default of a column
+        
+        A now() server default gives the current time. Other server defaults return
+        _SERVER_DEFAULT: the column is left out of the insert and computed by the database.
+        """
+        default = column.default
+        if default is not None and getattr(default, "is_scalar", False):
+            return default.arg
+        if default is not None and getattr(default, "is_callable", False):
+            return default.arg(None)
+        server_default = column.server_default
+        if server_default is not None:
+            if isinstance(getattr(server_default, "arg", None), _NOW_FUNCTIONS):
+                return datetime.now(timezone.utc)
+            return _SERVER_DEFAULT
+        return None
+    
+    def _get_insert_row(self, mapper: Any, task: TaskModelType) -> Dict[str, Any]:
+        """Get the INSERT values of a new task, filling defaults the way a flush would"""
+        row = {}
+        for prop in mapper.column_attrs:
+            value = task.__dict__.get(prop.key)
+            if value is None:
+                value = self._get_column_default(prop.columns[0])
+                if value is _SERVER_DEFAULT:
+                    continue
+            row[prop.key] = value
+        return row
+    
+    def _copy_task_values(self, stored: TaskModelType, task: TaskModelType) -> None:
+        """Copy the column values of an unsaved task that are not None onto its stored row"""
+        for prop in sa_inspect(self.task_model_class).column_attrs:
+            if prop.key in ("id", "created_at", "version"):
+                continue
+            value = task.__dict__.get(prop.key)
+            if value is not None:
+                setattr(stored, prop.key, value)
+    
+    async def update_tree_root_ids(self, task_tree: "TaskTreeNode") -> int:
+        """
+        Store the tree root in root_id for every task of a tree
+        
+        Needed when parent_id links are assigned after the tasks were created
+        (e.g. TaskCreator.create_task_tree_from_array()).
+        
+        Args:
+            task_tree: Task tree whose tasks are already saved
             
-            # Recursively save grandchildren
-            if child_node.children:
-                await self._save_children_recursive(child_node)
+        Returns:
+            Number of tasks whose root_id changed
+        """
+        root_task = task_tree.task
+        if not hasattr(root_task, "root_id"):
+            return 0
+        if root_task.parent_id:
+            root_id = await self._get_root_id_for_parent(root_task.parent_id)
+        else:
+            root_id = root_task.id
+        if not root_id:
+            return 0
+        
+        changed: List[TaskModelType] = []
+        stack = [task_tree]
+        while stack:
+            node = stack.pop()
+            if node.task.root_id != root_id:
+                node.task.root_id = root_id
+                changed.append(node.task)
+            stack.extend(node.children)
+        
+        if changed:
+            try:
+                await self._bump_version(*changed)
+                if self.is_async:
+                    await self.db.commit()
+                else:
+                    self.db.commit()
+            except Exception as e:
+                logger.error(f"Error updating root_id of tree {root_task.id}: {str(e)}")
+                if self.is_async:
+                    await self.db.rollback()
+                else:
+                    self.db.rollback()
+                raise
+        return len(changed)
+    
+    def _get_node_root_id(self, task: TaskModelType) -> Optional[str]:
+        """Get the root_id of an in-memory task (its own id for a root task)"""
+        return getattr(task, "root_id", None) or (None if task.parent_id else task.id)
     
     async def get_all_children_recursive(self, task_id: str) -> List[TaskModelType]:
         """
@@ -1075,23 +1719,18 @@ class TaskRepository:
         Returns:
             List of all child TaskModel instances (or custom TaskModel subclass) recursively
         """
-        all_children = []
-        
-        async def collect_children(parent_id: str):
-            children = await self.get_child_tasks_by_parent_id(parent_id)
-            for child in children:
-                all_children.append(child)
-                # Recursively collect grandchildren
-                await collect_children(child.id)
-        
-        await collect_children(task_id)
-        return all_children
+        task = await self.get_task_by_id(task_id)
+        if task is None:
+            return []
+        children_by_parent = await self._get_children_by_parent_id(task)
+        return self._walk_descendants(task_id, children_by_parent)
     
     async def find_dependent_tasks(self, task_id: str) -> List[TaskModelType]:
         """
         Find all tasks that depend on the given task (reverse dependencies)
         
-        This method searches for tasks that have the given task_id in their dependencies field.
+        Uses the dependency edge table (TaskDependencyModel), which is kept in sync
+        with the dependencies field, instead of scanning all tasks.
         
         Args:
             task_id: Task ID to find dependents for
@@ -1099,40 +1738,56 @@ class TaskRepository:
         Returns:
             List of TaskModel instances (or custom TaskModel subclass) that depend on the given task
         """
+        await self._flush_before_read()
         try:
-            # Get all tasks from the database
-            # We need to check all tasks' dependencies field to find reverse dependencies
+            edge_table = TaskDependencyModel.__table__
+            stmt = select(self.task_model_class).join(
+                edge_table, edge_table.c.task_id == self.task_model_class.id
+            ).where(edge_table.c.depends_on_id == task_id)
             if self.is_async:
-                stmt = select(self.task_model_class)
                 result = await self.db.execute(stmt)
-                all_tasks = result.scalars().all()
             else:
-                all_tasks = self.db.query(self.task_model_class).all()
-            
-            dependent_tasks = []
-            for task in all_tasks:
-                dependencies = task.dependencies or []
-                if not dependencies:
-                    continue
-                
-                # Check if this task depends on the given task_id
-                for dep in dependencies:
-                    dep_id = None
-                    if isinstance(dep, dict):
-                        dep_id = dep.get("id")
-                    elif isinstance(dep, str):
-                        dep_id = dep
-                    
-                    if dep_id == task_id:
-                        dependent_tasks.append(task)
-                        break  # Found dependency, no need to check other dependencies
-            
-            return dependent_tasks
+                result = self.db.execute(stmt)
+            return list(result.scalars().all())
             
         except Exception as e:
             logger.error(f"Error finding dependent tasks for {task_id}: {str(e)}")
             return []
     
+    async def rebuild_dependency_index(self, batch_size: int = 1000) -> int:
+        """
+        Rebuild the dependency edge table from all tasks' dependencies fields
+        
+        Only needed for rows written outside the ORM (e.g. raw SQL); tables created
+        by an older version are backfilled automatically when tables are created.
+        
+        Args:
+            batch_size: Number of tasks read per query
+            
+        Returns:
+            Number of edges written
+        """
+        await self.flush_pending_updates(commit=False)
+        task_table = self.task_model_class.__table__
+        try:
+            if self.is_async:
+                edge_count = await self.db.run_sync(
+                    lambda session: rebuild_dependency_edges(session.connection(), task_table, batch_size)
+                )
+                await self.db.commit()
+            else:
+                edge_count = rebuild_dependency_edges(self.db.connection(), task_table, batch_size)
+                self.db.commit()
+        except Exception as e:
+            logger.error(f"Error rebuilding dependency index: {str(e)}")
+            if self.is_async:
+                await self.db.rollback()
+            else:
+                self.db.rollback()
+            raise
+        logger.info(f"Rebuilt dependency index: {edge_count} edges")
+        return edge_count
+    
     async def delete_task(self, task_id: str) -> bool:
         """
         Physically delete a task from the database
@@ -1148,10 +1803,15 @@ class TaskRepository:
             if not task:
                 return False
             
+            self._pending_updates.pop(task_id, None)
+            
             if self.is_async:
                 # For async session, use delete statement
                 stmt = delete(self.task_model_class).where(self.task_model_class.id == task_id)
                 await self.db.execute(stmt)
+                # Core delete bypasses ORM events, so remove dependency edges explicitly
+                edge_table = TaskDependencyModel.__table__
+                await self.db.execute(delete(edge_table).where(edge_table.c.task_id == task_id))
                 await self.db.commit()
             else:
                 # For sync session, mark for deletion
@@ -1169,6 +1829,51 @@ class TaskRepository:
                 self.db.rollback()
             return False
 
+    async def delete_tasks(self, task_ids: List[str]) -> int:
+        """
+        Physically delete several tasks with one statement and a single commit
+
+        Unlike delete_task(), the tasks are not loaded first. Instances already in the
+        session are expunged so later lookups do not return deleted rows.
+
+        Args:
+            task_ids: Task IDs to delete
+
+        Returns:
+            Number of deleted tasks
+        """
+        task_ids = [str(task_id) for task_id in task_ids]
+        if not task_ids:
+            return 0
+        session = self.db.sync_session if self.is_async else self.db
+        edge_table = TaskDependencyModel.__table__
+        task_stmt = delete(self.task_model_class).where(self.task_model_class.id.in_(task_ids))
+        edge_stmt = delete(edge_table).where(edge_table.c.task_id.in_(task_ids))
+        try:
+            for task_id in task_ids:
+                self._pending_updates.pop(task_id, None)
+                loaded = self._get_loaded_task(task_id)
+                if loaded is not None:
+                    session.expunge(loaded)
+            # Core deletes bypass ORM events, so remove dependency edges explicitly
+            if self.is_async:
+                result = await self.db.execute(task_stmt)
+                await self.db.execute(edge_stmt)
+                await self.db.commit()
+            else:
+                result = self.db.execute(task_stmt)
+                self.db.execute(edge_stmt)
+                self.db.commit()
+        except Exception as e:
+            logger.error(f"Error deleting {len(task_ids)} tasks: {str(e)}")
+            if self.is_async:
+                await self.db.rollback()
+            else:
+                self.db.rollback()
+            raise
+        logger.debug(f"Physically deleted {result.rowcount} tasks")
+        return result.rowcount
+
 
 __all__ = [
     "TaskRepository",
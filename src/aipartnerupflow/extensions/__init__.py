@@ -47,6 +47,7 @@ except ImportError:
 # Auto-import core built-in executors to trigger registration
 try:
     from aipartnerupflow.extensions.core import aggregate_results_executor  # noqa: F401
+    from aipartnerupflow.extensions.core import map_executor  # noqa: F401
 except ImportError:
     # Core extensions may not be available, that's okay
     pass
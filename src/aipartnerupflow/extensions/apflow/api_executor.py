@@ -44,8 +44,17 @@ Production Solutions Implemented:
    - Prevents infinite loops even if other safeguards fail
    - Ensures predictable behavior
 
+Streaming Waits:
+----------------
+With wait_for_completion, tasks.execute is called with use_streaming and the executor
+waits on the remote SSE stream, so it returns as soon as the remote pushes the final
+event instead of polling tasks.get every poll_interval. The final status is confirmed
+with a single tasks.get. Polling is only used when the remote does not answer with an
+event stream, when the stream is interrupted, or with wait_mode="poll".
+
 Configuration:
 --------------
+- wait_mode: "stream" (default) or "poll"
 - poll_interval: Base polling interval (default: 1.0s)
 - timeout: Total timeout (default: 300s)
 - max_consecutive_failures: Circuit breaker threshold (10)
@@ -54,10 +63,12 @@ Configuration:
 """
 
 import asyncio
+import json
 import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Optional, Tuple
 from aipartnerupflow.core.base import BaseTask
 from aipartnerupflow.core.extensions.decorators import executor_register
+from aipartnerupflow.extensions.http.client_pool import get_http_client, make_auth_key
 from aipartnerupflow.core.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -116,6 +127,8 @@ class ApFlowApiExecutor(BaseTask):
                 - auth_token: Optional JWT token for authentication
                 - use_streaming: Whether to use streaming mode (only for tasks.execute, default: False)
                 - wait_for_completion: Whether to wait for task completion (only for tasks.execute, default: False)
+                - wait_mode: How to wait for completion: "stream" (remote SSE events, falls back
+                  to polling if unavailable) or "poll" (default: "stream")
                 - poll_interval: Polling interval in seconds when waiting for completion (default: 1.0)
                 - timeout: Total timeout in seconds (default: 300.0)
                 - headers: Additional HTTP headers dict (optional)
@@ -135,8 +148,9 @@ class ApFlowApiExecutor(BaseTask):
         auth_token = inputs.get("auth_token")
         use_streaming = inputs.get("use_streaming", False)
         wait_for_completion = inputs.get("wait_for_completion", False)
+        wait_mode = inputs.get("wait_mode", "stream")
         poll_interval = inputs.get("poll_interval", 1.0)
-        timeout = inputs.get("timeout", 300.0)
+        timeout = self.get_timeout(inputs.get("timeout", 300.0))
         headers = inputs.get("headers", {})
         
         # Prepare headers
@@ -162,88 +176,107 @@ class ApFlowApiExecutor(BaseTask):
         logger.info(f"Calling aipartnerupflow API {method} on {base_url}")
         
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                # Check for cancellation before making request
-                if self.cancellation_checker and self.cancellation_checker():
-                    logger.info("aipartnerupflow API call cancelled before execution")
-                    return {
-                        "success": False,
-                        "error": "Call was cancelled",
-                        "base_url": base_url,
-                        "method": method
-                    }
-                
+            client = get_http_client(base_url, auth_key=make_auth_key(auth_token))
+            # Check for cancellation before making request
+            if self.cancellation_checker and self.cancellation_checker():
+                logger.info("aipartnerupflow API call cancelled before execution")
+                return {
+                    "success": False,
+                    "error": "Call was cancelled",
+                    "base_url": base_url,
+                    "method": method
+                }
+            
+            response = None
+            if method == "tasks.execute" and wait_for_completion and wait_mode == "stream":
+                # Wait on the remote event stream; a non-streaming answer is handled below
+                stream_result, response = await self._execute_and_stream(
+                    client=client,
+                    api_url=api_url,
+                    jsonrpc_request=jsonrpc_request,
+                    request_headers=request_headers,
+                    base_url=base_url,
+                    auth_token=auth_token,
+                    poll_interval=poll_interval,
+                    timeout=timeout,
+                    headers=headers
+                )
+                if stream_result is not None:
+                    return stream_result
+            
+            if response is None:
                 # Make JSON-RPC request
                 response = await client.post(
                     api_url,
                     json=jsonrpc_request,
-                    headers=request_headers
+                    headers=request_headers,
+                    timeout=timeout
                 )
-                
-                # Check for cancellation after request
-                if self.cancellation_checker and self.cancellation_checker():
-                    logger.info("aipartnerupflow API call cancelled after request")
-                    return {
-                        "success": False,
-                        "error": "Call was cancelled",
-                        "base_url": base_url,
-                        "method": method,
-                        "status_code": response.status_code
-                    }
-                
-                # Parse response
-                if response.status_code != 200:
-                    logger.error(
-                        f"aipartnerupflow API returned status {response.status_code}: {response.text}"
-                    )
-                    return {
-                        "success": False,
-                        "error": f"API returned status {response.status_code}",
-                        "status_code": response.status_code,
-                        "response": response.text,
-                        "base_url": base_url,
-                        "method": method
-                    }
-                
-                json_response = response.json()
-                
-                # Check for JSON-RPC error
-                if "error" in json_response:
-                    error = json_response["error"]
-                    logger.error(f"aipartnerupflow API error: {error}")
-                    return {
-                        "success": False,
-                        "error": error.get("message", "Unknown error"),
-                        "error_code": error.get("code"),
-                        "error_data": error.get("data"),
-                        "base_url": base_url,
-                        "method": method
-                    }
-                
-                result_data = json_response.get("result", {})
-                
-                # Handle tasks.execute with wait_for_completion
-                if method == "tasks.execute" and wait_for_completion:
-                    task_id = result_data.get("task_id") or result_data.get("root_task_id")
-                    if task_id:
-                        logger.info(f"Waiting for task {task_id} to complete...")
-                        final_result = await self._wait_for_task_completion(
-                            base_url=base_url,
-                            task_id=task_id,
-                            auth_token=auth_token,
-                            poll_interval=poll_interval,
-                            timeout=timeout,
-                            headers=headers
-                        )
-                        return final_result
-                
+            
+            # Check for cancellation after request
+            if self.cancellation_checker and self.cancellation_checker():
+                logger.info("aipartnerupflow API call cancelled after request")
                 return {
-                    "success": True,
-                    "result": result_data,
+                    "success": False,
+                    "error": "Call was cancelled",
+                    "base_url": base_url,
+                    "method": method,
+                    "status_code": response.status_code
+                }
+            
+            # Parse response
+            if response.status_code != 200:
+                logger.error(
+                    f"aipartnerupflow API returned status {response.status_code}: {response.text}"
+                )
+                return {
+                    "success": False,
+                    "error": f"API returned status {response.status_code}",
+                    "status_code": response.status_code,
+                    "response": response.text,
                     "base_url": base_url,
                     "method": method
                 }
-                
+            
+            json_response = response.json()
+            
+            # Check for JSON-RPC error
+            if "error" in json_response:
+                error = json_response["error"]
+                logger.error(f"aipartnerupflow API error: {error}")
+                return {
+                    "success": False,
+                    "error": error.get("message", "Unknown error"),
+                    "error_code": error.get("code"),
+                    "error_data": error.get("data"),
+                    "base_url": base_url,
+                    "method": method
+                }
+            
+            result_data = json_response.get("result", {})
+            
+            # Handle tasks.execute with wait_for_completion
+            if method == "tasks.execute" and wait_for_completion:
+                task_id = result_data.get("task_id") or result_data.get("root_task_id")
+                if task_id:
+                    logger.info(f"Waiting for task {task_id} to complete...")
+                    final_result = await self._wait_for_task_completion(
+                        base_url=base_url,
+                        task_id=task_id,
+                        auth_token=auth_token,
+                        poll_interval=poll_interval,
+                        timeout=timeout,
+                        headers=headers
+                    )
+                    return final_result
+            
+            return {
+                "success": True,
+                "result": result_data,
+                "base_url": base_url,
+                "method": method
+            }
+            
         except httpx.TimeoutException:
             logger.error(f"aipartnerupflow API call timeout after {timeout} seconds: {base_url}")
             return {
@@ -269,6 +302,163 @@ class ApFlowApiExecutor(BaseTask):
                 "method": method
             }
     
+    async def _execute_and_stream(
+        self,
+        client: httpx.AsyncClient,
+        api_url: str,
+        jsonrpc_request: Dict[str, Any],
+        request_headers: Dict[str, Any],
+        base_url: str,
+        auth_token: Optional[str],
+        poll_interval: float,
+        timeout: float,
+        headers: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[httpx.Response]]:
+        """
+        Call tasks.execute with use_streaming and wait for the remote task on its SSE stream
+        
+        The stream ends when the remote sends the final event (or stream_end / timeout).
+        The task status is then confirmed by _wait_for_task_completion, whose first poll
+        is immediate, so the task is usually finished with a single tasks.get. If the
+        stream is interrupted after the task was started, waiting continues by polling.
+        
+        Args:
+            client: Pooled HTTP client
+            api_url: JSON-RPC endpoint URL
+            jsonrpc_request: tasks.execute JSON-RPC request
+            request_headers: Request headers
+            base_url: API base URL
+            auth_token: Optional auth token
+            poll_interval: Base polling interval in seconds
+            timeout: Total timeout in seconds
+            headers: Additional headers
+        
+        Returns:
+            (result, None) if the event stream was consumed, or (None, response) if the
+            remote answered without an event stream (to be handled as a regular response)
+        """
+        loop = asyncio.get_event_loop()
+        start_time = loop.time()
+        streaming_request = {
+            **jsonrpc_request,
+            "params": {**jsonrpc_request.get("params", {}), "use_streaming": True}
+        }
+        task_id = None
+        
+        async def consume_stream() -> Any:
+            nonlocal task_id
+            async with client.stream(
+                "POST",
+                api_url,
+                json=streaming_request,
+                headers=request_headers,
+                timeout=timeout
+            ) as response:
+                content_type = response.headers.get("content-type", "")
+                if not content_type.startswith("text/event-stream"):
+                    await response.aread()
+                    return response
+                
+                async for event in self._iter_sse_events(response):
+                    if self.cancellation_checker and self.cancellation_checker():
+                        logger.info(f"Waiting for task {task_id} cancelled while streaming")
+                        return {
+                            "success": False,
+                            "error": "Wait was cancelled",
+                            "task_id": task_id,
+                            "base_url": base_url
+                        }
+                    
+                    if "jsonrpc" in event:
+                        # Initial JSON-RPC response
+                        if "error" in event:
+                            error = event["error"]
+                            logger.error(f"aipartnerupflow API error: {error}")
+                            return {
+                                "success": False,
+                                "error": error.get("message", "Unknown error"),
+                                "error_code": error.get("code"),
+                                "error_data": error.get("data"),
+                                "base_url": base_url,
+                                "method": "tasks.execute"
+                            }
+                        result_data = event.get("result") or {}
+                        task_id = result_data.get("task_id") or result_data.get("root_task_id")
+                        logger.info(f"Waiting for task {task_id} to complete (streaming)...")
+                        continue
+                    
+                    if event.get("final", False) or event.get("type") in ("stream_end", "timeout", "error"):
+                        logger.debug(f"Task {task_id} event stream ended with {event.get('type')} event")
+                        break
+            return None
+        
+        try:
+            outcome = await asyncio.wait_for(consume_stream(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Task {task_id} streaming wait timeout after {timeout}s")
+            return {
+                "success": False,
+                "error": f"Timeout waiting for task completion after {timeout} seconds",
+                "task_id": task_id,
+                "base_url": base_url
+            }, None
+        except (httpx.TimeoutException, httpx.RequestError) as e:
+            if task_id is None:
+                raise
+            logger.warning(f"Event stream of task {task_id} interrupted, falling back to polling: {e}")
+        else:
+            if isinstance(outcome, httpx.Response):
+                return None, outcome
+            if outcome is not None:
+                return outcome, None
+        
+        if not task_id:
+            return {
+                "success": False,
+                "error": "Event stream ended without a task_id",
+                "base_url": base_url,
+                "method": "tasks.execute"
+            }, None
+        
+        remaining = timeout - (loop.time() - start_time)
+        result = await self._wait_for_task_completion(
+            base_url=base_url,
+            task_id=task_id,
+            auth_token=auth_token,
+            poll_interval=poll_interval,
+            # Always allow the confirming poll, even if the stream used up the timeout
+            timeout=max(remaining, poll_interval),
+            headers=headers
+        )
+        result["wait_mode"] = "stream"
+        return result, None
+    
+    @staticmethod
+    async def _iter_sse_events(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Parse JSON events from a Server-Sent Events response
+        
+        Args:
+            response: Streaming httpx response
+        
+        Yields:
+            Decoded event data (comments, ids and non-JSON data are skipped)
+        """
+        data_lines = []
+        async for line in response.aiter_lines():
+            if line.startswith("data:"):
+                data_lines.append(line[5:].lstrip(" "))
+                continue
+            if line or not data_lines:
+                continue
+            # Blank line: dispatch event
+            payload = "\n".join(data_lines)
+            data_lines = []
+            try:
+                yield json.loads(payload)
+            except ValueError:
+                logger.warning(f"Ignoring non-JSON SSE event: {payload[:200]}")
+    
     async def _wait_for_task_completion(
         self,
         base_url: str,
@@ -363,87 +553,88 @@ class ApFlowApiExecutor(BaseTask):
                     "id": f"apflow_poll_{asyncio.get_event_loop().time()}"
                 }
                 
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.post(
-                        api_url,
-                        json=jsonrpc_request,
-                        headers=request_headers
-                    )
-                    
-                    if response.status_code == 200:
-                        json_response = response.json()
-                        if "result" in json_response:
-                            task = json_response["result"]
-                            status = task.get("status")
-                            
-                            # Successful poll - reset failure counters
-                            if consecutive_failures > 0:
-                                logger.info(
-                                    f"Task {task_id} polling recovered after {consecutive_failures} "
-                                    f"consecutive failures"
-                                )
-                            consecutive_failures = 0
-                            poll_success = True
-                            
-                            if status in ("completed", "failed", "cancelled"):
-                                logger.info(
-                                    f"Task {task_id} finished with status: {status} "
-                                    f"(polls: {poll_count}, failures: {total_failures})"
-                                )
-                                return {
-                                    "success": status == "completed",
-                                    "task_id": task_id,
-                                    "status": status,
-                                    "task": task,
-                                    "base_url": base_url,
-                                    "poll_count": poll_count,
-                                    "total_failures": total_failures
-                                }
-                            
-                            logger.debug(f"Task {task_id} status: {status}, waiting...")
-                        else:
-                            # Missing result field - treat as non-retryable error
-                            consecutive_failures += 1
-                            total_failures += 1
-                            last_error = "Missing 'result' field in response"
-                            logger.warning(
-                                f"Task {task_id} poll {poll_count}: {last_error} "
-                                f"(consecutive: {consecutive_failures}, total: {total_failures})"
+                client = get_http_client(base_url, auth_key=make_auth_key(auth_token))
+                response = await client.post(
+                    api_url,
+                    json=jsonrpc_request,
+                    headers=request_headers,
+                    timeout=30.0
+                )
+                
+                if response.status_code == 200:
+                    json_response = response.json()
+                    if "result" in json_response:
+                        task = json_response["result"]
+                        status = task.get("status")
+                        
+                        # Successful poll - reset failure counters
+                        if consecutive_failures > 0:
+                            logger.info(
+                                f"Task {task_id} polling recovered after {consecutive_failures} "
+                                f"consecutive failures"
                             )
-                    elif 400 <= response.status_code < 500:
-                        # Client error (4xx) - likely non-retryable
-                        consecutive_failures += 1
-                        total_failures += 1
-                        last_error = f"Client error {response.status_code}: {response.text[:200]}"
-                        logger.error(
-                            f"Task {task_id} poll {poll_count}: {last_error} "
-                            f"(consecutive: {consecutive_failures}, total: {total_failures})"
-                        )
-                        # For 4xx errors, we might want to fail faster
-                        if consecutive_failures >= 3:
-                            logger.error(
-                                f"Task {task_id} polling stopped: too many client errors "
-                                f"(likely invalid task_id or auth issue)"
+                        consecutive_failures = 0
+                        poll_success = True
+                        
+                        if status in ("completed", "failed", "cancelled"):
+                            logger.info(
+                                f"Task {task_id} finished with status: {status} "
+                                f"(polls: {poll_count}, failures: {total_failures})"
                             )
                             return {
-                                "success": False,
-                                "error": f"Polling failed: {last_error}",
+                                "success": status == "completed",
                                 "task_id": task_id,
+                                "status": status,
+                                "task": task,
                                 "base_url": base_url,
                                 "poll_count": poll_count,
-                                "total_failures": total_failures,
-                                "error_type": "client_error"
+                                "total_failures": total_failures
                             }
+                        
+                        logger.debug(f"Task {task_id} status: {status}, waiting...")
                     else:
-                        # Server error (5xx) - retryable
+                        # Missing result field - treat as non-retryable error
                         consecutive_failures += 1
                         total_failures += 1
-                        last_error = f"Server error {response.status_code}: {response.text[:200]}"
+                        last_error = "Missing 'result' field in response"
                         logger.warning(
                             f"Task {task_id} poll {poll_count}: {last_error} "
                             f"(consecutive: {consecutive_failures}, total: {total_failures})"
                         )
-                    
+                elif 400 <= response.status_code < 500:
+                    # Client error (4xx) - likely non-retryable
+                    consecutive_failures += 1
+                    total_failures += 1
+                    last_error = f"Client error {response.status_code}: {response.text[:200]}"
+                    logger.error(
+                        f"Task {task_id} poll {poll_count}: {last_error} "
+                        f"(consecutive: {consecutive_failures}, total: {total_failures})"
+                    )
+                    # For 4xx errors, we might want to fail faster
+                    if consecutive_failures >= 3:
+                        logger.error(
+                            f"Task {task_id} polling stopped: too many client errors "
+                            f"(likely invalid task_id or auth issue)"
+                        )
+                        return {
+                            "success": False,
+                            "error": f"Polling failed: {last_error}",
+                            "task_id": task_id,
+                            "base_url": base_url,
+                            "poll_count": poll_count,
+                            "total_failures": total_failures,
+                            "error_type": "client_error"
+                        }
+                else:
+                    # Server error (5xx) - retryable
+                    consecutive_failures += 1
+                    total_failures += 1
+                    last_error = f"Server error {response.status_code}: {response.text[:200]}"
+                    logger.warning(
+                        f"Task {task_id} poll {poll_count}: {last_error} "
+                        f"(consecutive: {consecutive_failures}, total: {total_failures})"
+                    )
+                
             except httpx.TimeoutException as e:
                 # Network timeout - retryable
                 consecutive_failures += 1
@@ -524,7 +715,6 @@ class ApFlowApiExecutor(BaseTask):
     
     def get_demo_result(self, task: Any, inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Provide demo API call result"""
-        import json
         method = inputs.get("method", "tasks.get")
         params = inputs.get("params", {})
         
@@ -609,6 +799,11 @@ class ApFlowApiExecutor(BaseTask):
                     "type": "boolean",
                     "description": "Wait for task completion (only for tasks.execute, default: False)"
                 },
+                "wait_mode": {
+                    "type": "string",
+                    "enum": ["stream", "poll"],
+                    "description": "How to wait for completion: remote SSE events (falls back to polling) or polling (default: stream)"
+                },
                 "poll_interval": {
                     "type": "number",
                     "description": "Polling interval in seconds when waiting for completion (default: 1.0)"
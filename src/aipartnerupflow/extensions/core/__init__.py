@@ -2,10 +2,12 @@
 Core built-in executors for common task patterns
 """
 
-# Import aggregate_results_executor to trigger registration
+# Import executors to trigger registration
 from aipartnerupflow.extensions.core.aggregate_results_executor import AggregateResultsExecutor  # noqa: F401
+from aipartnerupflow.extensions.core.map_executor import MapExecutor, register_reducer  # noqa: F401
 
 __all__ = [
     "AggregateResultsExecutor",
+    "MapExecutor",
+    "register_reducer",
 ]
-
@@ -0,0 +1,375 @@
+"""
+Map Executor - Expands a list into child tasks at runtime and reduces their results
+
+The number of child tasks is only known when the task runs (e.g. one child per row
+returned by a dependency), so the children are created by the executor itself, under
+its own task, through the ChildTaskRunner that TaskManager provides to executors
+declaring `spawns_children = True` (see core/execution/fan_out.py).
+
+Children are created and executed chunk by chunk. The results of each chunk are
+folded into a running reduction before the next chunk starts, so at most one chunk
+of child results is held in memory whatever the number of items.
+"""
+
+import copy
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from aipartnerupflow.core.base import BaseTask
+from aipartnerupflow.core.execution.retry import is_error_result
+from aipartnerupflow.core.execution.templates import substitute_parameters
+from aipartnerupflow.core.extensions.decorators import executor_register
+from aipartnerupflow.core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_MAX_CONCURRENCY = 10
+
+# At most this many failed child ids are reported in the result
+MAX_REPORTED_FAILURES = 100
+
+
+@dataclass
+class Reducer:
+    """
+    Streaming reduction of child results
+
+    Attributes:
+        step: Function (accumulator, value) -> new accumulator, called once per child result
+        initial: Function returning the initial accumulator
+    """
+
+    step: Callable[[Any, Any], Any]
+    initial: Callable[[], Any]
+
+
+def _concat(accumulator: List[Any], value: Any) -> List[Any]:
+    if isinstance(value, list):
+        accumulator.extend(value)
+    else:
+        accumulator.append(value)
+    return accumulator
+
+
+def _merge(accumulator: Dict[str, Any], value: Any) -> Dict[str, Any]:
+    if value is None:
+        return accumulator
+    if not isinstance(value, dict):
+        raise ValueError(f"reduce 'merge' expects object results, got {type(value).__name__}")
+    accumulator.update(value)
+    return accumulator
+
+
+def _sum(accumulator: Any, value: Any) -> Any:
+    if value is None:
+        return accumulator
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"reduce 'sum' expects numeric results, got {type(value).__name__}")
+    return accumulator + value
+
+
+_reducers: Dict[str, Reducer] = {
+    "concat": Reducer(step=_concat, initial=list),
+    "merge": Reducer(step=_merge, initial=dict),
+    "sum": Reducer(step=_sum, initial=lambda: 0),
+}
+
+
+def register_reducer(
+    name: str,
+    step: Callable[[Any, Any], Any],
+    initial: Optional[Callable[[], Any]] = None,
+) -> None:
+    """
+    Register a custom reduction usable as `reduce` input of map_executor
+
+    Args:
+        name: Reducer name
+        step: Function (accumulator, value) -> new accumulator
+        initial: Function returning the initial accumulator (default: None)
+
+    Example:
+        register_reducer("max", lambda acc, value: value if acc is None else max(acc, value))
+    """
+    _reducers[name] = Reducer(step=step, initial=initial or (lambda: None))
+
+
+def get_reducer(name: str) -> Reducer:
+    """
+    Get a registered reducer by name
+
+    Raises:
+        ValueError: If no reducer is registered under this name
+    """
+    reducer = _reducers.get(name)
+    if reducer is None:
+        raise ValueError(f"Unknown reduce '{name}', available: {', '.join(sorted(_reducers))}")
+    return reducer
+
+
+def resolve_path(value: Any, path: Optional[str]) -> Any:
+    """
+    Follow a dotted path through nested objects and lists (list segments are indexes)
+
+    Args:
+        value: Root value
+        path: Dotted path such as "fetch-task.rows" or "items.0.id"; empty returns value
+
+    Returns:
+        Value at the path, or None if a segment is missing
+    """
+    if not path:
+        return value
+    for segment in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(segment)
+        elif isinstance(value, list) and segment.lstrip("-").isdigit():
+            index = int(segment)
+            value = value[index] if -len(value) <= index < len(value) else None
+        else:
+            return None
+        if value is None:
+            return None
+    return value
+
+
+@executor_register()
+class MapExecutor(BaseTask):
+    """
+    Executor that fans a list out to one child task per item and reduces their results
+
+    **Inputs:**
+    - items: List to map over, or
+    - items_from: Dotted path into inputs pointing to the list, typically a dependency
+      result merged by TaskManager (e.g. "fetch-rows" or "fetch-rows.rows")
+    - task: Child task template with optional name, schemas, params, inputs and
+      priority. "{{item}}" and "{{index}}" placeholders are replaced in every child;
+      without inputs, each child receives {"item": item}
+    - chunk_size: Number of children created and executed per chunk (default 100)
+    - max_concurrency: Children executing at the same time (default 10)
+    - reduce: "concat" (default), "merge", "sum" or a name registered with register_reducer()
+    - reduce_field: Dotted path into each child result to reduce (default: whole result)
+    - allow_failures: Reduce the completed children when some fail instead of returning an
+      unsuccessful result (default False). A child fails when its status is not completed
+      or its result reports an error
+
+    **Example usage:**
+    ```python
+    {
+        "name": "Fetch every page",
+        "schemas": {"method": "map_executor"},
+        "dependencies": [{"id": "list-pages", "required": True}],
+        "inputs": {
+            "items_from": "list-pages.urls",
+            "task": {
+                "name": "Fetch {{index}}",
+                "schemas": {"method": "rest_executor"},
+                "inputs": {"url": "{{item}}", "method": "GET"}
+            },
+            "chunk_size": 50,
+            "max_concurrency": 5,
+            "reduce": "concat",
+            "reduce_field": "json"
+        }
+    }
+    ```
+
+    **Result structure:**
+    ```python
+    {
+        "result": [...],          # Reduced child results
+        "item_count": 120,
+        "completed": 120,
+        "failed": 0,
+        "failed_task_ids": []
+    }
+    ```
+
+    Children are created under this task (parent_id) and run with the same hooks,
+    retries and streaming events as any other task. They count against concurrency
+    limits; this task gives up its own slots while its children run.
+    """
+
+    id = "map_executor"
+    name = "Map Executor"
+    description = "Expands a list into child tasks at runtime and reduces their results"
+    tags = ["map", "reduce", "fan-out", "core", "built-in"]
+    examples = [
+        "Call an API once per item of a dependency result",
+        "Process a list in chunks with bounded concurrency",
+        "Sum or concatenate the results of many subtasks",
+    ]
+
+    # Cancellation is checked between chunks
+    cancelable: bool = False
+
+    # TaskManager sets child_task_runner for executors spawning child tasks
+    spawns_children: bool = True
+
+    @property
+    def type(self) -> str:
+        """Extension type identifier for categorization"""
+        return "core"
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        inputs: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ):
+        """
+        Initialize MapExecutor
+
+        Args:
+            name: Optional executor name
+            inputs: Input parameters
+            **kwargs: Additional configuration
+        """
+        super().__init__(inputs=inputs, **kwargs)
+        if name:
+            self.name = name
+        self.child_task_runner = None
+
+    def _get_items(self, inputs: Dict[str, Any]) -> List[Any]:
+        if inputs.get("items") is not None:
+            items = inputs["items"]
+            source = "items"
+        elif inputs.get("items_from"):
+            source = inputs["items_from"]
+            items = resolve_path(inputs, source)
+        else:
+            raise ValueError("map_executor requires 'items' or 'items_from' in inputs")
+        if not isinstance(items, list):
+            raise ValueError(f"map_executor '{source}' must be a list, got {type(items).__name__}")
+        return items
+
+    @staticmethod
+    def _build_child(template: Dict[str, Any], item: Any, index: int) -> Dict[str, Any]:
+        values = {"item": item, "index": index}
+        child = substitute_parameters(
+            {key: template[key] for key in ("name", "schemas", "params", "inputs") if key in template},
+            values,
+        )
+        if "inputs" not in child:
+            child["inputs"] = {"item": copy.deepcopy(item)}
+        if "priority" in template:
+            child["priority"] = template["priority"]
+        child.setdefault("name", f"Map item {index}")
+        return child
+
+    async def execute(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Spawn one child task per item, chunk by chunk, and reduce their results
+
+        Args:
+            inputs: See class docstring
+
+        Returns:
+            Reduced result with item and failure counts
+            ("success": false with the failed child ids if children failed and
+            allow_failures is not set)
+
+        Raises:
+            ValueError: If inputs are invalid
+        """
+        items = self._get_items(inputs)
+        template = inputs.get("task")
+        if not isinstance(template, dict) or not (template.get("schemas") or template.get("params")):
+            raise ValueError("map_executor requires a 'task' template with 'schemas' (executor method)")
+        chunk_size = int(inputs.get("chunk_size") or DEFAULT_CHUNK_SIZE)
+        max_concurrency = int(inputs.get("max_concurrency") or DEFAULT_MAX_CONCURRENCY)
+        if chunk_size < 1 or max_concurrency < 1:
+            raise ValueError("map_executor 'chunk_size' and 'max_concurrency' must be positive")
+        reducer = get_reducer(inputs.get("reduce") or "concat")
+        reduce_field = inputs.get("reduce_field")
+        allow_failures = bool(inputs.get("allow_failures", False))
+        if self.child_task_runner is None:
+            raise RuntimeError("map_executor must be executed by TaskManager (no child task runner)")
+
+        accumulator = reducer.initial()
+        completed = 0
+        failed_task_ids: List[str] = []
+        failed = 0
+        for start in range(0, len(items), chunk_size):
+            if self.cancellation_checker and self.cancellation_checker():
+                logger.info(f"Map task {self.name} cancelled after {start} of {len(items)} items")
+                return {
+                    "success": False,
+                    "error": "Map was cancelled",
+                    "item_count": len(items),
+                    "completed": completed,
+                    "failed": failed,
+                }
+            chunk = items[start:start + chunk_size]
+            children = [self._build_child(template, item, start + offset) for offset, item in enumerate(chunk)]
+            for child_task in await self.child_task_runner.run(children, max_concurrency=max_concurrency):
+                if child_task.status == "completed" and not is_error_result(child_task.result):
+                    completed += 1
+                    accumulator = reducer.step(accumulator, resolve_path(child_task.result, reduce_field))
+                else:
+                    failed += 1
+                    if len(failed_task_ids) < MAX_REPORTED_FAILURES:
+                        failed_task_ids.append(str(child_task.id))
+            logger.debug(f"Map task {self.name}: {start + len(chunk)} of {len(items)} items done")
+
+        logger.info(f"Map task {self.name}: {completed} children completed, {failed} failed")
+        if failed and not allow_failures:
+            return {
+                "success": False,
+                "error": f"{failed} of {len(items)} child tasks failed: {', '.join(failed_task_ids[:10])}",
+                "item_count": len(items),
+                "completed": completed,
+                "failed": failed,
+                "failed_task_ids": failed_task_ids,
+            }
+        return {
+            "result": accumulator,
+            "item_count": len(items),
+            "completed": completed,
+            "failed": failed,
+            "failed_task_ids": failed_task_ids,
+        }
+
+    def get_demo_result(self, task: Any, inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Provide a demo result without spawning children"""
+        try:
+            items = self._get_items(inputs)
+        except ValueError:
+            items = ["demo-item-1", "demo-item-2"]
+        return {
+            "result": [{"item": item, "demo_mode": True} for item in items],
+            "item_count": len(items),
+            "completed": len(items),
+            "failed": 0,
+            "failed_task_ids": [],
+            "_demo_sleep": 0.05,
+        }
+
+    def get_input_schema(self) -> Dict[str, Any]:
+        """Get input parameter schema"""
+        return {
+            "type": "object",
+            "properties": {
+                "items": {"type": "array", "description": "List to map over"},
+                "items_from": {
+                    "type": "string",
+                    "description": "Dotted path into inputs to the list, e.g. '<dependency-id>.rows'",
+                },
+                "task": {
+                    "type": "object",
+                    "description": "Child task template (name, schemas, params, inputs, priority); "
+                                   "supports {{item}} and {{index}} placeholders",
+                },
+                "chunk_size": {"type": "integer", "minimum": 1, "default": DEFAULT_CHUNK_SIZE},
+                "max_concurrency": {"type": "integer", "minimum": 1, "default": DEFAULT_MAX_CONCURRENCY},
+                "reduce": {
+                    "type": "string",
+                    "description": "concat, merge, sum or a registered reducer name",
+                    "default": "concat",
+                },
+                "reduce_field": {"type": "string", "description": "Dotted path into each child result"},
+                "allow_failures": {"type": "boolean", "default": False},
+            },
+            "required": ["task"],
+        }
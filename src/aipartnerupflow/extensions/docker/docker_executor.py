@@ -127,7 +127,7 @@ class DockerExecutor(BaseTask):
         env = inputs.get("env", {})
         volumes = inputs.get("volumes", {})
         working_dir = inputs.get("working_dir")
-        timeout = inputs.get("timeout", 60)
+        timeout = self.get_timeout(inputs.get("timeout", 60))
         remove = inputs.get("remove", True)
         resources_config = inputs.get("resources", {})
         
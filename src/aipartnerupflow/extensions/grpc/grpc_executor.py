@@ -108,7 +108,7 @@ class GrpcExecutor(BaseTask):
             raise ValueError("method is required in inputs")
         
         request_data = inputs.get("request", {})
-        timeout = inputs.get("timeout", 30.0)
+        timeout = self.get_timeout(inputs.get("timeout", 30.0))
         metadata_dict = inputs.get("metadata", {})
         
         logger.info(f"Calling gRPC {service}.{method} on {server}")
@@ -5,7 +5,19 @@ This feature provides HTTP/REST API execution capabilities for tasks.
 Useful for calling external REST APIs, webhooks, and HTTP-based services.
 """
 
+from aipartnerupflow.extensions.http.client_pool import (
+    HttpClientPool,
+    close_http_clients,
+    get_http_client,
+    get_http_client_pool,
+)
 from aipartnerupflow.extensions.http.rest_executor import RestExecutor
 
-__all__ = ["RestExecutor"]
+__all__ = [
+    "RestExecutor",
+    "HttpClientPool",
+    "get_http_client",
+    "get_http_client_pool",
+    "close_http_clients",
+]
 
@@ -0,0 +1,283 @@
+"""
+Shared pooled HTTP clients
+
+Creating an httpx.AsyncClient per request pays TCP and TLS setup on every call and
+discards the connection pool afterwards. HttpClientPool keeps one AsyncClient per
+(origin, TLS settings, credentials) and event loop, so repeated calls to the same host
+reuse keep-alive connections. The connection limits of a client therefore apply per host.
+
+Clients cannot be shared across event loops, so each loop has its own set, and the
+code owning a loop closes its clients with close_http_clients() before the loop
+ends: the thread and process execution lanes after every call (one loop per call)
+and the API server when its lifespan ends (close_http_clients_on_shutdown()).
+Clients of loops closed without that step can no longer be closed; they are
+dropped the next time the pool is used from a new loop.
+
+Pooled clients never store response cookies, so sharing a client does not leak
+cookies between tasks. Per-request options (headers, auth, timeout, redirects) are
+passed to each request.
+
+Environment variables:
+- AIPARTNERUPFLOW_HTTP_MAX_CONNECTIONS: connections per host (default 100)
+- AIPARTNERUPFLOW_HTTP_MAX_KEEPALIVE: idle keep-alive connections per host (default 20)
+- AIPARTNERUPFLOW_HTTP_KEEPALIVE_EXPIRY: seconds an idle connection is kept (default 30)
+- AIPARTNERUPFLOW_HTTP2: enable HTTP/2 (requires the h2 package, default false)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import weakref
+from contextlib import asynccontextmanager
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+from aipartnerupflow.core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+
+def make_auth_key(credentials: Any) -> Optional[str]:
+    """
+    Build a pool key component from credentials without keeping the secret itself
+
+    Args:
+        credentials: Token string, auth config dict, headers, or None
+
+    Returns:
+        SHA-256 digest of the credentials, or None if there are no credentials
+    """
+    if not credentials:
+        return None
+    if not isinstance(credentials, str):
+        credentials = json.dumps(credentials, sort_keys=True, default=str)
+    return hashlib.sha256(credentials.encode("utf-8")).hexdigest()
+
+
+class HttpClientPool:
+    """
+    Registry of shared httpx.AsyncClient instances
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+    ):
+        """
+        Initialize pool
+
+        Args:
+            max_connections: Maximum connections per client (i.e. per host)
+            max_keepalive_connections: Maximum idle keep-alive connections per client
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Enable HTTP/2 (falls back to HTTP/1.1 if h2 is not installed)
+        """
+        if max_connections < 1:
+            raise ValueError(f"max_connections must be >= 1, got {max_connections}")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(max_keepalive_connections, max_connections),
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        # Event loop -> pool key -> client
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[Any, ...], httpx.AsyncClient]]"
+        self._loops = weakref.WeakKeyDictionary()
+
+    def get_client(
+        self,
+        url: str,
+        verify: Any = True,
+        auth_key: Optional[str] = None,
+    ) -> httpx.AsyncClient:
+        """
+        Get the shared client for a URL
+
+        Must be called from a running event loop; clients are bound to the loop
+        that created them and are closed by aclose() from that loop.
+
+        Args:
+            url: Request URL or base URL (only scheme, host and port are used)
+            verify: TLS verification setting passed to httpx (bool, CA bundle path or SSLContext)
+            auth_key: Credentials identity, see make_auth_key()
+
+        Returns:
+            httpx.AsyncClient (do not close it; the pool owns it)
+        """
+        parsed = httpx.URL(url)
+        verify_key = verify if isinstance(verify, (bool, str)) else id(verify)
+        key = (parsed.scheme, parsed.host, parsed.port, verify_key, auth_key)
+        loop = asyncio.get_running_loop()
+
+        clients = self._loops.get(loop)
+        if clients is None:
+            self._discard_closed_loops()
+            clients = self._loops[loop] = {}
+        client = clients.get(key)
+        if client is not None and not client.is_closed:
+            return client
+
+        client = self._create_client(verify)
+        clients[key] = client
+        logger.debug(f"Created pooled HTTP client for {parsed.scheme}://{parsed.host}")
+        return client
+
+    def _discard_closed_loops(self) -> None:
+        """Drop the clients of event loops closed without closing them (they keep their loop referenced)"""
+        for loop in [loop for loop in list(self._loops.keys()) if loop.is_closed()]:
+            clients = self._loops.pop(loop)
+            if clients:
+                logger.warning(f"Dropping {len(clients)} pooled HTTP clients of an event loop closed before them")
+
+    def _create_client(self, verify: Any) -> httpx.AsyncClient:
+        kwargs: Dict[str, Any] = {"verify": verify, "limits": self.limits}
+        client = None
+        if self.http2:
+            try:
+                client = httpx.AsyncClient(http2=True, **kwargs)
+            except ImportError:
+                logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+                self.http2 = False
+        if client is None:
+            client = httpx.AsyncClient(**kwargs)
+        # Reject all cookies: the client is shared between unrelated requests
+        client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return client
+
+    async def aclose(self) -> None:
+        """Close all clients created in the running event loop and drop those of closed loops"""
+        clients = self._loops.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            if not client.is_closed:
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    logger.warning(f"Error closing pooled HTTP client: {str(e)}")
+        self._discard_closed_loops()
+
+    def __len__(self) -> int:
+        return sum(len(clients) for clients in list(self._loops.values()))
+
+
+_pool: Optional[HttpClientPool] = None
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+def get_http_client_pool() -> HttpClientPool:
+    """
+    Get the process-wide HttpClientPool instance
+
+    Returns:
+        HttpClientPool singleton
+    """
+    global _pool
+    if _pool is None:
+        _pool = HttpClientPool(
+            max_connections=int(os.getenv("AIPARTNERUPFLOW_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+            max_keepalive_connections=int(
+                os.getenv("AIPARTNERUPFLOW_HTTP_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+            ),
+            keepalive_expiry=float(os.getenv("AIPARTNERUPFLOW_HTTP_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY)),
+            http2=_env_flag("AIPARTNERUPFLOW_HTTP2"),
+        )
+    return _pool
+
+
+def configure_http_client_pool(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool = False,
+) -> HttpClientPool:
+    """
+    Replace the process-wide pool with one using the given limits
+
+    Clients of the previous pool are not closed; call close_http_clients() first
+    if it was already in use.
+
+    Returns:
+        New HttpClientPool
+    """
+    global _pool
+    _pool = HttpClientPool(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+        http2=http2,
+    )
+    return _pool
+
+
+def get_http_client(url: str, verify: Any = True, auth_key: Optional[str] = None) -> httpx.AsyncClient:
+    """
+    Get the shared client for a URL from the process-wide pool
+
+    Args:
+        url: Request URL or base URL
+        verify: TLS verification setting
+        auth_key: Credentials identity, see make_auth_key()
+
+    Returns:
+        httpx.AsyncClient
+    """
+    return get_http_client_pool().get_client(url, verify=verify, auth_key=auth_key)
+
+
+async def close_http_clients() -> None:
+    """Close the pooled clients of the running event loop (call before the loop ends)"""
+    if _pool is not None:
+        await _pool.aclose()
+
+
+def close_http_clients_on_shutdown(app: Any) -> None:
+    """
+    Close pooled clients when a Starlette/FastAPI app shuts down
+
+    Wraps the app's lifespan instead of adding an on_shutdown handler, which is
+    not available in all Starlette versions.
+
+    Args:
+        app: Starlette or FastAPI application
+    """
+    original_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(lifespan_app: Any) -> AsyncIterator[Any]:
+        try:
+            async with original_lifespan(lifespan_app) as state:
+                yield state
+        finally:
+            await close_http_clients()
+
+    app.router.lifespan_context = lifespan
+
+
+def reset_http_client_pool() -> None:
+    """Drop the process-wide pool without closing its clients (for tests)"""
+    global _pool
+    _pool = None
+
+
+__all__ = [
+    "HttpClientPool",
+    "make_auth_key",
+    "get_http_client_pool",
+    "configure_http_client_pool",
+    "get_http_client",
+    "close_http_clients",
+    "close_http_clients_on_shutdown",
+    "reset_http_client_pool",
+]
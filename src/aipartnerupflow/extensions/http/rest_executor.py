@@ -9,12 +9,18 @@ import httpx
 from typing import Dict, Any, Optional
 from aipartnerupflow.core.base import BaseTask
 from aipartnerupflow.core.extensions.decorators import executor_register
+from aipartnerupflow.extensions.http.client_pool import get_http_client, make_auth_key
 from aipartnerupflow.core.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-@executor_register()
+def _is_cacheable_request(inputs: Dict[str, Any]) -> bool:
+    """Only safe methods (GET, HEAD) are reused by the result cache"""
+    return str(inputs.get("method", "GET")).upper() in ("GET", "HEAD")
+
+
+@executor_register(cacheable=_is_cacheable_request)
 class RestExecutor(BaseTask):
     """
     Executor for executing HTTP/REST API requests
@@ -92,7 +98,7 @@ class RestExecutor(BaseTask):
         params = inputs.get("params")
         json_data = inputs.get("json")
         data = inputs.get("data")
-        timeout = inputs.get("timeout", 30.0)
+        timeout = self.get_timeout(inputs.get("timeout", 30.0))
         verify = inputs.get("verify", True)
         follow_redirects = inputs.get("follow_redirects", True)
         
@@ -122,12 +128,13 @@ class RestExecutor(BaseTask):
                             params = {}
                         params[key] = value
         
-        # Prepare request kwargs (verify and timeout go to AsyncClient, not request)
+        # Prepare request kwargs (verify selects the pooled AsyncClient, everything else is per request)
         request_kwargs = {
             "method": method,
             "url": url,
             "headers": headers,
             "follow_redirects": follow_redirects,
+            "timeout": timeout,
         }
         
         if params:
@@ -142,54 +149,54 @@ class RestExecutor(BaseTask):
         logger.info(f"Executing HTTP {method} request to {url}")
         
         try:
-            async with httpx.AsyncClient(verify=verify, timeout=timeout) as client:
-                # Check for cancellation before making request
-                if self.cancellation_checker and self.cancellation_checker():
-                    logger.info("Request cancelled before execution")
-                    return {
-                        "success": False,
-                        "error": "Request was cancelled",
-                        "url": url,
-                        "method": method
-                    }
-                
-                response = await client.request(**request_kwargs)
-                
-                # Check for cancellation after request
-                if self.cancellation_checker and self.cancellation_checker():
-                    logger.info("Request cancelled after execution")
-                    return {
-                        "success": False,
-                        "error": "Request was cancelled",
-                        "url": url,
-                        "method": method,
-                        "status_code": response.status_code
-                    }
-                
-                # Try to parse JSON response
-                json_response = None
-                try:
-                    json_response = response.json()
-                except Exception:
-                    pass
-                
-                result = {
-                    "url": str(response.url),
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers),
-                    "body": response.text,
-                    "json": json_response,
-                    "success": 200 <= response.status_code < 300,
+            client = get_http_client(url, verify=verify, auth_key=make_auth_key(auth_config))
+            # Check for cancellation before making request
+            if self.cancellation_checker and self.cancellation_checker():
+                logger.info("Request cancelled before execution")
+                return {
+                    "success": False,
+                    "error": "Request was cancelled",
+                    "url": url,
                     "method": method
                 }
-                
-                if not result["success"]:
-                    logger.warning(
-                        f"HTTP request returned non-success status {response.status_code}: {url}"
-                    )
-                
-                return result
-                
+            
+            response = await client.request(**request_kwargs)
+            
+            # Check for cancellation after request
+            if self.cancellation_checker and self.cancellation_checker():
+                logger.info("Request cancelled after execution")
+                return {
+                    "success": False,
+                    "error": "Request was cancelled",
+                    "url": url,
+                    "method": method,
+                    "status_code": response.status_code
+                }
+            
+            # Try to parse JSON response
+            json_response = None
+            try:
+                json_response = response.json()
+            except Exception:
+                pass
+            
+            result = {
+                "url": str(response.url),
+                "status_code": response.status_code,
+                "headers": dict(response.headers),
+                "body": response.text,
+                "json": json_response,
+                "success": 200 <= response.status_code < 300,
+                "method": method
+            }
+            
+            if not result["success"]:
+                logger.warning(
+                    f"HTTP request returned non-success status {response.status_code}: {url}"
+                )
+            
+            return result
+            
         except httpx.TimeoutException as e:
             logger.error(f"HTTP request timeout after {timeout} seconds: {url}")
             return {
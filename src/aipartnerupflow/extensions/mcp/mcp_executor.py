@@ -110,7 +110,7 @@ class McpExecutor(BaseTask):
         if not operation:
             raise ValueError("operation is required in inputs (list_tools, call_tool, list_resources, read_resource)")
         
-        timeout = inputs.get("timeout", 30.0)
+        timeout = self.get_timeout(inputs.get("timeout", 30.0))
         
         # Check for cancellation before execution
         if self.cancellation_checker and self.cancellation_checker():
@@ -140,7 +140,7 @@ class SshExecutor(BaseTask):
             raise ValueError("Either password or key_file must be provided")
         
         port = inputs.get("port", 22)
-        timeout = inputs.get("timeout", 30)
+        timeout = self.get_timeout(inputs.get("timeout", 30))
         env = inputs.get("env", {})
         
         # Validate key file if provided
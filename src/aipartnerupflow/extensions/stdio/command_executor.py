@@ -131,7 +131,7 @@ class CommandExecutor(BaseTask):
                     "security_blocked": True
                 }
         
-        timeout = inputs.get("timeout", 30)
+        timeout = self.get_timeout(inputs.get("timeout", 30))
         
         # Log command execution with security warning
         logger.warning(
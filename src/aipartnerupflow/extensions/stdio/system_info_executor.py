@@ -15,7 +15,9 @@ from aipartnerupflow.core.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-@executor_register()
+# Readings change over time: cached results (when the result cache is enabled) are
+# only reused for a minute, e.g. by a tree re-run right after a failure
+@executor_register(cacheable=True, cache_ttl=60)
 class SystemInfoExecutor(BaseTask):
     """
     Executor for querying system resource information
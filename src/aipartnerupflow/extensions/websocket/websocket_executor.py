@@ -98,7 +98,7 @@ class WebSocketExecutor(BaseTask):
             raise ValueError("message is required in inputs")
         
         wait_response = inputs.get("wait_response", True)
-        timeout = inputs.get("timeout", 30.0)
+        timeout = self.get_timeout(inputs.get("timeout", 30.0))
         headers = inputs.get("headers", {})
         
         logger.info(f"Connecting to WebSocket {url} and sending message")
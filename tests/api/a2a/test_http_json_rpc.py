@@ -429,6 +429,29 @@ def test_jsonrpc_system_health(json_rpc_client):
     assert health["status"] == "healthy"
 
 
+def test_jsonrpc_system_executor_stats(json_rpc_client):
+    """Test executor duration statistics via JSON-RPC"""
+    from aipartnerupflow.core.execution.duration_stats import get_executor_stats
+
+    get_executor_stats().record("stats_test_executor", 0.5)
+    response = json_rpc_client.post(
+        "/system",
+        json={
+            "jsonrpc": "2.0",
+            "id": 51,
+            "method": "system.executor_stats",
+            "params": {"executor_id": "stats_test_executor"},
+        },
+        headers={"Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 200
+    executors = response.json()["result"]["executors"]
+    assert list(executors) == ["stats_test_executor"]
+    assert executors["stats_test_executor"]["count"] >= 1
+    assert 0.32 <= executors["stats_test_executor"]["p50"] <= 0.64
+
+
 def test_jsonrpc_error_handling(json_rpc_client):
     """Test JSON-RPC error handling"""
     # Invalid method
@@ -802,6 +825,63 @@ def test_jsonrpc_tasks_copy_with_children(json_rpc_client):
     assert len(copied_task["children"]) == 2  # Should have both children
 
 
+def test_jsonrpc_tasks_template(json_rpc_client):
+    """Test creating a task template and instantiating it via JSON-RPC"""
+    create_response = json_rpc_client.post(
+        "/tasks",
+        json={
+            "jsonrpc": "2.0",
+            "id": 320,
+            "method": "tasks.template.create",
+            "params": {
+                "name": "system-info",
+                "parameters": ["resource"],
+                "tasks": [
+                    {"name": "Root", "user_id": "test-user"},
+                    {
+                        "name": "Info",
+                        "user_id": "test-user",
+                        "parent_id": "Root",
+                        "schemas": {"method": "system_info_executor"},
+                        "inputs": {"resource": "{{resource}}"},
+                    },
+                ],
+            },
+        },
+    )
+    assert create_response.status_code == 200
+    template = create_response.json()["result"]
+    assert template["parameters"] == ["resource"]
+    assert template["task_count"] == 2
+
+    instantiate_response = json_rpc_client.post(
+        "/tasks",
+        json={
+            "jsonrpc": "2.0",
+            "id": 321,
+            "method": "tasks.template.instantiate",
+            "params": {"template_id": template["template_id"], "parameters": {"resource": "cpu"}},
+        },
+    )
+    assert instantiate_response.status_code == 200
+    tree = instantiate_response.json()["result"]
+    assert tree["name"] == "Root"
+    assert tree["user_id"] == "test-user"
+    assert tree["children"][0]["inputs"] == {"resource": "cpu"}
+    assert tree["children"][0]["parent_id"] == tree["id"]
+
+    missing_response = json_rpc_client.post(
+        "/tasks",
+        json={
+            "jsonrpc": "2.0",
+            "id": 322,
+            "method": "tasks.template.instantiate",
+            "params": {"template_id": template["template_id"]},
+        },
+    )
+    assert "error" in missing_response.json()
+
+
 def test_jsonrpc_tasks_execute(json_rpc_client):
     """Test executing a task via JSON-RPC"""
     # First create a task
@@ -1178,6 +1258,76 @@ def test_jsonrpc_tasks_execute_with_webhook(json_rpc_client):
         # For this test, we just verify the setup is correct
 
 
+def test_jsonrpc_tasks_execute_batch(json_rpc_client):
+    """Test creating and executing several task trees with one tasks.execute_batch request"""
+    prefix = uuid.uuid4().hex[:8]
+    trees = [
+        [
+            {
+                "id": f"batch-{prefix}-{index}",
+                "name": f"Batch Tree {index}",
+                "user_id": "test-user",
+                "schemas": {"method": "system_info_executor"},
+                "inputs": {"resource": "cpu"},
+            }
+        ]
+        for index in range(3)
+    ]
+    root_task_ids = [tree[0]["id"] for tree in trees]
+
+    response = json_rpc_client.post("/tasks", json={
+        "jsonrpc": "2.0",
+        "id": 320,
+        "method": "tasks.execute_batch",
+        "params": {"trees": trees},
+    })
+    assert response.status_code == 200
+    result = response.json()["result"]
+    assert result["success"] is True
+    assert result["root_task_ids"] == root_task_ids
+    assert result["status"] == "completed"
+    assert [r["root_task_id"] for r in result["results"]] == root_task_ids
+    assert all(r["status"] == "completed" for r in result["results"])
+
+    # An invalid tree rejects the whole batch
+    response = json_rpc_client.post("/tasks", json={
+        "jsonrpc": "2.0",
+        "id": 321,
+        "method": "tasks.execute_batch",
+        "params": {"trees": [[{"name": "Valid"}], [{"name": "Orphan", "parent_id": "missing"}]]},
+    })
+    assert "Tree 1: " in response.json()["error"]["data"]
+
+    # Streaming: one SSE stream for all trees, ended by a batch_completed event
+    stream_trees = [
+        [{"name": f"Streamed Tree {index}", "user_id": "test-user", "schemas": {"method": "system_info_executor"}}]
+        for index in range(2)
+    ]
+    response = json_rpc_client.post(
+        "/tasks",
+        json={
+            "jsonrpc": "2.0",
+            "id": 322,
+            "method": "tasks.execute_batch",
+            "params": {"trees": stream_trees, "use_streaming": True},
+        },
+        headers={"Content-Type": "application/json", "Accept": "text/event-stream"},
+    )
+    assert response.headers.get("content-type") == "text/event-stream; charset=utf-8"
+    events = [json.loads(line[6:]) for line in response.text.split("\n") if line.startswith("data: ")]
+    initial = events[0]["result"]
+    assert initial["status"] == "started"
+    stream_root_ids = initial["root_task_ids"]
+    assert len(stream_root_ids) == 2
+
+    tree_finals = {e["root_task_id"] for e in events[1:] if e.get("tree_final")}
+    assert tree_finals == set(stream_root_ids)
+    batch_event = next(e for e in events if e.get("type") == "batch_completed")
+    assert batch_event["batch_id"] == initial["batch_id"]
+    assert batch_event["status"] == "completed"
+    assert events[-1]["type"] == "stream_end"
+
+
 def test_jsonrpc_tasks_execute_task_tree(json_rpc_client):
     """Test executing a task tree via JSON-RPC"""
     # Create a task tree
@@ -0,0 +1,78 @@
+"""
+Test TaskEventBroker (push-based task streaming events)
+"""
+import asyncio
+import pytest
+
+from aipartnerupflow.api.event_broker import TaskEventBroker
+
+
+class TestTaskEventBroker:
+    """Test per-root-task event streams"""
+
+    @pytest.mark.asyncio
+    async def test_subscriber_woken_by_publish(self):
+        """A waiting subscriber receives events as soon as they are published"""
+        broker = TaskEventBroker()
+        broker.open_stream("root")
+
+        waiter = asyncio.create_task(broker.wait_for_events("root", after_id=0, timeout=5))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        event_id = await broker.publish("root", {"type": "progress"})
+        events = await asyncio.wait_for(waiter, 1)
+        assert events == [(event_id, {"type": "progress"})]
+
+    @pytest.mark.asyncio
+    async def test_resume_after_event_id(self):
+        """Subscribers only receive events after their offset"""
+        broker = TaskEventBroker()
+        broker.open_stream("root")
+        for index in range(5):
+            await broker.publish("root", {"index": index})
+
+        events = await broker.wait_for_events("root", after_id=3, timeout=0)
+        assert [event_id for event_id, _ in events] == [4, 5]
+        assert await broker.wait_for_events("root", after_id=5, timeout=0.01) == []
+
+    @pytest.mark.asyncio
+    async def test_buffer_is_bounded(self):
+        """Only the most recent max_events are kept"""
+        broker = TaskEventBroker(max_events=3)
+        broker.open_stream("root")
+        for index in range(10):
+            await broker.publish("root", {"index": index})
+
+        assert broker.get_events("root") == [{"index": 7}, {"index": 8}, {"index": 9}]
+        events = await broker.wait_for_events("root", after_id=2, timeout=0)
+        assert [event_id for event_id, _ in events] == [8, 9, 10]
+
+    @pytest.mark.asyncio
+    async def test_final_event_finishes_stream(self):
+        """Waiting on a finished stream returns immediately"""
+        broker = TaskEventBroker()
+        broker.open_stream("root")
+        await broker.publish("root", {"type": "final", "final": True})
+
+        assert broker.is_finished("root")
+        assert await asyncio.wait_for(broker.wait_for_events("root", after_id=1, timeout=10), 1) == []
+
+        # A new execution of the same root task starts a fresh stream
+        broker.open_stream("root")
+        assert not broker.is_finished("root")
+        assert broker.get_events("root") == []
+
+    @pytest.mark.asyncio
+    async def test_finished_streams_evicted_after_ttl(self):
+        """Finished streams are dropped once older than the TTL; running ones are kept"""
+        broker = TaskEventBroker(ttl=0.05)
+        broker.open_stream("finished")
+        broker.open_stream("running")
+        await broker.publish("running", {"type": "progress"})
+        await broker.finish("finished")
+
+        assert broker.has_stream("finished")
+        await asyncio.sleep(0.06)
+        assert not broker.has_stream("finished")
+        assert broker.has_stream("running")
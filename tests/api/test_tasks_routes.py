@@ -19,8 +19,9 @@ from starlette.responses import StreamingResponse
 from aipartnerupflow.api.routes.tasks import TaskRoutes
 from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
 from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
-from aipartnerupflow.core.config import get_task_model_class
+from aipartnerupflow.core.config import get_task_model_class, set_work_queue, clear_config
 from aipartnerupflow.core.execution.task_tracker import TaskTracker
+from aipartnerupflow.core.execution.work_queue import TaskWorkQueue, reset_queue_worker
 
 
 @pytest.fixture
@@ -253,6 +254,30 @@ class TestHandleTaskExecute:
         # Note: execute_task_by_id is called via asyncio.create_task in background
         # The context is created before the async task, so we verify the response type
 
+    @pytest.mark.asyncio
+    async def test_sse_resume_from_last_event_id(self, task_routes, mock_request, sample_task):
+        """Test SSE reconnect with last_event_id streams remaining events without re-executing"""
+        from aipartnerupflow.api.event_broker import get_event_broker
+
+        broker = get_event_broker()
+        broker.open_stream(sample_task)
+        await broker.publish(sample_task, {"type": "progress", "progress": 0.5})
+        await broker.publish(sample_task, {"type": "final", "status": "completed", "final": True})
+
+        params = {"task_id": sample_task, "use_streaming": True, "last_event_id": "1"}
+        with patch(
+            "aipartnerupflow.core.execution.task_executor.TaskExecutor"
+        ) as mock_executor_class:
+            result = await task_routes.handle_task_execute(params, mock_request, str(uuid.uuid4()))
+            chunks = [chunk async for chunk in result.body_iterator]
+
+        mock_executor_class.return_value.execute_task_by_id.assert_not_called()
+        assert isinstance(result, StreamingResponse)
+        assert chunks[0].startswith("id: 2\n")
+        assert json.loads(chunks[0].split("data: ", 1)[1])["status"] == "completed"
+        assert json.loads(chunks[1][len("data: "):])["type"] == "stream_end"
+        assert len(chunks) == 2
+
     @pytest.mark.asyncio
     async def test_task_not_found(self, task_routes, mock_request):
         """Test error handling when task is not found"""
@@ -525,6 +550,60 @@ class TestHandleTaskExecute:
         assert result.media_type == "text/event-stream"
 
 
+class TestWorkQueueRoutes:
+    """Test execution, running state and cancellation with the shared work queue"""
+
+    def setup_method(self):
+        set_work_queue(True)
+
+    def teardown_method(self):
+        clear_config()
+        reset_queue_worker()
+
+    @pytest.mark.asyncio
+    async def test_execute_queues_task(self, task_routes, mock_request, sample_task, use_test_db_session):
+        """Regular POST queues the execution for any worker"""
+        params = {"task_id": sample_task}
+        result = await task_routes.handle_task_execute(params, mock_request, str(uuid.uuid4()))
+
+        assert result["success"] is True
+        assert result["status"] == "queued"
+        assert await TaskWorkQueue(use_test_db_session).is_active(sample_task)
+
+        # Queued executions count as running for duplicate checks
+        result = await task_routes.handle_task_execute(params, mock_request, str(uuid.uuid4()))
+        assert result["status"] == "already_running"
+
+    @pytest.mark.asyncio
+    async def test_running_tasks_of_other_workers(
+        self, task_routes, mock_request, sample_task, use_test_db_session
+    ):
+        """Running list, count and status include executions of other workers"""
+        await TaskWorkQueue(use_test_db_session).register_running(sample_task, sample_task, "other-worker")
+
+        running = await task_routes.handle_running_tasks_list({}, mock_request, "1")
+        assert [task["id"] for task in running] == [sample_task]
+        count = await task_routes.handle_running_tasks_count({}, mock_request, "2")
+        assert count == {"count": 1}
+        statuses = await task_routes.handle_running_tasks_status(
+            {"task_ids": [sample_task]}, mock_request, "3"
+        )
+        assert statuses[0]["is_running"] is True
+
+    @pytest.mark.asyncio
+    async def test_cancel_on_other_worker(self, task_routes, mock_request, sample_task, use_test_db_session):
+        """Cancelling an execution of another worker stores a request for that worker"""
+        queue = TaskWorkQueue(use_test_db_session)
+        await queue.register_running(sample_task, sample_task, "other-worker")
+
+        results = await task_routes.handle_task_cancel(
+            {"task_ids": [sample_task], "error_message": "Stop"}, mock_request, "1"
+        )
+        assert results[0]["status"] == "cancel_requested"
+        assert results[0]["worker_ids"] == ["other-worker"]
+        assert await queue.heartbeat("other-worker", [sample_task]) == {sample_task: {sample_task: "Stop"}}
+
+
 class TestHandleTaskDelete:
     """Test cases for handle_task_delete method"""
 
@@ -200,6 +200,38 @@ class TestRunCommand:
         assert task1 is not None
         assert task2 is not None
     
+    @pytest.mark.asyncio
+    async def test_run_flow_batch(self, use_test_db_session):
+        """Test executing unrelated task groups as one batch"""
+        tasks_json = json.dumps([
+            {
+                "id": f"batch-root-{index}",
+                "name": f"Batch Root {index}",
+                "user_id": "test_user",
+                "schemas": {"method": "system_info_executor"},
+                "inputs": {"resource": "cpu"},
+            }
+            for index in range(3)
+        ])
+        
+        result = runner.invoke(app, [
+            "run", "flow",
+            "--tasks", tasks_json,
+            "--batch"
+        ])
+        
+        assert result.exit_code == 0
+        assert "executing as one batch" in result.stdout
+        output = json.loads(result.stdout.split("Result: ", 1)[1])
+        assert output["task_groups"] == 3
+        assert output["root_task_ids"] == ["batch-root-0", "batch-root-1", "batch-root-2"]
+        assert output["status"] == "completed"
+        
+        task_repository = TaskRepository(use_test_db_session, task_model_class=get_task_model_class())
+        for index in range(3):
+            task = await task_repository.get_task_by_id(f"batch-root-{index}")
+            assert task.status == "completed"
+    
     @pytest.mark.asyncio
     async def test_run_flow_task_tree(self, use_test_db_session):
         """Test executing task tree (parent-child relationship)"""
@@ -474,6 +474,19 @@ def reset_storage_singleton():
     reset_default_session()
 
 
+@pytest.fixture(autouse=True)
+def reset_http_clients():
+    """Drop pooled HTTP clients so tests patching httpx.AsyncClient get fresh clients"""
+    try:
+        from aipartnerupflow.extensions.http.client_pool import reset_http_client_pool
+    except ImportError:
+        yield  # httpx not installed
+        return
+    reset_http_client_pool()
+    yield
+    reset_http_client_pool()
+
+
 @pytest.fixture(autouse=True)
 def ensure_executors_registered():
     """
@@ -537,8 +550,9 @@ def ensure_executors_registered():
         pass
     
     try:
-        from aipartnerupflow.extensions.core import AggregateResultsExecutor
+        from aipartnerupflow.extensions.core import AggregateResultsExecutor, MapExecutor
         ensure_registered(AggregateResultsExecutor, "aggregate_results_executor")
+        ensure_registered(MapExecutor, "map_executor")
     except ImportError:
         pass
     
@@ -560,6 +574,33 @@ def ensure_executors_registered():
     # (which is the desired behavior for most tests)
 
 
+@pytest.fixture(autouse=True)
+def register_test_executors(request):
+    """
+    Register the executors a test module declares in its TEST_EXECUTORS list
+    
+    Entries are executor classes or (executor class, executor_register() options)
+    tuples. They are registered before every test of the module, because other tests
+    may have cleared the registry, and configuration changed by the test is cleared
+    afterwards.
+    
+    Example:
+        TEST_EXECUTORS = [SleepExecutor, (CountingExecutor, {"cacheable": True})]
+    """
+    entries = getattr(request.module, "TEST_EXECUTORS", None)
+    if not entries:
+        yield
+        return
+    
+    from aipartnerupflow import clear_config, executor_register
+    
+    for entry in entries:
+        executor_class, options = entry if isinstance(entry, tuple) else (entry, {})
+        executor_register(override=True, **options)(executor_class)
+    yield
+    clear_config()
+
+
 @pytest.fixture(scope="function")
 def use_test_db_session(sync_db_session):
     """
@@ -0,0 +1,198 @@
+"""
+Test live cancellation tokens
+"""
+import asyncio
+
+import pytest
+
+from aipartnerupflow.core.base import BaseTask
+from aipartnerupflow.core.config import set_cancellation_grace_period, set_scheduler_mode
+from aipartnerupflow.core.execution.cancellation import (
+    CancellationRegistry,
+    CancellationToken,
+    TaskCancelledError,
+)
+from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.types import TaskTreeNode
+
+events = []
+
+
+class CooperativeExecutor(BaseTask):
+    id = "cancellation_cooperative_executor"
+    name = "Cooperative Executor"
+    description = "Polls its cancellation checker"
+
+    async def execute(self, inputs):
+        events.append(("started", inputs.get("label")))
+        for _ in range(500):
+            if self.cancellation_checker and self.cancellation_checker():
+                events.append(("observed", inputs.get("label")))
+                return {"stopped": True}
+            await asyncio.sleep(0.01)
+        return {"stopped": False}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+class StubbornExecutor(BaseTask):
+    id = "cancellation_stubborn_executor"
+    name = "Stubborn Executor"
+    description = "Ignores its cancellation checker"
+
+    async def execute(self, inputs):
+        events.append(("started", inputs.get("label")))
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            events.append(("interrupted", inputs.get("label")))
+            raise
+        return {"done": True}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+TEST_EXECUTORS = [CooperativeExecutor, StubbornExecutor]
+
+
+@pytest.fixture(autouse=True)
+def clear_events():
+    events.clear()
+
+
+async def _wait_until_started(label):
+    for _ in range(200):
+        if ("started", label) in events:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{label} did not start")
+
+
+class TestCancellationToken:
+    """Test token propagation"""
+
+    def test_cancel_propagates_to_descendants(self):
+        root = CancellationToken("root")
+        child = CancellationToken("child", root)
+        grandchild = CancellationToken("grandchild", child)
+        sibling = CancellationToken("sibling", root)
+
+        assert child.cancel("stop") == ["child", "grandchild"]
+        assert grandchild.is_cancelled() and grandchild.reason == "stop"
+        assert not root.is_cancelled() and not sibling.is_cancelled()
+        assert root.cancel() == ["root", "sibling"]
+
+    @pytest.mark.asyncio
+    async def test_run_cancels_stubborn_call_after_grace_period(self):
+        token = CancellationToken("task")
+        run = asyncio.create_task(token.run(asyncio.sleep(30), grace_period=0.01))
+        await asyncio.sleep(0.01)
+        token.cancel()
+        with pytest.raises(TaskCancelledError):
+            await asyncio.wait_for(run, 2)
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result_within_grace_period(self):
+        token = CancellationToken("task")
+
+        async def cooperative():
+            while not token.is_cancelled():
+                await asyncio.sleep(0.01)
+            return "partial"
+
+        run = asyncio.create_task(token.run(cooperative(), grace_period=1))
+        await asyncio.sleep(0.02)
+        token.cancel()
+        assert await run == "partial"
+
+    def test_registry_unregister_keeps_newer_tokens(self):
+        registry = CancellationRegistry()
+        first = {"a": CancellationToken("a")}
+        second = {"a": CancellationToken("a")}
+        registry._tokens.update(first)
+        registry._tokens.update(second)
+        registry.unregister_tree(first)
+        assert registry.get("a") is second["a"]
+        assert registry.cancel("missing") == []
+
+
+class TestTaskManagerCancellation:
+    """Test cancellation of running trees"""
+
+    @pytest.mark.asyncio
+    async def test_running_executor_sees_cancel(self, sync_db_session):
+        """cancellation_checker reflects a cancel issued after the executor started"""
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        task = await repo.create_task(
+            name="coop", schemas={"method": "cancellation_cooperative_executor"}, inputs={"label": "coop"}
+        )
+        run = asyncio.create_task(task_manager.distribute_task_tree(TaskTreeNode(task=task), use_callback=False))
+        await _wait_until_started("coop")
+
+        result = await TaskManager(sync_db_session, pre_hooks=[], post_hooks=[]).cancel_task(task.id, "Stop")
+        await asyncio.wait_for(run, 5)
+
+        assert result["status"] == "cancelled"
+        assert ("observed", "coop") in events
+        task = await repo.get_task_by_id(task.id)
+        assert task.status == "cancelled"
+        assert task.error == "Stop"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scheduler_mode", ["recursive", "ready_queue"])
+    async def test_cancel_parent_cancels_descendants(self, sync_db_session, scheduler_mode):
+        """
+        root
+        ├── slow (ignores cancellation)
+        └── after (depends on slow)
+        """
+        set_scheduler_mode(scheduler_mode)
+        set_cancellation_grace_period(0.05)
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        root = await repo.create_task(
+            name="root", schemas={"method": "cancellation_cooperative_executor"}, inputs={"label": "root"}
+        )
+        slow = await repo.create_task(
+            name="slow",
+            parent_id=root.id,
+            schemas={"method": "cancellation_stubborn_executor"},
+            inputs={"label": "slow"},
+        )
+        after = await repo.create_task(
+            name="after",
+            parent_id=root.id,
+            schemas={"method": "cancellation_cooperative_executor"},
+            inputs={"label": "after"},
+            dependencies=[{"id": slow.id, "required": True}],
+        )
+        tree = TaskTreeNode(task=root)
+        tree.add_child(TaskTreeNode(task=slow))
+        tree.add_child(TaskTreeNode(task=after))
+
+        run = asyncio.create_task(task_manager.distribute_task_tree(tree, use_callback=False))
+        await _wait_until_started("slow")
+
+        result = await TaskManager(sync_db_session, pre_hooks=[], post_hooks=[]).cancel_task(root.id)
+        await asyncio.wait_for(run, 5)
+
+        assert sorted(result["cancelled_descendants"]) == sorted([slow.id, after.id])
+        assert ("interrupted", "slow") in events
+        assert ("started", "after") not in events
+        assert ("started", "root") not in events
+        for task_id in (root.id, slow.id, after.id):
+            assert (await repo.get_task_by_id(task_id)).status == "cancelled"
+
+    @pytest.mark.asyncio
+    async def test_cancel_finished_task(self, sync_db_session):
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        task = await repo.create_task(name="done", schemas={"method": "cancellation_cooperative_executor"})
+        await repo.update_task_status(task.id, status="completed", result={})
+
+        result = await task_manager.cancel_task(task.id)
+        assert result["status"] == "failed"
+        assert result["current_status"] == "completed"
@@ -0,0 +1,142 @@
+"""
+Test global, per-executor and per-user concurrency limits
+"""
+import asyncio
+import pytest
+
+from aipartnerupflow import executor_register
+from aipartnerupflow.core.base import BaseTask
+from aipartnerupflow.core.config import (
+    clear_config,
+    set_executor_max_concurrency,
+    set_max_concurrency,
+    set_user_max_concurrency,
+)
+from aipartnerupflow.core.execution.concurrency import get_concurrency_limiter
+from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.types import TaskTreeNode
+
+
+class ConcurrencyProbe:
+    """Pre-hook that records peak concurrency (overall and per user)"""
+
+    def __init__(self):
+        self.active = {}
+        self.peak = 0
+        self.peak_per_user = {}
+
+    async def pre_hook(self, task):
+        self.active[task.id] = task.user_id
+        self.peak = max(self.peak, len(self.active))
+        user_count = sum(1 for user_id in self.active.values() if user_id == task.user_id)
+        self.peak_per_user[task.user_id] = max(self.peak_per_user.get(task.user_id, 0), user_count)
+        await asyncio.sleep(0.05)
+        self.active.pop(task.id)
+
+
+async def _run_parallel_children(db, probe, user_ids):
+    task_manager = TaskManager(db, pre_hooks=[probe.pre_hook], post_hooks=[])
+    repo = task_manager.task_repository
+    root = await repo.create_task(name="root", user_id=user_ids[0], schemas={"method": "system_info_executor"},
+                                  inputs={"resource": "cpu"})
+    root_node = TaskTreeNode(task=root)
+    children = []
+    for index, user_id in enumerate(user_ids):
+        child = await repo.create_task(
+            name=f"child-{index}", user_id=user_id, parent_id=root.id, priority=1,
+            schemas={"method": "system_info_executor"}, inputs={"resource": "cpu"}
+        )
+        children.append(child)
+        root_node.add_child(TaskTreeNode(task=child))
+    await task_manager.distribute_task_tree(root_node, use_callback=False)
+    for child in children:
+        assert (await repo.get_task_by_id(child.id)).status == "completed"
+
+
+class TestConcurrencyLimits:
+    """Test ConcurrencyLimiter integration in TaskManager"""
+
+    def teardown_method(self):
+        clear_config()
+
+    @pytest.mark.asyncio
+    async def test_global_limit(self, sync_db_session):
+        """Process-wide limit bounds parallel siblings"""
+        set_max_concurrency(2)
+        probe = ConcurrencyProbe()
+        await _run_parallel_children(sync_db_session, probe, ["u1"] * 5)
+        assert probe.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_executor_limit(self, sync_db_session):
+        """Per-executor limit override bounds executions of that executor"""
+        set_executor_max_concurrency("system_info_executor", 1)
+        probe = ConcurrencyProbe()
+        await _run_parallel_children(sync_db_session, probe, ["u1"] * 3)
+        assert probe.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_user_limit(self, sync_db_session):
+        """Per-user limit applies to each user separately"""
+        set_user_max_concurrency(1)
+        probe = ConcurrencyProbe()
+        await _run_parallel_children(sync_db_session, probe, ["u1", "u2", "u1", "u2"])
+        assert probe.peak_per_user == {"u1": 1, "u2": 1}
+        assert probe.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_waiting_tasks_stay_pending(self, sync_db_session):
+        """Tasks waiting for a slot are not marked in_progress"""
+        set_max_concurrency(1)
+        statuses = []
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+
+        async def pre_hook(task):
+            await asyncio.sleep(0.01)
+            statuses.append(sorted(
+                task_manager._tree_state.get_status(task_id) for task_id in sibling_ids
+            ))
+
+        task_manager.pre_hooks = [pre_hook]
+        repo = task_manager.task_repository
+        root = await repo.create_task(name="root", user_id="u1", schemas={"method": "system_info_executor"},
+                                      inputs={"resource": "cpu"})
+        root_node = TaskTreeNode(task=root)
+        sibling_ids = []
+        for index in range(3):
+            child = await repo.create_task(
+                name=f"child-{index}", user_id="u1", parent_id=root.id, priority=1,
+                schemas={"method": "system_info_executor"}, inputs={"resource": "cpu"}
+            )
+            sibling_ids.append(child.id)
+            root_node.add_child(TaskTreeNode(task=child))
+
+        await task_manager.distribute_task_tree(root_node, use_callback=False)
+
+        # While the first child runs, the other two are still pending
+        assert statuses[0] == ["in_progress", "pending", "pending"]
+
+    def test_executor_register_max_concurrency(self):
+        """max_concurrency declared with executor_register is used as executor limit"""
+
+        @executor_register(max_concurrency=3, override=True)
+        class LimitedExecutor(BaseTask):
+            id = "limited_test_executor"
+            name = "Limited Executor"
+            description = "Executor with a concurrency limit"
+
+            async def execute(self, inputs):
+                return {}
+
+            def get_input_schema(self):
+                return {"type": "object"}
+
+        limiter = get_concurrency_limiter()
+        assert LimitedExecutor._executor_options == {"max_concurrency": 3}
+        assert limiter.get_executor_limit("limited_test_executor") == 3
+
+        set_executor_max_concurrency("limited_test_executor", 5)
+        assert limiter.get_executor_limit("limited_test_executor") == 5
+
+        with pytest.raises(ValueError):
+            set_max_concurrency(0)
@@ -0,0 +1,127 @@
+"""
+Test per-task timeouts and tree deadlines
+"""
+import asyncio
+import time
+
+import pytest
+
+from aipartnerupflow.core.base import BaseTask
+from aipartnerupflow.core.config import set_scheduler_mode
+from aipartnerupflow.core.execution.deadlines import get_task_timeout, get_tree_deadline
+from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+from aipartnerupflow.core.types import TaskTreeNode
+
+
+class SleepExecutor(BaseTask):
+    id = "deadline_sleep_executor"
+    name = "Sleep Executor"
+    description = "Sleeps and reports its remaining budget"
+
+    async def execute(self, inputs):
+        await asyncio.sleep(inputs.get("sleep", 0))
+        return {"remaining": self.get_remaining_time(), "timeout": self.get_timeout(30)}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+TEST_EXECUTORS = [SleepExecutor]
+
+
+async def _create(repo, name, sleep=0, parent_id=None, dependencies=None, **schemas):
+    return await repo.create_task(
+        name=name,
+        parent_id=parent_id,
+        schemas={"method": "deadline_sleep_executor", **schemas},
+        inputs={"sleep": sleep},
+        dependencies=dependencies,
+    )
+
+
+class TestTaskTimeout:
+    """Test schemas.timeout"""
+
+    @pytest.mark.asyncio
+    async def test_hung_task_fails_after_timeout(self, sync_db_session):
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        task = await _create(repo, "hung", sleep=30, timeout=0.1)
+
+        started = time.monotonic()
+        await task_manager.distribute_task_tree(TaskTreeNode(task=task), use_callback=False)
+
+        assert time.monotonic() - started < 5
+        task = await repo.get_task_by_id(task.id)
+        assert task.status == "failed"
+        assert "timed out after 0.1 seconds" in task.error
+
+    @pytest.mark.asyncio
+    async def test_executor_receives_remaining_budget(self, sync_db_session):
+        """Executors shrink their own timeouts to the task timeout"""
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        task = await _create(repo, "budget", timeout=10)
+
+        await task_manager.distribute_task_tree(TaskTreeNode(task=task), use_callback=False)
+
+        task = await repo.get_task_by_id(task.id)
+        assert task.status == "completed"
+        assert 9 < task.result["remaining"] <= 10
+        assert task.result["timeout"] <= 10
+
+    def test_invalid_timeout(self):
+        with pytest.raises(ValueError):
+            get_task_timeout(TaskModel(id="t", name="t", schemas={"timeout": -1}))
+        assert get_task_timeout(TaskModel(id="t", name="t", schemas={})) is None
+
+
+class TestTreeDeadline:
+    """Test schemas.deadline on the root task"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scheduler_mode", ["recursive", "ready_queue"])
+    async def test_deadline_fails_running_and_waiting_tasks(self, sync_db_session, scheduler_mode):
+        """
+        root (deadline 0.3s)
+        ├── fast
+        ├── slow (30s)
+        └── after (depends on slow)
+        """
+        set_scheduler_mode(scheduler_mode)
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        root = await _create(repo, "root", deadline=0.3)
+        fast = await _create(repo, "fast", parent_id=root.id)
+        slow = await _create(repo, "slow", sleep=30, parent_id=root.id)
+        after = await _create(
+            repo, "after", parent_id=root.id, dependencies=[{"id": slow.id, "required": True}]
+        )
+        tree = TaskTreeNode(task=root)
+        for task in (fast, slow, after):
+            tree.add_child(TaskTreeNode(task=task))
+
+        started = time.monotonic()
+        await task_manager.distribute_task_tree(tree, use_callback=False)
+        assert time.monotonic() - started < 5
+
+        fast = await repo.get_task_by_id(fast.id)
+        assert fast.status == "completed"
+        assert fast.result["remaining"] <= 0.3
+        slow = await repo.get_task_by_id(slow.id)
+        assert slow.status == "failed"
+        assert "tree deadline" in slow.error
+        for task_id in (after.id, root.id):
+            task = await repo.get_task_by_id(task_id)
+            assert task.status == "failed"
+            assert task.error == "Tree deadline exceeded before the task started"
+
+    def test_deadline_formats(self):
+        relative = TaskModel(id="r", name="r", schemas={"deadline": 60})
+        assert get_tree_deadline(relative, started_at=1000.0) == 1060.0
+        absolute = TaskModel(id="r", name="r", schemas={"deadline": "2030-01-01T00:00:00Z"})
+        assert get_tree_deadline(absolute) == 1893456000.0
+        assert get_tree_deadline(TaskModel(id="r", name="r", schemas={})) is None
+        with pytest.raises(ValueError):
+            get_tree_deadline(TaskModel(id="r", name="r", schemas={"deadline": "tomorrow"}))
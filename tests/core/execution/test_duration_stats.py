@@ -0,0 +1,194 @@
+"""
+Test executor duration statistics and critical-path ordering
+"""
+import pytest
+
+from aipartnerupflow.core.base import BaseTask
+from aipartnerupflow.core.config import (
+    set_critical_path_scheduling,
+    set_scheduler_max_workers,
+    set_scheduler_mode,
+)
+from aipartnerupflow.core.execution.duration_stats import (
+    DurationHistogram,
+    ExecutorStatsStore,
+    get_critical_path_lengths,
+    get_executor_stats,
+)
+from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.storage.sqlalchemy.models import ExecutorStatsModel
+from aipartnerupflow.core.types import TaskTreeNode
+
+started = []
+
+
+class FastExecutor(BaseTask):
+    id = "stats_fast_executor"
+    name = "Fast Executor"
+    description = "Records its start"
+
+    async def execute(self, inputs):
+        started.append(inputs["label"])
+        return {"label": inputs["label"]}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+class SlowExecutor(FastExecutor):
+    id = "stats_slow_executor"
+    name = "Slow Executor"
+
+
+TEST_EXECUTORS = [FastExecutor, SlowExecutor]
+
+
+@pytest.fixture(autouse=True)
+def clear_stats():
+    get_executor_stats().clear()
+    started.clear()
+    yield
+    get_executor_stats().clear()
+
+
+class TestDurationHistogram:
+    """Test histogram percentiles"""
+
+    def test_percentiles(self):
+        histogram = DurationHistogram()
+        for _ in range(90):
+            histogram.record(0.1)
+        for _ in range(10):
+            histogram.record(10)
+
+        stats = histogram.to_dict()
+        assert stats["count"] == 100
+        assert stats["mean"] == pytest.approx(1.09)
+        assert 0.08 <= stats["p50"] <= 0.16
+        assert 5.12 <= stats["p95"] <= 10.24
+        assert DurationHistogram().percentile(50) is None
+
+    def test_critical_path_lengths(self):
+        """
+        a (1s) -> b (5s) -> d (1s)
+        c (2s) ---------->
+        """
+        lengths = get_critical_path_lengths(
+            {"a": 1, "b": 5, "c": 2, "d": 1},
+            {"a": ["b"], "b": ["d"], "c": ["d"]},
+        )
+        assert lengths == {"a": 7, "b": 6, "c": 3, "d": 1}
+
+
+class TestExecutorStatsStore:
+    """Test persistence of executor statistics"""
+
+    @pytest.mark.asyncio
+    async def test_flush_accumulates_across_processes(self, sync_db_session):
+        first, second = ExecutorStatsStore(), ExecutorStatsStore()
+        first.record("executor", 1.0)
+        second.record("executor", 3.0)
+        assert await first.flush(sync_db_session) == 1
+        assert await second.flush(sync_db_session) == 1
+        assert await first.flush(sync_db_session) == 0
+
+        row = sync_db_session.get(ExecutorStatsModel, "executor")
+        assert row.count == 2
+        assert row.total_seconds == pytest.approx(4.0)
+
+        reader = ExecutorStatsStore()
+        reader.record("executor", 2.0)
+        await reader.load(sync_db_session)
+        assert reader.get_stats()["executor"]["count"] == 3
+        assert reader.get_stats("other") == {}
+
+    @pytest.mark.asyncio
+    async def test_flush_leaves_caller_session_alone(self, sync_db_session):
+        """Flushes neither commit the caller's session nor reuse its loaded rows"""
+        from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+
+        first, second = ExecutorStatsStore(), ExecutorStatsStore()
+        first.record("executor", 1.0)
+        await first.flush(sync_db_session)
+        # The row now sits in the caller's identity map
+        assert sync_db_session.get(ExecutorStatsModel, "executor").count == 1
+
+        sync_db_session.add(TaskModel(id="uncommitted-task", name="Uncommitted", user_id="test-user"))
+        sync_db_session.flush()
+        first.record("executor", 1.0)
+        second.record("executor", 2.0)
+        await first.flush(sync_db_session)
+        await second.flush(sync_db_session)
+        sync_db_session.rollback()
+        assert sync_db_session.get(TaskModel, "uncommitted-task") is None
+
+        reader = ExecutorStatsStore()
+        await reader.load(sync_db_session)
+        stats = reader.get_stats("executor")["executor"]
+        assert stats["count"] == 3
+        assert stats["mean"] == pytest.approx(4.0 / 3)
+
+    @pytest.mark.asyncio
+    async def test_task_manager_records_durations(self, sync_db_session):
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        task = await task_manager.task_repository.create_task(
+            name="fast", schemas={"method": "stats_fast_executor"}, inputs={"label": "fast"}
+        )
+        await task_manager.distribute_task_tree(TaskTreeNode(task=task), use_callback=False)
+
+        assert get_executor_stats().get_stats()["stats_fast_executor"]["count"] == 1
+        reader = ExecutorStatsStore()
+        await reader.load(sync_db_session)
+        assert reader.get_stats()["stats_fast_executor"]["count"] == 1
+
+
+class TestCriticalPathScheduling:
+    """Test critical-path ordering in the ready-queue scheduler"""
+
+    async def _run_tree(self, sync_db_session):
+        """
+        root
+        ├── fast_1, fast_2 (fast executor)
+        └── chain_head (fast executor) -> chain_tail (slow executor)
+        """
+        set_scheduler_mode("ready_queue")
+        set_scheduler_max_workers(1)
+        stats = get_executor_stats()
+        for _ in range(5):
+            stats.record("stats_fast_executor", 0.01)
+            stats.record("stats_slow_executor", 5.0)
+
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+
+        async def create(label, method, parent_id=None, dependencies=None):
+            return await repo.create_task(
+                name=label,
+                parent_id=parent_id,
+                schemas={"method": method},
+                inputs={"label": label},
+                dependencies=dependencies,
+            )
+
+        root = await create("root", "stats_fast_executor")
+        tree = TaskTreeNode(task=root)
+        fast_1 = await create("fast_1", "stats_fast_executor", root.id)
+        fast_2 = await create("fast_2", "stats_fast_executor", root.id)
+        chain_head = await create("chain_head", "stats_fast_executor", root.id)
+        chain_tail = await create(
+            "chain_tail", "stats_slow_executor", root.id, dependencies=[{"id": chain_head.id, "required": True}]
+        )
+        for task in (fast_1, fast_2, chain_head, chain_tail):
+            tree.add_child(TaskTreeNode(task=task))
+        await task_manager.distribute_task_tree(tree, use_callback=False)
+
+    @pytest.mark.asyncio
+    async def test_long_chain_starts_first(self, sync_db_session):
+        await self._run_tree(sync_db_session)
+        assert started == ["chain_head", "chain_tail", "fast_1", "fast_2", "root"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_keeps_tree_order(self, sync_db_session):
+        set_critical_path_scheduling(False)
+        await self._run_tree(sync_db_session)
+        assert started == ["fast_1", "fast_2", "chain_head", "chain_tail", "root"]
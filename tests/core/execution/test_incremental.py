@@ -0,0 +1,190 @@
+"""
+Test incremental re-execution (input fingerprints and early cutoff)
+"""
+import pytest
+
+from aipartnerupflow.core.base import BaseTask
+from aipartnerupflow.core.config import set_incremental_reexecution, set_scheduler_mode
+from aipartnerupflow.core.execution.incremental import (
+    compute_input_fingerprint,
+    select_tasks_for_incremental_reexecution,
+)
+from aipartnerupflow.core.execution.task_executor import TaskExecutor
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
+from aipartnerupflow.core.types import TaskTreeNode
+
+calls = []
+outputs = {}
+
+
+class LabelExecutor(BaseTask):
+    id = "incremental_label_executor"
+    name = "Label Executor"
+    description = "Records its calls and returns the configured output of its label"
+
+    async def execute(self, inputs):
+        label = inputs["label"]
+        calls.append(label)
+        return {"value": outputs.get(label, 1)}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+TEST_EXECUTORS = [LabelExecutor]
+
+
+@pytest.fixture(autouse=True)
+def clear_records():
+    calls.clear()
+    outputs.clear()
+
+
+async def _create_tree(db):
+    """
+    root
+    ├── a
+    ├── b
+    ├── combine (depends on a, b)
+    └── final (depends on combine)
+    """
+    repo = TaskRepository(db)
+    schemas = {"method": "incremental_label_executor"}
+    root = await repo.create_task(name="root", schemas=schemas, inputs={"label": "root"})
+    tasks = {"root": root}
+    for label, dependencies in [("a", []), ("b", []), ("combine", ["a", "b"]), ("final", ["combine"])]:
+        tasks[label] = await repo.create_task(
+            name=label,
+            parent_id=root.id,
+            schemas=schemas,
+            inputs={"label": label},
+            dependencies=[{"id": tasks[name].id, "required": True} for name in dependencies],
+        )
+    return repo, tasks
+
+
+async def _execute(repo, root_id):
+    root = await repo.get_task_by_id(root_id)
+    task_tree = await repo.build_task_tree(root)
+    await TaskExecutor().execute_task_tree(task_tree, root_id, db_session=repo.db)
+
+
+async def _set_failed(repo, task_id):
+    await repo.update_task_status(task_id, status="failed", error="Simulated failure")
+
+
+class TestIncrementalReexecution:
+    """Test that re-executed trees only run what changed"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scheduler_mode", ["recursive", "ready_queue"])
+    async def test_failed_leaf_with_same_result_runs_alone(self, sync_db_session, scheduler_mode):
+        """Dependents of a re-executed task are kept when its result did not change"""
+        set_scheduler_mode(scheduler_mode)
+        set_incremental_reexecution(True)
+        repo, tasks = await _create_tree(sync_db_session)
+        await _execute(repo, tasks["root"].id)
+        assert sorted(calls) == ["a", "b", "combine", "final", "root"]
+        for task in tasks.values():
+            assert (await repo.get_task_by_id(task.id)).input_fingerprint
+
+        calls.clear()
+        await _set_failed(repo, tasks["a"].id)
+        await _execute(repo, tasks["root"].id)
+
+        assert calls == ["a"]
+        for task in tasks.values():
+            assert (await repo.get_task_by_id(task.id)).status == "completed"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scheduler_mode", ["recursive", "ready_queue"])
+    async def test_changed_result_propagates_until_cutoff(self, sync_db_session, scheduler_mode):
+        """A changed result re-runs dependents until a result stays the same"""
+        set_scheduler_mode(scheduler_mode)
+        set_incremental_reexecution(True)
+        repo, tasks = await _create_tree(sync_db_session)
+        await _execute(repo, tasks["root"].id)
+
+        calls.clear()
+        outputs["a"] = 2
+        await _set_failed(repo, tasks["a"].id)
+        await _execute(repo, tasks["root"].id)
+
+        # combine sees a new input, its own result is unchanged so final is kept
+        assert calls == ["a", "combine"]
+        combine = await repo.get_task_by_id(tasks["combine"].id)
+        assert combine.inputs[tasks["a"].id] == {"value": 2}
+
+    @pytest.mark.asyncio
+    async def test_changed_inputs_are_reexecuted(self, sync_db_session):
+        """Completed tasks whose inputs were edited run again, unchanged ones do not"""
+        set_incremental_reexecution(True)
+        repo, tasks = await _create_tree(sync_db_session)
+        await _execute(repo, tasks["root"].id)
+
+        calls.clear()
+        await repo.update_task_inputs(tasks["b"].id, {"label": "b", "extra": True})
+        await _execute(repo, tasks["root"].id)
+        assert calls == ["b"]
+
+        calls.clear()
+        await _execute(repo, tasks["root"].id)
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_disabled_reexecutes_completed_tasks(self, sync_db_session):
+        """Without incremental re-execution, completed tasks are re-executed too"""
+        repo, tasks = await _create_tree(sync_db_session)
+        await _execute(repo, tasks["root"].id)
+
+        calls.clear()
+        await _set_failed(repo, tasks["a"].id)
+        await _execute(repo, tasks["root"].id)
+        assert set(calls) >= {"a", "b"}
+
+
+class TestSelectTasks:
+    """Test selection of tasks for incremental re-execution"""
+
+    @staticmethod
+    def _completed(task_id, parent_id=None, dependencies=None, results=None):
+        task = TaskModel(
+            id=task_id,
+            parent_id=parent_id,
+            name=task_id,
+            status="completed",
+            inputs={"label": task_id},
+            dependencies=dependencies,
+            result={"value": task_id},
+        )
+        task.input_fingerprint = compute_input_fingerprint(task, results or {})
+        return task
+
+    def test_one_failed_leaf_in_large_tree(self):
+        """Only the failed leaf and the ancestors needed to reach it are marked"""
+        root = TaskTreeNode(task=self._completed("root"))
+        for index in range(299):
+            root.add_child(TaskTreeNode(task=self._completed(f"leaf-{index}", parent_id="root")))
+        root.children[42].task.status = "failed"
+
+        assert select_tasks_for_incremental_reexecution(root) == {"root", "leaf-42"}
+
+    def test_dependents_of_changed_task_are_candidates(self):
+        """Dependents of a changed task are marked; unrelated tasks are not"""
+        root = TaskTreeNode(task=self._completed("root"))
+        first = self._completed("first", parent_id="root")
+        second = self._completed(
+            "second",
+            parent_id="root",
+            dependencies=[{"id": "first"}],
+            results={"first": first.result},
+        )
+        other = self._completed("other", parent_id="root")
+        for task in (first, second, other):
+            root.add_child(TaskTreeNode(task=task))
+
+        assert select_tasks_for_incremental_reexecution(root) == set()
+
+        first.inputs = {"label": "first", "changed": True}
+        assert select_tasks_for_incremental_reexecution(root) == {"root", "first", "second"}
@@ -0,0 +1,182 @@
+"""
+Test thread and process execution lanes
+"""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from aipartnerupflow import executor_register
+from aipartnerupflow.core.base import BaseTask
+from aipartnerupflow.core.config import get_lane_workers, set_lane_workers
+from aipartnerupflow.core.execution.lanes import (
+    PROCESS_LANE,
+    THREAD_LANE,
+    ExecutionLanes,
+    LaneCancelledError,
+    get_execution_lane,
+    get_execution_lanes,
+)
+from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.types import TaskTreeNode
+
+
+class ThreadLaneExecutor(BaseTask):
+    id = "thread_lane_executor"
+    name = "Thread Lane Executor"
+    description = "Blocks for a while and reports its thread"
+
+    async def execute(self, inputs):
+        time.sleep(inputs.get("sleep", 0))
+        return {"thread": threading.current_thread().name}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+class ProcessLaneExecutor(BaseTask):
+    id = "process_lane_executor"
+    name = "Process Lane Executor"
+    description = "Reports its process id"
+
+    async def execute(self, inputs):
+        return {"pid": os.getpid(), "total": sum(range(inputs.get("n", 10)))}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+class CooperativeExecutor(BaseTask):
+    id = "cooperative_lane_executor"
+    name = "Cooperative Executor"
+    description = "Runs until cancelled"
+
+    async def execute(self, inputs):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if self.cancellation_checker and self.cancellation_checker():
+                return {"stopped": True}
+            time.sleep(0.01)
+        return {"stopped": False}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+TEST_EXECUTORS = [
+    (ThreadLaneExecutor, {"execution_lane": "thread"}),
+    (ProcessLaneExecutor, {"execution_lane": "process"}),
+]
+
+
+@pytest.fixture(autouse=True)
+def shutdown_lanes():
+    yield
+    get_execution_lanes().shutdown()
+
+
+@pytest.fixture
+def lanes():
+    lanes = ExecutionLanes()
+    yield lanes
+    lanes.shutdown()
+
+
+class TestExecutionLanes:
+    """Test ExecutionLanes pools"""
+
+    def test_lane_from_registration(self):
+        assert get_execution_lane("thread_lane_executor") == THREAD_LANE
+        assert get_execution_lane("process_lane_executor") == PROCESS_LANE
+        assert get_execution_lane("system_info_executor") == "event_loop"
+
+    def test_invalid_lane(self):
+        with pytest.raises(ValueError):
+            executor_register(execution_lane="gpu", override=True)(ThreadLaneExecutor)
+
+    @pytest.mark.asyncio
+    async def test_thread_lane_does_not_block_event_loop(self, lanes):
+        """Blocking executors run in lane threads while the event loop keeps running"""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        results = await asyncio.gather(
+            *(lanes.run(THREAD_LANE, ThreadLaneExecutor(), {"sleep": 0.2}) for _ in range(2))
+        )
+        ticker_task.cancel()
+
+        assert all(result["thread"].startswith("apflow-lane") for result in results)
+        assert ticks >= 5
+        metrics = lanes.get_metrics()[THREAD_LANE]
+        assert metrics["submitted"] == 2
+        assert metrics["completed"] == 2
+        assert metrics["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_process_lane_runs_in_worker_process(self, lanes):
+        """Process lane calls run in another process with a new executor instance"""
+        set_lane_workers(process_workers=1)
+        result = await lanes.run(PROCESS_LANE, ProcessLaneExecutor(), {"n": 100}, init_kwargs={"user_id": "u"})
+        assert result["pid"] != os.getpid()
+        assert result["total"] == 4950
+
+    @pytest.mark.asyncio
+    async def test_process_lane_requires_picklable_executor(self, lanes):
+        class LocalExecutor(ProcessLaneExecutor):
+            pass
+
+        with pytest.raises(ValueError, match="picklable"):
+            await lanes.run(PROCESS_LANE, LocalExecutor(), {})
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("lane", [THREAD_LANE, PROCESS_LANE])
+    async def test_cancel_stops_waiting_and_signals_executor(self, lanes, lane):
+        """Cancelled calls raise LaneCancelledError; the executor sees its cancellation_checker"""
+        set_lane_workers(process_workers=1)
+        executor = CooperativeExecutor()
+        run = asyncio.create_task(lanes.run(lane, executor, {}, task_id="task-1"))
+        await asyncio.sleep(0.2)
+        assert lanes.get_metrics()[lane]["running"] == 1
+
+        assert lanes.cancel("task-1")
+        with pytest.raises(LaneCancelledError):
+            await run
+        assert not lanes.cancel("task-1")
+        assert lanes.get_metrics()[lane]["cancelled"] == 1
+        if lane == THREAD_LANE:
+            assert executor.cancellation_checker()
+
+    def test_lane_workers_config(self):
+        set_lane_workers(thread_workers=2, process_workers=3)
+        assert get_lane_workers() == {"thread_workers": 2, "process_workers": 3}
+        with pytest.raises(ValueError):
+            set_lane_workers(thread_workers=0)
+
+
+class TestTaskManagerLanes:
+    """Test TaskManager dispatching executors to their lane"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method", ["thread_lane_executor", "process_lane_executor"])
+    async def test_task_runs_in_lane(self, sync_db_session, method):
+        set_lane_workers(process_workers=1)
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        task = await repo.create_task(name="lane", schemas={"method": method}, inputs={"n": 5})
+        await task_manager.distribute_task_tree(TaskTreeNode(task=task), use_callback=False)
+
+        task = await repo.get_task_by_id(task.id)
+        assert task.status == "completed"
+        if method == "thread_lane_executor":
+            assert task.result["thread"].startswith("apflow-lane")
+        else:
+            assert task.result["pid"] != os.getpid()
+            assert task.result["total"] == 10
@@ -0,0 +1,205 @@
+"""
+Test the executor result cache
+"""
+import asyncio
+import pytest
+
+from aipartnerupflow.core.base import BaseTask
+from aipartnerupflow.core.config import clear_config, set_result_cache
+from aipartnerupflow.core.execution.result_cache import (
+    DatabaseResultCache,
+    InMemoryResultCache,
+    get_cache_options,
+    make_cache_key,
+    reset_result_cache_backends,
+)
+from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.types import TaskTreeNode
+
+calls = []
+
+
+class CountingExecutor(BaseTask):
+    id = "cache_counting_executor"
+    name = "Counting Executor"
+    description = "Deterministic executor counting its calls"
+
+    async def execute(self, inputs):
+        calls.append(inputs)
+        return {"value": inputs.get("value", 0) * 2}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+class UncachedExecutor(BaseTask):
+    id = "cache_uncached_executor"
+    name = "Uncached Executor"
+    description = "Executor without cacheable results"
+
+    async def execute(self, inputs):
+        calls.append(inputs)
+        return {"value": 1}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+TEST_EXECUTORS = [(CountingExecutor, {"cacheable": True, "cache_version": "1"}), UncachedExecutor]
+
+
+async def _run_task(db, method, inputs, user_id=None):
+    task_manager = TaskManager(db, pre_hooks=[], post_hooks=[])
+    repo = task_manager.task_repository
+    task = await repo.create_task(name="cached", user_id=user_id, schemas={"method": method}, inputs=inputs)
+    await task_manager.distribute_task_tree(TaskTreeNode(task=task), use_callback=False)
+    return await repo.get_task_by_id(task.id)
+
+
+class TestCacheKey:
+    """Test cache key construction"""
+
+    def test_key_is_stable(self):
+        """Dictionary order does not change the key; any component does"""
+        key = make_cache_key("executor", {"a": 1, "b": 2}, {"x": [1, 2]}, "1")
+        assert key == make_cache_key("executor", {"b": 2, "a": 1}, {"x": [1, 2]}, "1")
+        assert key != make_cache_key("executor", {"a": 1, "b": 2}, {"x": [2, 1]}, "1")
+        assert key != make_cache_key("executor", {"a": 1, "b": 2}, {"x": [1, 2]}, "2")
+        assert key != make_cache_key("other", {"a": 1, "b": 2}, {"x": [1, 2]}, "1")
+        assert key != make_cache_key("executor", {"a": 1, "b": 2}, {"x": [1, 2]}, "1", user_id="alice")
+
+    def test_cacheable_options(self):
+        """Cacheability comes from executor_register metadata"""
+        assert get_cache_options("cache_counting_executor", {}) == {"version": "1", "ttl": None}
+        assert get_cache_options("cache_uncached_executor", {}) is None
+        assert get_cache_options("rest_executor", {"method": "GET"}) is not None
+        assert get_cache_options("rest_executor", {"method": "POST"}) is None
+
+
+class TestBackends:
+    """Test result cache backends"""
+
+    @pytest.mark.asyncio
+    async def test_memory_lru_eviction(self):
+        """The least recently used entry is evicted first"""
+        cache = InMemoryResultCache(max_entries=2)
+        await cache.set("a", {"v": 1}, "executor")
+        await cache.set("b", {"v": 2}, "executor")
+        assert await cache.get("a") == {"v": 1}
+        await cache.set("c", {"v": 3}, "executor")
+        assert await cache.get("b") is None
+        assert await cache.get("a") == {"v": 1}
+        assert len(cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_memory_ttl(self):
+        """Expired entries are misses"""
+        cache = InMemoryResultCache()
+        await cache.set("a", {"v": 1}, "executor", ttl=0.01)
+        await asyncio.sleep(0.02)
+        assert await cache.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_memory_returns_copies(self):
+        """Callers cannot modify cached results"""
+        cache = InMemoryResultCache()
+        await cache.set("a", {"v": [1]}, "executor")
+        (await cache.get("a"))["v"].append(2)
+        assert await cache.get("a") == {"v": [1]}
+
+    @pytest.mark.asyncio
+    async def test_database_backend(self, sync_db_session):
+        """Results are stored in the cache table and replaced on set"""
+        cache = DatabaseResultCache()
+        assert await cache.get("a", db=sync_db_session) is None
+        await cache.set("a", {"v": 1}, "executor", db=sync_db_session)
+        await cache.set("a", {"v": 2}, "executor", db=sync_db_session)
+        assert await cache.get("a", db=sync_db_session) == {"v": 2}
+
+        await cache.set("b", {"v": 1}, "executor", ttl=0.01, db=sync_db_session)
+        await asyncio.sleep(0.02)
+        assert await cache.get("b", db=sync_db_session) is None
+
+        await cache.clear(db=sync_db_session)
+        assert await cache.get("a", db=sync_db_session) is None
+
+    @pytest.mark.asyncio
+    async def test_database_backend_leaves_caller_transaction_alone(self, sync_db_session):
+        """Cache writes neither commit nor roll back the caller's session"""
+        from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+
+        cache = DatabaseResultCache()
+        sync_db_session.add(TaskModel(id="uncommitted-task", name="Uncommitted", user_id="test-user"))
+        sync_db_session.flush()
+        await asyncio.gather(
+            cache.set("same", {"v": 1}, "executor", db=sync_db_session),
+            cache.set("same", {"v": 2}, "executor", db=sync_db_session),
+        )
+        assert await cache.get("same", db=sync_db_session) == {"v": 2}
+        # Still pending in the caller's transaction
+        assert sync_db_session.get(TaskModel, "uncommitted-task") is not None
+        sync_db_session.rollback()
+        assert sync_db_session.get(TaskModel, "uncommitted-task") is None
+
+
+class TestTaskManagerCache:
+    """Test result reuse in TaskManager"""
+
+    def setup_method(self):
+        calls.clear()
+        reset_result_cache_backends()
+
+    def teardown_method(self):
+        clear_config()
+        reset_result_cache_backends()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend", ["memory", "database"])
+    async def test_identical_execution_reuses_result(self, sync_db_session, backend):
+        """Second execution with identical inputs does not call the executor"""
+        set_result_cache(True, backend=backend)
+        first = await _run_task(sync_db_session, "cache_counting_executor", {"value": 3})
+        second = await _run_task(sync_db_session, "cache_counting_executor", {"value": 3})
+
+        assert len(calls) == 1
+        assert first.result == {"value": 6}
+        assert second.status == "completed"
+        assert second.result["value"] == 6
+        assert second.result["cache_hit"] is True
+
+        await _run_task(sync_db_session, "cache_counting_executor", {"value": 4})
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_results_are_not_shared_between_users(self, sync_db_session):
+        set_result_cache(True)
+        await _run_task(sync_db_session, "cache_counting_executor", {"value": 3}, user_id="alice")
+        bob = await _run_task(sync_db_session, "cache_counting_executor", {"value": 3}, user_id="bob")
+        assert len(calls) == 2
+        assert "cache_hit" not in bob.result
+
+    def test_system_info_results_expire(self):
+        from aipartnerupflow.extensions.stdio.system_info_executor import SystemInfoExecutor
+
+        assert SystemInfoExecutor._executor_options["cache_ttl"] == 60
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, sync_db_session):
+        """Without set_result_cache(True) every execution calls the executor"""
+        await _run_task(sync_db_session, "cache_counting_executor", {"value": 3})
+        await _run_task(sync_db_session, "cache_counting_executor", {"value": 3})
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_executor(self, sync_db_session):
+        """Executors not declared cacheable always run"""
+        set_result_cache(True)
+        await _run_task(sync_db_session, "cache_uncached_executor", {})
+        await _run_task(sync_db_session, "cache_uncached_executor", {})
+        assert len(calls) == 2
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            set_result_cache(True, backend="redis")
+        with pytest.raises(ValueError):
+            set_result_cache(True, ttl=0)
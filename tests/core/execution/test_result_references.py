@@ -0,0 +1,183 @@
+"""
+Test dependency field projection and result references
+"""
+import pytest
+
+from aipartnerupflow.core.base import BaseTask
+from aipartnerupflow.core.config import set_dependency_result_mode
+from aipartnerupflow.core.execution.result_references import (
+    RESULT_REF_KEY,
+    make_result_reference,
+    materialize_result_references,
+    project_fields,
+)
+from aipartnerupflow.core.execution.task_creator import TaskCreator
+from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.types import TaskTreeNode
+
+PAGE = {"status": 200, "page": {"title": "Home", "body": "x" * 1000}, "links": ["/a", "/b"]}
+received = {}
+
+
+class PageExecutor(BaseTask):
+    id = "result_ref_page_executor"
+    name = "Page Executor"
+    description = "Returns a large page result"
+
+    async def execute(self, inputs):
+        return PAGE
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+class ConsumerExecutor(BaseTask):
+    id = "result_ref_consumer_executor"
+    name = "Consumer Executor"
+    description = "Records the inputs it is called with"
+
+    async def execute(self, inputs):
+        received[inputs["label"]] = inputs
+        return {"ok": True}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+TEST_EXECUTORS = [PageExecutor, ConsumerExecutor]
+
+
+@pytest.fixture(autouse=True)
+def clear_received():
+    received.clear()
+
+
+async def _run_tree(sync_db_session, dependency_options, consumer_schemas=None):
+    """Run page -> consumer and return (page, stored consumer)"""
+    task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+    repo = task_manager.task_repository
+    root = await repo.create_task(name="root", schemas={"method": "result_ref_consumer_executor"}, inputs={"label": "root"})
+    page = await repo.create_task(name="page", parent_id=root.id, schemas={"method": "result_ref_page_executor"})
+    consumer = await repo.create_task(
+        name="consumer",
+        parent_id=root.id,
+        schemas={"method": "result_ref_consumer_executor", **(consumer_schemas or {})},
+        inputs={"label": "consumer"},
+        dependencies=[{"id": page.id, "required": True, **dependency_options}],
+    )
+    tree = TaskTreeNode(task=root)
+    tree.add_child(TaskTreeNode(task=page))
+    tree.add_child(TaskTreeNode(task=consumer))
+    await task_manager.distribute_task_tree(tree, use_callback=False)
+    return page, await repo.get_task_by_id(consumer.id)
+
+
+class TestProjection:
+    """Test field projection and reference materialization"""
+
+    def test_project_fields(self):
+        assert project_fields(PAGE, ["status", "page.title", "missing.x"]) == {
+            "status": 200,
+            "page": {"title": "Home"},
+        }
+        # An enclosing field selected as a whole wins over its nested fields
+        assert project_fields(PAGE, ["page", "page.title"]) == {"page": PAGE["page"]}
+        assert project_fields(["a"], ["x"]) == ["a"]
+        assert project_fields(PAGE, None) is PAGE
+
+    def test_materialize(self):
+        inputs = {
+            "a": make_result_reference("t1", ["page.title"]),
+            "nested": [make_result_reference("t1", path=["status"])],
+            "missing": make_result_reference("t2"),
+            "plain": {RESULT_REF_KEY: "not a reference"},
+        }
+        assert materialize_result_references(inputs, {"t1": PAGE}) == {
+            "a": {"page": {"title": "Home"}},
+            "nested": [200],
+            "missing": None,
+            "plain": {RESULT_REF_KEY: "not a reference"},
+        }
+
+
+class TestDependencyResultModes:
+    """Test how dependency results reach executors and stored inputs"""
+
+    @pytest.mark.asyncio
+    async def test_copy_with_fields(self, sync_db_session):
+        page, consumer = await _run_tree(sync_db_session, {"fields": ["status", "page.title"]})
+        projected = {"status": 200, "page": {"title": "Home"}}
+        assert received["consumer"][page.id] == projected
+        assert consumer.inputs[page.id] == projected
+
+    @pytest.mark.asyncio
+    async def test_reference_mode_stores_pointer(self, sync_db_session):
+        page, consumer = await _run_tree(sync_db_session, {"mode": "reference", "fields": ["page.title"]})
+        # The executor sees the projected result, the stored inputs only the reference
+        assert received["consumer"][page.id] == {"page": {"title": "Home"}}
+        assert consumer.inputs[page.id] == {RESULT_REF_KEY: {"task_id": page.id, "fields": ["page.title"]}}
+        assert consumer.status == "completed"
+
+    @pytest.mark.asyncio
+    async def test_reference_mode_with_schema_mapping_and_default(self, sync_db_session):
+        set_dependency_result_mode("reference")
+        input_schema = {"properties": {"status": {"type": "integer"}, "links": {"type": "array"}}}
+        page, consumer = await _run_tree(sync_db_session, {}, consumer_schemas={"input_schema": input_schema})
+        assert received["consumer"]["status"] == 200
+        assert received["consumer"]["links"] == ["/a", "/b"]
+        assert consumer.inputs["links"] == {RESULT_REF_KEY: {"task_id": page.id, "path": ["links"]}}
+
+        # A dependency's own mode overrides the default
+        received.clear()
+        page, consumer = await _run_tree(sync_db_session, {"mode": "copy"})
+        assert consumer.inputs[page.id] == PAGE
+        with pytest.raises(ValueError, match="Invalid dependency result mode"):
+            set_dependency_result_mode("pointer")
+
+    @pytest.mark.asyncio
+    async def test_reference_to_foreign_task_is_not_resolved(self, sync_db_session):
+        """Only results of the task's own dependencies are materialized"""
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        secret = await repo.create_task(name="secret", user_id="alice", schemas={"method": "result_ref_page_executor"})
+        await task_manager.distribute_task_tree(TaskTreeNode(task=secret), use_callback=False)
+        assert (await repo.get_task_by_id(secret.id)).status == "completed"
+
+        intruder = await repo.create_task(
+            name="intruder",
+            user_id="bob",
+            schemas={"method": "result_ref_consumer_executor"},
+            inputs={"label": "intruder", "x": make_result_reference(secret.id)},
+        )
+        await task_manager.distribute_task_tree(TaskTreeNode(task=intruder), use_callback=False)
+        assert received["intruder"]["x"] is None
+
+
+class TestTaskCreatorOptions:
+    """Test that dependency options are validated and kept"""
+
+    @pytest.mark.asyncio
+    async def test_options_kept_and_validated(self, sync_db_session):
+        creator = TaskCreator(sync_db_session)
+        tree = await creator.create_task_tree_from_array([
+            {"id": "root", "name": "Root"},
+            {"id": "page", "name": "Page", "parent_id": "root"},
+            {
+                "id": "use",
+                "name": "Use",
+                "parent_id": "root",
+                "dependencies": [{"id": "page", "fields": ["page.title"], "mode": "reference"}],
+            },
+        ])
+        use = tree.children[1].task
+        assert use.dependencies == [
+            {"id": "page", "required": True, "type": "result", "fields": ["page.title"], "mode": "reference"}
+        ]
+
+        for option, message in (({"mode": "pointer"}, "Invalid dependency mode"), ({"fields": "a"}, "fields")):
+            with pytest.raises(ValueError, match=message):
+                await creator.create_task_tree_from_array([
+                    {"id": "r2", "name": "Root"},
+                    {"id": "p2", "name": "Page", "parent_id": "r2"},
+                    {"id": "u2", "name": "Use", "parent_id": "r2", "dependencies": [{"id": "p2", **option}]},
+                ])
@@ -0,0 +1,192 @@
+"""
+Test per-task retry policies
+"""
+import time
+
+import pytest
+
+from aipartnerupflow.core.base import BaseTask
+from aipartnerupflow.core.config import set_scheduler_max_workers, set_scheduler_mode
+from aipartnerupflow.core.execution.deadlines import TaskTimeoutError
+from aipartnerupflow.core.execution.retry import RetryPolicy, get_retry_policy
+from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+from aipartnerupflow.core.types import TaskTreeNode
+
+calls = {}
+events = []
+
+
+class FlakyExecutor(BaseTask):
+    id = "retry_flaky_executor"
+    name = "Flaky Executor"
+    description = "Fails a given number of times before succeeding"
+
+    async def execute(self, inputs):
+        label = inputs["label"]
+        calls[label] = calls.get(label, 0) + 1
+        events.append((label, time.monotonic()))
+        if calls[label] <= inputs.get("failures", 0):
+            if inputs.get("mode") == "result":
+                return {"success": False, "status_code": inputs.get("status_code", 503), "error": "unavailable"}
+            raise RuntimeError(inputs.get("message", "boom"))
+        return {"label": label, "calls": calls[label]}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+TEST_EXECUTORS = [FlakyExecutor]
+
+
+@pytest.fixture(autouse=True)
+def clear_records():
+    calls.clear()
+    events.clear()
+
+
+async def _create(repo, label, parent_id=None, dependencies=None, retry=None, **inputs):
+    schemas = {"method": "retry_flaky_executor"}
+    if retry is not None:
+        schemas["retry"] = retry
+    return await repo.create_task(
+        name=label,
+        parent_id=parent_id,
+        schemas=schemas,
+        inputs={"label": label, **inputs},
+        dependencies=dependencies,
+    )
+
+
+class TestRetryPolicy:
+    """Test schemas.retry parsing and matching"""
+
+    def test_parse_policy(self):
+        task = TaskModel(
+            id="t", name="t", schemas={"retry": {"max_attempts": 5, "backoff": 0.5, "jitter": True, "retry_on": "5xx"}}
+        )
+        policy = get_retry_policy(task)
+        assert policy.max_attempts == 5
+        assert policy.jitter == 0.5
+        assert policy.retry_on == ["5xx"]
+        assert get_retry_policy(TaskModel(id="t", name="t", schemas={})) is None
+        for invalid in ({"max_attempts": 0}, {"jitter": 2}, {"retry_on": []}, "always"):
+            with pytest.raises(ValueError):
+                get_retry_policy(TaskModel(id="t", name="t", schemas={"retry": invalid}))
+
+    def test_backoff_is_exponential_and_capped(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5)
+        assert [policy.get_delay(attempt) for attempt in (1, 2, 3, 4)] == [1, 2, 4, 5]
+        jittered = RetryPolicy(backoff=1, jitter=0.5)
+        assert all(0.5 <= jittered.get_delay(1) <= 1.5 for _ in range(20))
+
+    def test_retry_on(self):
+        policy = RetryPolicy(max_attempts=3, retry_on=["timeout", "5xx", 404])
+        assert policy.should_retry(1, error=TaskTimeoutError("Task t timed out after 1 seconds"))
+        assert policy.should_retry(1, result={"success": False, "status_code": 502})
+        assert policy.should_retry(1, result={"success": False, "status_code": 404})
+        assert not policy.should_retry(1, result={"success": False, "status_code": 400})
+        assert not policy.should_retry(1, error=ValueError("bad input"))
+        assert not policy.should_retry(3, error=TaskTimeoutError("timed out"))
+        assert RetryPolicy(retry_on=["rate_limit"]).should_retry(1, error=RuntimeError("Rate limit exceeded"))
+
+
+class TestTaskManagerRetry:
+    """Test retries during tree execution"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scheduler_mode", ["recursive", "ready_queue"])
+    async def test_flaky_task_succeeds_and_dependent_waits(self, sync_db_session, scheduler_mode):
+        """
+        root
+        ├── flaky (fails twice)
+        └── after (depends on flaky)
+        """
+        set_scheduler_mode(scheduler_mode)
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        root = await _create(repo, "root")
+        flaky = await _create(
+            repo, "flaky", parent_id=root.id, failures=2, retry={"max_attempts": 3, "backoff": 0.01}
+        )
+        after = await _create(repo, "after", parent_id=root.id, dependencies=[{"id": flaky.id, "required": True}])
+        tree = TaskTreeNode(task=root)
+        tree.add_child(TaskTreeNode(task=flaky))
+        tree.add_child(TaskTreeNode(task=after))
+
+        await task_manager.distribute_task_tree(tree, use_callback=False)
+
+        flaky = await repo.get_task_by_id(flaky.id)
+        assert flaky.status == "completed"
+        assert flaky.attempts == 3
+        assert flaky.last_error == "boom"
+        assert flaky.error is None
+        assert calls["flaky"] == 3
+        assert calls["after"] == 1
+        assert (await repo.get_task_by_id(after.id)).status == "completed"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scheduler_mode", ["recursive", "ready_queue"])
+    async def test_exhausted_retries_fail_task_and_block_dependents(self, sync_db_session, scheduler_mode):
+        """Unsuccessful results count as failed attempts once a retry policy is set"""
+        set_scheduler_mode(scheduler_mode)
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        root = await _create(repo, "root")
+        flaky = await _create(
+            repo,
+            "flaky",
+            parent_id=root.id,
+            failures=5,
+            mode="result",
+            retry={"max_attempts": 2, "backoff": 0.01, "retry_on": ["5xx"]},
+        )
+        after = await _create(repo, "after", parent_id=root.id, dependencies=[{"id": flaky.id, "required": True}])
+        tree = TaskTreeNode(task=root)
+        tree.add_child(TaskTreeNode(task=flaky))
+        tree.add_child(TaskTreeNode(task=after))
+
+        await task_manager.distribute_task_tree(tree, use_callback=False)
+
+        flaky = await repo.get_task_by_id(flaky.id)
+        assert flaky.status == "failed"
+        assert flaky.attempts == 2
+        assert flaky.error == flaky.last_error == "unavailable"
+        assert flaky.result["status_code"] == 503
+        assert "after" not in calls
+
+    @pytest.mark.asyncio
+    async def test_retry_on_filters_errors(self, sync_db_session):
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        task = await _create(
+            repo, "fatal", failures=1, message="invalid input", retry={"backoff": 0.01, "retry_on": ["timeout"]}
+        )
+
+        await task_manager.distribute_task_tree(TaskTreeNode(task=task), use_callback=False)
+
+        task = await repo.get_task_by_id(task.id)
+        assert task.status == "failed"
+        assert task.attempts == 1
+        assert calls["fatal"] == 1
+
+    @pytest.mark.asyncio
+    async def test_backoff_does_not_hold_worker_slot(self, sync_db_session):
+        """With a single worker, an independent task runs while another waits for its retry"""
+        set_scheduler_mode("ready_queue")
+        set_scheduler_max_workers(1)
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        root = await _create(repo, "root")
+        flaky = await _create(
+            repo, "flaky", parent_id=root.id, failures=1, retry={"max_attempts": 2, "backoff": 0.3}
+        )
+        other = await _create(repo, "other", parent_id=root.id)
+        tree = TaskTreeNode(task=root)
+        tree.add_child(TaskTreeNode(task=flaky))
+        tree.add_child(TaskTreeNode(task=other))
+
+        await task_manager.distribute_task_tree(tree, use_callback=False)
+
+        assert [label for label, _ in events] == ["flaky", "other", "flaky", "root"]
+        assert (await repo.get_task_by_id(flaky.id)).status == "completed"
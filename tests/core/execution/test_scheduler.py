@@ -0,0 +1,131 @@
+"""
+Test ready-queue scheduler mode of TaskManager
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from aipartnerupflow.core.config import (
+    get_scheduler_max_workers,
+    set_scheduler_max_workers,
+    set_scheduler_mode,
+)
+from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.types import TaskTreeNode
+
+
+async def _create_tree(repo, children_spec):
+    """
+    Create a root task with children
+
+    children_spec: list of (name, method, dependency names)
+    """
+    root = await repo.create_task(
+        name="root", user_id="test-user",
+        schemas={"method": "system_info_executor"}, inputs={"resource": "cpu"}
+    )
+    root_node = TaskTreeNode(task=root)
+    tasks = {"root": root}
+    for name, method, dependency_names in children_spec:
+        task = await repo.create_task(
+            name=name, user_id="test-user", parent_id=root.id,
+            schemas={"method": method}, inputs={"resource": "cpu"},
+            dependencies=[{"id": tasks[dep].id, "required": True} for dep in dependency_names] or None,
+        )
+        tasks[name] = task
+        root_node.add_child(TaskTreeNode(task=task))
+    return root_node, tasks
+
+
+class TestReadyQueueScheduler:
+    """Test TaskManager with scheduler_mode="ready_queue" """
+
+    @pytest.mark.asyncio
+    async def test_diamond_dependencies(self, sync_db_session):
+        """Tasks run after their dependencies; parent runs after its children"""
+        order = []
+
+        async def post_hook(task, inputs, result):
+            order.append(task.name)
+
+        task_manager = TaskManager(
+            sync_db_session, pre_hooks=[], post_hooks=[post_hook], scheduler_mode="ready_queue"
+        )
+        root_node, tasks = await _create_tree(task_manager.task_repository, [
+            ("a", "system_info_executor", []),
+            ("b", "system_info_executor", ["a"]),
+            ("c", "system_info_executor", ["a"]),
+            ("d", "system_info_executor", ["b", "c"]),
+        ])
+
+        await task_manager.distribute_task_tree(root_node, use_callback=False)
+
+        for task in tasks.values():
+            assert (await task_manager.task_repository.get_task_by_id(task.id)).status == "completed"
+        assert order[0] == "a"
+        assert order.index("d") > order.index("b")
+        assert order.index("d") > order.index("c")
+        assert order[-1] == "root"
+
+    @pytest.mark.asyncio
+    async def test_failed_dependency_blocks_dependents(self, sync_db_session):
+        """Dependents of a failed task stay pending; unrelated tasks and the parent still run"""
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[], scheduler_mode="ready_queue")
+        repo = task_manager.task_repository
+        root_node, tasks = await _create_tree(repo, [
+            ("broken", "system_info_executor", []),
+            ("after_broken", "system_info_executor", ["broken"]),
+            ("after_after", "system_info_executor", ["after_broken"]),
+            ("independent", "system_info_executor", []),
+        ])
+
+        execute_with_schemas = task_manager._execute_task_with_schemas
+
+        async def failing_execute(task, inputs):
+            if task.name == "broken":
+                raise RuntimeError("executor failed")
+            return await execute_with_schemas(task, inputs)
+
+        with patch.object(task_manager, "_execute_task_with_schemas", side_effect=failing_execute):
+            await task_manager.distribute_task_tree(root_node, use_callback=False)
+
+        assert (await repo.get_task_by_id(tasks["broken"].id)).status == "failed"
+        assert (await repo.get_task_by_id(tasks["after_broken"].id)).status == "pending"
+        assert (await repo.get_task_by_id(tasks["after_after"].id)).status == "pending"
+        assert (await repo.get_task_by_id(tasks["independent"].id)).status == "completed"
+        assert (await repo.get_task_by_id(tasks["root"].id)).status == "completed"
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_is_bounded(self, sync_db_session):
+        """No more than max_workers tasks execute at the same time"""
+        active = 0
+        peak = 0
+
+        async def pre_hook(task):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+
+        previous_max_workers = get_scheduler_max_workers()
+        set_scheduler_max_workers(2)
+        try:
+            task_manager = TaskManager(
+                sync_db_session, pre_hooks=[pre_hook], post_hooks=[], scheduler_mode="ready_queue"
+            )
+            root_node, _ = await _create_tree(task_manager.task_repository, [
+                (f"task-{i}", "system_info_executor", []) for i in range(5)
+            ])
+            await task_manager.distribute_task_tree(root_node, use_callback=False)
+        finally:
+            set_scheduler_max_workers(previous_max_workers)
+
+        assert peak == 2
+
+    def test_invalid_scheduler_mode(self):
+        """Unknown scheduler modes are rejected"""
+        with pytest.raises(ValueError):
+            set_scheduler_mode("unknown")
+        with pytest.raises(ValueError):
+            set_scheduler_max_workers(0)
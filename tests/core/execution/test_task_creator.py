@@ -956,6 +956,84 @@ class TestTaskCreator:
         with pytest.raises(ValueError, match="Multiple root tasks found"):
             await creator.create_task_tree_from_array(tasks)
 
+    
+    @pytest.mark.asyncio
+    async def test_error_parent_cycle_detected_before_creating_tasks(self, sync_db_session):
+        """Test that tasks whose parent_id chain is a cycle are rejected and nothing is created"""
+        from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
+        
+        creator = TaskCreator(sync_db_session)
+        tasks = [
+            {"id": "cycle_root", "name": "Root"},
+            {"id": "cycle_b", "name": "Task B", "parent_id": "cycle_c"},
+            {"id": "cycle_c", "name": "Task C", "parent_id": "cycle_b"},
+        ]
+        
+        with pytest.raises(ValueError, match=r"Tasks not in the same tree: \['Task B', 'Task C'\]"):
+            await creator.create_task_tree_from_array(tasks)
+        assert await TaskRepository(sync_db_session).get_task_by_id("cycle_root") is None
+    
+    def test_validate_large_task_array(self, sync_db_session):
+        """Test validation of a 20k task array with a long dependency chain (no recursion limit)"""
+        creator = TaskCreator(sync_db_session)
+        count = 20000
+        tasks = [{"id": "task_0", "name": "Task 0"}]
+        for index in range(1, count):
+            tasks.append({
+                "id": f"task_{index}",
+                "name": f"Task {index}",
+                "parent_id": f"task_{(index - 1) // 10}",
+                "dependencies": [{"id": f"task_{index - 1}", "required": True}],
+            })
+        
+        assert creator._validate_task_array(tasks) == 0
+        
+        tasks[5]["dependencies"] = [{"id": "task_7", "required": True}]
+        with pytest.raises(ValueError, match="Circular dependency detected: Task 5 -> Task 7 -> Task 6 -> Task 5\\."):
+            creator._validate_task_array(tasks)
+
+    @pytest.mark.asyncio
+    async def test_create_task_trees_from_arrays(self, sync_db_session):
+        """Test that several trees are validated first and inserted with one INSERT"""
+        from sqlalchemy import event
+        from aipartnerupflow.core.storage.sqlalchemy.models import TASK_TABLE_NAME
+        from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
+
+        creator = TaskCreator(sync_db_session)
+        task_arrays = [
+            [
+                {"id": f"tree_{index}", "name": "Root", "user_id": "user_1"},
+                {"id": f"tree_{index}_child", "name": "Child", "parent_id": f"tree_{index}",
+                 "dependencies": [f"tree_{index}_sibling"]},
+                {"id": f"tree_{index}_sibling", "name": "Sibling", "parent_id": f"tree_{index}"},
+            ]
+            for index in range(3)
+        ]
+        invalid = task_arrays + [[{"name": "A", "parent_id": "missing"}]]
+        with pytest.raises(ValueError, match="Tree 3: "):
+            await creator.create_task_trees_from_arrays(invalid)
+        assert await TaskRepository(sync_db_session).get_task_by_id("tree_0") is None
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = sync_db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            trees = await creator.create_task_trees_from_arrays(task_arrays)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert [tree.task.id for tree in trees] == ["tree_0", "tree_1", "tree_2"]
+        assert len([s for s in statements if s.startswith(f"INSERT INTO {TASK_TABLE_NAME} ")]) == 1
+
+        repo = TaskRepository(sync_db_session)
+        child = await repo.get_task_by_id("tree_2_child")
+        assert child.root_id == "tree_2"
+        assert child.dependencies == [{"id": "tree_2_sibling", "required": True, "type": "result"}]
+        assert (await repo.get_task_by_id("tree_2")).has_children is True
 
 class TestTaskCreatorCopy:
     """Test task copy functionality with dependencies"""
@@ -1963,6 +2041,63 @@ class TestTaskCreatorCopyWithSave:
         assert original_root is not None
         assert original_root.name == "Root Task"
     
+    @pytest.mark.asyncio
+    async def test_create_task_copy_full_inserts_tree_in_one_statement(self, sync_db_session):
+        """
+        Test that a full copy is inserted with one batched INSERT and its dependencies
+        are remapped to the copied tasks
+        
+        root (unrelated, stays completed)
+        ├── step-0 (failed)
+        ├── step-1 (depends on step-0)
+        └── ... step-19 (each depends on the previous step)
+        """
+        from sqlalchemy import event
+        from aipartnerupflow.core.storage.sqlalchemy.models import TASK_TABLE_NAME
+        from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
+        
+        task_repository = TaskRepository(sync_db_session)
+        creator = TaskCreator(sync_db_session)
+        root_task = await self.create_task(sync_db_session, task_repository, "bulk-root", "Root Task")
+        steps = []
+        for index in range(20):
+            steps.append(await self.create_task(
+                sync_db_session, task_repository,
+                f"bulk-step-{index}", f"Step {index}",
+                parent_id=root_task.id,
+                dependencies=[{"id": steps[-1].id, "required": True}] if steps else None,
+                status="failed" if index == 0 else "completed",
+            ))
+        
+        statements = []
+        engine = sync_db_session.get_bind()
+
+        def listener(conn, cursor, statement, params, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            new_tree = await creator.create_task_copy(steps[10], copy_mode="full")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        
+        assert len([s for s in statements if s.startswith(f"INSERT INTO {TASK_TABLE_NAME} ")]) == 1
+        copies = {task.original_task_id: task for task in creator.tree_to_flat_list(new_tree)}
+        assert len(copies) == 21
+        for index in range(1, 20):
+            copied = await task_repository.get_task_by_id(copies[steps[index].id].id)
+            assert copied.parent_id == new_tree.task.id
+            assert copied.root_id == new_tree.task.id
+            assert copied.dependencies[0]["id"] == copies[steps[index - 1].id].id
+            assert copied.status == "pending"
+        assert new_tree.task.status == "completed"
+        assert [task.id for task in await task_repository.find_dependent_tasks(copies[steps[10].id].id)] == [
+            copies[steps[11].id].id
+        ]
+        sync_db_session.expire_all()
+        for step in steps:
+            assert (await task_repository.get_task_by_id(step.id)).has_copy
+    
     @pytest.mark.asyncio
     async def test_tree_to_task_array_format(self, sync_db_session):
         """Test that _tree_to_task_array returns correct format compatible with tasks.create"""
@@ -496,3 +496,82 @@ class TestTaskManager:
             # Should have executed child tasks
             assert mock_execute.call_count >= 1
 
+    
+    @pytest.mark.asyncio
+    async def test_distribute_task_tree_with_write_behind(self, sync_db_session):
+        """Write-behind buffering reduces commits and still persists final statuses"""
+        from aipartnerupflow.core.config import set_write_behind, clear_config
+        
+        async def run_tree(write_behind):
+            set_write_behind(write_behind, flush_interval=3600)
+            try:
+                task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+            finally:
+                clear_config()
+            repo = task_manager.task_repository
+            root = await repo.create_task(
+                name="Root", user_id="test-user",
+                schemas={"method": "system_info_executor"}, inputs={"resource": "cpu"}
+            )
+            root_node = TaskTreeNode(task=root)
+            for index in range(3):
+                child = await repo.create_task(
+                    name=f"Child {index}", user_id="test-user", parent_id=root.id,
+                    schemas={"method": "system_info_executor"}, inputs={"resource": "cpu"}
+                )
+                root_node.add_child(TaskTreeNode(task=child))
+            
+            with patch.object(sync_db_session, "commit", wraps=sync_db_session.commit) as commit_spy:
+                await task_manager.distribute_task_tree(root_node, use_callback=False)
+            
+            for node in [root_node] + root_node.children:
+                assert (await repo.get_task_by_id(node.task.id)).status == "completed"
+            return commit_spy.call_count
+        
+        commits_without_buffer = await run_tree(False)
+        commits_with_buffer = await run_tree(True)
+        assert commits_with_buffer < commits_without_buffer
+
+
+    @pytest.mark.asyncio
+    async def test_execute_single_task_skips_unchanged_reloads(self, sync_db_session):
+        """Tasks are reloaded only when another writer changed their version"""
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        task = await repo.create_task(
+            name="Task", user_id="test-user",
+            schemas={"method": "system_info_executor"}, inputs={"resource": "cpu"}
+        )
+        
+        with patch.object(repo, "get_task_by_id", wraps=repo.get_task_by_id) as get_spy:
+            await task_manager.distribute_task_tree(TaskTreeNode(task=task), use_callback=False)
+        
+        assert (await repo.get_task_by_id(task.id)).status == "completed"
+        # Initial load, the two status updates and the lookup in execute_after_task
+        assert get_spy.call_count <= 4
+    
+    @pytest.mark.asyncio
+    async def test_execute_single_task_detects_external_cancel(self, sync_db_session):
+        """A cancellation written by another session during execution is still detected"""
+        from sqlalchemy import text
+        from aipartnerupflow.core.storage.sqlalchemy.models import TASK_TABLE_NAME
+        
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        task = await repo.create_task(
+            name="Task", user_id="test-user",
+            schemas={"method": "system_info_executor"}, inputs={"resource": "cpu"}
+        )
+        
+        async def cancel_during_execution(task, inputs):
+            sync_db_session.execute(
+                text(f"UPDATE {TASK_TABLE_NAME} SET status = 'cancelled', version = version + 1 WHERE id = :task_id"),
+                {"task_id": task.id}
+            )
+            sync_db_session.commit()
+            return {"result": "ignored"}
+        
+        with patch.object(task_manager, "_execute_task_with_schemas", side_effect=cancel_during_execution):
+            await task_manager.distribute_task_tree(TaskTreeNode(task=task), use_callback=False)
+        
+        assert (await repo.get_task_by_id(task.id)).status == "cancelled"
@@ -0,0 +1,152 @@
+"""
+Test precompiled task tree templates
+"""
+import pytest
+from sqlalchemy import event
+
+from aipartnerupflow.core.execution.templates import (
+    TaskTemplateRegistry,
+    clear_template_cache,
+    substitute_parameters,
+)
+from aipartnerupflow.core.storage.sqlalchemy.models import (
+    TASK_TABLE_NAME,
+    TASK_TEMPLATE_TABLE_NAME,
+    TaskDependencyModel,
+    TaskTemplateModel,
+)
+from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
+
+TASKS = [
+    {
+        "name": "Report {{city}}",
+        "user_id": "user_1",
+        "schemas": {"method": "system_info_executor"},
+        "inputs": {"prompt": "Summarize {{ city }} for {{audience}}"},
+    },
+    {
+        "name": "Fetch",
+        "user_id": "user_1",
+        "parent_id": "Report {{city}}",
+        "schemas": {"method": "rest_executor"},
+        "inputs": {"url": "{{url}}", "retries": "{{retries}}"},
+    },
+    {
+        "name": "Parse",
+        "user_id": "user_1",
+        "parent_id": "Report {{city}}",
+        "dependencies": [{"name": "Fetch", "required": True}],
+        "inputs": {"format": "json"},
+    },
+]
+
+
+@pytest.fixture(autouse=True)
+def template_cache():
+    clear_template_cache()
+    yield
+    clear_template_cache()
+
+
+class TestSubstituteParameters:
+    """Test placeholder substitution"""
+
+    def test_substitution(self):
+        values = {"city": "Paris", "retries": 3}
+        assert substitute_parameters("{{retries}}", values) == 3
+        assert substitute_parameters("{{ city }} x{{retries}}", values) == "Paris x3"
+        assert substitute_parameters({"a": ["{{city}}", "{{other}}"]}, values) == {"a": ["Paris", "{{other}}"]}
+
+
+class TestTaskTemplateRegistry:
+    """Test template creation and instantiation"""
+
+    @pytest.mark.asyncio
+    async def test_instantiate_substitutes_parameters_and_links_tree(self, sync_db_session):
+        registry = TaskTemplateRegistry(sync_db_session)
+        template = await registry.create_template(
+            TASKS, name="report", parameters=["city", "url", "retries"], user_id="user_1"
+        )
+        assert template.parameters == ["city", "url", "retries"]
+        assert sync_db_session.get(TaskTemplateModel, template.id).task_count == 3
+
+        tree = await registry.instantiate(
+            template.id, {"city": "Paris", "url": "https://example.com", "retries": 3}
+        )
+        root = tree.task
+        assert root.name == "Report Paris"
+        # Undeclared placeholders are left as they are
+        assert root.inputs == {"prompt": "Summarize Paris for {{audience}}"}
+        assert root.has_children is True
+        fetch, parse = (child.task for child in tree.children)
+        assert fetch.inputs == {"url": "https://example.com", "retries": 3}
+        assert parse.dependencies == [{"id": fetch.id, "required": True, "type": "result"}]
+
+        repo = TaskRepository(sync_db_session)
+        for task in (root, fetch, parse):
+            stored = await repo.get_task_by_id(task.id)
+            assert stored.status == "pending"
+            assert stored.user_id == "user_1"
+            assert stored.root_id == root.id
+        assert (await repo.get_task_by_id(fetch.id)).parent_id == root.id
+        edge = sync_db_session.get(TaskDependencyModel, (parse.id, fetch.id))
+        assert edge is not None and edge.required is True
+
+        # Every instance gets new ids; the stored template is unchanged
+        second = await registry.instantiate(
+            template.id, {"city": "Rome", "url": "https://example.org", "retries": 1}, user_id="user_2"
+        )
+        assert second.task.id != root.id
+        assert second.task.name == "Report Rome"
+        assert second.task.user_id == "user_2"
+        assert (await registry.get_template(template.id)).nodes[1]["inputs"]["url"] == "{{url}}"
+
+    @pytest.mark.asyncio
+    async def test_instantiate_is_one_insert_without_lookups(self, sync_db_session):
+        registry = TaskTemplateRegistry(sync_db_session)
+        template = await registry.create_template(TASKS, parameters=["city", "url", "retries"])
+        clear_template_cache()
+        params = {"city": "Paris", "url": "https://example.com", "retries": 3}
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = sync_db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            await registry.instantiate(template.id, params)
+            await registry.instantiate(template.id, params)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        task_inserts = [s for s in statements if s.startswith(f"INSERT INTO {TASK_TABLE_NAME} ")]
+        task_selects = [s for s in statements if s.startswith("SELECT") and f"FROM {TASK_TABLE_NAME}" in s]
+        template_selects = [s for s in statements if f"FROM {TASK_TEMPLATE_TABLE_NAME}" in s]
+        assert len(task_inserts) == 2
+        assert task_selects == []
+        # Loaded once, then served from the process cache
+        assert len(template_selects) == 1
+
+    @pytest.mark.asyncio
+    async def test_create_validates_once(self, sync_db_session):
+        registry = TaskTemplateRegistry(sync_db_session)
+        cyclic = [
+            {"name": "A", "dependencies": [{"name": "B"}]},
+            {"name": "B", "parent_id": "A", "dependencies": [{"name": "C"}]},
+            {"name": "C", "parent_id": "A", "dependencies": [{"name": "B"}]},
+        ]
+        with pytest.raises(ValueError, match="Circular dependency"):
+            await registry.create_template(cyclic)
+        with pytest.raises(ValueError, match="Invalid template parameter name"):
+            await registry.create_template(TASKS, parameters=["not-valid"])
+        assert sync_db_session.query(TaskTemplateModel).count() == 0
+
+        template = await registry.create_template(TASKS, template_id="report", parameters=["url"])
+        with pytest.raises(ValueError, match="already exists"):
+            await registry.create_template(TASKS, template_id="report")
+        with pytest.raises(ValueError, match="Missing template parameters: url"):
+            await registry.instantiate(template.id, {})
+        with pytest.raises(ValueError, match="not found"):
+            await registry.instantiate("missing", {})
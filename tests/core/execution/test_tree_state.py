@@ -0,0 +1,101 @@
+"""
+Test TaskTreeState in-memory index and its use by TaskManager
+"""
+import pytest
+from unittest.mock import patch
+
+from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.execution.tree_state import TaskTreeState
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
+from aipartnerupflow.core.types import TaskTreeNode
+
+
+def _build_tree():
+    root = TaskModel(id="root", name="Root", status="pending")
+    child_a = TaskModel(id="a", parent_id="root", name="A", status="completed", result={"x": 1})
+    child_b = TaskModel(
+        id="b",
+        parent_id="root",
+        name="B",
+        status="pending",
+        dependencies=[{"id": "a", "required": True}, "c"],
+    )
+    child_c = TaskModel(id="c", parent_id="root", name="C", status="pending")
+    root_node = TaskTreeNode(task=root)
+    for child in (child_a, child_b, child_c):
+        root_node.add_child(TaskTreeNode(task=child))
+    return root_node
+
+
+class TestTaskTreeState:
+    """Test TaskTreeState index maintenance"""
+
+    def test_from_task_tree(self):
+        """Index contains all tasks, parents and reverse dependencies"""
+        state = TaskTreeState.from_task_tree(_build_tree())
+
+        assert state.has_tasks(["root", "a", "b", "c"])
+        assert not state.has_task("missing")
+        assert state.get_parent_id("b") == "root"
+        assert state.get_parent_id("root") is None
+        assert state.get_dependents("a") == {"b"}
+        assert state.get_dependents("c") == {"b"}
+        assert set(state.get_completed_tasks_by_id().keys()) == {"a"}
+
+    def test_update_tracks_completed_tasks(self):
+        """Status transitions move tasks in and out of the completed view"""
+        state = TaskTreeState.from_task_tree(_build_tree())
+
+        state.update("c", "in_progress")
+        assert state.get_status("c") == "in_progress"
+        assert "c" not in state.get_completed_tasks_by_id()
+
+        state.update("c", "completed", {"y": 2})
+        assert state.get_completed_tasks_by_id()["c"].result == {"y": 2}
+
+        # Re-execution: result is kept until overwritten, but task leaves the completed view
+        state.update("a", "in_progress")
+        assert "a" not in state.get_completed_tasks_by_id()
+        state.update("a", "completed")
+        assert state.get_completed_tasks_by_id()["a"].result == {"x": 1}
+
+        # Unknown ids are ignored
+        state.update("missing", "completed", {"z": 3})
+        assert not state.has_task("missing")
+
+
+class TestTaskManagerTreeState:
+    """Test TaskManager reading dependency state from the index"""
+
+    @pytest.mark.asyncio
+    async def test_dependencies_checked_without_tree_reload(self, sync_db_session):
+        """Dependent tasks are triggered from the index without reloading the tree"""
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+
+        root = await repo.create_task(
+            name="Root", user_id="test-user", schemas={"method": "system_info_executor"},
+            inputs={"resource": "cpu"}
+        )
+        first = await repo.create_task(
+            name="First", user_id="test-user", parent_id=root.id,
+            schemas={"method": "system_info_executor"}, inputs={"resource": "cpu"}
+        )
+        second = await repo.create_task(
+            name="Second", user_id="test-user", parent_id=root.id,
+            schemas={"method": "system_info_executor"}, inputs={"resource": "cpu"},
+            dependencies=[{"id": first.id, "required": True}]
+        )
+
+        root_node = TaskTreeNode(task=root)
+        root_node.add_child(TaskTreeNode(task=first))
+        root_node.add_child(TaskTreeNode(task=second))
+
+        with patch.object(repo, "get_all_tasks_in_tree", wraps=repo.get_all_tasks_in_tree) as tree_spy:
+            await task_manager.distribute_task_tree(root_node, use_callback=False)
+
+        assert tree_spy.call_count == 0
+        assert (await repo.get_task_by_id(first.id)).status == "completed"
+        assert (await repo.get_task_by_id(second.id)).status == "completed"
+        assert task_manager._tree_state.get_status(second.id) == "completed"
+        assert task_manager._tree_state.get_status(root.id) == "completed"
@@ -0,0 +1,215 @@
+"""
+Test the shared database work queue (TaskWorkQueue, QueueWorker)
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from aipartnerupflow.core.config import clear_config, get_work_queue, set_work_queue
+from aipartnerupflow.core.execution.work_queue import QueueWorker, TaskWorkQueue
+from aipartnerupflow.core.storage.sqlalchemy.models import TaskQueueModel
+from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
+
+
+def _session_factory(session):
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory
+
+
+async def _expire_lease(session, task_id):
+    table = TaskQueueModel.__table__
+    session.execute(
+        update(table)
+        .where(table.c.task_id == task_id)
+        .values(lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    session.commit()
+
+
+class TestTaskWorkQueue:
+    """Test queue table operations"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_and_claim_in_priority_order(self, sync_db_session):
+        """Executions are claimed once, smaller priority first"""
+        queue = TaskWorkQueue(sync_db_session, lease_seconds=30)
+        assert await queue.enqueue("low", "low", priority=3)
+        assert await queue.enqueue("urgent", "urgent", priority=0)
+        assert await queue.enqueue("normal", "normal")
+        assert not await queue.enqueue("normal", "normal")  # Already queued
+
+        claimed = await queue.claim("worker-a", limit=2)
+        assert [row["task_id"] for row in claimed] == ["urgent", "normal"]
+        assert all(row["worker_id"] == "worker-a" and row["attempts"] == 1 for row in claimed)
+
+        claimed = await queue.claim("worker-b", limit=5)
+        assert [row["task_id"] for row in claimed] == ["low"]
+        assert await queue.claim("worker-b", limit=5) == []
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_claimed_again(self, sync_db_session):
+        """Executions of a dead worker are taken over after the lease expires"""
+        queue = TaskWorkQueue(sync_db_session, lease_seconds=30)
+        await queue.enqueue("task-1", "task-1")
+        await queue.claim("worker-a")
+        assert await queue.is_running("task-1")
+        assert await queue.claim("worker-b") == []
+
+        await _expire_lease(sync_db_session, "task-1")
+        assert not await queue.is_running("task-1")
+        claimed = await queue.claim("worker-b")
+        assert claimed[0]["worker_id"] == "worker-b"
+        assert claimed[0]["attempts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_shared_running_state(self, sync_db_session):
+        """Running roots of all workers are visible; completed executions disappear"""
+        queue = TaskWorkQueue(sync_db_session, lease_seconds=30)
+        await queue.enqueue("child-1", "root-1")
+        assert await queue.is_active("root-1")
+        assert not await queue.is_running("root-1")
+
+        await queue.claim("worker-a")
+        await queue.register_running("root-2", "root-2", "worker-b")
+        assert await queue.get_running_root_ids() == ["root-1", "root-2"]
+
+        await queue.complete("child-1", "worker-a")
+        assert await queue.get_running_root_ids() == ["root-2"]
+        assert not await queue.is_active("root-1")
+
+    @pytest.mark.asyncio
+    async def test_cancel_request_reaches_owning_worker(self, sync_db_session):
+        """A cancellation for another worker's execution is delivered on its heartbeat"""
+        queue = TaskWorkQueue(sync_db_session, lease_seconds=30)
+        await queue.enqueue("root-1", "root-1")
+        await queue.claim("worker-a")
+
+        # The owning worker handles its own executions directly
+        assert await queue.request_cancel("child-1", "root-1", local_worker_id="worker-a") is None
+
+        result = await queue.request_cancel("child-1", "root-1", "Stop", local_worker_id="worker-b")
+        assert result == {"status": "requested", "worker_ids": ["worker-a"]}
+
+        assert await queue.heartbeat("worker-b", ["root-1"]) == {}
+        assert await queue.heartbeat("worker-a", ["root-1"]) == {"root-1": {"child-1": "Stop"}}
+        # Requests are delivered once
+        assert await queue.heartbeat("worker-a", ["root-1"]) == {}
+
+    @pytest.mark.asyncio
+    async def test_cancel_removes_queued_executions(self, sync_db_session):
+        """Cancelling the root removes queued executions of its tree"""
+        queue = TaskWorkQueue(sync_db_session, lease_seconds=30)
+        await queue.enqueue("child-1", "root-1")
+        await queue.enqueue("child-2", "root-1")
+
+        result = await queue.request_cancel("child-1", "root-1", local_worker_id="worker-a")
+        assert result == {"status": "dequeued", "task_ids": ["child-1"]}
+        result = await queue.request_cancel("root-1", "root-1", local_worker_id="worker-a")
+        assert result == {"status": "dequeued", "task_ids": ["child-2"]}
+        assert await queue.claim("worker-a") == []
+
+    @pytest.mark.asyncio
+    async def test_release_puts_executions_back(self, sync_db_session):
+        """Released executions can be claimed by another worker"""
+        queue = TaskWorkQueue(sync_db_session, lease_seconds=30)
+        await queue.enqueue("task-1", "task-1")
+        await queue.claim("worker-a")
+        await queue.release("worker-a", ["task-1"])
+        assert [row["task_id"] for row in await queue.claim("worker-b")] == ["task-1"]
+
+
+class TestQueueWorker:
+    """Test QueueWorker claiming and executing tasks"""
+
+    @pytest.mark.asyncio
+    async def test_worker_executes_queued_task(self, sync_db_session):
+        """A worker claims a queued task, executes it and removes it from the queue"""
+        repo = TaskRepository(sync_db_session)
+        task = await repo.create_task(
+            name="queued", schemas={"method": "system_info_executor"}, inputs={"resource": "cpu"}
+        )
+        queue = TaskWorkQueue(sync_db_session, lease_seconds=30)
+        await queue.enqueue(task.id, task.id)
+
+        worker = QueueWorker(
+            worker_id="worker-a",
+            poll_interval=0.05,
+            lease_seconds=30,
+            max_concurrent=1,
+            session_factory=_session_factory(sync_db_session),
+        )
+        claimed = await worker.poll()
+        assert [row["task_id"] for row in claimed] == [task.id]
+        await asyncio.gather(*worker._active.values())
+
+        assert (await repo.get_task_by_id(task.id)).status == "completed"
+        assert not await queue.is_active(task.id)
+        assert worker.get_active_task_ids() == []
+
+    @pytest.mark.asyncio
+    async def test_worker_respects_max_concurrent(self, sync_db_session):
+        """A worker only claims as many executions as it has free slots"""
+        queue = TaskWorkQueue(sync_db_session, lease_seconds=30)
+        for index in range(3):
+            await queue.enqueue(f"task-{index}", f"task-{index}")
+        worker = QueueWorker(
+            worker_id="worker-a",
+            lease_seconds=30,
+            max_concurrent=2,
+            session_factory=_session_factory(sync_db_session),
+        )
+        worker._active = {"task-x": asyncio.get_running_loop().create_future()}
+        claimed = await worker.poll()
+        assert len(claimed) == 1
+        for task in worker._active.values():
+            task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_run_local_shares_running_state(self, sync_db_session):
+        """Executions run in-process are visible to other workers while they run"""
+        queue = TaskWorkQueue(sync_db_session, lease_seconds=30)
+        worker = QueueWorker(
+            worker_id="worker-a", lease_seconds=30, session_factory=_session_factory(sync_db_session)
+        )
+        release = asyncio.Event()
+
+        async def execution():
+            await release.wait()
+            return "done"
+
+        run = asyncio.create_task(worker.run_local("task-1", "root-1", execution()))
+        await asyncio.sleep(0.01)
+        assert await queue.get_running_root_ids() == ["root-1"]
+        release.set()
+        assert await run == "done"
+        assert await queue.get_running_root_ids() == []
+
+
+class TestWorkQueueConfig:
+    """Test work queue configuration"""
+
+    def teardown_method(self):
+        clear_config()
+
+    def test_set_work_queue(self):
+        set_work_queue(True, poll_interval=0.5, lease_seconds=10, max_concurrent=8)
+        assert get_work_queue() == {
+            "enabled": True,
+            "poll_interval": 0.5,
+            "lease_seconds": 10.0,
+            "max_concurrent": 8,
+        }
+
+    def test_invalid_values(self):
+        with pytest.raises(ValueError):
+            set_work_queue(True, poll_interval=0)
+        with pytest.raises(ValueError):
+            set_work_queue(True, poll_interval=5, lease_seconds=5)
+        with pytest.raises(ValueError):
+            set_work_queue(True, max_concurrent=0)
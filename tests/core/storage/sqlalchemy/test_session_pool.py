@@ -37,6 +37,52 @@ class TestSessionPoolManager:
         """Clean up after each test"""
         reset_session_pool_manager()
     
+    def test_session_pool_manager_adds_missing_columns(self, tmp_path):
+        """Tables created by an older version get newly added columns"""
+        from sqlalchemy import create_engine, inspect
+        from aipartnerupflow.core.storage.sqlalchemy.models import TASK_TABLE_NAME
+        
+        db_path = tmp_path / "test.duckdb"
+        engine = create_engine(f"duckdb:///{db_path}")
+        with engine.begin() as connection:
+            connection.execute(text(f"CREATE TABLE {TASK_TABLE_NAME} (id VARCHAR PRIMARY KEY, name VARCHAR)"))
+            connection.execute(text(f"INSERT INTO {TASK_TABLE_NAME} (id, name) VALUES ('old-task', 'Old')"))
+        engine.dispose()
+        
+        manager = SessionPoolManager()
+        manager.initialize(path=str(db_path))
+        columns = {column["name"] for column in inspect(manager._engine).get_columns(TASK_TABLE_NAME)}
+        assert "version" in columns
+        with manager._engine.connect() as connection:
+            version = connection.execute(
+                text(f"SELECT version FROM {TASK_TABLE_NAME} WHERE id = 'old-task'")
+            ).scalar()
+        assert version == 1
+    
+    def test_session_pool_manager_indexes_existing_dependencies(self, tmp_path):
+        """A dependency edge table added to an existing database is filled from the tasks"""
+        from sqlalchemy import create_engine, select
+        from aipartnerupflow.core.storage.sqlalchemy.models import TASK_TABLE_NAME, TaskDependencyModel
+        
+        db_path = tmp_path / "test.duckdb"
+        engine = create_engine(f"duckdb:///{db_path}")
+        with engine.begin() as connection:
+            connection.execute(text(f"CREATE TABLE {TASK_TABLE_NAME} (id VARCHAR PRIMARY KEY, name VARCHAR, dependencies JSON)"))
+            connection.execute(text(
+                f"INSERT INTO {TASK_TABLE_NAME} (id, name, dependencies) VALUES "
+                f"('a', 'A', NULL), ('b', 'B', '[{{\"id\": \"a\", \"required\": false}}]')"
+            ))
+        engine.dispose()
+        
+        manager = SessionPoolManager()
+        manager.initialize(path=str(db_path))
+        edge_table = TaskDependencyModel.__table__
+        with manager._engine.connect() as connection:
+            edges = connection.execute(
+                select(edge_table.c.task_id, edge_table.c.depends_on_id, edge_table.c.required)
+            ).all()
+        assert edges == [("b", "a", False)]
+    
     def test_session_pool_manager_initialization(self):
         """Test SessionPoolManager can be initialized"""
         manager = SessionPoolManager()
@@ -6,6 +6,7 @@ layer that provides actual functionality, rather than just the model layer.
 """
 import pytest
 from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
 from sqlalchemy import Column, String
 from aipartnerupflow.core.storage.sqlalchemy.models import TaskModel
 from aipartnerupflow.core.storage.sqlalchemy.task_repository import TaskRepository
@@ -253,6 +254,55 @@ class TestTaskRepository:
         
         assert len(all_children) == 0
     
+    @pytest.mark.asyncio
+    async def test_build_task_tree_deep(self, sync_db_session):
+        """Deep trees are loaded with one query and keep priority order among siblings"""
+        repo = TaskRepository(sync_db_session)
+        root = await repo.create_task(name="Root Task", user_id="test-user")
+        assert root.root_id == root.id
+        
+        chain = [root]
+        for depth in range(20):
+            chain.append(await repo.create_task(
+                name=f"Level {depth}", user_id="test-user", parent_id=chain[-1].id, priority=2
+            ))
+        urgent = await repo.create_task(name="Urgent", user_id="test-user", parent_id=root.id, priority=0)
+        assert chain[-1].root_id == root.id
+        
+        with patch.object(sync_db_session, "execute", wraps=sync_db_session.execute) as execute_spy:
+            tree = await repo.build_task_tree(root)
+        assert execute_spy.call_count == 1
+        
+        assert [child.task.id for child in tree.children] == [urgent.id, chain[1].id]
+        node = tree.children[1]
+        for task in chain[2:]:
+            assert [child.task.id for child in node.children] == [task.id]
+            node = node.children[0]
+        
+        all_tasks = await repo.get_all_tasks_in_tree(root)
+        assert [task.id for task in all_tasks] == [root.id, urgent.id] + [task.id for task in chain[1:]]
+        assert (await repo.get_root_task(chain[-1])).id == root.id
+        
+        # Subtrees are loaded through parent_id links
+        subtree_children = await repo.get_all_children_recursive(chain[10].id)
+        assert [task.id for task in subtree_children] == [task.id for task in chain[11:]]
+    
+    @pytest.mark.asyncio
+    async def test_build_task_tree_with_reassigned_parent(self, sync_db_session):
+        """Tasks attached by setting parent_id directly are still part of the tree"""
+        repo = TaskRepository(sync_db_session)
+        root = await repo.create_task(name="Root Task", user_id="test-user")
+        moved = await repo.create_task(name="Moved", user_id="test-user")
+        moved_child = await repo.create_task(name="Moved Child", user_id="test-user", parent_id=moved.id)
+        
+        moved.parent_id = root.id
+        sync_db_session.commit()
+        
+        tree = await repo.build_task_tree(root)
+        assert [child.task.id for child in tree.children] == [moved.id]
+        assert [child.task.id for child in tree.children[0].children] == [moved_child.id]
+        assert (await repo.get_root_task(moved_child)).id == root.id
+    
     @pytest.mark.asyncio
     async def test_find_dependent_tasks(self, sync_db_session):
         """Test finding tasks that depend on a given task"""
@@ -329,6 +379,41 @@ class TestTaskRepository:
         
         assert len(dependents) == 0
     
+    @pytest.mark.asyncio
+    async def test_dependency_edges_follow_task_writes(self, sync_db_session):
+        """Dependency edge table tracks create, update, direct assignment and delete"""
+        from sqlalchemy import select
+        from aipartnerupflow.core.storage.sqlalchemy.models import TaskDependencyModel
+        
+        def edges():
+            table = TaskDependencyModel.__table__
+            return set(sync_db_session.execute(select(table.c.task_id, table.c.depends_on_id, table.c.required)).all())
+        
+        repo = TaskRepository(sync_db_session)
+        a = await repo.create_task(name="A", user_id="test-user")
+        b = await repo.create_task(name="B", user_id="test-user")
+        c = await repo.create_task(
+            name="C", user_id="test-user",
+            dependencies=[{"id": a.id, "required": True}, {"id": b.id, "required": False}]
+        )
+        assert edges() == {(c.id, a.id, True), (c.id, b.id, False)}
+        
+        await repo.update_task_dependencies(c.id, [{"id": b.id}])
+        assert edges() == {(c.id, b.id, True)}
+        
+        b.dependencies = [a.id]
+        sync_db_session.commit()
+        assert edges() == {(c.id, b.id, True), (b.id, a.id, True)}
+        assert [task.id for task in await repo.find_dependent_tasks(a.id)] == [b.id]
+        
+        await repo.delete_task(c.id)
+        assert edges() == {(b.id, a.id, True)}
+        
+        sync_db_session.execute(TaskDependencyModel.__table__.delete())
+        sync_db_session.commit()
+        assert await repo.rebuild_dependency_index() == 1
+        assert edges() == {(b.id, a.id, True)}
+    
     @pytest.mark.asyncio
     async def test_delete_task(self, sync_db_session):
         """Test physically deleting a task"""
@@ -354,6 +439,43 @@ class TestTaskRepository:
         deleted_task = await repo.get_task_by_id(task_id)
         assert deleted_task is None
     
+    @pytest.mark.asyncio
+    async def test_version_bumped_on_update(self, sync_db_session):
+        """Every repository update increments the stored version"""
+        repo = TaskRepository(sync_db_session)
+        task = await repo.create_task(name="Task", user_id="test-user")
+        assert await repo.get_task_version(task.id) == 1
+        
+        await repo.update_task_status(task.id, status="in_progress")
+        assert await repo.get_task_version(task.id) == 2
+        await repo.update_task_inputs(task.id, {"key": "value"})
+        assert await repo.get_task_version(task.id) == 3
+        assert (await repo.get_task_by_id(task.id)).version == 3
+        assert await repo.get_task_version("missing-task") is None
+    
+    @pytest.mark.asyncio
+    async def test_stale_writer_commits_a_new_version(self, sync_db_session):
+        """A session holding an outdated instance never commits a version already used"""
+        from sqlalchemy.orm import Session
+        
+        repo = TaskRepository(sync_db_session)
+        task = await repo.create_task(name="Task", user_id="test-user")
+        other_session = Session(sync_db_session.get_bind(), expire_on_commit=False)
+        try:
+            other_repo = TaskRepository(other_session)
+            stale = await other_repo.get_task_by_id(task.id)
+            other_session.commit()
+            
+            await repo.update_task_status(task.id, status="in_progress")
+            assert task.version == 2
+            # The second writer loaded the task before the first write was committed
+            with patch.object(other_repo, "get_task_by_id", AsyncMock(return_value=stale)):
+                assert await other_repo.update_task_status(task.id, status="cancelled")
+            assert stale.version == 3
+            assert await other_repo.get_task_version(task.id) == 3
+        finally:
+            other_session.close()
+    
     @pytest.mark.asyncio
     async def test_delete_task_not_found(self, sync_db_session):
         """Test deleting a non-existent task"""
@@ -362,3 +484,203 @@ class TestTaskRepository:
         result = await repo.delete_task("non-existent-id")
         assert result is False
 
+
+
+class TestTaskRepositoryWriteBehind:
+    """Test write-behind buffering of non-terminal status updates"""
+    
+    @staticmethod
+    def _stored_status(db, task_id):
+        from sqlalchemy import text
+        from aipartnerupflow.core.storage.sqlalchemy.models import TASK_TABLE_NAME
+        return db.execute(
+            text(f"SELECT status FROM {TASK_TABLE_NAME} WHERE id = :task_id"), {"task_id": task_id}
+        ).scalar()
+    
+    @pytest.mark.asyncio
+    async def test_non_terminal_updates_are_buffered(self, sync_db_session):
+        """In-progress updates are buffered, visible through the repository, and flushed in one batch"""
+        repo = TaskRepository(sync_db_session, write_behind=True)
+        repo._write_behind_flush_interval = 3600
+        tasks = [await repo.create_task(name=f"Task {i}", user_id="test-user") for i in range(3)]
+        
+        for task in tasks:
+            await repo.update_task_status(task.id, status="in_progress", progress=0.5)
+        
+        assert self._stored_status(sync_db_session, tasks[0].id) == "pending"
+        loaded = await repo.get_task_by_id(tasks[0].id)
+        assert loaded.status == "in_progress"
+        assert float(loaded.progress) == 0.5
+        
+        assert await repo.flush_pending_updates() == 3
+        for task in tasks:
+            assert self._stored_status(sync_db_session, task.id) == "in_progress"
+            # Loaded instances follow the version written by the flush
+            assert task.version == await repo.get_task_version(task.id) == 2
+    
+    @pytest.mark.asyncio
+    async def test_terminal_update_forces_flush(self, sync_db_session):
+        """A terminal status update writes buffered updates of other tasks in the same commit"""
+        repo = TaskRepository(sync_db_session, write_behind=True)
+        repo._write_behind_flush_interval = 3600
+        first = await repo.create_task(name="First", user_id="test-user")
+        second = await repo.create_task(name="Second", user_id="test-user")
+        
+        await repo.update_task_status(first.id, status="in_progress")
+        await repo.update_task_status(second.id, status="completed", result={"ok": True})
+        
+        assert repo._pending_updates == {}
+        assert self._stored_status(sync_db_session, first.id) == "in_progress"
+        assert self._stored_status(sync_db_session, second.id) == "completed"
+    
+    @pytest.mark.asyncio
+    async def test_buffered_update_does_not_override_cancel(self, sync_db_session):
+        """A cancellation written elsewhere wins over a buffered in_progress update"""
+        from sqlalchemy import text
+        from aipartnerupflow.core.storage.sqlalchemy.models import TASK_TABLE_NAME
+        
+        repo = TaskRepository(sync_db_session, write_behind=True)
+        repo._write_behind_flush_interval = 3600
+        task = await repo.create_task(name="Task", user_id="test-user")
+        
+        await repo.update_task_status(task.id, status="in_progress")
+        sync_db_session.execute(
+            text(f"UPDATE {TASK_TABLE_NAME} SET status = 'cancelled' WHERE id = :task_id"), {"task_id": task.id}
+        )
+        sync_db_session.commit()
+        
+        assert (await repo.get_task_by_id(task.id)).status == "cancelled"
+        await repo.update_task_status(task.id, status="in_progress")
+        await repo.flush_pending_updates()
+        assert self._stored_status(sync_db_session, task.id) == "cancelled"
+    
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_updates(self, sync_db_session):
+        """Updates of a failed flush stay buffered and are written by the next one"""
+        repo = TaskRepository(sync_db_session, write_behind=True)
+        repo._write_behind_flush_interval = 3600
+        task = await repo.create_task(name="Task", user_id="test-user")
+        
+        await repo.update_task_status(task.id, status="in_progress", progress=0.5)
+        with patch.object(sync_db_session, "execute", side_effect=RuntimeError("database unavailable")):
+            assert await repo.flush_pending_updates() == 0
+        assert repo._pending_updates[task.id] == {"status": "in_progress", "progress": 0.5}
+        
+        assert await repo.flush_pending_updates() == 1
+        assert self._stored_status(sync_db_session, task.id) == "in_progress"
+    
+    @pytest.mark.asyncio
+    async def test_buffer_flushes_when_full(self, sync_db_session):
+        """Reaching max_pending buffered tasks triggers a flush"""
+        repo = TaskRepository(sync_db_session, write_behind=True)
+        repo._write_behind_flush_interval = 3600
+        repo._write_behind_max_pending = 2
+        first = await repo.create_task(name="First", user_id="test-user")
+        second = await repo.create_task(name="Second", user_id="test-user")
+        
+        await repo.update_task_status(first.id, status="in_progress")
+        assert self._stored_status(sync_db_session, first.id) == "pending"
+        await repo.update_task_status(second.id, status="in_progress")
+        assert self._stored_status(sync_db_session, first.id) == "in_progress"
+        assert repo._pending_updates == {}
+
+
+class TestTaskRepositorySaveTaskTree:
+    """Test saving whole task trees with save_task_tree()"""
+    
+    @staticmethod
+    def _build_tree(width=3, depth=2):
+        from aipartnerupflow.core.types import TaskTreeNode
+        
+        root = TaskTreeNode(task=TaskModel(name="root", user_id="test-user"))
+        level = [root]
+        for _ in range(depth):
+            next_level = []
+            for parent in level:
+                for index in range(width):
+                    child = TaskTreeNode(task=TaskModel(name=f"{parent.task.name}.{index}", user_id="test-user"))
+                    parent.add_child(child)
+                    next_level.append(child)
+            level = next_level
+        return root, level
+    
+    @pytest.mark.asyncio
+    async def test_new_tree_is_inserted_in_one_statement(self, sync_db_session):
+        """
+        root
+        ├── root.0 ── root.0.0, root.0.1, root.0.2
+        ├── root.1 ── ...
+        └── root.2 ── ... (leaves depend on their first sibling)
+        """
+        from sqlalchemy import event
+        from aipartnerupflow.core.storage.sqlalchemy.models import TASK_TABLE_NAME
+        
+        repo = TaskRepository(sync_db_session)
+        tree, leaves = self._build_tree()
+        for parent in tree.children:
+            parent.children[0].task.id = f"{parent.task.name}-first"
+            for leaf in parent.children[1:]:
+                leaf.task.dependencies = [{"id": parent.children[0].task.id, "required": True}]
+        
+        statements = []
+        engine = sync_db_session.get_bind()
+
+        def listener(conn, cursor, statement, params, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            counts = await repo.save_task_tree(tree)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        
+        assert counts == {"inserted": 13, "updated": 0}
+        task_inserts = [s for s in statements if s.startswith(f"INSERT INTO {TASK_TABLE_NAME} ")]
+        assert len(task_inserts) == 1
+        
+        stored = await repo.get_task_by_id(leaves[-1].task.id)
+        assert stored is leaves[-1].task
+        assert stored.parent_id == tree.children[-1].task.id
+        assert stored.root_id == tree.task.id
+        assert stored.status == "pending"
+        assert stored.version == 1
+        assert stored.created_at is not None
+        rebuilt = await repo.build_task_tree(tree.task)
+        assert len(rebuilt.children) == 3
+        assert all(len(child.children) == 3 for child in rebuilt.children)
+        
+        await repo.update_task_status(leaves[0].task.id, status="completed")
+        assert stored.status == "pending"
+    
+    def test_only_now_server_defaults_are_filled(self, sync_db_session):
+        """Batched inserts fill now() server defaults and leave others to the database"""
+        from sqlalchemy import DateTime, func, text
+        from aipartnerupflow.core.storage.sqlalchemy.task_repository import _SERVER_DEFAULT
+        
+        repo = TaskRepository(sync_db_session)
+        assert isinstance(repo._get_column_default(Column(DateTime, server_default=func.now())), datetime)
+        assert repo._get_column_default(Column(String, server_default=text("'open'"))) is _SERVER_DEFAULT
+        assert repo._get_column_default(Column(String, default="draft")) == "draft"
+        assert repo._get_column_default(Column(String)) is None
+    
+    @pytest.mark.asyncio
+    async def test_existing_tasks_are_merged(self, sync_db_session):
+        """Tasks whose id already exists are updated instead of inserted"""
+        from aipartnerupflow.core.types import TaskTreeNode
+        
+        repo = TaskRepository(sync_db_session)
+        root = await repo.create_task(name="root", user_id="test-user", inputs={"a": 1})
+        sync_db_session.expunge_all()
+        
+        tree = TaskTreeNode(task=TaskModel(id=root.id, name="renamed", inputs={"b": 2}))
+        tree.add_child(TaskTreeNode(task=TaskModel(name="child", user_id="test-user", dependencies=[root.id])))
+        
+        counts = await repo.save_task_tree(tree)
+        
+        assert counts == {"inserted": 1, "updated": 1}
+        stored = await repo.get_task_by_id(root.id)
+        assert stored.name == "renamed"
+        assert stored.inputs == {"b": 2}
+        assert stored.user_id == "test-user"
+        assert stored.version == 2
+        assert [task.id for task in await repo.find_dependent_tasks(root.id)] == [tree.children[0].task.id]
@@ -0,0 +1,45 @@
+"""
+Test table creation and missing column additions of the session factory
+"""
+from sqlalchemy import JSON, Column, Integer, MetaData, String, Table, create_engine, text
+
+from aipartnerupflow.core.storage.factory import _add_column, _create_tables
+from aipartnerupflow.core.storage.sqlalchemy.models import TASK_TABLE_NAME
+
+
+class TestAddMissingColumns:
+    """Test columns added to tables created by an older version"""
+
+    def test_quoted_names_and_defaults(self, tmp_path):
+        """Reserved and mixed-case names are quoted; JSON defaults fill existing rows"""
+        engine = create_engine(f"duckdb:///{tmp_path / 'columns.duckdb'}")
+        table = Table(
+            "Order",
+            MetaData(),
+            Column("id", String, primary_key=True),
+            Column("select", Integer, default=1),
+            Column("Tags", JSON, default=[]),
+            Column("note", String, default="100% it's"),
+        )
+        with engine.connect() as connection:
+            connection.execute(text('CREATE TABLE "Order" (id VARCHAR PRIMARY KEY)'))
+            connection.execute(text("""INSERT INTO "Order" (id) VALUES ('a')"""))
+            for column in list(table.columns)[1:]:
+                _add_column(connection, table, column)
+            connection.commit()
+            assert connection.execute(table.select()).all() == [("a", 1, [], "100% it's")]
+        engine.dispose()
+
+    def test_create_tables_adds_task_version(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+        _create_tables(engine)
+        with engine.connect() as connection:
+            connection.execute(text(f"INSERT INTO {TASK_TABLE_NAME} (id, name) VALUES ('old', 'Old task')"))
+            connection.execute(text(f"ALTER TABLE {TASK_TABLE_NAME} DROP COLUMN version"))
+            connection.commit()
+
+        _create_tables(engine)
+        with engine.connect() as connection:
+            version = connection.execute(text(f"SELECT version FROM {TASK_TABLE_NAME} WHERE id = 'old'")).scalar()
+        assert version == 1
+        engine.dispose()
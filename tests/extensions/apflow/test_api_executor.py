@@ -8,6 +8,7 @@ import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 import httpx
 from aipartnerupflow.extensions.apflow.api_executor import ApFlowApiExecutor
+from aipartnerupflow.extensions.http.client_pool import reset_http_client_pool
 
 
 class TestApFlowApiExecutor:
@@ -28,7 +29,7 @@ class TestApFlowApiExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.post = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -56,7 +57,7 @@ class TestApFlowApiExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.post = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -85,7 +86,7 @@ class TestApFlowApiExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.post = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -126,7 +127,7 @@ class TestApFlowApiExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.post = AsyncMock(side_effect=httpx.TimeoutException("Timeout"))
             
             result = await executor.execute({
@@ -169,7 +170,7 @@ class TestApFlowApiExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.post = AsyncMock(side_effect=[mock_execute_response] + mock_poll_responses)
             
             result = await executor.execute({
@@ -177,6 +178,7 @@ class TestApFlowApiExecutor:
                 "method": "tasks.execute",
                 "params": {"task_id": "task-123"},
                 "wait_for_completion": True,
+                "wait_mode": "poll",
                 "poll_interval": 0.1
             })
             
@@ -211,7 +213,7 @@ class TestApFlowApiExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             
             # First call is execute, then all subsequent calls are polls
             call_count = [0]
@@ -243,6 +245,7 @@ class TestApFlowApiExecutor:
                     "method": "tasks.execute",
                     "params": {"task_id": "task-123"},
                     "wait_for_completion": True,
+                "wait_mode": "poll",
                     "poll_interval": 0.01,  # Very short interval
                     "timeout": 1.0
                 })
@@ -262,7 +265,7 @@ class TestApFlowApiExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.post = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -281,7 +284,7 @@ class TestApFlowApiExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.post = AsyncMock(side_effect=httpx.RequestError("Connection error"))
             
             result = await executor.execute({
@@ -316,6 +319,7 @@ class TestApFlowApiExecutor:
         methods = ["tasks.create", "tasks.get", "tasks.update", "tasks.delete", "tasks.list"]
         
         for method in methods:
+            reset_http_client_pool()
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {
@@ -326,7 +330,7 @@ class TestApFlowApiExecutor:
             
             with patch("httpx.AsyncClient") as mock_client:
                 mock_client_instance = AsyncMock()
-                mock_client.return_value.__aenter__.return_value = mock_client_instance
+                mock_client.return_value = mock_client_instance
                 mock_client_instance.post = AsyncMock(return_value=mock_response)
                 
                 result = await executor.execute({
@@ -355,7 +359,7 @@ class TestApFlowApiExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.post = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -369,6 +373,106 @@ class TestApFlowApiExecutor:
             call_kwargs = mock_client_instance.post.call_args[1]
             assert call_kwargs["headers"]["X-Custom-Header"] == "custom-value"
     
+    @staticmethod
+    def _remote_client(sse_events, task_status="completed", execute_json=None):
+        """Create an AsyncClient for a fake remote instance, recording JSON-RPC calls"""
+        import json
+
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            calls.append(body)
+            if body["method"] == "tasks.get":
+                return httpx.Response(200, json={
+                    "jsonrpc": "2.0",
+                    "result": {"id": "task-123", "status": task_status},
+                    "id": body["id"]
+                })
+            if execute_json is not None:
+                return httpx.Response(200, json=execute_json)
+            content = "".join(
+                f"id: {index}\ndata: {json.dumps(event)}\n\n" for index, event in enumerate(sse_events)
+            )
+            return httpx.Response(200, content=content, headers={"content-type": "text/event-stream"})
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+    @pytest.mark.asyncio
+    async def test_execute_wait_for_completion_streaming(self):
+        """Test waiting on the remote SSE stream instead of polling"""
+        executor = ApFlowApiExecutor()
+        client, calls = self._remote_client([
+            {"jsonrpc": "2.0", "id": "1", "result": {"task_id": "task-123", "status": "started"}},
+            {"type": "progress", "task_id": "task-123", "status": "in_progress", "progress": 0.5},
+            {"type": "final", "task_id": "task-123", "status": "completed", "final": True},
+            {"type": "stream_end", "task_id": "task-123"},
+        ])
+
+        with patch(
+            "aipartnerupflow.extensions.apflow.api_executor.get_http_client", return_value=client
+        ):
+            result = await executor.execute({
+                "base_url": "http://localhost:8000",
+                "method": "tasks.execute",
+                "params": {"task_id": "task-123"},
+                "wait_for_completion": True,
+                "poll_interval": 10.0
+            })
+
+        assert result["success"] is True
+        assert result["status"] == "completed"
+        assert result["wait_mode"] == "stream"
+        assert [call["method"] for call in calls] == ["tasks.execute", "tasks.get"]
+        assert calls[0]["params"]["use_streaming"] is True
+
+    @pytest.mark.asyncio
+    async def test_execute_wait_for_completion_stream_end_without_final(self):
+        """Test a stream that ends without final event (failed tree) reports the remote status"""
+        executor = ApFlowApiExecutor()
+        client, calls = self._remote_client([
+            {"jsonrpc": "2.0", "id": "1", "result": {"task_id": "task-123", "status": "started"}},
+            {"type": "stream_end", "task_id": "task-123"},
+        ], task_status="failed")
+
+        with patch(
+            "aipartnerupflow.extensions.apflow.api_executor.get_http_client", return_value=client
+        ):
+            result = await executor.execute({
+                "base_url": "http://localhost:8000",
+                "method": "tasks.execute",
+                "params": {"task_id": "task-123"},
+                "wait_for_completion": True
+            })
+
+        assert result["success"] is False
+        assert result["status"] == "failed"
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_execute_wait_for_completion_falls_back_to_polling(self):
+        """Test polling is used when the remote answers without an event stream"""
+        executor = ApFlowApiExecutor()
+        client, calls = self._remote_client([], execute_json={
+            "jsonrpc": "2.0",
+            "result": {"task_id": "task-123", "status": "started"},
+            "id": "1"
+        })
+
+        with patch(
+            "aipartnerupflow.extensions.apflow.api_executor.get_http_client", return_value=client
+        ):
+            result = await executor.execute({
+                "base_url": "http://localhost:8000",
+                "method": "tasks.execute",
+                "params": {"task_id": "task-123"},
+                "wait_for_completion": True
+            })
+
+        assert result["success"] is True
+        assert "wait_mode" not in result
+        assert [call["method"] for call in calls] == ["tasks.execute", "tasks.get"]
+
     @pytest.mark.asyncio
     async def test_get_input_schema(self):
         """Test input schema generation"""
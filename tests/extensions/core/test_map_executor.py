@@ -0,0 +1,282 @@
+"""
+Unit tests for MapExecutor
+
+Children are spawned at runtime under the map task and executed by TaskManager.
+"""
+import asyncio
+
+import pytest
+
+from aipartnerupflow.core.base import BaseTask
+from aipartnerupflow.core.config import (
+    set_max_concurrency,
+    set_scheduler_mode,
+    set_user_max_concurrency,
+)
+from aipartnerupflow.core.execution.fan_out import SPAWNED_BY_KEY
+from aipartnerupflow.core.execution.task_executor import TaskExecutor
+from aipartnerupflow.core.execution.task_manager import TaskManager
+from aipartnerupflow.core.types import TaskTreeNode
+from aipartnerupflow.extensions.core import MapExecutor, register_reducer
+from aipartnerupflow.extensions.core.map_executor import get_reducer, resolve_path
+
+calls = []
+
+
+class SquareExecutor(BaseTask):
+    id = "map_test_square_executor"
+    name = "Square Executor"
+    description = "Squares its input, fails for negative numbers"
+
+    async def execute(self, inputs):
+        calls.append(inputs["item"])
+        if inputs["item"] < 0:
+            raise RuntimeError("negative item")
+        return {"value": inputs["item"] ** 2, "label": inputs.get("label")}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+class ListExecutor(BaseTask):
+    id = "map_test_list_executor"
+    name = "List Executor"
+    description = "Returns the given rows"
+
+    async def execute(self, inputs):
+        return {"rows": inputs["rows"]}
+
+    def get_input_schema(self):
+        return {"type": "object"}
+
+
+TEST_EXECUTORS = [SquareExecutor, ListExecutor, MapExecutor]
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+CHILD_TEMPLATE = {
+    "name": "Square {{index}}",
+    "schemas": {"method": "map_test_square_executor"},
+    "inputs": {"item": "{{item}}", "label": "item-{{index}}"},
+}
+
+
+class TestReducers:
+    """Test built-in reductions and path resolution"""
+
+    def test_builtin_reducers(self):
+        concat, merge, total = get_reducer("concat"), get_reducer("merge"), get_reducer("sum")
+        assert concat.step(concat.step(concat.initial(), [1, 2]), 3) == [1, 2, 3]
+        assert merge.step(merge.step(merge.initial(), {"a": 1}), {"b": 2}) == {"a": 1, "b": 2}
+        assert total.step(total.step(total.initial(), 2), 1.5) == 3.5
+        with pytest.raises(ValueError, match="numeric"):
+            total.step(0, "x")
+        with pytest.raises(ValueError, match="Unknown reduce"):
+            get_reducer("missing")
+
+    def test_resolve_path(self):
+        value = {"fetch": {"rows": [{"id": 1}, {"id": 2}]}}
+        assert resolve_path(value, "fetch.rows.1.id") == 2
+        assert resolve_path(value, "fetch.missing.id") is None
+        assert resolve_path(value, None) is value
+
+
+class TestMapExecutor:
+    """Test fan-out execution through TaskManager"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scheduler_mode", ["recursive", "ready_queue"])
+    async def test_map_over_dependency_result(self, sync_db_session, scheduler_mode):
+        """
+        root
+        ├── rows
+        └── map (depends on rows, one child per row, summed)
+        """
+        set_scheduler_mode(scheduler_mode)
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        root = await repo.create_task(name="root", schemas={"method": "map_test_list_executor"}, inputs={"rows": []})
+        rows = await repo.create_task(
+            name="rows",
+            parent_id=root.id,
+            schemas={"method": "map_test_list_executor"},
+            inputs={"rows": [1, 2, 3, 4, 5]},
+        )
+        map_task = await repo.create_task(
+            name="map",
+            parent_id=root.id,
+            schemas={"method": "map_executor"},
+            dependencies=[{"id": rows.id, "required": True}],
+            inputs={
+                "items_from": f"{rows.id}.rows",
+                "task": CHILD_TEMPLATE,
+                "chunk_size": 2,
+                "max_concurrency": 2,
+                "reduce": "sum",
+                "reduce_field": "value",
+            },
+        )
+        tree = TaskTreeNode(task=root)
+        tree.add_child(TaskTreeNode(task=rows))
+        tree.add_child(TaskTreeNode(task=map_task))
+
+        await task_manager.distribute_task_tree(tree, use_callback=False)
+
+        map_task = await repo.get_task_by_id(map_task.id)
+        assert map_task.status == "completed"
+        assert map_task.result["result"] == 55
+        assert map_task.result["item_count"] == 5
+        assert map_task.result["completed"] == 5
+        assert map_task.has_children is True
+        assert sorted(calls) == [1, 2, 3, 4, 5]
+        assert (await repo.get_task_by_id(root.id)).status == "completed"
+
+        children = await repo.get_child_tasks_by_parent_id(map_task.id)
+        assert sorted(child.name for child in children) == [f"Square {i}" for i in range(5)]
+        for child in children:
+            assert child.status == "completed"
+            assert child.root_id == root.id
+            assert child.schemas[SPAWNED_BY_KEY] == map_task.id
+            assert child.inputs["label"] == f"item-{child.name.split()[-1]}"
+            # Consumed children do not stay in the in-memory tree index
+            assert not task_manager._tree_state.has_task(child.id)
+
+    @pytest.mark.asyncio
+    async def test_concat_default_inputs_and_custom_reducer(self, sync_db_session):
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        template = {"schemas": {"method": "map_test_square_executor"}}
+        concat = await repo.create_task(
+            name="concat", schemas={"method": "map_executor"}, inputs={"items": [3, 1, 2], "task": template}
+        )
+        await task_manager.distribute_task_tree(TaskTreeNode(task=concat), use_callback=False)
+        concat = await repo.get_task_by_id(concat.id)
+        # Default child inputs are {"item": item}; results keep item order
+        assert [entry["value"] for entry in concat.result["result"]] == [9, 1, 4]
+
+        register_reducer("max", lambda acc, value: value if acc is None else max(acc, value))
+        largest = await repo.create_task(
+            name="largest",
+            schemas={"method": "map_executor"},
+            inputs={"items": [3, 7, 2], "task": template, "reduce": "max", "reduce_field": "value"},
+        )
+        await task_manager.distribute_task_tree(TaskTreeNode(task=largest), use_callback=False)
+        assert (await repo.get_task_by_id(largest.id)).result["result"] == 49
+
+    @pytest.mark.asyncio
+    async def test_child_failures(self, sync_db_session):
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        strict = await repo.create_task(
+            name="strict", schemas={"method": "map_executor"}, inputs={"items": [1, -1, 2], "task": CHILD_TEMPLATE}
+        )
+        await task_manager.distribute_task_tree(TaskTreeNode(task=strict), use_callback=False)
+        strict = await repo.get_task_by_id(strict.id)
+        assert strict.result["success"] is False
+        assert strict.result["error"].startswith("1 of 3 child tasks failed")
+        assert len(strict.result["failed_task_ids"]) == 1
+
+        lenient = await repo.create_task(
+            name="lenient",
+            schemas={"method": "map_executor"},
+            inputs={
+                "items": [1, -1, 2],
+                "task": CHILD_TEMPLATE,
+                "allow_failures": True,
+                "reduce_field": "value",
+            },
+        )
+        await task_manager.distribute_task_tree(TaskTreeNode(task=lenient), use_callback=False)
+        lenient = await repo.get_task_by_id(lenient.id)
+        assert lenient.status == "completed"
+        assert lenient.result["result"] == [1, 4]
+        assert lenient.result["failed"] == 1
+        failed_child = await repo.get_task_by_id(lenient.result["failed_task_ids"][0])
+        assert failed_child.result["error"] == "negative item"
+        assert failed_child.parent_id == lenient.id
+
+    @pytest.mark.asyncio
+    async def test_rerun_replaces_spawned_children(self, sync_db_session):
+        repo = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[]).task_repository
+        root = await repo.create_task(name="root", schemas={"method": "map_test_list_executor"}, inputs={"rows": []})
+        map_task = await repo.create_task(
+            name="map",
+            parent_id=root.id,
+            schemas={"method": "map_executor"},
+            inputs={"items": [1, 2, 3], "task": CHILD_TEMPLATE},
+        )
+
+        async def execute():
+            tree = await repo.build_task_tree(await repo.get_task_by_id(root.id))
+            await TaskExecutor().execute_task_tree(tree, root.id, db_session=sync_db_session)
+            return tree
+
+        await execute()
+        first_ids = {child.id for child in await repo.get_child_tasks_by_parent_id(map_task.id)}
+        assert len(first_ids) == 3
+
+        # Spawned children are not re-executed on their own; the map task replaces them
+        calls.clear()
+        await execute()
+        assert sorted(calls) == [1, 2, 3]
+        children = await repo.get_child_tasks_by_parent_id(map_task.id)
+        assert len(children) == 3
+        assert not first_ids & {child.id for child in children}
+        assert (await repo.get_task_by_id(map_task.id)).result["completed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limits_do_not_deadlock(self, sync_db_session):
+        """The map task releases its slots while its children run"""
+        set_user_max_concurrency(1)
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        template = {"schemas": {"method": "map_test_square_executor"}}
+        single = await repo.create_task(
+            name="single", user_id="alice", schemas={"method": "map_executor"}, inputs={"items": [1, 2], "task": template}
+        )
+        await asyncio.wait_for(
+            task_manager.distribute_task_tree(TaskTreeNode(task=single), use_callback=False), timeout=10
+        )
+        single = await repo.get_task_by_id(single.id)
+        assert single.status == "completed"
+        assert single.result["completed"] == 2
+
+        # Two sibling maps with a global limit of two
+        set_user_max_concurrency(None)
+        set_max_concurrency(2)
+        root = await repo.create_task(name="root", schemas={"method": "map_test_list_executor"}, inputs={"rows": []})
+        tree = TaskTreeNode(task=root)
+        maps = []
+        for name in ("left", "right"):
+            map_task = await repo.create_task(
+                name=name,
+                parent_id=root.id,
+                schemas={"method": "map_executor"},
+                inputs={"items": [1, 2, 3], "task": template, "reduce_field": "value"},
+            )
+            maps.append(map_task)
+            tree.add_child(TaskTreeNode(task=map_task))
+        await asyncio.wait_for(task_manager.distribute_task_tree(tree, use_callback=False), timeout=10)
+        for map_task in maps:
+            assert (await repo.get_task_by_id(map_task.id)).result["result"] == [1, 4, 9]
+
+    @pytest.mark.asyncio
+    async def test_invalid_inputs(self, sync_db_session):
+        task_manager = TaskManager(sync_db_session, pre_hooks=[], post_hooks=[])
+        repo = task_manager.task_repository
+        task = await repo.create_task(
+            name="invalid", schemas={"method": "map_executor"}, inputs={"items": "abc", "task": CHILD_TEMPLATE}
+        )
+        await task_manager.distribute_task_tree(TaskTreeNode(task=task), use_callback=False)
+        task = await repo.get_task_by_id(task.id)
+        assert "must be a list" in task.result["error"]
+        assert await repo.get_child_tasks_by_parent_id(task.id) == []
+
+    def test_demo_result(self):
+        result = MapExecutor().get_demo_result(None, {"items": [1, 2]})
+        assert result["item_count"] == 2
+        assert result["result"][0]["demo_mode"] is True
@@ -0,0 +1,177 @@
+"""
+Test HttpClientPool
+
+Tests for shared pooled HTTP clients.
+"""
+
+import asyncio
+import pytest
+import httpx
+
+from aipartnerupflow.extensions.http.client_pool import (
+    HttpClientPool,
+    close_http_clients_on_shutdown,
+    get_http_client,
+    get_http_client_pool,
+    make_auth_key,
+    reset_http_client_pool,
+)
+
+
+class TestHttpClientPool:
+    """Test HttpClientPool functionality"""
+
+    @pytest.mark.asyncio
+    async def test_same_origin_shares_client(self):
+        """Requests to the same host reuse one client; other hosts get their own"""
+        pool = HttpClientPool()
+        try:
+            client = pool.get_client("https://api.example.com/users")
+            assert pool.get_client("https://api.example.com/orders?page=2") is client
+            assert pool.get_client("https://other.example.com/users") is not client
+            assert pool.get_client("http://api.example.com/users") is not client
+            assert len(pool) == 3
+        finally:
+            await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_tls_and_auth_select_separate_clients(self):
+        """TLS settings and credentials are part of the pool key"""
+        pool = HttpClientPool()
+        try:
+            url = "https://api.example.com"
+            client = pool.get_client(url)
+            assert pool.get_client(url, verify=False) is not client
+            token_client = pool.get_client(url, auth_key=make_auth_key("token-a"))
+            assert token_client is not client
+            assert pool.get_client(url, auth_key=make_auth_key("token-a")) is token_client
+            assert pool.get_client(url, auth_key=make_auth_key("token-b")) is not token_client
+        finally:
+            await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_clients(self):
+        """Closing the pool closes its clients; later calls create new ones"""
+        pool = HttpClientPool()
+        client = pool.get_client("https://api.example.com")
+        await pool.aclose()
+
+        assert client.is_closed
+        assert len(pool) == 0
+        new_client = pool.get_client("https://api.example.com")
+        assert new_client is not client
+        await pool.aclose()
+
+    def test_clients_are_bound_to_event_loop(self):
+        """A client created in another event loop is not reused"""
+        pool = HttpClientPool()
+
+        async def get_client():
+            return pool.get_client("https://api.example.com")
+
+        clients = []
+        for _ in range(2):
+            loop = asyncio.new_event_loop()
+            try:
+                clients.append(loop.run_until_complete(get_client()))
+            finally:
+                loop.close()
+        assert clients[0] is not clients[1]
+
+    def test_event_loops_keep_their_own_clients(self):
+        """Using the pool from one event loop does not replace the clients of another"""
+        pool = HttpClientPool()
+
+        async def get_client():
+            return pool.get_client("https://api.example.com")
+
+        loops = [asyncio.new_event_loop() for _ in range(2)]
+        try:
+            first = loops[0].run_until_complete(get_client())
+            second = loops[1].run_until_complete(get_client())
+            assert first is not second
+            assert loops[0].run_until_complete(get_client()) is first
+            assert len(pool) == 2
+        finally:
+            for loop in loops:
+                loop.run_until_complete(pool.aclose())
+                loop.close()
+        assert first.is_closed and second.is_closed
+
+    def test_thread_lane_closes_clients_of_its_loop(self):
+        """The thread execution lane closes the clients created during a call (one loop per call)"""
+        from aipartnerupflow.core.execution.lanes import _run_executor
+
+        class ClientExecutor:
+            async def execute(self, inputs):
+                return get_http_client(inputs["url"])
+
+        reset_http_client_pool()
+        try:
+            client = _run_executor(ClientExecutor(), {"url": "https://api.example.com"})
+            assert client.is_closed
+            assert len(get_http_client_pool()) == 0
+        finally:
+            reset_http_client_pool()
+
+    def test_clients_of_closed_event_loops_are_dropped(self):
+        """Clients of loops closed before their clients are dropped"""
+        pool = HttpClientPool()
+
+        async def get_client():
+            return pool.get_client("https://api.example.com")
+
+        for _ in range(2):
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(get_client())
+            loop.close()
+            assert len(pool) == 1
+
+    @pytest.mark.asyncio
+    async def test_cookies_are_not_stored(self):
+        """Response cookies are not kept on shared clients"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers={"Set-Cookie": "session=secret; Path=/"})
+
+        pool = HttpClientPool()
+        client = pool._create_client(True)
+        client._transport = httpx.MockTransport(handler)
+        try:
+            await client.get("https://api.example.com/login")
+            assert len(client.cookies) == 0
+        finally:
+            await client.aclose()
+
+    def test_clients_closed_on_app_shutdown(self):
+        """Pooled clients are closed when the app lifespan ends"""
+        from starlette.applications import Starlette
+        from starlette.responses import JSONResponse
+        from starlette.routing import Route
+        from starlette.testclient import TestClient
+
+        clients = []
+
+        async def handler(request):
+            clients.append(get_http_client("https://api.example.com"))
+            return JSONResponse({})
+
+        app = Starlette(routes=[Route("/", handler)])
+        close_http_clients_on_shutdown(app)
+
+        with TestClient(app) as test_client:
+            test_client.get("/")
+            assert not clients[0].is_closed
+        assert clients[0].is_closed
+
+    def test_make_auth_key(self):
+        """Credentials are hashed and empty credentials give no key"""
+        assert make_auth_key(None) is None
+        assert make_auth_key({}) is None
+        key = make_auth_key({"type": "bearer", "token": "secret"})
+        assert "secret" not in key
+        assert key == make_auth_key({"token": "secret", "type": "bearer"})
+
+    def test_invalid_limits(self):
+        """max_connections must be positive"""
+        with pytest.raises(ValueError):
+            HttpClientPool(max_connections=0)
@@ -27,7 +27,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -54,7 +54,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -82,7 +82,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -108,7 +108,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -127,7 +127,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(side_effect=httpx.TimeoutException("Timeout"))
             
             result = await executor.execute({
@@ -160,7 +160,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -186,7 +186,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -212,7 +212,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -238,7 +238,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -265,7 +265,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -282,7 +282,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(side_effect=httpx.RequestError("Connection error"))
             
             result = await executor.execute({
@@ -328,7 +328,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -355,7 +355,7 @@ class TestRestExecutor:
             
             with patch("httpx.AsyncClient") as mock_client:
                 mock_client_instance = AsyncMock()
-                mock_client.return_value.__aenter__.return_value = mock_client_instance
+                mock_client.return_value = mock_client_instance
                 mock_client_instance.request = AsyncMock(return_value=mock_response)
                 
                 result = await executor.execute({
@@ -380,7 +380,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -389,9 +389,9 @@ class TestRestExecutor:
             })
             
             assert result["success"] is True
-            # timeout is passed to AsyncClient constructor, not request method
-            client_call_kwargs = mock_client.call_args[1]
-            assert client_call_kwargs["timeout"] == 60.0
+            # timeout is passed per request (the AsyncClient is shared)
+            call_kwargs = mock_client_instance.request.call_args[1]
+            assert call_kwargs["timeout"] == 60.0
     
     @pytest.mark.asyncio
     async def test_execute_with_ssl_verification_disabled(self):
@@ -407,7 +407,7 @@ class TestRestExecutor:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_client_instance = AsyncMock()
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+            mock_client.return_value = mock_client_instance
             mock_client_instance.request = AsyncMock(return_value=mock_response)
             
             result = await executor.execute({
@@ -416,7 +416,7 @@ class TestRestExecutor:
             })
             
             assert result["success"] is True
-            # verify is passed to AsyncClient constructor, not request method
+            # verify selects the pooled AsyncClient, it is not a request option
             client_call_kwargs = mock_client.call_args[1]
             assert client_call_kwargs["verify"] is False
     